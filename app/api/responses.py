@@ -0,0 +1,14 @@
+"""API 响应类。"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.core import json_codec
+
+
+class CodecJSONResponse(JSONResponse):
+    """默认 JSON 响应：经 app.core.json_codec 序列化（orjson 可用时走 orjson）。"""
+
+    def render(self, content: Any) -> bytes:
+        return json_codec.dumps_bytes(content)
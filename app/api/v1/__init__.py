@@ -6,6 +6,7 @@ from app.api.v1.consistency.routes import router as consistency_router
 from app.api.v1.events.routes import router as events_router
 from app.api.v1.identity.routes import router as identity_router
 from app.api.v1.identity.routes import selection_router
+from app.api.v1.jobs.routes import router as jobs_router
 from app.api.v1.launch_kit.routes import router as launch_kit_router
 from app.api.v1.onboarding.routes import router as onboarding_router
 from app.api.v1.persona.routes import risk_router
@@ -23,3 +24,4 @@ v1_router.include_router(risk_router)
 v1_router.include_router(launch_kit_router)
 v1_router.include_router(consistency_router)
 v1_router.include_router(events_router)
+v1_router.include_router(jobs_router)
@@ -2,11 +2,14 @@
 
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.api.v1.pagination import page_items
+from app.db.session import get_async_db, get_db
 from app.schemas.consistency_check import (
+    ConsistencyCheckBatchCreate,
     ConsistencyCheckCreate,
     ConsistencyCheckResponse,
 )
@@ -16,6 +19,31 @@ from app.services.event_log import log_event
 
 router = APIRouter(prefix="/consistency-checks", tags=["consistency"])
 
+# 每条检查携带完整 draft_text，列表单页默认/上限较小。
+LIST_DEFAULT_LIMIT = 20
+LIST_MAX_LIMIT = 100
+
+
+def _check_result_to_dict(result: consistency_service.ConsistencyCheckExecutionResult) -> dict[str, Any]:
+    check = result.check
+    return {
+        "id": check.id,
+        "deviation_items": check.deviation_items_json,
+        "deviation_reasons": check.deviation_reasons_json,
+        "suggestions": check.suggestions_json,
+        "risk_triggered": check.risk_triggered,
+        "risk_warning": check.risk_warning,
+        "score": result.score,
+        "degraded": result.degraded,
+        "degrade_reason": result.degrade_reason,
+        "schema_repair_attempts": result.schema_repair_attempts,
+        "precheck_hits": [hit.to_dict() for hit in result.precheck_hits],
+        "short_circuited": result.short_circuited,
+        "cached": result.cached,
+        "segments_total": result.segments_total,
+        "segments_reused": result.segments_reused,
+    }
+
 
 @router.post("", response_model=dict)
 def create_consistency_check(
@@ -37,6 +65,7 @@ def create_consistency_check(
             draft_text=body.draft_text,
             identity_model_id=body.identity_model_id,
             constitution_id=body.constitution_id,
+            force=body.force,
         )
         check = result.check
 
@@ -53,21 +82,13 @@ def create_consistency_check(
                 "degraded": result.degraded,
                 "degrade_reason": result.degrade_reason,
                 "schema_repair_attempts": result.schema_repair_attempts,
+                "short_circuited": result.short_circuited,
+                "cached": result.cached,
+                "segments_reused": result.segments_reused,
             },
         )
 
-        return {
-            "id": check.id,
-            "deviation_items": check.deviation_items_json,
-            "deviation_reasons": check.deviation_reasons_json,
-            "suggestions": check.suggestions_json,
-            "risk_triggered": check.risk_triggered,
-            "risk_warning": check.risk_warning,
-            "score": result.score,
-            "degraded": result.degraded,
-            "degrade_reason": result.degrade_reason,
-            "schema_repair_attempts": result.schema_repair_attempts,
-        }
+        return _check_result_to_dict(result)
     except LLMServiceError as error:
         # LLM 调用失败统一返回结构化 502。
         raise HTTPException(status_code=502, detail=error.to_detail()) from error
@@ -75,22 +96,79 @@ def create_consistency_check(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/batch", response_model=dict)
+def create_consistency_check_batch(
+    body: ConsistencyCheckBatchCreate,
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    """
+    Check many drafts in one request.
+
+    results 与 drafts 顺序一致；单条 LLM 失败以 status=error 返回，不影响其他草稿。
+    """
+    try:
+        items = consistency_service.check_consistency_batch(
+            db=db,
+            user_id=body.user_id,
+            drafts=body.drafts,
+            identity_model_id=body.identity_model_id,
+            constitution_id=body.constitution_id,
+            force=body.force,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    results: list[dict[str, Any]] = []
+    for item in items:
+        if item.result is None:
+            results.append({"index": item.index, "status": "error", "error": item.error.to_detail()})
+        else:
+            results.append({"index": item.index, "status": "ok", **_check_result_to_dict(item.result)})
+
+    succeeded = [item.result for item in items if item.result is not None]
+    # 批量请求只记一条触发事件，payload 汇总本批信号字段。
+    log_event(
+        db=db,
+        user_id=body.user_id,
+        event_name="consistency_check_triggered",
+        stage="MVP",
+        identity_model_id=body.identity_model_id,
+        payload={
+            "batch_size": len(items),
+            "succeeded": len(succeeded),
+            "failed": len(items) - len(succeeded),
+            "risk_triggered": sum(1 for result in succeeded if result.check.risk_triggered),
+            "degraded": sum(1 for result in succeeded if result.degraded),
+            "short_circuited": sum(1 for result in succeeded if result.short_circuited),
+            "cached": sum(1 for result in succeeded if result.cached),
+        },
+    )
+    return {"results": results}
+
+
 @router.get("/users/{user_id}", response_model=list[ConsistencyCheckResponse])
-def get_user_checks(
+async def get_user_checks(
     user_id: str,
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(default=LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
 ) -> list[ConsistencyCheckResponse]:
-    """Get all consistency checks for a user."""
-    return consistency_service.get_user_checks(db, user_id)
+    """Get a page of consistency checks for a user (newest first); next page cursor in X-Next-Cursor."""
+    try:
+        page = await consistency_service.get_user_checks_page_async(db, user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_items(response, page)
 
 
 @router.get("/{check_id}", response_model=ConsistencyCheckResponse)
-def get_check(
+async def get_check(
     check_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> ConsistencyCheckResponse:
     """Get consistency check by ID."""
-    check = consistency_service.get_check(db, check_id)
+    check = await consistency_service.get_check_async(db, check_id)
     if not check:
         raise HTTPException(status_code=404, detail="Consistency check not found")
     return check
@@ -2,20 +2,24 @@
 
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.schemas.event_log import EventLogCreate, EventLogResponse
+from app.api.v1.pagination import page_items
+from app.db.session import get_async_db
+from app.schemas.event_log import EventLogBatchCreate, EventLogCreate, EventLogResponse
 from app.services import event_log as event_service
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+LIST_DEFAULT_LIMIT = 100
+LIST_MAX_LIMIT = 500
+
 
 @router.post("", response_model=dict)
-def create_event(
+async def create_event(
     body: EventLogCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> dict[str, Any]:
     """
     Log an event for analytics.
@@ -28,7 +32,7 @@ def create_event(
     """
     try:
         # 事件校验（event_name/stage）下沉在 service 层执行。
-        event = event_service.log_event(
+        event = await event_service.log_event_async(
             db=db,
             user_id=body.user_id,
             event_name=body.event_name,
@@ -46,30 +50,86 @@ def create_event(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/batch", response_model=dict)
+async def create_event_batch(
+    body: EventLogBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> dict[str, Any]:
+    """
+    Log many events in one request.
+
+    每条事件单独校验，返回逐条 accepted/rejected 结果；通过校验的事件在同一事务中批量写入。
+    """
+    try:
+        results = await event_service.log_events_batch_async(
+            db,
+            [item.model_dump() for item in body.events],
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    items: list[dict[str, Any]] = []
+    for result in results:
+        if result.event is not None:
+            items.append(
+                {
+                    "index": result.index,
+                    "status": "accepted",
+                    "id": result.event.id,
+                    "occurred_at": result.event.occurred_at.isoformat(),
+                }
+            )
+        else:
+            items.append({"index": result.index, "status": "rejected", "error": result.error})
+    return {
+        "accepted": sum(1 for item in items if item["status"] == "accepted"),
+        "rejected": sum(1 for item in items if item["status"] == "rejected"),
+        "results": items,
+    }
+
+
 @router.get("/users/{user_id}", response_model=list[EventLogResponse])
-def get_user_events(
+async def get_user_events(
     user_id: str,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(default=LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
 ) -> list[EventLogResponse]:
-    """Get events for a user."""
-    return event_service.get_user_events(db, user_id, limit)
+    """Get events for a user (newest first); next page cursor in X-Next-Cursor."""
+    try:
+        page = await event_service.get_user_events_page_async(db, user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_items(response, page)
 
 
 @router.get("/name/{event_name}", response_model=list[EventLogResponse])
-def get_events_by_name(
+async def get_events_by_name(
     event_name: str,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(default=LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
 ) -> list[EventLogResponse]:
-    """Get events by name."""
-    return event_service.get_events_by_name(db, event_name, limit)
+    """Get events by name (newest first); next page cursor in X-Next-Cursor."""
+    try:
+        page = await event_service.get_events_by_name_page_async(db, event_name, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_items(response, page)
 
 
 @router.get("/recent", response_model=list[EventLogResponse])
-def get_recent_events(
-    limit: int = 100,
-    db: Session = Depends(get_db),
+async def get_recent_events(
+    response: Response,
+    limit: int = Query(default=LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
 ) -> list[EventLogResponse]:
-    """Get recent events across all users."""
-    return event_service.get_recent_events(db, limit)
+    """Get recent events across all users; next page cursor in X-Next-Cursor."""
+    try:
+        page = await event_service.get_recent_events_page_async(db, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_items(response, page)
@@ -0,0 +1,86 @@
+"""
+生成接口（身份模型/人格宪法/启动包）共用的 HTTP 约定。
+
+- async=true：只创建后台任务，返回 202 与任务地址；
+- Idempotency-Key：成功响应（含 202）在 TTL 内按同一个 key 重放，重放响应带 Idempotent-Replayed: true；
+- 并发的相同请求在进程内合并为一次生成。
+"""
+
+from typing import Any
+
+from fastapi import Header, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.responses import CodecJSONResponse
+from app.schemas.generation_job import GenerationJobResponse
+from app.services import generation_jobs as job_service
+from app.services import idempotency as idempotency_service
+from app.services.llm_client import LLMServiceError
+
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+
+ASYNC_QUERY = Query(
+    default=False,
+    alias="async",
+    description="true 时立即返回 202 与任务，结果通过 GET /v1/jobs/{job_id} 获取。",
+)
+
+IDEMPOTENCY_KEY_HEADER = Header(
+    default=None,
+    alias="Idempotency-Key",
+    min_length=1,
+    max_length=255,
+    description="客户端生成的唯一键；重试时携带同一个 key 会重放首次成功的响应，不会重复生成。",
+)
+
+GENERATION_RESPONSES: dict[int | str, dict[str, Any]] = {
+    202: {"model": GenerationJobResponse, "description": "Generation job accepted"},
+    409: {"description": "A request with the same Idempotency-Key is still in progress"},
+    422: {"description": "Validation error, or Idempotency-Key reused with a different request body"},
+}
+
+
+async def run_generation(
+    db: AsyncSession,
+    *,
+    operation: str,
+    user_id: str,
+    request: dict[str, Any],
+    run_async: bool,
+    idempotency_key: str | None,
+) -> CodecJSONResponse:
+    """按 async 同步生成或创建任务；外层套上请求合并与幂等重放。同步生成时 LLM 调用在事件循环内等待。"""
+
+    async def _execute() -> idempotency_service.StoredResponse:
+        if run_async:
+            job = await job_service.enqueue_job_async(db, operation=operation, user_id=user_id, request=request)
+            return idempotency_service.StoredResponse(
+                202, jsonable_encoder(GenerationJobResponse.model_validate(job))
+            )
+        try:
+            # 路由层只做参数组装，生成/校验逻辑全部在 service 内完成。
+            body = await job_service.ASYNC_JOB_OPERATIONS[operation](db, **request)
+        except LLMServiceError as error:
+            # 统一返回结构化 502，避免泄露上游敏感信息。
+            raise HTTPException(status_code=502, detail=error.to_detail()) from error
+        return idempotency_service.StoredResponse(200, body)
+
+    try:
+        stored = await idempotency_service.execute_idempotent_async(
+            db,
+            user_id=user_id,
+            operation=operation,
+            request={"async": run_async, **request},
+            idempotency_key=idempotency_key,
+            execute=_execute,
+        )
+    except idempotency_service.IdempotencyError as error:
+        raise HTTPException(status_code=error.status_code, detail=str(error)) from error
+
+    headers: dict[str, str] = {}
+    if stored.status_code == 202:
+        headers["Location"] = f"/v1/jobs/{stored.body['id']}"
+    if stored.replayed:
+        headers[IDEMPOTENT_REPLAYED_HEADER] = "true"
+    return CodecJSONResponse(status_code=stored.status_code, content=stored.body, headers=headers)
@@ -1,4 +1,6 @@
-"""健康检查路由：提供服务与数据库可用性探针。"""
+"""健康检查路由：提供服务、数据库可用性与 LLM 上游熔断状态探针。"""
+
+from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import text
@@ -6,12 +8,13 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
+from app.services.llm_client import get_llm_circuit_breakers
 
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health")
-def health_check(db: Session = Depends(get_db)) -> dict[str, bool | str]:
+def health_check(db: Session = Depends(get_db)) -> dict[str, Any]:
     # 仅执行轻量 SQL 探针，避免健康检查本身产生业务副作用。
     try:
         db.execute(text("SELECT 1"))
@@ -20,4 +23,9 @@ def health_check(db: Session = Depends(get_db)) -> dict[str, bool | str]:
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="database unavailable",
         ) from exc
-    return {"status": "ok", "db_ok": True}
+
+    # LLM 上游熔断只影响生成接口，读接口仍可用：标记为 degraded 但保持 200。
+    breakers = get_llm_circuit_breakers()
+    llm_circuits = breakers.snapshot() if breakers is not None else []
+    degraded = any(circuit["state"] != "closed" for circuit in llm_circuits)
+    return {"status": "degraded" if degraded else "ok", "db_ok": True, "llm_circuits": llm_circuits}
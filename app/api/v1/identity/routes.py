@@ -2,28 +2,40 @@
 
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.api.v1.generation import (
+    ASYNC_QUERY,
+    GENERATION_RESPONSES,
+    IDEMPOTENCY_KEY_HEADER,
+    run_generation,
+)
+from app.api.v1.pagination import page_items
+from app.db.session import get_async_db, get_db
 from app.schemas.identity_model import (
     IdentityModelGenerate,
     IdentityModelResponse,
     IdentitySelectionCreate,
     IdentitySelectionResponse,
 )
-from app.services.llm_client import LLMServiceError
 from app.services import identity_model as identity_service
 from app.services.event_log import log_event
 
 router = APIRouter(prefix="/identity-models", tags=["identity"])
 
+LIST_DEFAULT_LIMIT = 50
+LIST_MAX_LIMIT = 200
+
 
-@router.post("/generate", response_model=list[dict])
-def generate_identity_models(
+@router.post("/generate", response_model=list[dict], responses=GENERATION_RESPONSES)
+async def generate_identity_models(
     body: IdentityModelGenerate,
-    db: Session = Depends(get_db),
-) -> list[dict[str, Any]]:
+    run_async: bool = ASYNC_QUERY,
+    idempotency_key: str | None = IDEMPOTENCY_KEY_HEADER,
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
     """
     Generate 3-5 identity models based on capability profile.
     
@@ -31,61 +43,33 @@ def generate_identity_models(
     - differentiation must be non-empty
     - tone_examples >= 5 sentences
     - long_term_views 5-10 items
-    """
-    # 若提供 session_id，则优先读取已落库画像，覆盖请求体中的 capability_profile。
-    capability_profile = body.capability_profile
-    if body.session_id:
-        from app.services.onboarding import get_profile
-        profile = get_profile(db, body.session_id)
-        if profile:
-            import json
-            capability_profile = {
-                "skill_stack": json.loads(profile.skill_stack_json),
-                "cognitive_style": profile.cognitive_style,
-                "risk_tolerance": profile.risk_tolerance,
-            }
 
-    try:
-        # 路由层只做参数组装，生成/校验逻辑全部在 service 内完成。
-        models = identity_service.generate_identity_models(
-            db=db,
-            user_id=body.user_id,
-            session_id=body.session_id,
-            capability_profile=capability_profile,
-            count=body.count,
-        )
-    except LLMServiceError as error:
-        # 统一返回结构化 502，避免泄露上游敏感信息。
-        raise HTTPException(status_code=502, detail=error.to_detail()) from error
-
-    # 生成成功后记录埋点事件。
-    log_event(
-        db=db,
+    async=true 时返回 202 与生成任务，结果与同步响应体相同；带 Idempotency-Key 的重试重放首次成功响应。
+    """
+    return await run_generation(
+        db,
+        operation="identity_models",
         user_id=body.user_id,
-        event_name="identity_models_generated",
-        stage="MVP",
+        request=body.model_dump(mode="json"),
+        run_async=run_async,
+        idempotency_key=idempotency_key,
     )
 
-    return [
-        {
-            "id": m.id,
-            "title": m.title,
-            "target_audience_pain": m.target_audience_pain,
-            "differentiation": m.differentiation,
-            "is_primary": m.is_primary,
-            "is_backup": m.is_backup,
-        }
-        for m in models
-    ]
-
 
 @router.get("/users/{user_id}", response_model=list[IdentityModelResponse])
 def get_user_identity_models(
     user_id: str,
+    response: Response,
+    limit: int = Query(default=LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
 ) -> list[IdentityModelResponse]:
-    """Get all identity models for a user."""
-    return identity_service.get_user_identity_models(db, user_id)
+    """Get a page of identity models for a user (oldest first); next page cursor in X-Next-Cursor."""
+    try:
+        page = identity_service.get_user_identity_models_page(db, user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_items(response, page)
 
 
 @router.get("/{model_id}", response_model=IdentityModelResponse)
@@ -0,0 +1,5 @@
+"""Generation job API exports."""
+
+from app.api.v1.jobs.routes import router as jobs_router
+
+__all__ = ["jobs_router"]
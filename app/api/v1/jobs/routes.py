@@ -0,0 +1,55 @@
+"""后台生成任务 API 路由。"""
+
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.sse import SSE_HEADERS, format_sse, format_sse_comment
+from app.core.config import get_settings
+from app.db.session import get_async_db
+from app.schemas.generation_job import GenerationJobResponse
+from app.services import generation_jobs as job_service
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# 任务状态 -> SSE 事件名；未结束的状态统一为 status。
+_TERMINAL_EVENTS = {"succeeded": "completed", "failed": "failed"}
+
+
+@router.get("/{job_id}", response_model=GenerationJobResponse)
+async def get_generation_job(
+    job_id: str,
+    wait: float = Query(default=0.0, ge=0, description="长轮询秒数，上限为 GENERATION_JOB_MAX_WAIT_SECONDS"),
+    db: AsyncSession = Depends(get_async_db),
+) -> GenerationJobResponse:
+    """Get generation job by ID; with wait>0 the request returns as soon as the job finishes."""
+    if wait > 0:
+        timeout = min(wait, get_settings().generation_job_max_wait_seconds)
+        job = await job_service.wait_for_job_completion(db, job_id, timeout=timeout)
+    else:
+        job = await job_service.get_job_async(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Generation job not found")
+    return job
+
+
+@router.get("/{job_id}/events")
+async def stream_generation_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db),
+) -> StreamingResponse:
+    """Stream generation job status as Server-Sent Events (status... -> completed | failed)."""
+    if not await job_service.get_job_async(db, job_id):
+        raise HTTPException(status_code=404, detail="Generation job not found")
+
+    async def event_stream() -> AsyncIterator[str]:
+        async for job in job_service.iter_job_updates(db, job_id):
+            if job is None:
+                yield format_sse_comment("heartbeat")
+                continue
+            data = GenerationJobResponse.model_validate(job).model_dump(mode="json")
+            yield format_sse(_TERMINAL_EVENTS.get(job.status, "status"), data)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -1,90 +1,141 @@
 """启动包 API 路由。"""
 
-from typing import Any
+from collections.abc import Iterator
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.schemas.launch_kit import LaunchKitGenerate, LaunchKitResponse
+from app.api.v1.generation import (
+    ASYNC_QUERY,
+    GENERATION_RESPONSES,
+    IDEMPOTENCY_KEY_HEADER,
+    run_generation,
+)
+from app.api.v1.pagination import page_items
+from app.api.v1.sse import SSE_HEADERS, format_sse
+from app.db.session import get_async_db, get_db
+from app.schemas.launch_kit import LaunchKitGenerate, LaunchKitResponse, LaunchKitSummaryResponse
 from app.services.llm_client import LLMServiceError
 from app.services import launch_kit as launch_kit_service
 from app.services.event_log import log_event
 
 router = APIRouter(prefix="/launch-kits", tags=["launch_kit"])
 
+# 每个启动包带 7 天正文，列表单页默认/上限较小。
+LIST_DEFAULT_LIMIT = 10
+LIST_MAX_LIMIT = 50
+
+# full 返回每天完整正文；summary 省略 draft_or_outline，只需主题/开场白时使用。
+LaunchKitView = Literal["full", "summary"]
 
-@router.post("/generate", response_model=dict)
-def generate_launch_kit(
-    body: LaunchKitGenerate,
-    db: Session = Depends(get_db),
-) -> dict[str, Any]:
-    """Generate 7-Day Launch Kit."""
-    try:
-        # 请求体参数按原样传入 service，服务层负责 LLM 调用与落库。
-        kit = launch_kit_service.generate_launch_kit(
-            db=db,
-            user_id=body.user_id,
-            identity_model_id=body.identity_model_id,
-            constitution_id=body.constitution_id,
-            sustainable_columns=body.sustainable_columns,
-            growth_experiment_suggestion=body.growth_experiment_suggestion,
-        )
-    except LLMServiceError as error:
-        # 对外统一返回可观测的 502 结构，不透传上游原始响应。
-        raise HTTPException(status_code=502, detail=error.to_detail()) from error
 
-    # 生成成功后记录 launch_kit_generated 事件。
-    log_event(
-        db=db,
+@router.post("/generate", response_model=dict, responses=GENERATION_RESPONSES)
+async def generate_launch_kit(
+    body: LaunchKitGenerate,
+    run_async: bool = ASYNC_QUERY,
+    idempotency_key: str | None = IDEMPOTENCY_KEY_HEADER,
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """Generate 7-Day Launch Kit; async=true returns 202 with a generation job."""
+    return await run_generation(
+        db,
+        operation="launch_kit",
         user_id=body.user_id,
-        event_name="launch_kit_generated",
-        stage="MVP",
-        identity_model_id=kit.identity_model_id,
+        request=body.model_dump(mode="json"),
+        run_async=run_async,
+        idempotency_key=idempotency_key,
     )
 
-    return {
-        "id": kit.id,
-        "user_id": kit.user_id,
-        "days": [
-            {
-                "day_no": d.day_no,
-                "theme": d.theme,
-                "opening_text": d.opening_text,
-            }
-            for d in kit.days
-        ],
-    }
-
-
-@router.get("/users/{user_id}", response_model=list[LaunchKitResponse])
-def get_user_launch_kits(
-    user_id: str,
+
+@router.post("/generate/stream")
+def stream_launch_kit(
+    body: LaunchKitGenerate,
     db: Session = Depends(get_db),
-) -> list[LaunchKitResponse]:
-    """Get all launch kits for a user."""
-    return launch_kit_service.get_user_launch_kits(db, user_id)
+) -> StreamingResponse:
+    """Generate 7-Day Launch Kit as Server-Sent Events (day... -> completed)."""
+
+    def event_stream() -> Iterator[str]:
+        try:
+            for item in launch_kit_service.stream_launch_kit(
+                db=db,
+                user_id=body.user_id,
+                identity_model_id=body.identity_model_id,
+                constitution_id=body.constitution_id,
+                sustainable_columns=body.sustainable_columns,
+                growth_experiment_suggestion=body.growth_experiment_suggestion,
+            ):
+                if item.event == "completed":
+                    # 与非流式接口一致：落库成功后再记录 launch_kit_generated 事件。
+                    log_event(
+                        db=db,
+                        user_id=body.user_id,
+                        event_name="launch_kit_generated",
+                        stage="MVP",
+                        identity_model_id=item.data.get("identity_model_id"),
+                    )
+                yield format_sse(item.event, item.data)
+        except LLMServiceError as error:
+            # 响应头已发送，错误以 error 事件下发，结构与 502 detail 相同。
+            yield format_sse("error", error.to_detail())
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
 
 
-@router.get("/users/{user_id}/latest", response_model=LaunchKitResponse)
-def get_latest_launch_kit(
+def _serialize_kit(kit: Any, view: LaunchKitView) -> LaunchKitResponse | LaunchKitSummaryResponse:
+    # 显式转换成目标 Schema，summary 视图不会触碰未加载的 draft_or_outline。
+    if view == "summary":
+        return LaunchKitSummaryResponse.model_validate(kit)
+    return LaunchKitResponse.model_validate(kit)
+
+
+@router.get(
+    "/users/{user_id}",
+    response_model=list[LaunchKitResponse] | list[LaunchKitSummaryResponse],
+)
+async def get_user_launch_kits(
     user_id: str,
-    db: Session = Depends(get_db),
-) -> LaunchKitResponse:
+    response: Response,
+    limit: int = Query(default=LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT),
+    cursor: str | None = None,
+    view: LaunchKitView = "full",
+    db: AsyncSession = Depends(get_async_db),
+) -> list[LaunchKitResponse] | list[LaunchKitSummaryResponse]:
+    """Get a page of launch kits for a user (newest first); next page cursor in X-Next-Cursor."""
+    try:
+        page = await launch_kit_service.get_user_launch_kits_page_async(
+            db, user_id, limit=limit, cursor=cursor, summary=view == "summary"
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return [_serialize_kit(kit, view) for kit in page_items(response, page)]
+
+
+@router.get("/users/{user_id}/latest", response_model=LaunchKitResponse | LaunchKitSummaryResponse)
+async def get_latest_launch_kit(
+    user_id: str,
+    view: LaunchKitView = "full",
+    db: AsyncSession = Depends(get_async_db),
+) -> LaunchKitResponse | LaunchKitSummaryResponse:
     """Get user's latest launch kit."""
-    kit = launch_kit_service.get_latest_launch_kit(db, user_id)
+    kit = await launch_kit_service.get_latest_launch_kit_async(
+        db, user_id, summary=view == "summary"
+    )
     if not kit:
         raise HTTPException(status_code=404, detail="No launch kit found")
-    return kit
+    return _serialize_kit(kit, view)
 
 
-@router.get("/{kit_id}", response_model=LaunchKitResponse)
-def get_launch_kit(
+@router.get("/{kit_id}", response_model=LaunchKitResponse | LaunchKitSummaryResponse)
+async def get_launch_kit(
     kit_id: str,
-    db: Session = Depends(get_db),
-) -> LaunchKitResponse:
+    view: LaunchKitView = "full",
+    db: AsyncSession = Depends(get_async_db),
+) -> LaunchKitResponse | LaunchKitSummaryResponse:
     """Get launch kit by ID."""
-    kit = launch_kit_service.get_launch_kit(db, kit_id)
+    kit = await launch_kit_service.get_launch_kit_async(db, kit_id, summary=view == "summary")
     if not kit:
         raise HTTPException(status_code=404, detail="Launch kit not found")
-    return kit
+    return _serialize_kit(kit, view)
@@ -2,9 +2,10 @@
 
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
+from app.api.v1.pagination import page_items
 from app.db.session import get_db
 from app.schemas.onboarding import (
     OnboardingSessionCreate,
@@ -17,6 +18,9 @@ from app.services.event_log import log_event
 
 router = APIRouter(prefix="/onboarding", tags=["onboarding"])
 
+LIST_DEFAULT_LIMIT = 20
+LIST_MAX_LIMIT = 100
+
 
 @router.post("/sessions", response_model=dict)
 def create_session(
@@ -103,7 +107,14 @@ def get_profile(
 @router.get("/users/{user_id}/profiles", response_model=list[CapabilityProfileResponse])
 def get_user_profiles(
     user_id: str,
+    response: Response,
+    limit: int = Query(default=LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
 ) -> list[CapabilityProfileResponse]:
-    """Get all capability profiles for a user."""
-    return onboarding_service.get_user_profiles(db, user_id)
+    """Get a page of capability profiles for a user (newest first); next page cursor in X-Next-Cursor."""
+    try:
+        page = onboarding_service.get_user_profiles_page(db, user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_items(response, page)
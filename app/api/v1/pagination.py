@@ -0,0 +1,18 @@
+"""列表接口分页的 HTTP 约定：响应体保持数组，下一页游标放在响应头。"""
+
+from typing import TypeVar
+
+from fastapi import Response
+
+from app.services.pagination import Page
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_items(response: Response, page: Page[T]) -> list[T]:
+    """写入 X-Next-Cursor（仅在还有下一页时）并返回本页数据。"""
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
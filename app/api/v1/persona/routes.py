@@ -2,56 +2,64 @@
 
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.api.v1.generation import (
+    ASYNC_QUERY,
+    GENERATION_RESPONSES,
+    IDEMPOTENCY_KEY_HEADER,
+    run_generation,
+)
+from app.api.v1.pagination import page_items
+from app.db.session import get_async_db, get_db
 from app.schemas.persona import (
     PersonaConstitutionGenerate,
     PersonaConstitutionResponse,
     RiskBoundaryItemCreate,
     RiskBoundaryItemResponse,
 )
-from app.services.llm_client import LLMServiceError
 from app.services import persona as persona_service
 
 router = APIRouter(prefix="/persona-constitutions", tags=["persona"])
 
+LIST_DEFAULT_LIMIT = 20
+LIST_MAX_LIMIT = 100
 
-@router.post("/generate", response_model=dict)
-def generate_constitution(
-    body: PersonaConstitutionGenerate,
-    db: Session = Depends(get_db),
-) -> dict[str, Any]:
-    """Generate persona constitution."""
-    try:
-        # 透传用户输入提示词到服务层，服务层负责调用 LLM 与结构校验。
-        constitution = persona_service.generate_constitution(
-            db=db,
-            user_id=body.user_id,
-            identity_model_id=body.identity_model_id,
-            common_words=body.common_words,
-            forbidden_words=body.forbidden_words,
-        )
-    except LLMServiceError as error:
-        # LLM 相关异常统一映射为结构化 502。
-        raise HTTPException(status_code=502, detail=error.to_detail()) from error
 
-    return {
-        "id": constitution.id,
-        "user_id": constitution.user_id,
-        "version": constitution.version,
-        "narrative_mainline": constitution.narrative_mainline,
-    }
+@router.post("/generate", response_model=dict, responses=GENERATION_RESPONSES)
+async def generate_constitution(
+    body: PersonaConstitutionGenerate,
+    run_async: bool = ASYNC_QUERY,
+    idempotency_key: str | None = IDEMPOTENCY_KEY_HEADER,
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """Generate persona constitution; async=true returns 202 with a generation job."""
+    return await run_generation(
+        db,
+        operation="persona_constitution",
+        user_id=body.user_id,
+        request=body.model_dump(mode="json"),
+        run_async=run_async,
+        idempotency_key=idempotency_key,
+    )
 
 
 @router.get("/users/{user_id}", response_model=list[PersonaConstitutionResponse])
 def get_user_constitutions(
     user_id: str,
+    response: Response,
+    limit: int = Query(default=LIST_DEFAULT_LIMIT, ge=1, le=LIST_MAX_LIMIT),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
 ) -> list[PersonaConstitutionResponse]:
-    """Get all persona constitutions for a user."""
-    return persona_service.get_user_constitutions(db, user_id)
+    """Get a page of persona constitutions for a user (newest first); next page cursor in X-Next-Cursor."""
+    try:
+        page = persona_service.get_user_constitutions_page(db, user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_items(response, page)
 
 
 @router.get("/users/{user_id}/latest", response_model=PersonaConstitutionResponse)
@@ -81,6 +89,9 @@ def get_constitution(
 # 风险边界维护路由。
 risk_router = APIRouter(prefix="/risk-boundaries", tags=["risk"])
 
+RISK_LIST_DEFAULT_LIMIT = 50
+RISK_LIST_MAX_LIMIT = 200
+
 
 @risk_router.post("", response_model=dict)
 def create_risk_boundary(
@@ -97,6 +108,7 @@ def create_risk_boundary(
         identity_model_id=body.identity_model_id,
         constitution_id=body.constitution_id,
         source=body.source,
+        keywords=body.keywords,
     )
 
     return {
@@ -104,13 +116,21 @@ def create_risk_boundary(
         "risk_level": item.risk_level,
         "boundary_type": item.boundary_type,
         "statement": item.statement,
+        "keywords": item.keywords_json,
     }
 
 
 @risk_router.get("/users/{user_id}", response_model=list[RiskBoundaryItemResponse])
 def get_user_risk_boundaries(
     user_id: str,
+    response: Response,
+    limit: int = Query(default=RISK_LIST_DEFAULT_LIMIT, ge=1, le=RISK_LIST_MAX_LIMIT),
+    cursor: str | None = None,
     db: Session = Depends(get_db),
 ) -> list[RiskBoundaryItemResponse]:
-    """Get all risk boundaries for a user."""
-    return persona_service.get_user_risk_boundaries(db, user_id)
+    """Get a page of risk boundaries for a user (newest first); next page cursor in X-Next-Cursor."""
+    try:
+        page = persona_service.get_user_risk_boundaries_page(db, user_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page_items(response, page)
@@ -0,0 +1,17 @@
+"""Server-Sent Events 的 HTTP 约定：事件帧格式与禁用缓冲的响应头。"""
+
+from typing import Any
+
+from app.core import json_codec
+
+# 关闭客户端缓存与 nginx 缓冲，保证事件逐条到达。
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def format_sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json_codec.dumps(data)}\n\n"
+
+
+def format_sse_comment(text: str) -> str:
+    """注释行不会触发客户端事件，用作心跳。"""
+    return f": {text}\n\n"
@@ -2,11 +2,19 @@
 
 import json
 from functools import lru_cache
+from typing import Literal
 
-from pydantic import Field, field_validator, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class LLMModelRateLimit(BaseModel):
+    """单个模型的上游配额；0 表示不限制。"""
+
+    requests_per_minute: int = Field(default=0, ge=0)
+    tokens_per_minute: int = Field(default=0, ge=0)
+
+
 class Settings(BaseSettings):
     """集中管理后端运行时配置。"""
 
@@ -28,8 +36,94 @@ class Settings(BaseSettings):
     reason: bool | None = None
     openai_timeout_seconds: float = Field(default=90.0, gt=0)
     openai_max_retries: int = Field(default=2, ge=0)
+    # 重试退避：指数退避 + full jitter（首次重试等待 [0, base)，之后翻倍，封顶 max）；上游返回 Retry-After 时以其为准。
+    llm_retry_base_delay_seconds: float = Field(default=0.5, ge=0)
+    llm_retry_max_delay_seconds: float = Field(default=8.0, ge=0)
+    # 单次生成的总时间预算（秒）：覆盖全部重试、退避等待与 schema 修复调用，耗尽后不再发起上游请求。
+    llm_deadline_seconds: float = Field(default=180.0, gt=0)
+    # LLM 响应缓存：默认关闭，按 operation 白名单开启。
+    llm_cache_backend: Literal["none", "memory", "sqlite"] = "none"
+    llm_cache_ttl_seconds: float = Field(default=3600.0, gt=0)
+    llm_cache_max_entries: int = Field(default=512, ge=1)
+    llm_cache_sqlite_path: str = "./data/llm_cache.db"
+    llm_cache_operations: list[str] = Field(
+        default_factory=lambda: [
+            "generate_launch_kit",
+            "generate_launch_kit_plan",
+            "generate_launch_kit_day",
+            "check_consistency",
+        ]
+    )
+    # 进程级 LLM 调用限流：同时在途的上游请求上限（0 不限制），超出后按 FIFO 排队。
+    llm_max_in_flight: int = Field(default=16, ge=0)
+    # 默认每分钟请求数/token 数配额（0 不限制）；LLM_MODEL_RATE_LIMITS 可按模型名覆盖，
+    # 如 {"gpt-4o-mini": {"requests_per_minute": 500, "tokens_per_minute": 200000}}。
+    llm_requests_per_minute: int = Field(default=0, ge=0)
+    llm_tokens_per_minute: int = Field(default=0, ge=0)
+    llm_model_rate_limits: dict[str, LLMModelRateLimit] = Field(default_factory=dict)
+    # 排队等待上限（秒）；超时或预计等待超过上限时直接返回 LLM_QUEUE_TIMEOUT。
+    llm_queue_timeout_seconds: float = Field(default=30.0, gt=0)
+    # 上游熔断（按 base URL + 模型）：滚动窗口内请求数达到下限且失败率（超时/连接失败/5xx）达到阈值时打开，
+    # 打开期间直接返回 LLM_CIRCUIT_OPEN；冷却后进入半开，放行少量探测请求，成功即关闭、失败重新打开。
+    llm_circuit_breaker_enabled: bool = True
+    llm_circuit_window_seconds: float = Field(default=60.0, gt=0)
+    llm_circuit_min_requests: int = Field(default=10, ge=1)
+    llm_circuit_failure_rate_threshold: float = Field(default=0.5, gt=0, le=1)
+    llm_circuit_open_seconds: float = Field(default=30.0, gt=0)
+    llm_circuit_half_open_max_calls: int = Field(default=1, ge=1)
+
+    # SQLite 连接 pragma：仅 sqlite 驱动生效，每个新连接建立时执行；关闭后保持驱动默认值。
+    sqlite_pragmas_enabled: bool = True
+    sqlite_journal_mode: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST"] = "WAL"
+    sqlite_busy_timeout_ms: int = Field(default=5000, ge=0)
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    # 页缓存大小（KiB，对应 PRAGMA cache_size 负值写法）。
+    sqlite_cache_size_kib: int = Field(default=20000, ge=0)
+    sqlite_mmap_size_bytes: int = Field(default=268435456, ge=0)
+    sqlite_temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    # 文件型 SQLite 的连接池大小；:memory: 数据库固定使用单连接 StaticPool。
+    sqlite_pool_size: int = Field(default=5, ge=1)
+    sqlite_max_overflow: int = Field(default=10, ge=0)
+
+    # 事件日志写入：buffered 由后台线程按批量/时间触发批量插入；sync 每次调用立即提交（测试默认）。
+    event_log_mode: Literal["sync", "buffered"] = "buffered"
+    event_log_batch_size: int = Field(default=200, ge=1)
+    event_log_flush_interval_seconds: float = Field(default=1.0, gt=0)
+    event_log_queue_max_size: int = Field(default=10000, ge=1)
+    # 队列满时请求线程最多等待的秒数（背压），超时后退回同步写入。
+    event_log_enqueue_timeout_seconds: float = Field(default=0.05, ge=0)
+    # POST /v1/events/batch 单次请求的事件条数上限。
+    event_batch_max_items: int = Field(default=500, ge=1)
+
+    # 启动包生成模式：single 一次生成 7 天；parallel 先规划主题再并发生成每天正文。
+    launch_kit_generation_mode: Literal["single", "parallel"] = "single"
+    # 启动包上下文缓存：按用户缓存解析后的 context_bundle，身份/宪法/画像/风险边界写入时失效。
+    context_cache_enabled: bool = True
+    context_cache_ttl_seconds: float = Field(default=300.0, gt=0)
+    context_cache_max_entries: int = Field(default=1024, ge=1)
+
+    # 批量一致性检查：单次请求草稿上限与 LLM 并发度（增量检查的分段并发同样使用该值）。
+    consistency_batch_max_drafts: int = Field(default=20, ge=1)
+    consistency_batch_concurrency: int = Field(default=4, ge=1)
+    # 增量一致性检查：草稿按段落切分，段落数达到下限时只把变化段落发给 LLM，其余复用上次检查结果。
+    consistency_incremental_enabled: bool = True
+    consistency_incremental_min_segments: int = Field(default=2, ge=2)
+    # 本地禁用词/风险边界预检：off 关闭；annotate 把命中附加给 LLM；short_circuit 命中即直接返回确定性结果。
+    consistency_precheck_mode: Literal["off", "annotate", "short_circuit"] = "annotate"
+
+    # 后台生成任务（POST .../generate?async=true）：工作线程数、长轮询上限与 SSE 心跳间隔。
+    generation_job_workers: int = Field(default=4, ge=1)
+    generation_job_max_wait_seconds: float = Field(default=30.0, gt=0)
+    # 多进程部署时任务可能由其他进程执行，等待方按该间隔回查数据库。
+    generation_job_poll_interval_seconds: float = Field(default=1.0, gt=0)
+    generation_job_heartbeat_seconds: float = Field(default=15.0, gt=0)
+    # 执行中任务的租约：进程每 1/3 租约续约一次，超过租约未续约的 running 任务标记为中断（可多进程共享数据库）。
+    generation_job_lease_seconds: float = Field(default=60.0, gt=0)
+    # 生成接口幂等：带 Idempotency-Key 的成功响应在 TTL 内可重放；进行中的记录超过锁超时视为进程崩溃遗留，可重新认领。
+    idempotency_ttl_seconds: float = Field(default=86400.0, gt=0)
+    idempotency_lock_timeout_seconds: float = Field(default=600.0, gt=0)
 
-    @field_validator("cors_allow_origins", mode="before")
+    @field_validator("cors_allow_origins", "llm_cache_operations", mode="before")
     @classmethod
     def parse_cors_allow_origins(cls, value: object) -> object:
         """兼容 JSON 数组和逗号分隔字符串两种配置格式。"""
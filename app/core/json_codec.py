@@ -0,0 +1,51 @@
+"""
+JSON 编解码：安装了 orjson 时使用 orjson，否则回退标准库 json。
+
+两种后端输出同一种格式：紧凑分隔符、保留中文原文（等价于 ensure_ascii=False）。
+调用方统一通过本模块读写 JSON，不直接 import json/orjson。
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - 取决于运行环境
+    _orjson = None
+
+BACKEND = "orjson" if _orjson is not None else "json"
+
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，捕获它即可覆盖两种后端。
+JSONDecodeError = json.JSONDecodeError
+
+if _orjson is not None:
+    _OPTIONS = _orjson.OPT_NON_STR_KEYS
+    _SORTED_OPTIONS = _OPTIONS | _orjson.OPT_SORT_KEYS
+
+    def dumps_bytes(value: Any, *, sort_keys: bool = False) -> bytes:
+        """序列化为 UTF-8 字节；不可序列化的对象抛 TypeError。"""
+        return _orjson.dumps(value, option=_SORTED_OPTIONS if sort_keys else _OPTIONS)
+
+    def dumps(value: Any, *, sort_keys: bool = False) -> str:
+        """序列化为字符串；不可序列化的对象抛 TypeError。"""
+        return dumps_bytes(value, sort_keys=sort_keys).decode("utf-8")
+
+    def loads(data: str | bytes | bytearray) -> Any:
+        """解析 JSON 文本；格式非法时抛 JSONDecodeError。"""
+        return _orjson.loads(data)
+
+else:
+
+    def dumps(value: Any, *, sort_keys: bool = False) -> str:
+        """序列化为字符串；不可序列化的对象抛 TypeError。"""
+        return json.dumps(value, ensure_ascii=False, sort_keys=sort_keys, separators=(",", ":"))
+
+    def dumps_bytes(value: Any, *, sort_keys: bool = False) -> bytes:
+        """序列化为 UTF-8 字节；不可序列化的对象抛 TypeError。"""
+        return dumps(value, sort_keys=sort_keys).encode("utf-8")
+
+    def loads(data: str | bytes | bytearray) -> Any:
+        """解析 JSON 文本；格式非法时抛 JSONDecodeError。"""
+        return json.loads(data)
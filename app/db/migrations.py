@@ -6,7 +6,7 @@ from alembic import command
 from alembic.config import Config
 
 from app.core.config import get_settings
-from app.db.session import ensure_sqlite_directory
+from app.db import session as db_session
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
@@ -20,6 +20,10 @@ def _build_alembic_config(database_url: str) -> Config:
 
 def upgrade_database_to_head() -> None:
     settings = get_settings()
-    ensure_sqlite_directory(settings.database_url)
-    config = _build_alembic_config(settings.database_url)
+    db_session.ensure_sqlite_directory(settings.database_url)
+    database_url = settings.database_url
+    if database_url == db_session.settings.database_url:
+        # 与进程级引擎同一个库时使用引擎的 URL：内存库时迁移写入引擎共享的那个库。
+        database_url = db_session.database_url
+    config = _build_alembic_config(database_url)
     command.upgrade(config, "head")
@@ -1,13 +1,20 @@
 """数据库引擎、Session 工厂与请求级依赖。"""
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
+import threading
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import make_url
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
 
-from app.core.config import get_settings
+from app.core import json_codec
+from app.core.config import Settings, get_settings
 
 
 def ensure_sqlite_directory(database_url: str) -> None:
@@ -35,14 +42,150 @@ def _connect_args(database_url: str) -> dict[str, object]:
     return {}
 
 
+def _is_sqlite_memory(database_url: str) -> bool:
+    url = make_url(database_url)
+    database = url.database or ""
+    return (
+        not database
+        or database == ":memory:"
+        or "mode=memory" in database
+        or url.query.get("mode") == "memory"
+    )
+
+
+def shared_memory_database_url(database_url: str) -> str:
+    """
+    把 SQLite 内存库 URL 换成具名的共享缓存内存库，其他 URL 原样返回。
+
+    同步引擎与 aiosqlite 引擎各自打开的 :memory: 是两个互不可见的空库；
+    换成同名 file:...?mode=memory&cache=shared 后两个引擎读写同一份数据。
+    """
+    url = make_url(database_url)
+    if (
+        not url.drivername.startswith("sqlite")
+        or not _is_sqlite_memory(database_url)
+        or url.query.get("cache") == "shared"
+    ):
+        return database_url
+    shared = url.set(
+        database=f"file:bss-{uuid4().hex}",
+        query={"mode": "memory", "cache": "shared", "uri": "true"},
+    )
+    return shared.render_as_string(hide_password=False)
+
+
+def sqlite_pragmas(settings: Settings, *, in_memory: bool = False) -> list[tuple[str, str]]:
+    """
+    返回连接建立时要执行的 SQLite pragma（按执行顺序）。
+
+    内存库没有日志文件与可映射的磁盘页，跳过 journal_mode 与 mmap_size。
+    """
+    pragmas: list[tuple[str, str]] = [("busy_timeout", str(settings.sqlite_busy_timeout_ms))]
+    if not in_memory:
+        pragmas.append(("journal_mode", settings.sqlite_journal_mode))
+    pragmas += [
+        ("synchronous", settings.sqlite_synchronous),
+        ("cache_size", str(-settings.sqlite_cache_size_kib)),
+        ("temp_store", settings.sqlite_temp_store),
+    ]
+    if not in_memory:
+        pragmas.append(("mmap_size", str(settings.sqlite_mmap_size_bytes)))
+    return pragmas
+
+
+def _pool_options(database_url: str, settings: Settings, *, is_async: bool = False) -> dict[str, Any]:
+    url = make_url(database_url)
+    if not url.drivername.startswith("sqlite"):
+        return {}
+    if _is_sqlite_memory(database_url):
+        # 每个 :memory: 连接都是独立的空库，只能共享同一连接。
+        return {"poolclass": StaticPool}
+    return {
+        "poolclass": AsyncAdaptedQueuePool if is_async else QueuePool,
+        "pool_size": settings.sqlite_pool_size,
+        "max_overflow": settings.sqlite_max_overflow,
+    }
+
+
+def _register_sqlite_pragmas(engine: Engine, database_url: str, settings: Settings) -> None:
+    if not make_url(database_url).drivername.startswith("sqlite") or not settings.sqlite_pragmas_enabled:
+        return
+    pragmas = sqlite_pragmas(settings, in_memory=_is_sqlite_memory(database_url))
+
+    @event.listens_for(engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _json_serializer(value: Any) -> str:
+    # JSON 列保留中文原文，与旧版 json.dumps(..., ensure_ascii=False) 写入的数据格式一致。
+    return json_codec.dumps(value)
+
+
+def create_app_engine(database_url: str, settings: Settings | None = None) -> Engine:
+    """按配置创建引擎；SQLite 连接建立时统一执行 pragma。"""
+    settings = settings or get_settings()
+    engine = create_engine(
+        database_url,
+        pool_pre_ping=True,
+        connect_args=_connect_args(database_url),
+        json_serializer=_json_serializer,
+        json_deserializer=json_codec.loads,
+        **_pool_options(database_url, settings),
+    )
+    _register_sqlite_pragmas(engine, database_url, settings)
+    return engine
+
+
+def to_async_database_url(database_url: str) -> str:
+    """把同步驱动 URL 换成对应的异步驱动：SQLite 使用 aiosqlite，Postgres 使用 asyncpg。"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend == "sqlite" and url.drivername != "sqlite+aiosqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    elif backend == "postgresql" and url.drivername != "postgresql+asyncpg":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+def to_sync_database_url(database_url: str) -> str:
+    """to_async_database_url 的逆操作：aiosqlite/asyncpg 换回默认同步驱动。"""
+    url = make_url(database_url)
+    if url.drivername in {"sqlite+aiosqlite", "postgresql+asyncpg"}:
+        url = url.set(drivername=url.get_backend_name())
+    return url.render_as_string(hide_password=False)
+
+
+def create_async_app_engine(database_url: str, settings: Settings | None = None) -> AsyncEngine:
+    """创建与同步引擎同配置的异步引擎（连接池与 SQLite pragma 一致）。"""
+    settings = settings or get_settings()
+    async_url = to_async_database_url(database_url)
+    engine = create_async_engine(
+        async_url,
+        pool_pre_ping=True,
+        connect_args=_connect_args(async_url),
+        json_serializer=_json_serializer,
+        json_deserializer=json_codec.loads,
+        **_pool_options(async_url, settings, is_async=True),
+    )
+    _register_sqlite_pragmas(engine.sync_engine, async_url, settings)
+    return engine
+
+
 settings = get_settings()
 ensure_sqlite_directory(settings.database_url)
+# 同步与异步引擎必须指向同一个库；内存库换成共享缓存 URI，两个引擎各持一个常驻连接。
+database_url = shared_memory_database_url(settings.database_url)
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    connect_args=_connect_args(settings.database_url),
-)
+engine = create_app_engine(database_url, settings)
+if database_url != settings.database_url:
+    # 共享内存库在最后一个连接关闭时销毁：先让同步引擎建立常驻连接，迁移与异步引擎随后连入同一个库。
+    engine.connect().close()
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -51,6 +194,16 @@ SessionLocal = sessionmaker(
     class_=Session,
 )
 
+async_engine = create_async_app_engine(database_url, settings)
+
+# 异步 Session 提交后不过期实例，避免在返回响应时触发隐式 IO。
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession,
+)
+
 
 def get_db() -> Generator[Session, None, None]:
     """提供请求级 Session，并在请求结束后关闭连接。"""
@@ -59,3 +212,30 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """提供请求级 AsyncSession，供 async 路由在事件循环内直接访问数据库。"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+_sync_engines: dict[str, Engine] = {}
+_sync_engines_lock = threading.Lock()
+
+
+def sync_engine_for(bind: AsyncEngine) -> Engine:
+    """
+    返回与异步引擎指向同一数据库的同步 Engine，供后台线程（如事件日志写入）使用。
+
+    AsyncEngine.sync_engine 只能在 greenlet 适配层内调用，普通线程中直接使用会抛 MissingGreenlet。
+    """
+    if bind is async_engine:
+        return engine
+    url = to_sync_database_url(bind.url.render_as_string(hide_password=False))
+    with _sync_engines_lock:
+        sync_engine = _sync_engines.get(url)
+        if sync_engine is None:
+            sync_engine = create_app_engine(url)
+            _sync_engines[url] = sync_engine
+        return sync_engine
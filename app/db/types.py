@@ -0,0 +1,28 @@
+"""跨数据库的列类型。"""
+
+from typing import Any
+
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+
+class JSONValue(TypeDecorator[Any]):
+    """
+    原生 JSON 列：Postgres 使用 JSONB，SQLite 使用 JSON1（按 JSON 文本存储）。
+
+    读写只在驱动边界各做一次 (反)序列化，序列化函数由引擎的 json_serializer/json_deserializer 决定；
+    Python None 存为 SQL NULL，而不是 JSON 'null'。
+    """
+
+    impl = JSON
+    cache_ok = True
+
+    def __init__(self) -> None:
+        super().__init__(none_as_null=True)
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine[Any]:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB(none_as_null=True))
+        return dialect.type_descriptor(JSON(none_as_null=True))
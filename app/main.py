@@ -1,20 +1,32 @@
 """FastAPI 应用入口与启动阶段校验。"""
 
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
 
+from app.api.responses import CodecJSONResponse
 from app.api.v1 import v1_router
+from app.api.v1.generation import IDEMPOTENT_REPLAYED_HEADER
+from app.api.v1.pagination import NEXT_CURSOR_HEADER
 from app.api.v1.health import router as health_router
 from app.core.config import get_settings
 from app.db.migrations import upgrade_database_to_head
+from app.db.session import SessionLocal
+from app.services.event_sink import shutdown_event_sink
+from app.services.generation_jobs import recover_generation_jobs, shutdown_generation_job_runner
 from app.services.llm_client import ensure_llm_ready
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
 app = FastAPI(
     title=settings.app_name,
     version="0.1.0",
     debug=settings.debug,
+    default_response_class=CodecJSONResponse,
 )
 
 app.add_middleware(
@@ -23,6 +35,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Location", IDEMPOTENT_REPLAYED_HEADER],
 )
 
 app.include_router(health_router)
@@ -48,3 +61,25 @@ def validate_runtime_configuration() -> None:
         raise RuntimeError(
             f"Application startup failed due to invalid LLM configuration: {exc}"
         ) from exc
+
+
+@app.on_event("startup")
+def resume_generation_jobs() -> None:
+    # 迁移与 LLM 配置校验通过后再处理上次进程遗留的后台生成任务；恢复失败不阻止启动，遗留任务保持原状态。
+    try:
+        with SessionLocal() as db:
+            recover_generation_jobs(db)
+    except SQLAlchemyError:
+        logger.exception("generation_job_recovery_failed")
+
+
+@app.on_event("shutdown")
+def flush_event_log() -> None:
+    # 停机前写完缓冲中的事件，避免丢失埋点。
+    shutdown_event_sink()
+
+
+@app.on_event("shutdown")
+def drain_generation_jobs() -> None:
+    # 等待执行中的生成任务落库，未开始的任务留在 queued，下次启动时重新提交。
+    shutdown_generation_job_runner()
@@ -6,6 +6,8 @@ from app.models.identity_model import IdentityModel, IdentitySelection
 from app.models.persona import PersonaConstitution, RiskBoundaryItem
 from app.models.launch_kit import LaunchKit, LaunchKitDay
 from app.models.consistency_check import ConsistencyCheck, EventLog
+from app.models.generation_job import GenerationJob
+from app.models.idempotency import IdempotencyRecord
 
 __all__ = [
     "User",
@@ -19,4 +21,6 @@ __all__ = [
     "LaunchKitDay",
     "ConsistencyCheck",
     "EventLog",
+    "GenerationJob",
+    "IdempotencyRecord",
 ]
@@ -1,12 +1,14 @@
 """一致性检查与事件日志模型。"""
 
 from datetime import datetime, timezone
+from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
+from app.db.types import JSONValue
 
 
 def _new_id() -> str:
@@ -28,18 +30,26 @@ class ConsistencyCheck(Base):
         String(length=36), ForeignKey("persona_constitutions.id"), nullable=True
     )
 
-    # 输入草稿
+    # 输入草稿；draft_hash 为空白归一化后的 sha256，用于复用同稿检查结果。
     draft_text: Mapped[str] = mapped_column(Text, default="")
+    draft_hash: Mapped[str | None] = mapped_column(String(length=64), nullable=True)
 
-    # 输出结果（列表结构使用 JSON 文本）。
-    deviation_items_json: Mapped[str] = mapped_column(Text, default="[]")
-    deviation_reasons_json: Mapped[str] = mapped_column(Text, default="[]")
-    suggestions_json: Mapped[str] = mapped_column(Text, default="[]")
+    # 输出结果（列表结构使用原生 JSON 列）。
+    deviation_items_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)
+    deviation_reasons_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)
+    suggestions_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)
 
     # 风险信号
     risk_triggered: Mapped[bool] = mapped_column(Boolean, default=False)
     risk_warning: Mapped[str] = mapped_column(Text, default="")
 
+    # 评分与降级标记随结果落库，复用历史结果时原样返回。
+    score: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    degraded: Mapped[bool] = mapped_column(Boolean, default=False)
+
+    # 段落级结果（JSON 列）：每段的内容哈希与检查结论，供增量检查复用未变化段落。
+    segments_json: Mapped[list[dict[str, Any]] | None] = mapped_column(JSONValue, nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -58,7 +68,7 @@ class EventLog(Base):
     event_name: Mapped[str] = mapped_column(String(100), nullable=False)
     stage: Mapped[str] = mapped_column(String(10), nullable=False)  # MVP/V1/V2
     identity_model_id: Mapped[str | None] = mapped_column(String(length=36), nullable=True)
-    payload_json: Mapped[str] = mapped_column(Text, default="{}")
+    payload_json: Mapped[dict[str, Any]] = mapped_column(JSONValue, default=dict)
 
     occurred_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -0,0 +1,43 @@
+"""后台生成任务模型。"""
+
+from datetime import datetime, timezone
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.types import JSONValue
+
+
+def _new_id() -> str:
+    """生成 UUID 主键。"""
+    return str(uuid4())
+
+
+class GenerationJob(Base):
+    """一次异步生成请求：queued -> running -> succeeded/failed。"""
+
+    __tablename__ = "generation_jobs"
+
+    id: Mapped[str] = mapped_column(String(length=36), primary_key=True, default=_new_id)
+    user_id: Mapped[str] = mapped_column(String(length=36), ForeignKey("users.id"), nullable=False)
+    # identity_models / persona_constitution / launch_kit
+    operation: Mapped[str] = mapped_column(String(length=50), nullable=False)
+    status: Mapped[str] = mapped_column(String(length=20), nullable=False, default="queued")
+
+    # 原始请求体；结果与同步接口的响应体一致，失败时 error_json 与 502 detail 结构一致。
+    request_json: Mapped[dict[str, Any]] = mapped_column(JSONValue, default=dict)
+    result_json: Mapped[Any | None] = mapped_column(JSONValue, nullable=True)
+    error_json: Mapped[dict[str, Any] | None] = mapped_column(JSONValue, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # 执行进程的租约心跳：running 任务超过 GENERATION_JOB_LEASE_SECONDS 未续约即视为中断。
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,34 @@
+"""幂等键记录模型。"""
+
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.types import JSONValue
+
+
+class IdempotencyRecord(Base):
+    """一次带 Idempotency-Key 的生成请求：in_progress -> completed，仅保存成功响应。"""
+
+    __tablename__ = "idempotency_records"
+
+    # 幂等键按 (用户, 接口) 隔离，复合主键同时充当唯一约束。
+    user_id: Mapped[str] = mapped_column(String(length=36), ForeignKey("users.id"), primary_key=True)
+    operation: Mapped[str] = mapped_column(String(length=50), primary_key=True)
+    idempotency_key: Mapped[str] = mapped_column(String(length=255), primary_key=True)
+
+    # 规范化请求体的 sha256，同一个 key 携带不同请求体时拒绝。
+    request_hash: Mapped[str] = mapped_column(String(length=64), nullable=False)
+    status: Mapped[str] = mapped_column(String(length=20), nullable=False, default="in_progress")
+    response_status: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    response_json: Mapped[Any | None] = mapped_column(JSONValue, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
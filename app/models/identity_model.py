@@ -1,12 +1,14 @@
 """身份模型与主备选择模型。"""
 
 from datetime import datetime, timezone
+from typing import Any
 from uuid import uuid4
 
 from sqlalchemy import DateTime, ForeignKey, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.db.types import JSONValue
 
 
 def _new_id() -> str:
@@ -25,18 +27,20 @@ class IdentityModel(Base):
         String(length=36), ForeignKey("onboarding_sessions.id"), nullable=True
     )
 
-    # 业务交付字段：列表型字段使用 JSON 文本存储，减少迁移复杂度。
+    # 业务交付字段：列表型字段使用原生 JSON 列，读写时无需手动 json.loads/dumps。
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     target_audience_pain: Mapped[str] = mapped_column(Text, default="")
-    content_pillars_json: Mapped[str] = mapped_column(Text, default="[]")  # 3-5 个内容支柱
-    tone_keywords_json: Mapped[str] = mapped_column(Text, default="[]")  # 语气关键词
-    tone_examples_json: Mapped[str] = mapped_column(Text, default="[]")  # >=5 条口吻示例
-    long_term_views_json: Mapped[str] = mapped_column(Text, default="[]")  # 5-10 条长期观点
+    content_pillars_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)  # 3-5 个内容支柱
+    tone_keywords_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)  # 语气关键词
+    tone_examples_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)  # >=5 条口吻示例
+    long_term_views_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)  # 5-10 条长期观点
     differentiation: Mapped[str] = mapped_column(Text, default="")  # 差异化定位（必填）
     growth_path_0_3m: Mapped[str] = mapped_column(Text, default="")
     growth_path_3_12m: Mapped[str] = mapped_column(Text, default="")
-    monetization_validation_order_json: Mapped[str] = mapped_column(Text, default="[]")
-    risk_boundary_json: Mapped[str] = mapped_column(Text, default="[]")  # 风险边界列表
+    monetization_validation_order_json: Mapped[list[Any]] = mapped_column(
+        JSONValue, default=list
+    )
+    risk_boundary_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)  # 风险边界列表
 
     # 当前选择状态：由 selection 流程统一维护。
     is_primary: Mapped[bool] = mapped_column(default=False)
@@ -1,12 +1,14 @@
 """7 天启动包模型。"""
 
 from datetime import datetime, timezone
+from typing import Any
 from uuid import uuid4
 
 from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.db.types import JSONValue
 
 
 def _new_id() -> str:
@@ -28,8 +30,10 @@ class LaunchKit(Base):
         String(length=36), ForeignKey("persona_constitutions.id"), nullable=True
     )
 
-    sustainable_columns_json: Mapped[str] = mapped_column(Text, default="[]")  # 可持续栏目
-    growth_experiment_suggestion_json: Mapped[str] = mapped_column(Text, default="[]")  # 增长实验
+    sustainable_columns_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)  # 可持续栏目
+    growth_experiment_suggestion_json: Mapped[list[Any]] = mapped_column(
+        JSONValue, default=list
+    )  # 增长实验
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -1,12 +1,14 @@
 """Onboarding 模型：问卷会话与能力画像。"""
 
 from datetime import datetime, timezone
+from typing import Any
 from uuid import uuid4
 
 from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.db.types import JSONValue
 
 
 def _new_id() -> str:
@@ -52,11 +54,11 @@ class CapabilityProfile(Base):
     )
     user_id: Mapped[str] = mapped_column(String(length=36), ForeignKey("users.id"), nullable=False)
 
-    # 六维画像字段：列表结构使用 JSON 文本存储。
-    skill_stack_json: Mapped[str] = mapped_column(Text, default="[]")
-    interest_energy_curve_json: Mapped[str] = mapped_column(Text, default="[]")
+    # 六维画像字段：列表结构使用原生 JSON 列。
+    skill_stack_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)
+    interest_energy_curve_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)
     cognitive_style: Mapped[str] = mapped_column(String(500), default="")
-    value_boundaries_json: Mapped[str] = mapped_column(Text, default="[]")
+    value_boundaries_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)
     risk_tolerance: Mapped[int] = mapped_column(Integer, default=3)  # 1-5
     time_investment_hours: Mapped[int] = mapped_column(Integer, default=0)
 
@@ -1,12 +1,14 @@
 """人格宪法与风险边界模型。"""
 
 from datetime import datetime, timezone
+from typing import Any
 from uuid import uuid4
 
 from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
+from app.db.types import JSONValue
 
 
 def _new_id() -> str:
@@ -25,11 +27,11 @@ class PersonaConstitution(Base):
         String(length=36), ForeignKey("identity_models.id"), nullable=True
     )
 
-    # 业务内容字段：列表类内容统一为 JSON 文本。
-    common_words_json: Mapped[str] = mapped_column(Text, default="[]")
-    forbidden_words_json: Mapped[str] = mapped_column(Text, default="[]")
-    sentence_preferences_json: Mapped[str] = mapped_column(Text, default="[]")
-    moat_positions_json: Mapped[str] = mapped_column(Text, default="[]")
+    # 业务内容字段：列表类内容统一为原生 JSON 列。
+    common_words_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)
+    forbidden_words_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)
+    sentence_preferences_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)
+    moat_positions_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)
     narrative_mainline: Mapped[str] = mapped_column(Text, default="")
     growth_arc_template: Mapped[str] = mapped_column(Text, default="")
 
@@ -67,6 +69,8 @@ class RiskBoundaryItem(Base):
     risk_level: Mapped[int] = mapped_column(Integer, default=3)  # 1-5
     boundary_type: Mapped[str] = mapped_column(String(50), default="")  # legal/platform/reputational
     statement: Mapped[str] = mapped_column(Text, default="")
+    # 本地预检关键词：statement 为语义描述时，由调用方显式给出需要字面匹配的词。
+    keywords_json: Mapped[list[Any]] = mapped_column(JSONValue, default=list)
     source: Mapped[str] = mapped_column(String(100), default="")  # user_input/system_generated
 
     created_at: Mapped[datetime] = mapped_column(
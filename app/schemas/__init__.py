@@ -23,15 +23,21 @@ from app.schemas.launch_kit import (
     LaunchKitGenerate,
     LaunchKitResponse,
     LaunchKitDayResponse,
+    LaunchKitDaySummaryResponse,
+    LaunchKitSummaryResponse,
 )
 from app.schemas.consistency_check import (
+    ConsistencyCheckBatchCreate,
     ConsistencyCheckCreate,
     ConsistencyCheckResponse,
 )
 from app.schemas.event_log import (
+    EventLogBatchCreate,
+    EventLogBatchItem,
     EventLogCreate,
     EventLogResponse,
 )
+from app.schemas.generation_job import GenerationJobResponse
 from app.schemas.user import UserResponse
 
 __all__ = [
@@ -51,9 +57,15 @@ __all__ = [
     "LaunchKitGenerate",
     "LaunchKitResponse",
     "LaunchKitDayResponse",
+    "LaunchKitDaySummaryResponse",
+    "LaunchKitSummaryResponse",
+    "ConsistencyCheckBatchCreate",
     "ConsistencyCheckCreate",
     "ConsistencyCheckResponse",
+    "EventLogBatchCreate",
+    "EventLogBatchItem",
     "EventLogCreate",
     "EventLogResponse",
+    "GenerationJobResponse",
     "UserResponse",
 ]
@@ -17,6 +17,8 @@ class ConsistencyCheckCreate(BaseModel):
     suggestions: list[str] = Field(default_factory=list)
     risk_triggered: bool = False
     risk_warning: str = ""
+    # 为 true 时跳过同稿结果复用，强制重新检查。
+    force: bool = False
 
     @field_validator("risk_warning")
     @classmethod
@@ -27,6 +29,16 @@ class ConsistencyCheckCreate(BaseModel):
         return v
 
 
+class ConsistencyCheckBatchCreate(BaseModel):
+    """Batch consistency check request."""
+    user_id: str
+    identity_model_id: str | None = None
+    constitution_id: str | None = None
+    # 条数上限由服务端配置 CONSISTENCY_BATCH_MAX_DRAFTS 控制。
+    drafts: list[str] = Field(min_length=1)
+    force: bool = False
+
+
 class ConsistencyCheckResponse(BaseModel):
     """Consistency check response."""
     id: str
@@ -34,11 +46,13 @@ class ConsistencyCheckResponse(BaseModel):
     identity_model_id: str | None = None
     constitution_id: str | None = None
     draft_text: str
-    deviation_items_json: str
-    deviation_reasons_json: str
-    suggestions_json: str
+    deviation_items_json: list[str]
+    deviation_reasons_json: list[str]
+    suggestions_json: list[str]
     risk_triggered: bool
     risk_warning: str
+    score: int | None = None
+    degraded: bool = False
     created_at: datetime
 
     model_config = {"from_attributes": True}
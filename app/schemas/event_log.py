@@ -16,6 +16,20 @@ class EventLogCreate(BaseModel):
     payload: dict[str, Any] = Field(default_factory=dict)
 
 
+class EventLogBatchItem(BaseModel):
+    """Single event in a batch; event_name/stage are validated per item by the service."""
+    user_id: str
+    event_name: str
+    stage: str
+    identity_model_id: str | None = None
+    payload: dict[str, Any] = Field(default_factory=dict)
+
+
+class EventLogBatchCreate(BaseModel):
+    """Batch event log request."""
+    events: list[EventLogBatchItem] = Field(min_length=1)
+
+
 class EventLogResponse(BaseModel):
     """Event log response."""
     id: str
@@ -23,7 +37,7 @@ class EventLogResponse(BaseModel):
     event_name: str
     stage: str
     identity_model_id: str | None = None
-    payload_json: str
+    payload_json: dict[str, Any]
     occurred_at: datetime
 
     model_config = {"from_attributes": True}
@@ -0,0 +1,21 @@
+"""后台生成任务相关 Schema。"""
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class GenerationJobResponse(BaseModel):
+    """Generation job response; result_json is the synchronous endpoint's response body."""
+    id: str
+    user_id: str
+    operation: str
+    status: str
+    result_json: Any | None = None
+    error_json: dict[str, Any] | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
@@ -22,15 +22,15 @@ class IdentityModelResponse(BaseModel):
     session_id: str | None = None
     title: str
     target_audience_pain: str
-    content_pillars_json: str
-    tone_keywords_json: str
-    tone_examples_json: str
-    long_term_views_json: str
+    content_pillars_json: list[str]
+    tone_keywords_json: list[str]
+    tone_examples_json: list[str]
+    long_term_views_json: list[str]
     differentiation: str
     growth_path_0_3m: str
     growth_path_3_12m: str
-    monetization_validation_order_json: str
-    risk_boundary_json: str
+    monetization_validation_order_json: list[str]
+    risk_boundary_json: list[str]
     is_primary: bool
     is_backup: bool
     created_at: datetime
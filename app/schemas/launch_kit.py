@@ -1,6 +1,7 @@
 """启动包相关 Schema。"""
 
 from datetime import datetime
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -13,6 +14,8 @@ class LaunchKitGenerate(BaseModel):
     # 可选提示，不改变服务端输出结构校验规则。
     sustainable_columns: list[str] = Field(default_factory=list)
     growth_experiment_suggestion: list[dict[str, str]] = Field(default_factory=list)
+    # 为空时使用服务端配置 LAUNCH_KIT_GENERATION_MODE。
+    generation_mode: Literal["single", "parallel"] | None = None
 
 
 class LaunchKitDayResponse(BaseModel):
@@ -34,9 +37,35 @@ class LaunchKitResponse(BaseModel):
     user_id: str
     identity_model_id: str | None = None
     constitution_id: str | None = None
-    sustainable_columns_json: str
-    growth_experiment_suggestion_json: str
+    sustainable_columns_json: list[str]
+    growth_experiment_suggestion_json: list[dict[str, Any]]
     created_at: datetime
     days: list[LaunchKitDayResponse] = []
 
     model_config = {"from_attributes": True}
+
+
+class LaunchKitDaySummaryResponse(BaseModel):
+    """Launch kit day in the summary view (without draft_or_outline)."""
+    id: str
+    kit_id: str
+    day_no: int
+    theme: str
+    opening_text: str
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class LaunchKitSummaryResponse(BaseModel):
+    """Launch kit response for view=summary."""
+    id: str
+    user_id: str
+    identity_model_id: str | None = None
+    constitution_id: str | None = None
+    sustainable_columns_json: list[str]
+    growth_experiment_suggestion_json: list[dict[str, Any]]
+    created_at: datetime
+    days: list[LaunchKitDaySummaryResponse] = []
+
+    model_config = {"from_attributes": True}
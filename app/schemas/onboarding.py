@@ -53,10 +53,10 @@ class CapabilityProfileResponse(BaseModel):
     id: str
     session_id: str
     user_id: str
-    skill_stack_json: str
-    interest_energy_curve_json: str
+    skill_stack_json: list[str]
+    interest_energy_curve_json: list[dict[str, Any]]
     cognitive_style: str
-    value_boundaries_json: str
+    value_boundaries_json: list[str]
     risk_tolerance: int
     time_investment_hours: int
     created_at: datetime
@@ -19,10 +19,10 @@ class PersonaConstitutionResponse(BaseModel):
     id: str
     user_id: str
     identity_model_id: str | None = None
-    common_words_json: str
-    forbidden_words_json: str
-    sentence_preferences_json: str
-    moat_positions_json: str
+    common_words_json: list[str]
+    forbidden_words_json: list[str]
+    sentence_preferences_json: list[str]
+    moat_positions_json: list[str]
     narrative_mainline: str
     growth_arc_template: str
     version: int
@@ -41,6 +41,7 @@ class RiskBoundaryItemCreate(BaseModel):
     risk_level: int = Field(ge=1, le=5, default=3)
     boundary_type: str = ""  # legal/platform/reputational
     statement: str = ""
+    keywords: list[str] = Field(default_factory=list)  # 本地预检字面匹配词
     source: str = "user_input"  # user_input/system_generated
 
 
@@ -53,6 +54,7 @@ class RiskBoundaryItemResponse(BaseModel):
     risk_level: int
     boundary_type: str
     statement: str
+    keywords_json: list[str] = Field(default_factory=list)
     source: str
     created_at: datetime
 
@@ -2,21 +2,64 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-import json
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import hashlib
 import logging
+import re
+import threading
 from typing import Any
 
 from pydantic import BaseModel, ValidationError, field_validator, model_validator
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.models.consistency_check import ConsistencyCheck
-from app.services.llm_client import LLMServiceError, get_llm_client, llm_schema_error
+from app.models.persona import PersonaConstitution, RiskBoundaryItem
+from app.services.llm_client import LLMServiceError, get_llm_client, llm_deadline, llm_schema_error
+from app.services.pagination import Page, apply_keyset, build_page
+from app.services.schema_repair import FRAGMENT_RESPONSE_CONTRACT, repair_llm_output
 
 logger = logging.getLogger(__name__)
 
 SCHEMA_REPAIR_MAX_RETRIES = 2
 DEGRADE_REASON_SCHEMA_RETRY_EXHAUSTED = "llm_schema_retry_exhausted"
+MAX_RISK_BOUNDARIES = 20
+MAX_PRECHECK_HITS = 20
+NO_DEVIATION_PLACEHOLDER = "未发现明显偏离（建议人工复核）"
+PRECHECK_CACHE_MAX_ENTRIES = 256
+PRECHECK_KIND_FORBIDDEN_WORD = "forbidden_word"
+PRECHECK_KIND_RISK_BOUNDARY = "risk_boundary"
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+# 段落以空行分隔，是增量检查的最小复用单位。
+_PARAGRAPH_SPLIT_PATTERN = re.compile(r"\n\s*\n")
+
+# 风险边界条目中用引号标出的词视为边界词，例如：不要承诺“保本”。
+_QUOTED_TERM_PATTERN = re.compile(r"[\"“「『《‘]([^\"”」』》’]{1,40})[\"”」』》’]")
+
+
+@dataclass(frozen=True)
+class PrecheckHit:
+    """本地预检命中：term 在草稿中的 [start, end) 区间。"""
+
+    term: str
+    kind: str
+    start: int
+    end: int
+    risk_level: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "term": self.term,
+            "kind": self.kind,
+            "start": self.start,
+            "end": self.end,
+            "risk_level": self.risk_level,
+        }
 
 
 @dataclass
@@ -26,6 +69,176 @@ class ConsistencyCheckExecutionResult:
     degraded: bool
     degrade_reason: str | None
     schema_repair_attempts: int
+    precheck_hits: list[PrecheckHit] = field(default_factory=list)
+    short_circuited: bool = False
+    cached: bool = False
+    segments_total: int = 0
+    segments_reused: int = 0
+
+
+@dataclass
+class ConsistencyBatchItemResult:
+    """批量检查中单条草稿的结果：成功时 result 非空，LLM 失败时 error 非空。"""
+
+    index: int
+    result: ConsistencyCheckExecutionResult | None = None
+    error: LLMServiceError | None = None
+
+
+@dataclass(frozen=True)
+class _PrecheckPattern:
+    term: str
+    normalized: str
+    kind: str
+    risk_level: int | None = None
+
+
+def _normalize_for_match(text: str) -> str:
+    # 逐字符小写且保持长度不变，保证命中区间可直接映射回原文。
+    return "".join(lowered if len(lowered := char.lower()) == 1 else char for char in text)
+
+
+class _KeywordAutomaton:
+    """Aho-Corasick 多模式匹配：构建一次，按草稿长度线性扫描。"""
+
+    def __init__(self, patterns: list[_PrecheckPattern]) -> None:
+        self._patterns = patterns
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[int]] = [[]]
+        for index, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern.normalized:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                    self._goto[node][char] = next_node
+                node = next_node
+            self._outputs[node].append(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self._goto[node].items():
+                queue.append(next_node)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[next_node] = candidate if candidate != next_node else 0
+                self._outputs[next_node] = self._outputs[next_node] + self._outputs[self._fail[next_node]]
+
+    @property
+    def empty(self) -> bool:
+        return not self._patterns
+
+    def scan(self, text: str) -> list[PrecheckHit]:
+        if not self._patterns or not text:
+            return []
+        hits: list[PrecheckHit] = []
+        node = 0
+        for position, char in enumerate(_normalize_for_match(text)):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for index in self._outputs[node]:
+                pattern = self._patterns[index]
+                hits.append(
+                    PrecheckHit(
+                        term=pattern.term,
+                        kind=pattern.kind,
+                        start=position - len(pattern.normalized) + 1,
+                        end=position + 1,
+                        risk_level=pattern.risk_level,
+                    )
+                )
+        hits.sort(key=lambda hit: (hit.start, hit.end))
+        return hits
+
+
+_AUTOMATON_CACHE: OrderedDict[tuple[Any, ...], _KeywordAutomaton] = OrderedDict()
+_AUTOMATON_CACHE_LOCK = threading.Lock()
+
+
+def clear_precheck_cache() -> None:
+    with _AUTOMATON_CACHE_LOCK:
+        _AUTOMATON_CACHE.clear()
+
+
+def _boundary_terms(boundary: RiskBoundaryItem) -> list[str]:
+    # 词来源：条目显式给出的 keywords_json + statement 中引号明确标注的词。
+    # 未标注的 statement 本身是语义描述（如“医疗建议”），整句字面匹配既会漏判也会误判，
+    # 不从中猜词；没有任何词的条目只交给 LLM 按语义检查，不参与本地预检与短路。
+    terms = [
+        str(word).strip() for word in _as_list(boundary.keywords_json) if isinstance(word, (str, int, float))
+    ]
+    terms.extend(term.strip() for term in _QUOTED_TERM_PATTERN.findall(boundary.statement or ""))
+    return [term for term in terms if term]
+
+
+def _compile_precheck_patterns(
+    constitution: PersonaConstitution | None,
+    boundaries: list[RiskBoundaryItem],
+) -> list[_PrecheckPattern]:
+    patterns: dict[tuple[str, str], _PrecheckPattern] = {}
+    if constitution is not None:
+        for word in _as_list(constitution.forbidden_words_json):
+            term = str(word).strip() if isinstance(word, (str, int, float)) else ""
+            if term:
+                normalized = _normalize_for_match(term)
+                patterns.setdefault(
+                    (normalized, PRECHECK_KIND_FORBIDDEN_WORD),
+                    _PrecheckPattern(term=term, normalized=normalized, kind=PRECHECK_KIND_FORBIDDEN_WORD),
+                )
+    for boundary in boundaries:
+        for term in _boundary_terms(boundary):
+            normalized = _normalize_for_match(term)
+            patterns.setdefault(
+                (normalized, PRECHECK_KIND_RISK_BOUNDARY),
+                _PrecheckPattern(
+                    term=term,
+                    normalized=normalized,
+                    kind=PRECHECK_KIND_RISK_BOUNDARY,
+                    risk_level=boundary.risk_level,
+                ),
+            )
+    return list(patterns.values())
+
+
+def _get_precheck_automaton(
+    constitution: PersonaConstitution | None,
+    boundaries: list[RiskBoundaryItem],
+) -> _KeywordAutomaton:
+    """按 constitution_id/version（及边界条目集合）缓存编译好的自动机。"""
+    cache_key = (
+        constitution.id if constitution else None,
+        constitution.version if constitution else None,
+        tuple(sorted(boundary.id for boundary in boundaries)),
+    )
+    with _AUTOMATON_CACHE_LOCK:
+        automaton = _AUTOMATON_CACHE.get(cache_key)
+        if automaton is not None:
+            _AUTOMATON_CACHE.move_to_end(cache_key)
+            return automaton
+
+    automaton = _KeywordAutomaton(_compile_precheck_patterns(constitution, boundaries))
+    with _AUTOMATON_CACHE_LOCK:
+        _AUTOMATON_CACHE[cache_key] = automaton
+        _AUTOMATON_CACHE.move_to_end(cache_key)
+        while len(_AUTOMATON_CACHE) > PRECHECK_CACHE_MAX_ENTRIES:
+            _AUTOMATON_CACHE.popitem(last=False)
+    return automaton
+
+
+@dataclass
+class _CheckContext:
+    constitution: PersonaConstitution | None
+    risk_boundaries: list[RiskBoundaryItem]
+    context_bundle: dict[str, Any]
+    automaton: _KeywordAutomaton | None = None
 
 
 class _ConsistencyCheckOutput(BaseModel):
@@ -100,6 +313,9 @@ CONSISTENCY_CHECK_PROMPT = """
   - "suggestions": ["按当前方向继续优化表达，发布前做一次人工校对。"]
   - "score": 85
 - 【语言要求】输出的 JSON Values 文本内容必须全部使用中文。
+- 【上下文】若载荷包含 context_bundle，需依据其中 persona_constitution（常用词、禁用词、句式偏好、叙事主线）判断偏离，并依据 risk_boundaries 判断是否触发风险。
+- 【本地预检】若载荷包含 precheck_hits（本地规则命中的禁用词/风险边界词及其在草稿中的区间），必须在偏离项中体现这些命中。
+- 【分段检查】若载荷包含 segment（index 从 0 开始、count 为段落总数），draft_text 只是整篇草稿中的一段，只评估该段本身。
 - 【格式限制】不要输出任何 Markdown 格式符号（严禁使用 ```json 和 ``` 标签包裹内容），直接输出纯 JSON 字符串。
 """.strip()
 
@@ -134,6 +350,20 @@ Return strictly RAW JSON ONLY with the exact shape below:
 """.strip()
 
 
+CONSISTENCY_CHECK_FRAGMENT_REPAIR_PROMPT = (
+    """
+你正在修复 consistency check（一致性检查）结果中校验失败的字段，其余字段已通过校验，无需重新生成。
+
+字段 schema：
+- deviation_items / deviation_reasons / suggestions：至少 1 个非空中文字符串的数组。
+- risk_triggered：boolean；risk_warning：string（risk_triggered 为 true 时必须非空）。
+- score：0 到 100 的整数。
+""".strip()
+    + "\n\n"
+    + FRAGMENT_RESPONSE_CONTRACT
+)
+
+
 def _parse_consistency_output(payload: dict[str, Any]) -> _ConsistencyCheckOutput:
     """落库前校验一致性检查输出。"""
     try:
@@ -155,7 +385,7 @@ def _validation_error_brief(error_message: str) -> str:
 
 def _build_degraded_output() -> _ConsistencyCheckOutput:
     return _ConsistencyCheckOutput(
-        deviation_items=["未发现明显偏离（建议人工复核）"],
+        deviation_items=[NO_DEVIATION_PLACEHOLDER],
         deviation_reasons=["一致性检查已降级：LLM 结构化输出不稳定，请人工复核。"],
         suggestions=["请人工复核草稿后再发布，必要时可重新执行一致性检查。"],
         risk_triggered=False,
@@ -164,6 +394,8 @@ def _build_degraded_output() -> _ConsistencyCheckOutput:
     )
 
 
+# 首次检查与 schema 修复共享同一个总时间预算（LLM_DEADLINE_SECONDS）。
+@llm_deadline()
 def _generate_consistency_output(
     *,
     llm_payload: dict[str, Any],
@@ -173,6 +405,7 @@ def _generate_consistency_output(
         operation="check_consistency",
         system_prompt=CONSISTENCY_CHECK_PROMPT,
         user_payload=llm_payload,
+        validate=_parse_consistency_output,
     )
 
     try:
@@ -182,33 +415,23 @@ def _generate_consistency_output(
             raise
         last_error = exc
 
-    last_payload = response_payload
-    for attempt in range(1, SCHEMA_REPAIR_MAX_RETRIES + 1):
-        logger.warning(
-            "schema_retry operation=check_consistency schema_retry_attempt=%s validation_error_brief=%s degraded=%s",
-            attempt,
-            _validation_error_brief(last_error.message),
-            False,
-        )
-
-        repair_payload = {
-            "original_user_payload": llm_payload,
-            "previous_invalid_response": last_payload,
-            "validation_error": last_error.message,
-        }
-        repaired_payload = llm_client.generate_json(
+    try:
+        output, attempts = repair_llm_output(
+            llm_client=llm_client,
             operation="check_consistency",
-            system_prompt=CONSISTENCY_CHECK_REPAIR_PROMPT,
-            user_payload=repair_payload,
+            original_user_payload=llm_payload,
+            invalid_payload=response_payload,
+            validation_error=last_error,
+            parse=_parse_consistency_output,
+            full_repair_prompt=CONSISTENCY_CHECK_REPAIR_PROMPT,
+            targeted_repair_prompt=CONSISTENCY_CHECK_FRAGMENT_REPAIR_PROMPT,
+            max_retries=SCHEMA_REPAIR_MAX_RETRIES,
         )
-        try:
-            output = _parse_consistency_output(repaired_payload)
-            return output, False, None, attempt
-        except LLMServiceError as exc:
-            if exc.code != "LLM_SCHEMA_VALIDATION_FAILED":
-                raise
-            last_error = exc
-            last_payload = repaired_payload
+        return output, False, None, attempts
+    except LLMServiceError as exc:
+        if exc.code != "LLM_SCHEMA_VALIDATION_FAILED":
+            raise
+        last_error = exc
 
     logger.warning(
         "schema_retry operation=check_consistency schema_retry_attempt=%s validation_error_brief=%s degraded=%s",
@@ -224,12 +447,499 @@ def _generate_consistency_output(
     )
 
 
+def _as_list(value: Any) -> list[Any]:
+    # JSON 列已由驱动解码；非数组（NULL/对象/标量）一律按空列表处理。
+    return value if isinstance(value, list) else []
+
+
+def _resolve_check_constitution(
+    *,
+    db: Session,
+    user_id: str,
+    identity_model_id: str | None,
+    constitution_id: str | None,
+) -> PersonaConstitution | None:
+    if constitution_id:
+        requested = (
+            db.query(PersonaConstitution)
+            .filter(PersonaConstitution.id == constitution_id)
+            .first()
+        )
+        if requested and requested.user_id == user_id:
+            return requested
+
+    query = db.query(PersonaConstitution).filter(PersonaConstitution.user_id == user_id)
+    if identity_model_id:
+        by_identity = (
+            query.filter(PersonaConstitution.identity_model_id == identity_model_id)
+            .order_by(PersonaConstitution.version.desc(), PersonaConstitution.created_at.desc())
+            .first()
+        )
+        if by_identity:
+            return by_identity
+
+    return query.order_by(
+        PersonaConstitution.version.desc(),
+        PersonaConstitution.created_at.desc(),
+    ).first()
+
+
+def _resolve_check_risk_boundaries(
+    *,
+    db: Session,
+    user_id: str,
+    identity_model_id: str | None,
+    constitution: PersonaConstitution | None,
+) -> list[RiskBoundaryItem]:
+    query = db.query(RiskBoundaryItem).filter(RiskBoundaryItem.user_id == user_id)
+    ordered = (RiskBoundaryItem.created_at.desc(), RiskBoundaryItem.id.desc())
+    if constitution is not None:
+        by_constitution = (
+            query.filter(RiskBoundaryItem.constitution_id == constitution.id)
+            .order_by(*ordered)
+            .limit(MAX_RISK_BOUNDARIES)
+            .all()
+        )
+        if by_constitution:
+            return by_constitution
+    if identity_model_id:
+        by_identity = (
+            query.filter(RiskBoundaryItem.identity_model_id == identity_model_id)
+            .order_by(*ordered)
+            .limit(MAX_RISK_BOUNDARIES)
+            .all()
+        )
+        if by_identity:
+            return by_identity
+    return query.order_by(*ordered).limit(MAX_RISK_BOUNDARIES).all()
+
+
+def _resolve_check_context(
+    *,
+    db: Session,
+    user_id: str,
+    identity_model_id: str | None,
+    constitution_id: str | None,
+) -> _CheckContext:
+    """解析一次人格宪法与风险边界上下文，供单条与批量检查共用。"""
+    constitution = _resolve_check_constitution(
+        db=db,
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        constitution_id=constitution_id,
+    )
+    boundaries = _resolve_check_risk_boundaries(
+        db=db,
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        constitution=constitution,
+    )
+    context_bundle = {
+        "persona_constitution": (
+            {
+                "id": constitution.id,
+                "version": constitution.version,
+                "common_words": _as_list(constitution.common_words_json),
+                "forbidden_words": _as_list(constitution.forbidden_words_json),
+                "sentence_preferences": _as_list(constitution.sentence_preferences_json),
+                "narrative_mainline": constitution.narrative_mainline,
+            }
+            if constitution
+            else None
+        ),
+        "risk_boundaries": [
+            {
+                "risk_level": item.risk_level,
+                "boundary_type": item.boundary_type,
+                "statement": item.statement,
+            }
+            for item in boundaries
+        ],
+    }
+    return _CheckContext(
+        constitution=constitution,
+        risk_boundaries=boundaries,
+        context_bundle=context_bundle,
+        automaton=_get_precheck_automaton(constitution, boundaries),
+    )
+
+
+def _build_check_llm_payload(
+    *,
+    user_id: str,
+    identity_model_id: str | None,
+    constitution_id: str | None,
+    draft_text: str,
+    context: _CheckContext,
+) -> dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "identity_model_id": identity_model_id,
+        "constitution_id": constitution_id,
+        "draft_text": draft_text,
+        "context_bundle": context.context_bundle,
+    }
+
+
+def compute_draft_hash(draft_text: str) -> str:
+    """空白归一化（连续空白折叠为单个空格并去首尾）后的 sha256，迁移 0003 回填使用同一规则。"""
+    normalized = _WHITESPACE_PATTERN.sub(" ", draft_text or "").strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _effective_constitution_id(context: _CheckContext, constitution_id: str | None) -> str | None:
+    # 落库与结果复用都以实际参与检查的宪法为准；未解析到时保留请求值。
+    return context.constitution.id if context.constitution is not None else constitution_id
+
+
+def _filter_check_scope(
+    query: Any,
+    *,
+    user_id: str,
+    identity_model_id: str | None,
+    constitution_id: str | None,
+) -> Any:
+    query = query.filter(ConsistencyCheck.user_id == user_id)
+    query = query.filter(
+        ConsistencyCheck.constitution_id == constitution_id
+        if constitution_id is not None
+        else ConsistencyCheck.constitution_id.is_(None)
+    )
+    return query.filter(
+        ConsistencyCheck.identity_model_id == identity_model_id
+        if identity_model_id is not None
+        else ConsistencyCheck.identity_model_id.is_(None)
+    )
+
+
+def _find_reusable_checks(
+    db: Session,
+    *,
+    user_id: str,
+    identity_model_id: str | None,
+    constitution_id: str | None,
+    draft_hashes: list[str],
+) -> dict[str, ConsistencyCheck]:
+    """按 (user_id, constitution_id, identity_model_id, draft_hash) 查找可复用的最新非降级结果。"""
+    if not draft_hashes:
+        return {}
+    query = _filter_check_scope(
+        db.query(ConsistencyCheck),
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        constitution_id=constitution_id,
+    ).filter(
+        ConsistencyCheck.draft_hash.in_(draft_hashes),
+        ConsistencyCheck.score.isnot(None),
+        ConsistencyCheck.degraded.is_(False),
+    )
+    reusable: dict[str, ConsistencyCheck] = {}
+    for check in query.order_by(ConsistencyCheck.created_at.desc()).all():
+        reusable.setdefault(check.draft_hash, check)
+    return reusable
+
+
+def _cached_execution_result(
+    check: ConsistencyCheck,
+    *,
+    context: _CheckContext,
+    draft_text: str,
+) -> ConsistencyCheckExecutionResult:
+    mode = get_settings().consistency_precheck_mode
+    hits = context.automaton.scan(draft_text) if mode != "off" and context.automaton is not None else []
+    return ConsistencyCheckExecutionResult(
+        check=check,
+        score=check.score if check.score is not None else 0,
+        degraded=False,
+        degrade_reason=None,
+        schema_repair_attempts=0,
+        precheck_hits=hits,
+        short_circuited=False,
+        cached=True,
+    )
+
+
+def _build_check_row(
+    *,
+    user_id: str,
+    identity_model_id: str | None,
+    constitution_id: str | None,
+    draft_text: str,
+    outcome: _CheckOutcome,
+) -> ConsistencyCheck:
+    output = outcome.output
+    return ConsistencyCheck(
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        constitution_id=constitution_id,
+        draft_text=draft_text,
+        draft_hash=compute_draft_hash(draft_text),
+        deviation_items_json=output.deviation_items,
+        deviation_reasons_json=output.deviation_reasons,
+        suggestions_json=output.suggestions,
+        risk_triggered=output.risk_triggered,
+        risk_warning=output.risk_warning,
+        score=output.score,
+        degraded=outcome.degraded,
+        segments_json=outcome.segments,
+    )
+
+
+def _build_precheck_output(hits: list[PrecheckHit]) -> _ConsistencyCheckOutput:
+    """命中明确违规时的确定性结果，不调用 LLM。"""
+    forbidden_terms = list(dict.fromkeys(hit.term for hit in hits if hit.kind == PRECHECK_KIND_FORBIDDEN_WORD))
+    boundary_terms = list(dict.fromkeys(hit.term for hit in hits if hit.kind == PRECHECK_KIND_RISK_BOUNDARY))
+
+    deviation_items = [f"使用了禁用词：{term}" for term in forbidden_terms]
+    deviation_items += [f"触及风险边界：{term}" for term in boundary_terms]
+    deviation_reasons: list[str] = []
+    if forbidden_terms:
+        deviation_reasons.append("草稿包含人格宪法 forbidden_words 中的词语，与既定表达风格不一致。")
+    if boundary_terms:
+        deviation_reasons.append("草稿包含风险边界条目中标注的关键词，存在合规或信任风险。")
+    suggestions = [f"删除或替换“{term}”后重新检查。" for term in forbidden_terms + boundary_terms]
+
+    risk_triggered = bool(boundary_terms)
+    return _ConsistencyCheckOutput(
+        deviation_items=deviation_items,
+        deviation_reasons=deviation_reasons,
+        suggestions=suggestions,
+        risk_triggered=risk_triggered,
+        risk_warning=(
+            f"草稿触及风险边界：{'、'.join(boundary_terms)}，发布前请修改。" if risk_triggered else ""
+        ),
+        score=max(20, 70 - 10 * len(forbidden_terms + boundary_terms)),
+    )
+
+
+@dataclass
+class _CheckOutcome:
+    output: _ConsistencyCheckOutput
+    degraded: bool
+    degrade_reason: str | None
+    schema_repair_attempts: int
+    precheck_hits: list[PrecheckHit]
+    short_circuited: bool
+    segments: list[dict[str, Any]] | None = None
+    segments_reused: int = 0
+
+
+def _run_check(
+    *,
+    llm_payload: dict[str, Any],
+    context: _CheckContext,
+    draft_text: str,
+) -> _CheckOutcome:
+    """先做本地关键词预检，再按 CONSISTENCY_PRECHECK_MODE 决定短路或把命中附加给 LLM。"""
+    mode = get_settings().consistency_precheck_mode
+    hits: list[PrecheckHit] = []
+    if mode != "off" and context.automaton is not None:
+        hits = context.automaton.scan(draft_text)
+
+    if hits and mode == "short_circuit":
+        return _CheckOutcome(
+            output=_build_precheck_output(hits),
+            degraded=False,
+            degrade_reason=None,
+            schema_repair_attempts=0,
+            precheck_hits=hits,
+            short_circuited=True,
+        )
+
+    if hits:
+        llm_payload = {
+            **llm_payload,
+            "precheck_hits": [hit.to_dict() for hit in hits[:MAX_PRECHECK_HITS]],
+        }
+    output, degraded, degrade_reason, schema_repair_attempts = _generate_consistency_output(
+        llm_payload=llm_payload
+    )
+    return _CheckOutcome(
+        output=output,
+        degraded=degraded,
+        degrade_reason=degrade_reason,
+        schema_repair_attempts=schema_repair_attempts,
+        precheck_hits=hits,
+        short_circuited=False,
+    )
+
+
+def _split_draft_segments(draft_text: str) -> list[str]:
+    """按空行切分段落，去掉首尾空白并丢弃空段。"""
+    return [
+        segment.strip()
+        for segment in _PARAGRAPH_SPLIT_PATTERN.split(draft_text or "")
+        if segment.strip()
+    ]
+
+
+def _segment_record(segment_hash: str, output: _ConsistencyCheckOutput, *, degraded: bool) -> dict[str, Any]:
+    return {"hash": segment_hash, "degraded": degraded, **output.model_dump()}
+
+
+def _find_previous_segments(
+    db: Session,
+    *,
+    user_id: str,
+    identity_model_id: str | None,
+    constitution_id: str | None,
+) -> dict[str, _ConsistencyCheckOutput]:
+    """取同一用户/宪法/身份下最近一次带段落结果的检查，返回 段落哈希 -> 可复用的非降级结论。"""
+    previous = (
+        _filter_check_scope(
+            db.query(ConsistencyCheck),
+            user_id=user_id,
+            identity_model_id=identity_model_id,
+            constitution_id=constitution_id,
+        )
+        .filter(ConsistencyCheck.segments_json.isnot(None))
+        .order_by(ConsistencyCheck.created_at.desc())
+        .first()
+    )
+    if previous is None:
+        return {}
+
+    findings: dict[str, _ConsistencyCheckOutput] = {}
+    for record in _as_list(previous.segments_json):
+        if not isinstance(record, dict) or record.get("degraded") or not isinstance(record.get("hash"), str):
+            continue
+        try:
+            findings.setdefault(record["hash"], _ConsistencyCheckOutput.model_validate(record))
+        except ValidationError:
+            continue
+    return findings
+
+
+def _merge_segment_outputs(parts: list[tuple[str, _ConsistencyCheckOutput]]) -> _ConsistencyCheckOutput:
+    """
+    合并各段结论：列表按出现顺序去重，风险任一段触发即触发，分数按段落长度加权平均。
+
+    任一段报告了偏离项时，其他段的“未发现明显偏离”占位不再出现在合并结果里。
+    """
+    outputs = [output for _, output in parts]
+    deviation_items = list(dict.fromkeys(item for output in outputs for item in output.deviation_items))
+    findings = [item for item in deviation_items if item != NO_DEVIATION_PLACEHOLDER]
+    if findings:
+        deviation_items = findings
+    total_weight = sum(len(segment) for segment, _ in parts)
+    score = round(sum(len(segment) * output.score for segment, output in parts) / total_weight)
+    risk_warnings = list(
+        dict.fromkeys(output.risk_warning.strip() for output in outputs if output.risk_triggered)
+    )
+    return _ConsistencyCheckOutput(
+        deviation_items=deviation_items,
+        deviation_reasons=list(dict.fromkeys(item for output in outputs for item in output.deviation_reasons)),
+        suggestions=list(dict.fromkeys(item for output in outputs for item in output.suggestions)),
+        risk_triggered=bool(risk_warnings),
+        risk_warning="\n".join(risk_warnings),
+        score=score,
+    )
+
+
+def _run_incremental_check(
+    *,
+    llm_payload: dict[str, Any],
+    context: _CheckContext,
+    draft_text: str,
+    segments: list[str],
+    previous: dict[str, _ConsistencyCheckOutput],
+) -> _CheckOutcome:
+    """
+    段落级增量检查：哈希命中上次结果的段落直接复用，其余段落并发发给 LLM，最后合并为整篇结论。
+
+    本地预检仍按整篇草稿执行；short_circuit 模式命中时与非增量路径一样直接返回确定性结果。
+    """
+    settings = get_settings()
+    mode = settings.consistency_precheck_mode
+    hits: list[PrecheckHit] = []
+    if mode != "off" and context.automaton is not None:
+        hits = context.automaton.scan(draft_text)
+    if hits and mode == "short_circuit":
+        return _CheckOutcome(
+            output=_build_precheck_output(hits),
+            degraded=False,
+            degrade_reason=None,
+            schema_repair_attempts=0,
+            precheck_hits=hits,
+            short_circuited=True,
+        )
+
+    segment_hashes = [compute_draft_hash(segment) for segment in segments]
+    # 每个变化段落只调用一次 LLM，段内重复的段落共用结果。
+    pending: dict[str, tuple[int, str]] = {}
+    for index, (segment, segment_hash) in enumerate(zip(segments, segment_hashes)):
+        if segment_hash not in previous:
+            pending.setdefault(segment_hash, (index, segment))
+
+    def _check_segment(item: tuple[int, str]) -> tuple[_ConsistencyCheckOutput, bool, str | None, int]:
+        index, segment = item
+        payload = {
+            **llm_payload,
+            "draft_text": segment,
+            "segment": {"index": index, "count": len(segments)},
+        }
+        segment_hits = context.automaton.scan(segment) if hits and context.automaton is not None else []
+        if segment_hits:
+            payload["precheck_hits"] = [hit.to_dict() for hit in segment_hits[:MAX_PRECHECK_HITS]]
+        return _generate_consistency_output(llm_payload=payload)
+
+    analysed: dict[str, tuple[_ConsistencyCheckOutput, bool, str | None, int]] = {}
+    if pending:
+        max_workers = min(settings.consistency_batch_concurrency, len(pending))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            analysed = dict(zip(pending, executor.map(_check_segment, pending.values())))
+
+    parts: list[tuple[str, _ConsistencyCheckOutput]] = []
+    records: list[dict[str, Any]] = []
+    for segment, segment_hash in zip(segments, segment_hashes):
+        if segment_hash in analysed:
+            output, degraded = analysed[segment_hash][0], analysed[segment_hash][1]
+        else:
+            output, degraded = previous[segment_hash], False
+        parts.append((segment, output))
+        records.append(_segment_record(segment_hash, output, degraded=degraded))
+
+    degrade_reasons = [reason for _, degraded, reason, _ in analysed.values() if degraded]
+    segments_reused = sum(1 for segment_hash in segment_hashes if segment_hash not in analysed)
+    logger.info(
+        "consistency_incremental segments=%s reused=%s analysed=%s",
+        len(segments),
+        segments_reused,
+        len(analysed),
+    )
+    return _CheckOutcome(
+        output=_merge_segment_outputs(parts),
+        degraded=bool(degrade_reasons),
+        degrade_reason=degrade_reasons[0] if degrade_reasons else None,
+        schema_repair_attempts=sum(attempts for *_, attempts in analysed.values()),
+        precheck_hits=hits,
+        short_circuited=False,
+        segments=records,
+        segments_reused=segments_reused,
+    )
+
+
+def _to_execution_result(check: ConsistencyCheck, outcome: _CheckOutcome) -> ConsistencyCheckExecutionResult:
+    return ConsistencyCheckExecutionResult(
+        check=check,
+        score=outcome.output.score,
+        degraded=outcome.degraded,
+        degrade_reason=outcome.degrade_reason,
+        schema_repair_attempts=outcome.schema_repair_attempts,
+        precheck_hits=outcome.precheck_hits,
+        short_circuited=outcome.short_circuited,
+        segments_total=len(outcome.segments or []),
+        segments_reused=outcome.segments_reused,
+    )
+
+
 def check_consistency(
     db: Session,
     user_id: str,
     draft_text: str,
     identity_model_id: str | None = None,
     constitution_id: str | None = None,
+    force: bool = False,
 ) -> ConsistencyCheckExecutionResult:
     """
     Check draft consistency against persona constitution via LLM.
@@ -237,40 +947,209 @@ def check_consistency(
     Per product-spec 2.6:
     - 输出必须包含：偏离项、偏离原因、修改建议
     - 若触发风险边界，必须给出明确提醒
+
+    同一用户/宪法/身份下空白归一化后相同的草稿直接复用最近一次非降级结果（cached=True），
+    force=True 时跳过复用并重新检查。
+    多段草稿走段落级增量检查：首次逐段检查并记录各段结论，之后只把变化的段落发给 LLM，未变化段落复用已有结论。
     """
-    llm_payload = {
-        "user_id": user_id,
-        "identity_model_id": identity_model_id,
-        "constitution_id": constitution_id,
-        "draft_text": draft_text,
-    }
-    output, degraded, degrade_reason, schema_repair_attempts = _generate_consistency_output(
-        llm_payload=llm_payload
+    settings = get_settings()
+    context = _resolve_check_context(
+        db=db,
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        constitution_id=constitution_id,
     )
+    effective_constitution_id = _effective_constitution_id(context, constitution_id)
+    if not force:
+        draft_hash = compute_draft_hash(draft_text)
+        reusable = _find_reusable_checks(
+            db,
+            user_id=user_id,
+            identity_model_id=identity_model_id,
+            constitution_id=effective_constitution_id,
+            draft_hashes=[draft_hash],
+        )
+        if draft_hash in reusable:
+            return _cached_execution_result(reusable[draft_hash], context=context, draft_text=draft_text)
 
-    check = ConsistencyCheck(
+    llm_payload = _build_check_llm_payload(
         user_id=user_id,
         identity_model_id=identity_model_id,
-        constitution_id=constitution_id,
+        constitution_id=effective_constitution_id,
         draft_text=draft_text,
-        deviation_items_json=json.dumps(output.deviation_items, ensure_ascii=False),
-        deviation_reasons_json=json.dumps(output.deviation_reasons, ensure_ascii=False),
-        suggestions_json=json.dumps(output.suggestions, ensure_ascii=False),
-        risk_triggered=output.risk_triggered,
-        risk_warning=output.risk_warning,
+        context=context,
+    )
+    segments = _split_draft_segments(draft_text)
+    incremental = (
+        settings.consistency_incremental_enabled
+        and len(segments) >= settings.consistency_incremental_min_segments
+    )
+    previous: dict[str, _ConsistencyCheckOutput] = {}
+    if incremental and not force:
+        previous = _find_previous_segments(
+            db,
+            user_id=user_id,
+            identity_model_id=identity_model_id,
+            constitution_id=effective_constitution_id,
+        )
+    if incremental:
+        # 没有可复用段落（首次检查或 force=true）时同样逐段检查：偏离项天然归属到段落，
+        # 每段结论都记录下来，之后修改任一段只需重查变化的段落。
+        outcome = _run_incremental_check(
+            llm_payload=llm_payload,
+            context=context,
+            draft_text=draft_text,
+            segments=segments,
+            previous=previous,
+        )
+    else:
+        outcome = _run_check(llm_payload=llm_payload, context=context, draft_text=draft_text)
+        # 单段草稿的结论就是该段结论，记录下来供草稿扩写后增量复用。
+        if not outcome.short_circuited and len(segments) == 1:
+            outcome.segments = [
+                _segment_record(compute_draft_hash(segments[0]), outcome.output, degraded=outcome.degraded)
+            ]
+
+    check = _build_check_row(
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        constitution_id=effective_constitution_id,
+        draft_text=draft_text,
+        outcome=outcome,
     )
     db.add(check)
     # 以单事务写入检查结果，避免部分成功。
     db.commit()
     db.refresh(check)
-    return ConsistencyCheckExecutionResult(
-        check=check,
-        score=output.score,
-        degraded=degraded,
-        degrade_reason=degrade_reason,
-        schema_repair_attempts=schema_repair_attempts,
+    return _to_execution_result(check, outcome)
+
+
+def check_consistency_batch(
+    db: Session,
+    user_id: str,
+    drafts: list[str],
+    identity_model_id: str | None = None,
+    constitution_id: str | None = None,
+    force: bool = False,
+) -> list[ConsistencyBatchItemResult]:
+    """
+    Check many drafts in one request.
+
+    上下文只解析一次；各草稿的 LLM 调用按 CONSISTENCY_BATCH_CONCURRENCY 有界并发，
+    单条失败只记录在该条结果中；成功结果在同一事务内批量写入，结果顺序与输入一致。
+    已有结果（或本批内重复）的草稿按 draft_hash 复用，不再调用 LLM。
+    """
+    settings = get_settings()
+    if not drafts:
+        raise ValueError("drafts must contain at least 1 item")
+    if len(drafts) > settings.consistency_batch_max_drafts:
+        raise ValueError(
+            f"drafts must contain at most {settings.consistency_batch_max_drafts} items"
+        )
+
+    context = _resolve_check_context(
+        db=db,
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        constitution_id=constitution_id,
+    )
+    effective_constitution_id = _effective_constitution_id(context, constitution_id)
+    draft_hashes = [compute_draft_hash(draft_text) for draft_text in drafts]
+    reusable = (
+        {}
+        if force
+        else _find_reusable_checks(
+            db,
+            user_id=user_id,
+            identity_model_id=identity_model_id,
+            constitution_id=effective_constitution_id,
+            draft_hashes=list(dict.fromkeys(draft_hashes)),
+        )
     )
 
+    # 每个待检查的 draft_hash 只调用一次 LLM，取首次出现的草稿原文。
+    pending: dict[str, str] = {}
+    for draft_text, draft_hash in zip(drafts, draft_hashes):
+        if draft_hash not in reusable:
+            pending.setdefault(draft_hash, draft_text)
+
+    def _check_one(draft_text: str) -> _CheckOutcome | LLMServiceError:
+        try:
+            return _run_check(
+                llm_payload=_build_check_llm_payload(
+                    user_id=user_id,
+                    identity_model_id=identity_model_id,
+                    constitution_id=effective_constitution_id,
+                    draft_text=draft_text,
+                    context=context,
+                ),
+                context=context,
+                draft_text=draft_text,
+            )
+        except LLMServiceError as error:
+            return error
+
+    outcomes: dict[str, _CheckOutcome | LLMServiceError] = {}
+    if pending:
+        max_workers = min(settings.consistency_batch_concurrency, len(pending))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outcomes = dict(zip(pending, executor.map(_check_one, pending.values())))
+
+    items: list[ConsistencyBatchItemResult] = []
+    checks: list[ConsistencyCheck] = []
+    created: dict[str, ConsistencyCheck] = {}
+    for index, (draft_text, draft_hash) in enumerate(zip(drafts, draft_hashes)):
+        if draft_hash in reusable:
+            items.append(
+                ConsistencyBatchItemResult(
+                    index=index,
+                    result=_cached_execution_result(
+                        reusable[draft_hash],
+                        context=context,
+                        draft_text=draft_text,
+                    ),
+                )
+            )
+            continue
+
+        outcome = outcomes[draft_hash]
+        if isinstance(outcome, LLMServiceError):
+            logger.warning(
+                "consistency_batch_item_failed user_id=%s index=%s code=%s",
+                user_id,
+                index,
+                outcome.code,
+            )
+            items.append(ConsistencyBatchItemResult(index=index, error=outcome))
+            continue
+
+        if draft_hash in created:
+            # 本批内重复草稿共用同一条结果。
+            result = _to_execution_result(created[draft_hash], outcome)
+            result.cached = True
+            items.append(ConsistencyBatchItemResult(index=index, result=result))
+            continue
+
+        check = _build_check_row(
+            user_id=user_id,
+            identity_model_id=identity_model_id,
+            constitution_id=effective_constitution_id,
+            draft_text=draft_text,
+            outcome=outcome,
+        )
+        created[draft_hash] = check
+        checks.append(check)
+        items.append(ConsistencyBatchItemResult(index=index, result=_to_execution_result(check, outcome)))
+
+    if checks:
+        db.add_all(checks)
+        db.commit()
+        # 一次查询刷新本批全部行，避免逐条 refresh。
+        db.query(ConsistencyCheck).filter(
+            ConsistencyCheck.id.in_([check.id for check in checks])
+        ).all()
+    return items
+
 
 def get_user_checks(db: Session, user_id: str) -> list[ConsistencyCheck]:
     """Get all consistency checks for a user."""
@@ -285,3 +1164,26 @@ def get_user_checks(db: Session, user_id: str) -> list[ConsistencyCheck]:
 def get_check(db: Session, check_id: str) -> ConsistencyCheck | None:
     """Get consistency check by ID."""
     return db.query(ConsistencyCheck).filter(ConsistencyCheck.id == check_id).first()
+
+
+async def get_user_checks_page_async(
+    db: AsyncSession,
+    user_id: str,
+    *,
+    limit: int,
+    cursor: str | None = None,
+) -> Page[ConsistencyCheck]:
+    """One page of a user's consistency checks, newest first."""
+    stmt = apply_keyset(
+        select(ConsistencyCheck).where(ConsistencyCheck.user_id == user_id),
+        ConsistencyCheck.created_at,
+        ConsistencyCheck.id,
+        limit=limit,
+        cursor=cursor,
+    )
+    return build_page(list((await db.scalars(stmt)).all()), limit=limit)
+
+
+async def get_check_async(db: AsyncSession, check_id: str) -> ConsistencyCheck | None:
+    """Async variant of get_check."""
+    return await db.get(ConsistencyCheck, check_id)
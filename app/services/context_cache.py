@@ -0,0 +1,101 @@
+"""按用户缓存已解析的生成上下文（身份/宪法/能力画像/风险边界），写入时按用户失效。"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import copy
+import threading
+import time
+from typing import Any, Hashable
+
+from app.core.config import get_settings
+
+
+class ContextBundleCache:
+    """
+    进程内 LRU + TTL 缓存，键内含 user_id，每个用户一个版本号。
+
+    - invalidate_user 只递增版本号，旧条目在下次读取或被 LRU 淘汰时清理；
+    - 读取方先取 version 再查库，写入时带上该 version：查库期间若发生写入，
+      条目版本落后于当前版本，永远不会被读到，避免把旧数据写回缓存；
+    - 多进程部署时各进程独立缓存，跨进程的写入最多延迟 TTL 秒可见。
+    """
+
+    def __init__(self, *, ttl_seconds: float, max_entries: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, Hashable], tuple[float, int, Any]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def version(self, user_id: str) -> int:
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def get(self, user_id: str, key: Hashable) -> Any | None:
+        """命中时返回深拷贝，调用方可以自由修改。"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            if entry is None:
+                return None
+            expires_at, version, value = entry
+            if expires_at <= now or version != self._versions.get(user_id, 0):
+                del self._entries[(user_id, key)]
+                return None
+            self._entries.move_to_end((user_id, key))
+        return copy.deepcopy(value)
+
+    def set(self, user_id: str, key: Hashable, value: Any, *, version: int) -> None:
+        stored = copy.deepcopy(value)
+        expires_at = time.monotonic() + self._ttl_seconds
+        with self._lock:
+            if version != self._versions.get(user_id, 0):
+                return
+            self._entries[(user_id, key)] = (expires_at, version, stored)
+            self._entries.move_to_end((user_id, key))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+_CACHE: ContextBundleCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_context_cache() -> ContextBundleCache | None:
+    """返回进程级上下文缓存；CONTEXT_CACHE_ENABLED=false 时返回 None。"""
+    global _CACHE
+    settings = get_settings()
+    if not settings.context_cache_enabled:
+        return None
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = ContextBundleCache(
+                ttl_seconds=settings.context_cache_ttl_seconds,
+                max_entries=settings.context_cache_max_entries,
+            )
+        return _CACHE
+
+
+def invalidate_user_context(user_id: str) -> None:
+    """用户的身份/宪法/画像/风险边界发生写入后调用；缓存未创建时无需处理。"""
+    with _CACHE_LOCK:
+        cache = _CACHE
+    if cache is not None:
+        cache.invalidate_user(user_id)
+
+
+def reset_context_cache() -> None:
+    """丢弃进程级缓存（测试与配置变更时使用）。"""
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = None
@@ -1,11 +1,89 @@
 """事件日志服务。"""
 
-import json
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Any
+from uuid import uuid4
 
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
+from app.db.session import sync_engine_for
 from app.models.consistency_check import EventLog
+from app.models.user import User
+from app.services.event_sink import get_event_sink
+from app.services.pagination import Page, apply_keyset, build_page
+
+# 事件名称白名单统一在服务层维护，避免多处口径漂移；元组保留报错时的展示顺序。
+EVENT_NAMES = (
+    "onboarding_started",
+    "onboarding_completed",
+    "identity_models_generated",
+    "identity_selected",
+    "launch_kit_generated",
+    "content_published",
+    "consistency_check_triggered",
+    "experiment_created",
+    "monetization_plan_started",
+    "first_revenue_or_lead_confirmed",
+)
+VALID_EVENT_NAMES = frozenset(EVENT_NAMES)
+VALID_STAGES = frozenset({"MVP", "V1", "V2"})
+
+
+@dataclass
+class EventBatchItemResult:
+    """批量写入中单条事件的结果：accepted 时 event 非空，rejected 时 error 非空。"""
+
+    index: int
+    event: EventLog | None = None
+    error: str | None = None
+
+
+def _validate_event(event_name: str, stage: str) -> None:
+    if event_name not in VALID_EVENT_NAMES:
+        raise ValueError(f"Invalid event_name: {event_name}. Must be one of {list(EVENT_NAMES)}")
+    if stage not in VALID_STAGES:
+        raise ValueError(f"Invalid stage: {stage}. Must be MVP/V1/V2")
+
+
+def _build_event(
+    user_id: str,
+    event_name: str,
+    stage: str,
+    identity_model_id: str | None,
+    payload: dict | None,
+) -> EventLog:
+    """校验事件并构建待写入的 EventLog，同步与异步写入共用。"""
+    _validate_event(event_name, stage)
+
+    # payload 存入原生 JSON 列，便于后续字段扩展。
+    payload = payload or {}
+
+    # id 与时间在入队前确定，缓冲写入时调用方也能立即拿到。
+    return EventLog(
+        id=str(uuid4()),
+        user_id=user_id,
+        event_name=event_name,
+        stage=stage,
+        identity_model_id=identity_model_id,
+        payload_json=payload,
+        occurred_at=datetime.now(timezone.utc),
+    )
+
+
+def _event_row(event: EventLog) -> dict[str, Any]:
+    return {
+        "id": event.id,
+        "user_id": event.user_id,
+        "event_name": event.event_name,
+        "stage": event.stage,
+        "identity_model_id": event.identity_model_id,
+        "payload_json": event.payload_json,
+        "occurred_at": event.occurred_at,
+    }
 
 
 def log_event(
@@ -23,40 +101,21 @@ def log_event(
     - event_name must be one of the defined events
     - stage must be MVP/V1/V2
     - Each event includes user_id, timestamp, stage, identity_model_id
-    """
-    # 事件名称白名单统一在服务层维护，避免多处口径漂移。
-    valid_events = [
-        "onboarding_started",
-        "onboarding_completed",
-        "identity_models_generated",
-        "identity_selected",
-        "launch_kit_generated",
-        "content_published",
-        "consistency_check_triggered",
-        "experiment_created",
-        "monetization_plan_started",
-        "first_revenue_or_lead_confirmed",
-    ]
-
-    if event_name not in valid_events:
-        raise ValueError(f"Invalid event_name: {event_name}. Must be one of {valid_events}")
-
-    if stage not in ["MVP", "V1", "V2"]:
-        raise ValueError(f"Invalid stage: {stage}. Must be MVP/V1/V2")
 
-    # payload 以 JSON 文本存储，便于后续字段扩展。
-    payload = payload or {}
+    EVENT_LOG_MODE=buffered 时只入队由后台批量写入，返回的 EventLog 不在 Session 中；
+    队列持续满载或 sync 模式下退回同步写入。
+    """
+    event = _build_event(user_id, event_name, stage, identity_model_id, payload)
+    settings = get_settings()
+    if settings.event_log_mode == "buffered" and get_event_sink().submit(
+        db.get_bind(),
+        _event_row(event),
+        timeout=settings.event_log_enqueue_timeout_seconds,
+    ):
+        return event
 
-    event = EventLog(
-        user_id=user_id,
-        event_name=event_name,
-        stage=stage,
-        identity_model_id=identity_model_id,
-        payload_json=json.dumps(payload, ensure_ascii=False),
-        occurred_at=datetime.now(timezone.utc),
-    )
     db.add(event)
-    # 事件日志立即提交，保证可观测性与审计时效。
+    # 同步模式下事件日志立即提交，保证可观测性与审计时效。
     db.commit()
     db.refresh(event)
     return event
@@ -87,3 +146,107 @@ def get_events_by_name(db: Session, event_name: str, limit: int = 100) -> list[E
 def get_recent_events(db: Session, limit: int = 100) -> list[EventLog]:
     """Get recent events across all users."""
     return db.query(EventLog).order_by(EventLog.occurred_at.desc()).limit(limit).all()
+
+
+async def log_event_async(
+    db: AsyncSession,
+    user_id: str,
+    event_name: str,
+    stage: str,
+    identity_model_id: str | None = None,
+    payload: dict | None = None,
+) -> EventLog:
+    """Async variant of log_event; buffered mode never blocks the event loop waiting for queue space."""
+    event = _build_event(user_id, event_name, stage, identity_model_id, payload)
+    # 写线程不在 greenlet 中运行，必须提交真正的同步 Engine，不能用 AsyncEngine.sync_engine。
+    if get_settings().event_log_mode == "buffered" and get_event_sink().submit(
+        sync_engine_for(db.bind),
+        _event_row(event),
+    ):
+        return event
+
+    db.add(event)
+    await db.commit()
+    await db.refresh(event)
+    return event
+
+
+async def log_events_batch_async(db: AsyncSession, events: list[dict[str, Any]]) -> list[EventBatchItemResult]:
+    """
+    Log many events in one transaction.
+
+    每条事件各自校验（事件名/阶段白名单、用户存在），不合法的只在该条结果中拒绝；
+    通过校验的事件用一条批量 INSERT 写入，结果顺序与输入一致。
+    """
+    max_items = get_settings().event_batch_max_items
+    if len(events) > max_items:
+        raise ValueError(f"events must contain at most {max_items} items")
+
+    user_ids = {item["user_id"] for item in events}
+    known_users = set((await db.scalars(select(User.id).where(User.id.in_(user_ids)))).all())
+
+    results: list[EventBatchItemResult] = []
+    accepted: list[EventLog] = []
+    for index, item in enumerate(events):
+        if item["user_id"] not in known_users:
+            results.append(EventBatchItemResult(index=index, error=f"User not found: {item['user_id']}"))
+            continue
+        try:
+            event = _build_event(
+                item["user_id"],
+                item["event_name"],
+                item["stage"],
+                item.get("identity_model_id"),
+                item.get("payload"),
+            )
+        except ValueError as error:
+            results.append(EventBatchItemResult(index=index, error=str(error)))
+            continue
+        accepted.append(event)
+        results.append(EventBatchItemResult(index=index, event=event))
+
+    if accepted:
+        await db.execute(insert(EventLog), [_event_row(event) for event in accepted])
+        await db.commit()
+    return results
+
+
+async def _events_page(db: AsyncSession, stmt: Any, *, limit: int, cursor: str | None) -> Page[EventLog]:
+    stmt = apply_keyset(stmt, EventLog.occurred_at, EventLog.id, limit=limit, cursor=cursor)
+    return build_page(list((await db.scalars(stmt)).all()), limit=limit, sort_attr="occurred_at")
+
+
+async def get_user_events_page_async(
+    db: AsyncSession,
+    user_id: str,
+    *,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> Page[EventLog]:
+    """One page of a user's events, newest first."""
+    return await _events_page(
+        db, select(EventLog).where(EventLog.user_id == user_id), limit=limit, cursor=cursor
+    )
+
+
+async def get_events_by_name_page_async(
+    db: AsyncSession,
+    event_name: str,
+    *,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> Page[EventLog]:
+    """One page of events with the given name, newest first."""
+    return await _events_page(
+        db, select(EventLog).where(EventLog.event_name == event_name), limit=limit, cursor=cursor
+    )
+
+
+async def get_recent_events_page_async(
+    db: AsyncSession,
+    *,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> Page[EventLog]:
+    """One page of recent events across all users."""
+    return await _events_page(db, select(EventLog), limit=limit, cursor=cursor)
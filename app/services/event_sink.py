@@ -0,0 +1,171 @@
+"""进程内事件日志缓冲写入：请求线程只入队，后台线程按批量/时间触发批量插入。"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+import logging
+import queue
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+from app.models.consistency_check import EventLog
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _FlushRequest:
+    done: threading.Event
+
+
+_STOP = object()
+
+
+class EventSink:
+    """
+    有界队列 + 单个后台写线程。
+
+    - 攒满 batch_size 条或距本批第一条超过 flush_interval_seconds 即写入；
+    - 同一批按目标引擎分组，每组一个事务、一次 executemany；整组失败时逐行重试，只丢弃出错的行；
+    - 队列满时 submit 最多等待 timeout 秒（背压），仍满则返回 False，由调用方同步写入。
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int,
+        flush_interval_seconds: float,
+        max_queue_size: int,
+    ) -> None:
+        self._batch_size = batch_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max_queue_size)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="event-sink", daemon=True)
+            self._thread.start()
+
+    def submit(self, bind: Engine, row: dict[str, Any], *, timeout: float = 0.0) -> bool:
+        """把一行事件放入队列；队列在 timeout 内仍满时返回 False。"""
+        try:
+            if timeout > 0:
+                self._queue.put((bind, row), timeout=timeout)
+            else:
+                self._queue.put_nowait((bind, row))
+        except queue.Full:
+            logger.warning("event_sink_queue_full queue_size=%s", self._queue.qsize())
+            return False
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """阻塞直到此前入队的事件全部写入；后台线程未启动时直接返回 False。"""
+        if self._thread is None:
+            return False
+        request = _FlushRequest(done=threading.Event())
+        self._queue.put(request)
+        return request.done.wait(timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """写完队列中剩余事件后停止后台线程。"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        batch: list[tuple[Engine, dict[str, Any]]] = []
+        deadline: float | None = None
+        while True:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+
+            if item is not None and item is not _STOP and not isinstance(item, _FlushRequest):
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self._flush_interval_seconds
+                if len(batch) < self._batch_size:
+                    continue
+
+            # 到达批量上限、超时、收到 flush/stop 时写入当前批次。
+            if batch:
+                self._write(batch)
+                batch = []
+            deadline = None
+            if isinstance(item, _FlushRequest):
+                item.done.set()
+            elif item is _STOP:
+                return
+
+    def _write(self, batch: list[tuple[Engine, dict[str, Any]]]) -> None:
+        rows_by_bind: dict[Engine, list[dict[str, Any]]] = defaultdict(list)
+        for bind, row in batch:
+            rows_by_bind[bind].append(row)
+        for bind, rows in rows_by_bind.items():
+            try:
+                with bind.begin() as connection:
+                    connection.execute(insert(EventLog), rows)
+            except Exception:
+                logger.warning("event_sink_batch_failed rows=%s retrying_row_by_row=true", len(rows), exc_info=True)
+                self._write_rows(bind, rows)
+
+    def _write_rows(self, bind: Engine, rows: list[dict[str, Any]]) -> None:
+        """整批写入失败时逐行重试，每行一个事务：只丢弃写不进去的那几行，其余事件照常保存。"""
+        dropped = 0
+        for row in rows:
+            try:
+                with bind.begin() as connection:
+                    connection.execute(insert(EventLog), [row])
+            except Exception:
+                dropped += 1
+                # 埋点写入失败不影响业务请求，只记录丢失的事件。
+                logger.exception(
+                    "event_sink_write_failed event_name=%s user_id=%s",
+                    row.get("event_name"),
+                    row.get("user_id"),
+                )
+        if dropped:
+            logger.warning("event_sink_rows_dropped dropped=%s total=%s", dropped, len(rows))
+
+
+_SINK: EventSink | None = None
+_SINK_LOCK = threading.Lock()
+
+
+def get_event_sink() -> EventSink:
+    """返回按当前配置创建并已启动的进程级 EventSink。"""
+    global _SINK
+    with _SINK_LOCK:
+        if _SINK is None:
+            settings = get_settings()
+            _SINK = EventSink(
+                batch_size=settings.event_log_batch_size,
+                flush_interval_seconds=settings.event_log_flush_interval_seconds,
+                max_queue_size=settings.event_log_queue_max_size,
+            )
+            _SINK.start()
+        return _SINK
+
+
+def shutdown_event_sink() -> None:
+    """停机时写完剩余事件并释放进程级 EventSink。"""
+    global _SINK
+    with _SINK_LOCK:
+        sink, _SINK = _SINK, None
+    if sink is not None:
+        sink.close()
@@ -0,0 +1,637 @@
+"""
+后台生成任务：同步/异步生成共用的执行函数、工作线程池与完成等待。
+
+POST .../generate 默认在请求线程内执行；带 async=true 时只写入 generation_jobs 并立即返回，
+由进程内线程池执行同一个函数，客户端通过 GET /v1/jobs/{id}（长轮询）或 SSE 获取结果。
+长轮询与 SSE 在事件循环内等待（asyncio.Event + AsyncSession），等待中的连接不占用线程。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import logging
+import threading
+from typing import Any
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.session import sync_engine_for
+from app.models.generation_job import GenerationJob
+from app.services import identity_model as identity_service
+from app.services import launch_kit as launch_kit_service
+from app.services import persona as persona_service
+from app.services.event_log import log_event, log_event_async
+from app.services.llm_client import LLMServiceError
+from app.services.onboarding import get_profile
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({"succeeded", "failed"})
+
+
+def _profile_capability(db: Session, session_id: str | None, capability_profile: dict[str, Any]) -> dict[str, Any]:
+    # 若提供 session_id，则优先读取已落库画像，覆盖请求体中的 capability_profile。
+    if session_id:
+        profile = get_profile(db, session_id)
+        if profile:
+            return {
+                "skill_stack": profile.skill_stack_json,
+                "cognitive_style": profile.cognitive_style,
+                "risk_tolerance": profile.risk_tolerance,
+            }
+    return capability_profile
+
+
+def _identity_models_body(models: list[Any]) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": m.id,
+            "title": m.title,
+            "target_audience_pain": m.target_audience_pain,
+            "differentiation": m.differentiation,
+            "is_primary": m.is_primary,
+            "is_backup": m.is_backup,
+        }
+        for m in models
+    ]
+
+
+def _constitution_body(constitution: Any) -> dict[str, Any]:
+    return {
+        "id": constitution.id,
+        "user_id": constitution.user_id,
+        "version": constitution.version,
+        "narrative_mainline": constitution.narrative_mainline,
+    }
+
+
+def _launch_kit_body(kit: Any) -> dict[str, Any]:
+    return {
+        "id": kit.id,
+        "user_id": kit.user_id,
+        "days": [
+            {
+                "day_no": d.day_no,
+                "theme": d.theme,
+                "opening_text": d.opening_text,
+            }
+            for d in kit.days
+        ],
+    }
+
+
+def run_identity_models(
+    db: Session,
+    *,
+    user_id: str,
+    session_id: str | None,
+    capability_profile: dict[str, Any],
+    count: int,
+) -> list[dict[str, Any]]:
+    """生成身份模型并记录埋点，返回值即 POST /identity-models/generate 的响应体。"""
+    models = identity_service.generate_identity_models(
+        db=db,
+        user_id=user_id,
+        session_id=session_id,
+        capability_profile=_profile_capability(db, session_id, capability_profile),
+        count=count,
+    )
+
+    # 生成成功后记录埋点事件。
+    log_event(
+        db=db,
+        user_id=user_id,
+        event_name="identity_models_generated",
+        stage="MVP",
+    )
+
+    return _identity_models_body(models)
+
+
+async def run_identity_models_async(
+    db: AsyncSession,
+    *,
+    user_id: str,
+    session_id: str | None,
+    capability_profile: dict[str, Any],
+    count: int,
+) -> list[dict[str, Any]]:
+    """Async variant of run_identity_models，供 async 路由在事件循环内等待 LLM。"""
+    capability_profile = await db.run_sync(
+        lambda session: _profile_capability(session, session_id, capability_profile)
+    )
+    models = await identity_service.generate_identity_models_async(
+        db=db,
+        user_id=user_id,
+        session_id=session_id,
+        capability_profile=capability_profile,
+        count=count,
+    )
+    await log_event_async(
+        db=db,
+        user_id=user_id,
+        event_name="identity_models_generated",
+        stage="MVP",
+    )
+    return _identity_models_body(models)
+
+
+def run_persona_constitution(
+    db: Session,
+    *,
+    user_id: str,
+    identity_model_id: str | None,
+    common_words: list[str],
+    forbidden_words: list[str],
+) -> dict[str, Any]:
+    """生成人格宪法，返回值即 POST /persona-constitutions/generate 的响应体。"""
+    constitution = persona_service.generate_constitution(
+        db=db,
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        common_words=common_words,
+        forbidden_words=forbidden_words,
+    )
+    return _constitution_body(constitution)
+
+
+async def run_persona_constitution_async(
+    db: AsyncSession,
+    *,
+    user_id: str,
+    identity_model_id: str | None,
+    common_words: list[str],
+    forbidden_words: list[str],
+) -> dict[str, Any]:
+    """Async variant of run_persona_constitution."""
+    constitution = await persona_service.generate_constitution_async(
+        db=db,
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        common_words=common_words,
+        forbidden_words=forbidden_words,
+    )
+    return _constitution_body(constitution)
+
+
+def run_launch_kit(
+    db: Session,
+    *,
+    user_id: str,
+    identity_model_id: str | None,
+    constitution_id: str | None,
+    sustainable_columns: list[str],
+    growth_experiment_suggestion: list[dict[str, str]],
+    generation_mode: str | None,
+) -> dict[str, Any]:
+    """生成启动包并记录埋点，返回值即 POST /launch-kits/generate 的响应体。"""
+    kit = launch_kit_service.generate_launch_kit(
+        db=db,
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        constitution_id=constitution_id,
+        sustainable_columns=sustainable_columns,
+        growth_experiment_suggestion=growth_experiment_suggestion,
+        generation_mode=generation_mode,
+    )
+
+    # 生成成功后记录 launch_kit_generated 事件。
+    log_event(
+        db=db,
+        user_id=user_id,
+        event_name="launch_kit_generated",
+        stage="MVP",
+        identity_model_id=kit.identity_model_id,
+    )
+
+    return _launch_kit_body(kit)
+
+
+async def run_launch_kit_async(
+    db: AsyncSession,
+    *,
+    user_id: str,
+    identity_model_id: str | None,
+    constitution_id: str | None,
+    sustainable_columns: list[str],
+    growth_experiment_suggestion: list[dict[str, str]],
+    generation_mode: str | None,
+) -> dict[str, Any]:
+    """Async variant of run_launch_kit."""
+    kit = await launch_kit_service.generate_launch_kit_async(
+        db=db,
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        constitution_id=constitution_id,
+        sustainable_columns=sustainable_columns,
+        growth_experiment_suggestion=growth_experiment_suggestion,
+        generation_mode=generation_mode,
+    )
+    # 先在 run_sync 内组装响应体：kit.days 为懒加载关系，不能在事件循环内直接访问。
+    body = await db.run_sync(lambda _session: _launch_kit_body(kit))
+    await log_event_async(
+        db=db,
+        user_id=user_id,
+        event_name="launch_kit_generated",
+        stage="MVP",
+        identity_model_id=kit.identity_model_id,
+    )
+    return body
+
+
+# operation -> 执行函数；request_json 按关键字参数原样传入。后台任务在线程中执行同步版本。
+JOB_OPERATIONS: dict[str, Callable[..., Any]] = {
+    "identity_models": run_identity_models,
+    "persona_constitution": run_persona_constitution,
+    "launch_kit": run_launch_kit,
+}
+
+# 同一组 operation 的异步版本，供生成路由同步返回结果时在事件循环内执行。
+ASYNC_JOB_OPERATIONS: dict[str, Callable[..., Awaitable[Any]]] = {
+    "identity_models": run_identity_models_async,
+    "persona_constitution": run_persona_constitution_async,
+    "launch_kit": run_launch_kit_async,
+}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _finish_job(
+    db: Session,
+    job_id: str,
+    *,
+    status: str,
+    result: Any = None,
+    error: dict[str, Any] | None = None,
+) -> None:
+    db.execute(
+        update(GenerationJob)
+        .where(GenerationJob.id == job_id)
+        .values(status=status, result_json=result, error_json=error, finished_at=_utcnow())
+    )
+    db.commit()
+
+
+def execute_job(db: Session, job_id: str, *, on_claimed: Callable[[], None] | None = None) -> None:
+    """
+    执行一个 queued 任务。
+
+    先用条件 UPDATE 把 queued 改为 running 认领任务，认领失败（已被执行或不存在）直接返回，
+    因此重复提交同一个 job_id 也只会生成一次。认领时写入首个租约心跳，提交后调用 on_claimed。
+    """
+    now = _utcnow()
+    claimed = db.execute(
+        update(GenerationJob)
+        .where(GenerationJob.id == job_id, GenerationJob.status == "queued")
+        .values(status="running", started_at=now, heartbeat_at=now)
+    ).rowcount
+    db.commit()
+    if not claimed:
+        return
+    if on_claimed is not None:
+        on_claimed()
+
+    job = db.get(GenerationJob, job_id)
+    operation = job.operation
+    try:
+        result = JOB_OPERATIONS[operation](db, **job.request_json)
+    except LLMServiceError as error:
+        db.rollback()
+        _finish_job(db, job_id, status="failed", error=error.to_detail())
+    except Exception:
+        # 非 LLM 异常不透传内部信息，只记录日志。
+        logger.exception("generation_job_failed job_id=%s operation=%s", job_id, operation)
+        db.rollback()
+        _finish_job(
+            db,
+            job_id,
+            status="failed",
+            error={
+                "code": "JOB_INTERNAL_ERROR",
+                "message": "Generation job failed unexpectedly.",
+                "operation": operation,
+                "retryable": False,
+            },
+        )
+    else:
+        _finish_job(db, job_id, status="succeeded", result=result)
+
+
+def renew_job_leases(db: Session, job_ids: list[str]) -> None:
+    """为本进程执行中的任务续约。"""
+    db.execute(
+        update(GenerationJob)
+        .where(GenerationJob.id.in_(job_ids), GenerationJob.status == "running")
+        .values(heartbeat_at=_utcnow())
+    )
+    db.commit()
+
+
+def interrupt_expired_jobs(db: Session, *, lease_seconds: float) -> int:
+    """
+    把租约过期的 running 任务标记为可重试的失败，返回处理的任务数。
+
+    执行进程会持续续约，因此过期只意味着该进程已退出；其他进程正在执行的任务不受影响。
+    running 任务可能已部分写库，重新执行可能重复生成，因此交由客户端决定是否重试。
+    """
+    cutoff = _utcnow() - timedelta(seconds=lease_seconds)
+    interrupted = db.execute(
+        update(GenerationJob)
+        .where(
+            GenerationJob.status == "running",
+            or_(GenerationJob.heartbeat_at.is_(None), GenerationJob.heartbeat_at < cutoff),
+        )
+        .values(
+            status="failed",
+            finished_at=_utcnow(),
+            error_json={
+                "code": "JOB_INTERRUPTED",
+                "message": "Generation job was interrupted by a server restart.",
+                "retryable": True,
+            },
+        )
+    ).rowcount
+    db.commit()
+    if interrupted:
+        logger.warning("generation_jobs_interrupted count=%s", interrupted)
+    return interrupted
+
+
+class GenerationJobRunner:
+    """
+    固定大小线程池执行生成任务，LLM 调用不再占用请求线程。
+
+    每个任务使用独立 Session（绑定提交时请求 Session 的引擎）；任务结束时递增序号，
+    并通过 call_soon_threadsafe 唤醒各事件循环里的等待方。
+    后台租约线程每 1/3 租约为执行中的任务续约，并把其他进程遗留的过期任务标记为中断。
+    """
+
+    def __init__(self, *, max_workers: int, lease_seconds: float) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="generation-job")
+        self._lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._async_waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._running: dict[str, Engine] = {}
+        self._binds: set[Engine] = set()
+        self._stopped = threading.Event()
+        self._lease_thread: threading.Thread | None = None
+
+    def submit(self, bind: Engine, job_id: str) -> None:
+        self.watch(bind)
+        self._executor.submit(self._run, bind, job_id)
+
+    def watch(self, bind: Engine) -> None:
+        """登记数据库引擎，启动租约线程（只启动一次）。"""
+        with self._lock:
+            self._binds.add(bind)
+            if self._lease_thread is not None:
+                return
+            self._lease_thread = threading.Thread(
+                target=self._lease_loop,
+                name="generation-job-lease",
+                daemon=True,
+            )
+        self._lease_thread.start()
+
+    def maintain_leases(self) -> None:
+        """续约本进程执行中的任务，并中断租约已过期的任务。"""
+        with self._lock:
+            running = dict(self._running)
+            binds = list(self._binds)
+        for bind in binds:
+            job_ids = [job_id for job_id, job_bind in running.items() if job_bind is bind]
+            try:
+                with Session(bind=bind) as db:
+                    if job_ids:
+                        renew_job_leases(db, job_ids)
+                    interrupt_expired_jobs(db, lease_seconds=self._lease_seconds)
+            except Exception:
+                logger.exception("generation_job_lease_failed")
+
+    def sequence(self) -> int:
+        with self._lock:
+            return self._sequence
+
+    async def wait_for_update(self, since: int, timeout: float) -> None:
+        """在事件循环内等待到有任务在 since 之后开始或结束，或超时；不阻塞线程。"""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            if self._sequence != since:
+                return
+            self._async_waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                self._async_waiters.discard(waiter)
+
+    def close(self, *, wait: bool = True) -> None:
+        # 尚未开始的任务直接取消，数据库中保持 queued，由下次启动的 recover_generation_jobs 重新提交；
+        # 再等执行中的任务结束（期间继续续约），最后停租约线程。
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._stopped.set()
+        if self._lease_thread is not None:
+            self._lease_thread.join()
+
+    def _lease_loop(self) -> None:
+        while not self._stopped.wait(self._lease_seconds / 3):
+            self.maintain_leases()
+
+    def _run(self, bind: Engine, job_id: str) -> None:
+        with self._lock:
+            self._running[job_id] = bind
+        try:
+            with Session(bind=bind, autoflush=False, expire_on_commit=False) as db:
+                # 认领（queued -> running）后同样唤醒等待方，SSE 能立即推送状态变化。
+                execute_job(db, job_id, on_claimed=self._notify)
+        except Exception:
+            logger.exception("generation_job_crashed job_id=%s", job_id)
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+            self._notify()
+
+    def _notify(self) -> None:
+        """任务状态变化：递增序号并唤醒各事件循环里的等待方。"""
+        with self._lock:
+            self._sequence += 1
+            waiters = list(self._async_waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # 等待方所在事件循环已关闭。
+                pass
+
+
+_RUNNER: GenerationJobRunner | None = None
+_RUNNER_LOCK = threading.Lock()
+
+
+def get_generation_job_runner() -> GenerationJobRunner:
+    """返回进程级任务线程池。"""
+    global _RUNNER
+    with _RUNNER_LOCK:
+        if _RUNNER is None:
+            settings = get_settings()
+            _RUNNER = GenerationJobRunner(
+                max_workers=settings.generation_job_workers,
+                lease_seconds=settings.generation_job_lease_seconds,
+            )
+        return _RUNNER
+
+
+def shutdown_generation_job_runner(*, wait: bool = True) -> None:
+    """停机时等待执行中的任务结束并释放线程池。"""
+    global _RUNNER
+    with _RUNNER_LOCK:
+        runner, _RUNNER = _RUNNER, None
+    if runner is not None:
+        runner.close(wait=wait)
+
+
+def enqueue_job(db: Session, *, operation: str, user_id: str, request: dict[str, Any]) -> GenerationJob:
+    """写入 queued 任务并提交到线程池；request 为 JSON 兼容的请求体。"""
+    if operation not in JOB_OPERATIONS:
+        raise ValueError(f"Unknown generation job operation: {operation}")
+    job = GenerationJob(user_id=user_id, operation=operation, status="queued", request_json=request)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    get_generation_job_runner().submit(db.get_bind(), job.id)
+    return job
+
+
+async def enqueue_job_async(
+    db: AsyncSession,
+    *,
+    operation: str,
+    user_id: str,
+    request: dict[str, Any],
+) -> GenerationJob:
+    """Async variant of enqueue_job；线程池拿到的是同一数据库的同步 Engine。"""
+    if operation not in JOB_OPERATIONS:
+        raise ValueError(f"Unknown generation job operation: {operation}")
+    job = GenerationJob(user_id=user_id, operation=operation, status="queued", request_json=request)
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    # 工作线程不在 greenlet 中运行，不能使用 AsyncEngine.sync_engine。
+    get_generation_job_runner().submit(sync_engine_for(db.bind), job.id)
+    return job
+
+
+def get_job(db: Session, job_id: str) -> GenerationJob | None:
+    """Get generation job by ID."""
+    return db.get(GenerationJob, job_id)
+
+
+async def get_job_async(db: AsyncSession, job_id: str) -> GenerationJob | None:
+    """Async variant of get_job."""
+    return await db.get(GenerationJob, job_id)
+
+
+async def wait_for_job(
+    db: AsyncSession,
+    job_id: str,
+    *,
+    timeout: float,
+    last_status: str | None = None,
+) -> GenerationJob | None:
+    """
+    长轮询：任务状态变化、任务结束或 timeout 秒后返回最新状态；任务不存在时返回 None。
+
+    状态变化以 last_status 为基准，未传时以首次查到的状态为基准（如 queued -> running 即返回）。
+    """
+    runner = get_generation_job_runner()
+    poll_interval = get_settings().generation_job_poll_interval_seconds
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    baseline = last_status
+    while True:
+        # 先取序号再查库：查库后状态变化的任务会让下面的等待立即返回。
+        since = runner.sequence()
+        job = await db.get(GenerationJob, job_id, populate_existing=True)
+        if job is None or job.status in TERMINAL_STATUSES:
+            return job
+        if baseline is None:
+            baseline = job.status
+        remaining = deadline - loop.time()
+        if job.status != baseline or remaining <= 0:
+            return job
+        await runner.wait_for_update(since, min(remaining, poll_interval))
+
+
+async def wait_for_job_completion(db: AsyncSession, job_id: str, *, timeout: float) -> GenerationJob | None:
+    """GET 长轮询：任务结束或 timeout 秒后返回最新状态，中途的状态变化不提前返回。"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    last_status: str | None = None
+    while True:
+        job = await wait_for_job(
+            db,
+            job_id,
+            timeout=max(0.0, deadline - loop.time()),
+            last_status=last_status,
+        )
+        if job is None or job.status in TERMINAL_STATUSES or loop.time() >= deadline:
+            return job
+        last_status = job.status
+
+
+async def iter_job_updates(db: AsyncSession, job_id: str) -> AsyncIterator[GenerationJob | None]:
+    """
+    SSE 用：先产出当前状态，之后状态每变化一次产出一次任务，任务结束后停止。
+
+    超过心跳间隔仍无变化时产出 None，由路由写出注释行，避免代理按空闲超时断开连接。
+    """
+    heartbeat = get_settings().generation_job_heartbeat_seconds
+    job = await db.get(GenerationJob, job_id, populate_existing=True)
+    if job is None:
+        return
+    last_status = job.status
+    yield job
+    while job.status not in TERMINAL_STATUSES:
+        job = await wait_for_job(db, job_id, timeout=heartbeat, last_status=last_status)
+        if job is None:
+            return
+        if job.status == last_status:
+            yield None
+            continue
+        last_status = job.status
+        yield job
+
+
+def recover_generation_jobs(db: Session) -> int:
+    """
+    启动时处理遗留任务：租约已过期的 running 任务标记为中断，queued 任务重新提交。
+
+    其他进程仍在续约的 running 任务保持原状；重复提交的 queued 任务由 execute_job 的条件认领去重。
+    启动后由租约线程继续清理之后过期的任务。返回重新提交的任务数。
+    """
+    interrupt_expired_jobs(db, lease_seconds=get_settings().generation_job_lease_seconds)
+
+    queued_ids = list(
+        db.scalars(
+            select(GenerationJob.id)
+            .where(GenerationJob.status == "queued")
+            .order_by(GenerationJob.created_at)
+        ).all()
+    )
+    runner = get_generation_job_runner()
+    runner.watch(db.get_bind())
+    for job_id in queued_ids:
+        runner.submit(db.get_bind(), job_id)
+    return len(queued_ids)
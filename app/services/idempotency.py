@@ -0,0 +1,328 @@
+"""
+生成接口的幂等与请求合并。
+
+- 单飞（single-flight）：同一进程内 (user_id, operation, 请求哈希, Idempotency-Key) 相同的并发请求
+  只执行一次，其余请求等待同一个结果（含异常），双击/前端重试不会重复调用 LLM；
+- Idempotency-Key：成功响应持久化到 idempotency_records，TTL 内同一个 key 直接重放；
+  失败不记录，客户端可用同一个 key 重试。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import hashlib
+import threading
+from typing import Any, TypeVar
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import json_codec
+from app.core.config import get_settings
+from app.models.idempotency import IdempotencyRecord
+
+T = TypeVar("T")
+
+
+@dataclass
+class StoredResponse:
+    """可重放的响应：状态码与 JSON 响应体；replayed 表示来自已保存的结果。"""
+
+    status_code: int
+    body: Any
+    replayed: bool = False
+
+
+class IdempotencyError(RuntimeError):
+    """幂等键冲突，由路由按 status_code 映射为 HTTP 错误。"""
+
+    def __init__(self, message: str, *, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class SingleFlight:
+    """按 key 合并并发调用：首个调用方执行，其余调用方阻塞等待同一个 Future。"""
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, Future[Any]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            # 结果交付后再移除，之后到达的请求重新执行（或从幂等记录重放）。
+            with self._lock:
+                del self._calls[key]
+
+    async def do_async(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """do 的协程版本：等待方在事件循环内等待，与同步调用方共享同一组进行中的调用。"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            # concurrent Future 可跨线程/事件循环等待（测试客户端每个请求各用一个事件循环）。
+            return await asyncio.wrap_future(future)
+
+        try:
+            result = await func()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+# 生成执行按 (user_id, operation, request_hash) 合并；幂等记录的认领按 (user_id, operation, key, request_hash) 合并。
+_FLIGHTS = SingleFlight()
+_KEY_CLAIMS = SingleFlight()
+
+
+def hash_request(request: dict[str, Any]) -> str:
+    """规范化序列化（键排序）后取 sha256，字段顺序不同的相同请求哈希一致。"""
+    return hashlib.sha256(json_codec.dumps_bytes(request, sort_keys=True)).hexdigest()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite 读回的时间不带时区，按写入时的 UTC 解释。
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _claim(
+    db: Session,
+    *,
+    user_id: str,
+    operation: str,
+    idempotency_key: str,
+    request_hash: str,
+) -> StoredResponse | None:
+    """认领幂等键：新 key 写入 in_progress 并返回 None；已完成的 key 返回保存的响应。"""
+    settings = get_settings()
+    now = _utcnow()
+    # 顺带清理该用户已过期的记录（走主键前缀）。
+    db.execute(
+        delete(IdempotencyRecord)
+        .where(IdempotencyRecord.user_id == user_id, IdempotencyRecord.expires_at <= now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    for _attempt in range(2):
+        record = db.get(
+            IdempotencyRecord,
+            (user_id, operation, idempotency_key),
+            populate_existing=True,
+        )
+        if record is not None:
+            if record.request_hash != request_hash:
+                raise IdempotencyError(
+                    "Idempotency-Key was already used with a different request body",
+                    status_code=422,
+                )
+            if record.status == "completed":
+                return StoredResponse(record.response_status or 200, record.response_json, replayed=True)
+            lock_deadline = _as_utc(record.created_at) + timedelta(seconds=settings.idempotency_lock_timeout_seconds)
+            if lock_deadline > now:
+                raise IdempotencyError(
+                    "A request with this Idempotency-Key is still in progress",
+                    status_code=409,
+                )
+            # 进行中记录超过锁超时：视为崩溃遗留，由本次请求重新认领。
+            db.delete(record)
+            db.flush()
+
+        db.add(
+            IdempotencyRecord(
+                user_id=user_id,
+                operation=operation,
+                idempotency_key=idempotency_key,
+                request_hash=request_hash,
+                status="in_progress",
+                created_at=now,
+                expires_at=now + timedelta(seconds=settings.idempotency_ttl_seconds),
+            )
+        )
+        try:
+            db.commit()
+            return None
+        except IntegrityError:
+            # 其他进程刚写入同一个 key，回读一次按已有记录处理。
+            db.rollback()
+    raise IdempotencyError("A request with this Idempotency-Key is still in progress", status_code=409)
+
+
+def _complete(db: Session, *, user_id: str, operation: str, idempotency_key: str, response: StoredResponse) -> None:
+    db.execute(
+        update(IdempotencyRecord)
+        .where(
+            IdempotencyRecord.user_id == user_id,
+            IdempotencyRecord.operation == operation,
+            IdempotencyRecord.idempotency_key == idempotency_key,
+        )
+        .values(status="completed", response_status=response.status_code, response_json=response.body)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def _release(db: Session, *, user_id: str, operation: str, idempotency_key: str) -> None:
+    db.rollback()
+    db.execute(
+        delete(IdempotencyRecord)
+        .where(
+            IdempotencyRecord.user_id == user_id,
+            IdempotencyRecord.operation == operation,
+            IdempotencyRecord.idempotency_key == idempotency_key,
+            IdempotencyRecord.status == "in_progress",
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def execute_idempotent(
+    db: Session,
+    *,
+    user_id: str,
+    operation: str,
+    request: dict[str, Any],
+    idempotency_key: str | None,
+    execute: Callable[[], StoredResponse],
+) -> StoredResponse:
+    """
+    合并并发重复请求后执行 execute；带 idempotency_key 时保存/重放成功响应。
+
+    - 同一个 key 携带不同请求体：IdempotencyError(422)；
+    - 同一个 key 仍在其他进程执行中：IdempotencyError(409)，客户端稍后重试即可拿到重放结果；
+    - execute 抛异常或返回非 2xx：不保存，释放 key。
+    """
+    request_hash = hash_request(request)
+
+    def _execute_shared() -> StoredResponse:
+        # 生成按请求内容合并，与幂等键无关：键不同（或未带键）的相同请求共享同一次执行。
+        return _FLIGHTS.do((user_id, operation, request_hash), execute)
+
+    if idempotency_key is None:
+        return _execute_shared()
+
+    def _run_with_record() -> StoredResponse:
+        replay = _claim(
+            db,
+            user_id=user_id,
+            operation=operation,
+            idempotency_key=idempotency_key,
+            request_hash=request_hash,
+        )
+        if replay is not None:
+            return replay
+        try:
+            response = _execute_shared()
+        except BaseException:
+            _release(db, user_id=user_id, operation=operation, idempotency_key=idempotency_key)
+            raise
+        if 200 <= response.status_code < 300:
+            _complete(db, user_id=user_id, operation=operation, idempotency_key=idempotency_key, response=response)
+        else:
+            _release(db, user_id=user_id, operation=operation, idempotency_key=idempotency_key)
+        return response
+
+    # 幂等键只决定重放记录：同一个键、同一请求体的并发请求共用一次认领，每个键各自保存一份可重放的响应。
+    # 键相同而请求体不同的请求不加入合并，自行认领，由 _claim 按进行中记录的请求哈希返回 422。
+    return _KEY_CLAIMS.do((user_id, operation, idempotency_key, request_hash), _run_with_record)
+
+
+async def execute_idempotent_async(
+    db: AsyncSession,
+    *,
+    user_id: str,
+    operation: str,
+    request: dict[str, Any],
+    idempotency_key: str | None,
+    execute: Callable[[], Awaitable[StoredResponse]],
+) -> StoredResponse:
+    """Async variant of execute_idempotent；幂等记录读写走 run_sync，语义与同步版本一致。"""
+    request_hash = hash_request(request)
+
+    async def _execute_shared() -> StoredResponse:
+        return await _FLIGHTS.do_async((user_id, operation, request_hash), execute)
+
+    if idempotency_key is None:
+        return await _execute_shared()
+
+    async def _run_with_record() -> StoredResponse:
+        replay = await db.run_sync(
+            lambda session: _claim(
+                session,
+                user_id=user_id,
+                operation=operation,
+                idempotency_key=idempotency_key,
+                request_hash=request_hash,
+            )
+        )
+        if replay is not None:
+            return replay
+        try:
+            response = await _execute_shared()
+        except BaseException:
+            await db.run_sync(
+                lambda session: _release(
+                    session, user_id=user_id, operation=operation, idempotency_key=idempotency_key
+                )
+            )
+            raise
+        if 200 <= response.status_code < 300:
+            await db.run_sync(
+                lambda session: _complete(
+                    session,
+                    user_id=user_id,
+                    operation=operation,
+                    idempotency_key=idempotency_key,
+                    response=response,
+                )
+            )
+        else:
+            await db.run_sync(
+                lambda session: _release(
+                    session, user_id=user_id, operation=operation, idempotency_key=idempotency_key
+                )
+            )
+        return response
+
+    return await _KEY_CLAIMS.do_async((user_id, operation, idempotency_key, request_hash), _run_with_record)
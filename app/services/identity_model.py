@@ -2,18 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
 from concurrent.futures import ThreadPoolExecutor
-import json
 from typing import Any
 
 from pydantic import BaseModel, ValidationError, model_validator
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.consistency_check import ConsistencyCheck
 from app.models.identity_model import IdentityModel, IdentitySelection
 from app.models.launch_kit import LaunchKit
 from app.models.persona import PersonaConstitution, RiskBoundaryItem
-from app.services.llm_client import get_llm_client, llm_schema_error
+from app.services.context_cache import invalidate_user_context
+from app.services.llm_client import get_async_llm_client, get_llm_client, llm_schema_error
+from app.services.pagination import Page, apply_keyset, build_page
 
 
 class _IdentityCandidate(BaseModel):
@@ -125,6 +128,7 @@ def _generate_identity_candidates_parallel(
             operation="generate_identity_models",
             system_prompt=IDENTITY_MODELS_PROMPT,
             user_payload=payload,
+            validate=lambda response: _parse_identity_models(response, count=1),
         )
         candidates = _parse_identity_models(response_payload, count=1)
         return candidates[0]
@@ -133,6 +137,27 @@ def _generate_identity_candidates_parallel(
         return list(executor.map(_generate_one, range(count)))
 
 
+async def _generate_identity_candidates_async(
+    *,
+    count: int,
+    llm_payload: dict[str, Any],
+) -> list[_IdentityCandidate]:
+    """异步并发生成候选，每个候选一次请求；并发数仍受 LLM 限流器约束。"""
+
+    async def _generate_one() -> _IdentityCandidate:
+        payload = dict(llm_payload)
+        payload["count"] = 1
+        response_payload = await get_async_llm_client().generate_json(
+            operation="generate_identity_models",
+            system_prompt=IDENTITY_MODELS_PROMPT,
+            user_payload=payload,
+            validate=lambda response: _parse_identity_models(response, count=1),
+        )
+        return _parse_identity_models(response_payload, count=1)[0]
+
+    return list(await asyncio.gather(*(_generate_one() for _ in range(count))))
+
+
 def _replace_user_identity_models(db: Session, user_id: str) -> None:
     """Replace all identity models for a user and unlink old downstream references."""
 
@@ -175,23 +200,13 @@ def _replace_user_identity_models(db: Session, user_id: str) -> None:
     )
 
 
-def generate_identity_models(
+def _persist_identity_models(
     db: Session,
+    *,
     user_id: str,
     session_id: str | None,
-    capability_profile: dict,
-    count: int = 3,
+    candidates: list[_IdentityCandidate],
 ) -> list[IdentityModel]:
-    """Generate identity models and replace previous batch atomically."""
-
-    llm_payload = {
-        "user_id": user_id,
-        "session_id": session_id,
-        "count": count,
-        "capability_profile": capability_profile,
-    }
-
-    candidates = _generate_identity_candidates_parallel(count=count, llm_payload=llm_payload)
     _replace_user_identity_models(db, user_id)
 
     models: list[IdentityModel] = []
@@ -201,28 +216,73 @@ def generate_identity_models(
             session_id=session_id,
             title=candidate.title,
             target_audience_pain=candidate.target_audience_pain,
-            content_pillars_json=json.dumps(candidate.content_pillars, ensure_ascii=False),
-            tone_keywords_json=json.dumps(candidate.tone_keywords, ensure_ascii=False),
-            tone_examples_json=json.dumps(candidate.tone_examples, ensure_ascii=False),
-            long_term_views_json=json.dumps(candidate.long_term_views, ensure_ascii=False),
+            content_pillars_json=candidate.content_pillars,
+            tone_keywords_json=candidate.tone_keywords,
+            tone_examples_json=candidate.tone_examples,
+            long_term_views_json=candidate.long_term_views,
             differentiation=candidate.differentiation,
             growth_path_0_3m=candidate.growth_path_0_3m,
             growth_path_3_12m=candidate.growth_path_3_12m,
-            monetization_validation_order_json=json.dumps(
-                candidate.monetization_validation_order,
-                ensure_ascii=False,
-            ),
-            risk_boundary_json=json.dumps(candidate.risk_boundary, ensure_ascii=False),
+            monetization_validation_order_json=candidate.monetization_validation_order,
+            risk_boundary_json=candidate.risk_boundary,
         )
         db.add(model)
         models.append(model)
 
     db.commit()
+    invalidate_user_context(user_id)
     for model in models:
         db.refresh(model)
     return models
 
 
+def generate_identity_models(
+    db: Session,
+    user_id: str,
+    session_id: str | None,
+    capability_profile: dict,
+    count: int = 3,
+) -> list[IdentityModel]:
+    """Generate identity models and replace previous batch atomically."""
+
+    llm_payload = {
+        "user_id": user_id,
+        "session_id": session_id,
+        "count": count,
+        "capability_profile": capability_profile,
+    }
+
+    candidates = _generate_identity_candidates_parallel(count=count, llm_payload=llm_payload)
+    return _persist_identity_models(db, user_id=user_id, session_id=session_id, candidates=candidates)
+
+
+async def generate_identity_models_async(
+    db: AsyncSession,
+    user_id: str,
+    session_id: str | None,
+    capability_profile: dict,
+    count: int = 3,
+) -> list[IdentityModel]:
+    """Async variant of generate_identity_models."""
+
+    llm_payload = {
+        "user_id": user_id,
+        "session_id": session_id,
+        "count": count,
+        "capability_profile": capability_profile,
+    }
+
+    candidates = await _generate_identity_candidates_async(count=count, llm_payload=llm_payload)
+    return await db.run_sync(
+        lambda session: _persist_identity_models(
+            session,
+            user_id=user_id,
+            session_id=session_id,
+            candidates=candidates,
+        )
+    )
+
+
 def select_identity(
     db: Session,
     user_id: str,
@@ -260,6 +320,7 @@ def select_identity(
     )
     db.add(selection)
     db.commit()
+    invalidate_user_context(user_id)
     db.refresh(selection)
     return selection
 
@@ -275,6 +336,25 @@ def get_user_identity_models(db: Session, user_id: str) -> list[IdentityModel]:
     )
 
 
+def get_user_identity_models_page(
+    db: Session,
+    user_id: str,
+    *,
+    limit: int,
+    cursor: str | None = None,
+) -> Page[IdentityModel]:
+    """One page of a user's identity models, oldest first (same order as get_user_identity_models)."""
+    query = apply_keyset(
+        db.query(IdentityModel).filter(IdentityModel.user_id == user_id),
+        IdentityModel.created_at,
+        IdentityModel.id,
+        limit=limit,
+        cursor=cursor,
+        direction="asc",
+    )
+    return build_page(query.all(), limit=limit)
+
+
 def get_identity_model(db: Session, model_id: str) -> IdentityModel | None:
     """Get identity model by ID."""
 
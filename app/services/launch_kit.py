@@ -1,19 +1,35 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
 from pydantic import BaseModel, ValidationError, field_validator, model_validator
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, selectinload
 
+from app.core import json_codec
+from app.core.config import get_settings
 from app.models.identity_model import IdentityModel, IdentitySelection
 from app.models.launch_kit import LaunchKit, LaunchKitDay
 from app.models.onboarding import CapabilityProfile
 from app.models.persona import PersonaConstitution, RiskBoundaryItem
-from app.services.llm_client import LLMServiceError, get_llm_client, llm_schema_error
+from app.services.context_cache import get_context_cache
+from app.services.llm_client import (
+    LLMServiceError,
+    get_async_llm_client,
+    get_llm_client,
+    llm_deadline,
+    llm_schema_error,
+    parse_llm_json_text,
+)
+from app.services.pagination import Page, apply_keyset, build_page
+from app.services.schema_repair import FRAGMENT_RESPONSE_CONTRACT, repair_llm_output, repair_llm_output_async
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +39,13 @@ MAX_LIST_ITEMS = 5
 MAX_TONE_EXAMPLES = 3
 MAX_RISK_BOUNDARIES = 6
 
+_EMPTY_CONTEXT_SOURCES = {
+    "identity_model_source": "none",
+    "persona_constitution_source": "none",
+    "capability_profile_source": "none",
+    "risk_boundaries_source": "none",
+}
+
 
 class _LaunchKitDayOutput(BaseModel):
     """Single day output schema."""
@@ -72,6 +95,60 @@ class _LaunchKitOutput(BaseModel):
         return self
 
 
+class _LaunchKitPlanDay(BaseModel):
+    """Plan-phase day schema: theme only, bodies are generated per day."""
+
+    day_no: int
+    theme: str
+
+    @field_validator("day_no")
+    @classmethod
+    def validate_day_no(cls, value: int) -> int:
+        if value < 1 or value > 7:
+            raise ValueError("day_no must be between 1 and 7")
+        return value
+
+    @model_validator(mode="after")
+    def validate_text(self) -> "_LaunchKitPlanDay":
+        if not self.theme.strip():
+            raise ValueError("theme must be non-empty")
+        return self
+
+
+class _LaunchKitPlanOutput(BaseModel):
+    """Plan-phase output schema for parallel generation."""
+
+    sustainable_columns: list[str]
+    growth_experiment_suggestion: list[dict[str, Any]]
+    days: list[_LaunchKitPlanDay]
+
+    @model_validator(mode="after")
+    def validate_business_rules(self) -> "_LaunchKitPlanOutput":
+        if len(self.sustainable_columns) < 3:
+            raise ValueError("sustainable_columns must contain at least 3 items")
+        if len(self.growth_experiment_suggestion) < 1:
+            raise ValueError("growth_experiment_suggestion must contain at least 1 item")
+        day_numbers = sorted(day.day_no for day in self.days)
+        if day_numbers != [1, 2, 3, 4, 5, 6, 7]:
+            raise ValueError("days must contain unique day_no values 1..7")
+        return self
+
+
+class _LaunchKitDayBody(BaseModel):
+    """Day-phase output schema for parallel generation."""
+
+    draft_or_outline: str
+    opening_text: str
+
+    @model_validator(mode="after")
+    def validate_text(self) -> "_LaunchKitDayBody":
+        if not self.draft_or_outline.strip():
+            raise ValueError("draft_or_outline must be non-empty")
+        if not self.opening_text.strip():
+            raise ValueError("opening_text must be non-empty")
+        return self
+
+
 @dataclass
 class _ContextResolutionResult:
     context_bundle: dict[str, Any]
@@ -80,6 +157,14 @@ class _ContextResolutionResult:
     context_sources: dict[str, str]
 
 
+@dataclass
+class LaunchKitStreamEvent:
+    """流式生成事件：event 为 day/completed，data 为可直接 JSON 序列化的载荷。"""
+
+    event: str
+    data: dict[str, Any]
+
+
 LAUNCH_KIT_PROMPT = """
 你是一名内容增长助手，需要为创作者生成 7 天启动包（launch kit）。
 Return strict JSON only.
@@ -171,6 +256,76 @@ Schema：
 """.strip()
 
 
+LAUNCH_KIT_FRAGMENT_REPAIR_PROMPT = (
+    """
+You are repairing fragments of an invalid 7-day launch kit JSON.
+你正在修复 7 天 launch kit JSON 中校验失败的片段，其余部分已通过校验，无需重新生成。
+
+片段 schema：
+- days[i]：{"day_no": 1..7, "theme": "string", "draft_or_outline": "string", "opening_text": "string"}
+  draft_or_outline 必须为非空字符串，字数大于128；day_no 保持与原片段一致（原片段缺失时按路径序号推断）。
+- sustainable_columns：至少 3 个非空字符串。
+- growth_experiment_suggestion：至少 1 项，每项含 name、hypothesis、variables、duration、success_metric。
+- 必须保持与 original_user_payload 中 context_bundle 的语义对齐，不要使用 HTML 标签。
+""".strip()
+    + "\n\n"
+    + FRAGMENT_RESPONSE_CONTRACT
+)
+
+LAUNCH_KIT_PLAN_PROMPT = """
+你是一名内容增长助手，需要先为创作者规划 7 天启动包（launch kit）的整体框架。
+Return strict JSON only.
+只返回严格 JSON。不要输出 markdown、说明性文字、注释或代码块围栏。
+本步骤只规划栏目、增长实验与每天主题，不要生成正文。
+
+期望 JSON 结构：
+{
+  "sustainable_columns": ["string", "... 至少 3 项"],
+  "growth_experiment_suggestion": [
+    {
+      "name": "string",
+      "hypothesis": "string",
+      "variables": ["string", "..."],
+      "duration": "string",
+      "success_metric": "string"
+    }
+  ],
+  "days": [
+    {"day_no": 1, "theme": "string"}
+  ]
+}
+
+硬性约束：
+- days 必须且只能包含 7 条记录，day_no 唯一并完整覆盖 1..7。
+- 每个 day 条目只能包含：day_no、theme，theme 为非空字符串。
+- sustainable_columns 至少包含 3 个非空字符串。
+- growth_experiment_suggestion 至少包含 1 项。
+- 主题需与 context_bundle（身份模型、人格宪法、能力画像、风险边界）对齐，缺失的上下文不要虚构。
+- 若收到 previous_invalid_response 与 validation_error，请据此修正后重新输出完整 JSON。
+""".strip()
+
+LAUNCH_KIT_DAY_PROMPT = """
+你是一名内容增长助手，需要为 7 天启动包中的某一天撰写内容。
+Return strict JSON only.
+只返回严格 JSON。不要输出 markdown、说明性文字、注释或代码块围栏。
+
+你会收到：context_bundle、plan（栏目、增长实验与 7 天主题）、day_no、theme。
+只为 day_no 对应的这一天输出：
+{
+  "draft_or_outline": "string",// 该字段必须为非空字符串，字数大于128
+  "opening_text": "string"
+}
+
+硬性约束：
+- 只能包含 draft_or_outline、opening_text 两个 key，且均为非空字符串。
+- 内容必须紧扣给定 theme，并与 plan 中其他天的主题保持递进、避免重复。
+- 如果存在 context_bundle.persona_constitution，需遵循 common_words、forbidden_words、sentence_preferences、narrative_mainline。
+- 如果 context_bundle.risk_boundaries 非空，避免使用与其明显冲突的表达。
+- 不要使用 HTML 标签，例如 <br>。
+- 若收到 previous_invalid_response 与 validation_error，请据此修正后重新输出。
+""".strip()
+
+
 def _parse_launch_kit(payload: dict[str, Any]) -> _LaunchKitOutput:
     """Validate launch kit payload before persistence."""
     try:
@@ -194,12 +349,9 @@ def _truncate_text(value: Any, limit: int = MAX_TEXT_CHARS) -> str:
     return text[:limit]
 
 
-def _safe_loads_list(raw: str) -> list[Any]:
-    try:
-        payload = json.loads(raw)
-    except (TypeError, json.JSONDecodeError):
-        return []
-    return payload if isinstance(payload, list) else []
+def _as_list(value: Any) -> list[Any]:
+    # JSON 列已由驱动解码；非数组（NULL/对象/标量）一律按空列表处理。
+    return value if isinstance(value, list) else []
 
 
 def _to_short_text_list(
@@ -222,7 +374,7 @@ def _to_short_text_list(
                     text = value
                     break
             if not text:
-                text = json.dumps(item, ensure_ascii=False)
+                text = json_codec.dumps(item)
         if not text:
             continue
         text = _truncate_text(text, limit=max_chars)
@@ -238,32 +390,32 @@ def _identity_to_context(identity: IdentityModel) -> dict[str, Any]:
         "id": identity.id,
         "title": _truncate_text(identity.title),
         "target_audience_pain": _truncate_text(identity.target_audience_pain),
-        "content_pillars": _to_short_text_list(_safe_loads_list(identity.content_pillars_json)),
-        "tone_keywords": _to_short_text_list(_safe_loads_list(identity.tone_keywords_json)),
+        "content_pillars": _to_short_text_list(_as_list(identity.content_pillars_json)),
+        "tone_keywords": _to_short_text_list(_as_list(identity.tone_keywords_json)),
         "tone_examples": _to_short_text_list(
-            _safe_loads_list(identity.tone_examples_json),
+            _as_list(identity.tone_examples_json),
             max_items=MAX_TONE_EXAMPLES,
         ),
-        "long_term_views": _to_short_text_list(_safe_loads_list(identity.long_term_views_json)),
+        "long_term_views": _to_short_text_list(_as_list(identity.long_term_views_json)),
         "differentiation": _truncate_text(identity.differentiation),
         "growth_path_0_3m": _truncate_text(identity.growth_path_0_3m),
         "growth_path_3_12m": _truncate_text(identity.growth_path_3_12m),
         "monetization_validation_order": _to_short_text_list(
-            _safe_loads_list(identity.monetization_validation_order_json)
+            _as_list(identity.monetization_validation_order_json)
         ),
-        "risk_boundary": _to_short_text_list(_safe_loads_list(identity.risk_boundary_json)),
+        "risk_boundary": _to_short_text_list(_as_list(identity.risk_boundary_json)),
     }
 
 
 def _constitution_to_context(constitution: PersonaConstitution) -> dict[str, Any]:
     return {
         "id": constitution.id,
-        "common_words": _to_short_text_list(_safe_loads_list(constitution.common_words_json)),
-        "forbidden_words": _to_short_text_list(_safe_loads_list(constitution.forbidden_words_json)),
+        "common_words": _to_short_text_list(_as_list(constitution.common_words_json)),
+        "forbidden_words": _to_short_text_list(_as_list(constitution.forbidden_words_json)),
         "sentence_preferences": _to_short_text_list(
-            _safe_loads_list(constitution.sentence_preferences_json)
+            _as_list(constitution.sentence_preferences_json)
         ),
-        "moat_positions": _to_short_text_list(_safe_loads_list(constitution.moat_positions_json)),
+        "moat_positions": _to_short_text_list(_as_list(constitution.moat_positions_json)),
         "narrative_mainline": _truncate_text(constitution.narrative_mainline),
         "growth_arc_template": _truncate_text(constitution.growth_arc_template),
     }
@@ -273,12 +425,12 @@ def _profile_to_context(profile: CapabilityProfile) -> dict[str, Any]:
     return {
         "id": profile.id,
         "session_id": profile.session_id,
-        "skill_stack": _to_short_text_list(_safe_loads_list(profile.skill_stack_json)),
+        "skill_stack": _to_short_text_list(_as_list(profile.skill_stack_json)),
         "interest_energy_curve": _to_short_text_list(
-            _safe_loads_list(profile.interest_energy_curve_json)
+            _as_list(profile.interest_energy_curve_json)
         ),
         "cognitive_style": _truncate_text(profile.cognitive_style),
-        "value_boundaries": _to_short_text_list(_safe_loads_list(profile.value_boundaries_json)),
+        "value_boundaries": _to_short_text_list(_as_list(profile.value_boundaries_json)),
         "risk_tolerance": profile.risk_tolerance,
         "time_investment_hours": profile.time_investment_hours,
     }
@@ -477,6 +629,308 @@ def _resolve_risk_boundaries(
     return [], "none"
 
 
+def _build_context_resolution(
+    *,
+    requested_identity_model_id: str | None,
+    requested_constitution_id: str | None,
+    identity: tuple[IdentityModel | None, str],
+    constitution: tuple[PersonaConstitution | None, str],
+    profile: tuple[CapabilityProfile | None, str],
+    boundaries: tuple[list[RiskBoundaryItem], str],
+) -> _ContextResolutionResult:
+    identity_row, identity_source = identity
+    constitution_row, constitution_source = constitution
+    profile_row, profile_source = profile
+    boundary_rows, boundaries_source = boundaries
+
+    context_sources = {
+        "identity_model_source": identity_source,
+        "persona_constitution_source": constitution_source,
+        "capability_profile_source": profile_source,
+        "risk_boundaries_source": boundaries_source,
+    }
+    context_bundle = {
+        "identity_model": _identity_to_context(identity_row) if identity_row else None,
+        "persona_constitution": _constitution_to_context(constitution_row) if constitution_row else None,
+        "capability_profile": _profile_to_context(profile_row) if profile_row else None,
+        "risk_boundaries": [
+            _risk_boundary_to_context(item) for item in boundary_rows[:MAX_RISK_BOUNDARIES]
+        ],
+        "resolution_meta": {
+            **context_sources,
+            "requested_identity_model_id": requested_identity_model_id,
+            "requested_constitution_id": requested_constitution_id,
+            "resolved_identity_model_id": identity_row.id if identity_row else None,
+            "resolved_constitution_id": constitution_row.id if constitution_row else None,
+        },
+    }
+
+    return _ContextResolutionResult(
+        context_bundle=context_bundle,
+        resolved_identity_model_id=identity_row.id if identity_row else None,
+        resolved_constitution_id=constitution_row.id if constitution_row else None,
+        context_sources=context_sources,
+    )
+
+
+def _resolve_context_bundle_sequential(
+    *,
+    db: Session,
+    user_id: str,
+    requested_identity_model_id: str | None,
+    requested_constitution_id: str | None,
+) -> _ContextResolutionResult:
+    """逐级回退的原始实现（最多约 10 次串行查询），保留作为批量解析的语义基准。"""
+    identity = _resolve_identity_model(
+        db=db,
+        user_id=user_id,
+        requested_identity_model_id=requested_identity_model_id,
+    )
+    constitution = _resolve_constitution(
+        db=db,
+        user_id=user_id,
+        requested_constitution_id=requested_constitution_id,
+        resolved_identity=identity[0],
+    )
+    profile = _resolve_capability_profile(
+        db=db,
+        user_id=user_id,
+        resolved_identity=identity[0],
+    )
+    boundaries = _resolve_risk_boundaries(
+        db=db,
+        user_id=user_id,
+        resolved_identity=identity[0],
+        resolved_constitution=constitution[0],
+    )
+    return _build_context_resolution(
+        requested_identity_model_id=requested_identity_model_id,
+        requested_constitution_id=requested_constitution_id,
+        identity=identity,
+        constitution=constitution,
+        profile=profile,
+        boundaries=boundaries,
+    )
+
+
+def _pick_identity_model(
+    *,
+    db: Session,
+    user_id: str,
+    requested_identity_model_id: str | None,
+) -> tuple[IdentityModel | None, str]:
+    """一次查询取回 请求/当前选择/最新 三个候选身份，再按原优先级挑选。"""
+    selected_id = (
+        select(IdentitySelection.primary_identity_id)
+        .where(IdentitySelection.user_id == user_id)
+        .order_by(IdentitySelection.selected_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    latest_id = (
+        select(IdentityModel.id)
+        .where(IdentityModel.user_id == user_id)
+        .order_by(IdentityModel.created_at.desc(), IdentityModel.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    candidates = [IdentityModel.id == selected_id, IdentityModel.id == latest_id]
+    if requested_identity_model_id:
+        candidates.append(IdentityModel.id == requested_identity_model_id)
+    rows = db.execute(
+        select(IdentityModel, selected_id.label("selected_identity_id"), latest_id.label("latest_identity_id"))
+        .where(IdentityModel.user_id == user_id, or_(*candidates))
+    ).all()
+    by_id = {row[0].id: row[0] for row in rows}
+    # 用户没有任何身份模型时不返回行，此时选择记录是否孤立已无关紧要。
+    selection_identity_id = rows[0].selected_identity_id if rows else None
+    latest_identity_id = rows[0].latest_identity_id if rows else None
+
+    if requested_identity_model_id:
+        if requested_identity_model_id in by_id:
+            return by_id[requested_identity_model_id], "request"
+        logger.warning(
+            "launch_kit_context_identity_not_found user_id=%s requested_identity_model_id=%s",
+            user_id,
+            requested_identity_model_id,
+        )
+    if selection_identity_id:
+        if selection_identity_id in by_id:
+            return by_id[selection_identity_id], "selection"
+        logger.warning(
+            "launch_kit_context_selection_orphaned user_id=%s primary_identity_id=%s",
+            user_id,
+            selection_identity_id,
+        )
+    if latest_identity_id:
+        return by_id[latest_identity_id], "latest"
+    return None, "none"
+
+
+def _pick_constitution(
+    *,
+    db: Session,
+    user_id: str,
+    requested_constitution_id: str | None,
+    resolved_identity: IdentityModel | None,
+) -> tuple[PersonaConstitution | None, str]:
+    """一次查询取回 请求/该身份最新版本/全局最新版本 三个候选宪法。"""
+    version_order = (PersonaConstitution.version.desc(), PersonaConstitution.created_at.desc())
+    ranked = select(
+        PersonaConstitution,
+        func.row_number().over(
+            partition_by=PersonaConstitution.identity_model_id,
+            order_by=version_order,
+        ).label("identity_rank"),
+        func.row_number().over(order_by=version_order).label("latest_rank"),
+    ).where(PersonaConstitution.user_id == user_id).subquery()
+    constitution = aliased(PersonaConstitution, ranked)
+
+    candidates = [ranked.c.latest_rank == 1]
+    if resolved_identity:
+        candidates.append(
+            and_(ranked.c.identity_model_id == resolved_identity.id, ranked.c.identity_rank == 1)
+        )
+    if requested_constitution_id:
+        candidates.append(ranked.c.id == requested_constitution_id)
+    rows = db.execute(
+        select(constitution, ranked.c.identity_rank, ranked.c.latest_rank).where(or_(*candidates))
+    ).all()
+
+    if requested_constitution_id:
+        requested = next((row[0] for row in rows if row[0].id == requested_constitution_id), None)
+        if requested:
+            return requested, "request"
+        logger.warning(
+            "launch_kit_context_constitution_not_found user_id=%s requested_constitution_id=%s",
+            user_id,
+            requested_constitution_id,
+        )
+    if resolved_identity:
+        by_identity = next(
+            (
+                row[0]
+                for row in rows
+                if row[0].identity_model_id == resolved_identity.id and row.identity_rank == 1
+            ),
+            None,
+        )
+        if by_identity:
+            return by_identity, "identity"
+    latest = next((row[0] for row in rows if row.latest_rank == 1), None)
+    if latest:
+        return latest, "latest"
+    return None, "none"
+
+
+def _pick_capability_profile(
+    *,
+    db: Session,
+    user_id: str,
+    resolved_identity: IdentityModel | None,
+) -> tuple[CapabilityProfile | None, str]:
+    """一次查询取回 身份所属会话/最新 两个候选能力画像。"""
+    session_id = resolved_identity.session_id if resolved_identity else None
+    latest_id = (
+        select(CapabilityProfile.id)
+        .where(CapabilityProfile.user_id == user_id)
+        .order_by(CapabilityProfile.created_at.desc(), CapabilityProfile.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    candidates = [CapabilityProfile.id == latest_id]
+    if session_id:
+        candidates.append(CapabilityProfile.session_id == session_id)
+    rows = db.execute(
+        select(CapabilityProfile, latest_id.label("latest_profile_id"))
+        .where(CapabilityProfile.user_id == user_id, or_(*candidates))
+        .order_by(CapabilityProfile.created_at.desc(), CapabilityProfile.id.desc())
+    ).all()
+
+    if session_id:
+        by_session = next((row[0] for row in rows if row[0].session_id == session_id), None)
+        if by_session:
+            return by_session, "session"
+        logger.warning(
+            "launch_kit_context_profile_not_found user_id=%s session_id=%s",
+            user_id,
+            session_id,
+        )
+    latest = next((row[0] for row in rows if row[0].id == row.latest_profile_id), None)
+    if latest:
+        return latest, "latest"
+    return None, "none"
+
+
+def _pick_risk_boundaries(
+    *,
+    db: Session,
+    user_id: str,
+    resolved_identity: IdentityModel | None,
+    resolved_constitution: PersonaConstitution | None,
+) -> tuple[list[RiskBoundaryItem], str]:
+    """一次查询按 宪法/身份/全部 三个范围各取最近 MAX_RISK_BOUNDARIES 条。"""
+    recent_order = (RiskBoundaryItem.created_at.desc(), RiskBoundaryItem.id.desc())
+    ranked = select(
+        RiskBoundaryItem,
+        func.row_number().over(
+            partition_by=RiskBoundaryItem.constitution_id,
+            order_by=recent_order,
+        ).label("constitution_rank"),
+        func.row_number().over(
+            partition_by=RiskBoundaryItem.identity_model_id,
+            order_by=recent_order,
+        ).label("identity_rank"),
+        func.row_number().over(order_by=recent_order).label("latest_rank"),
+    ).where(RiskBoundaryItem.user_id == user_id).subquery()
+    boundary = aliased(RiskBoundaryItem, ranked)
+
+    constitution_id = resolved_constitution.id if resolved_constitution else None
+    identity_model_id = resolved_identity.id if resolved_identity else None
+
+    candidates = [ranked.c.latest_rank <= MAX_RISK_BOUNDARIES]
+    if constitution_id:
+        candidates.append(
+            and_(
+                ranked.c.constitution_id == constitution_id,
+                ranked.c.constitution_rank <= MAX_RISK_BOUNDARIES,
+            )
+        )
+    if identity_model_id:
+        candidates.append(
+            and_(
+                ranked.c.identity_model_id == identity_model_id,
+                ranked.c.identity_rank <= MAX_RISK_BOUNDARIES,
+            )
+        )
+    rows = db.execute(
+        select(boundary, ranked.c.constitution_rank, ranked.c.identity_rank, ranked.c.latest_rank)
+        .where(or_(*candidates))
+        .order_by(ranked.c.latest_rank)
+    ).all()
+
+    if constitution_id:
+        by_constitution = [
+            row[0]
+            for row in rows
+            if row[0].constitution_id == constitution_id and row.constitution_rank <= MAX_RISK_BOUNDARIES
+        ]
+        if by_constitution:
+            return by_constitution, "constitution"
+    if identity_model_id:
+        by_identity = [
+            row[0]
+            for row in rows
+            if row[0].identity_model_id == identity_model_id and row.identity_rank <= MAX_RISK_BOUNDARIES
+        ]
+        if by_identity:
+            return by_identity, "identity"
+    latest = [row[0] for row in rows if row.latest_rank <= MAX_RISK_BOUNDARIES]
+    if latest:
+        return latest, "latest"
+    return [], "none"
+
+
 def _resolve_context_bundle(
     *,
     db: Session,
@@ -484,63 +938,86 @@ def _resolve_context_bundle(
     requested_identity_model_id: str | None,
     requested_constitution_id: str | None,
 ) -> _ContextResolutionResult:
-    identity, identity_source = _resolve_identity_model(
+    """
+    批量解析上下文：每类实体一次查询取回全部候选行，回退优先级在内存中判定。
+
+    查询数固定为 4（身份、宪法、能力画像、风险边界），
+    语义与 _resolve_context_bundle_sequential 的逐级回退一致。
+    """
+    identity = _pick_identity_model(
         db=db,
         user_id=user_id,
         requested_identity_model_id=requested_identity_model_id,
     )
-    constitution, constitution_source = _resolve_constitution(
+    constitution = _pick_constitution(
         db=db,
         user_id=user_id,
         requested_constitution_id=requested_constitution_id,
-        resolved_identity=identity,
+        resolved_identity=identity[0],
     )
-    profile, profile_source = _resolve_capability_profile(
+    profile = _pick_capability_profile(
         db=db,
         user_id=user_id,
-        resolved_identity=identity,
+        resolved_identity=identity[0],
     )
-    boundaries, boundaries_source = _resolve_risk_boundaries(
+    boundaries = _pick_risk_boundaries(
         db=db,
         user_id=user_id,
-        resolved_identity=identity,
-        resolved_constitution=constitution,
+        resolved_identity=identity[0],
+        resolved_constitution=constitution[0],
+    )
+    return _build_context_resolution(
+        requested_identity_model_id=requested_identity_model_id,
+        requested_constitution_id=requested_constitution_id,
+        identity=identity,
+        constitution=constitution,
+        profile=profile,
+        boundaries=boundaries,
     )
 
-    context_sources = {
-        "identity_model_source": identity_source,
-        "persona_constitution_source": constitution_source,
-        "capability_profile_source": profile_source,
-        "risk_boundaries_source": boundaries_source,
-    }
-    context_bundle = {
-        "identity_model": _identity_to_context(identity) if identity else None,
-        "persona_constitution": _constitution_to_context(constitution) if constitution else None,
-        "capability_profile": _profile_to_context(profile) if profile else None,
-        "risk_boundaries": [_risk_boundary_to_context(item) for item in boundaries[:MAX_RISK_BOUNDARIES]],
-        "resolution_meta": {
-            **context_sources,
-            "requested_identity_model_id": requested_identity_model_id,
-            "requested_constitution_id": requested_constitution_id,
-            "resolved_identity_model_id": identity.id if identity else None,
-            "resolved_constitution_id": constitution.id if constitution else None,
-        },
-    }
 
-    return _ContextResolutionResult(
-        context_bundle=context_bundle,
-        resolved_identity_model_id=identity.id if identity else None,
-        resolved_constitution_id=constitution.id if constitution else None,
-        context_sources=context_sources,
+def _load_context_bundle(
+    *,
+    db: Session,
+    user_id: str,
+    requested_identity_model_id: str | None,
+    requested_constitution_id: str | None,
+) -> _ContextResolutionResult:
+    """先读按用户失效的上下文缓存，未命中再查库解析并回填。"""
+    cache = get_context_cache()
+    if cache is None:
+        return _resolve_context_bundle(
+            db=db,
+            user_id=user_id,
+            requested_identity_model_id=requested_identity_model_id,
+            requested_constitution_id=requested_constitution_id,
+        )
+
+    key = ("launch_kit", requested_identity_model_id, requested_constitution_id)
+    cached = cache.get(user_id, key)
+    if cached is not None:
+        return cached
+    # 先取版本再查库：查库期间发生写入时，回填会因版本落后被丢弃。
+    version = cache.version(user_id)
+    resolution = _resolve_context_bundle(
+        db=db,
+        user_id=user_id,
+        requested_identity_model_id=requested_identity_model_id,
+        requested_constitution_id=requested_constitution_id,
     )
+    cache.set(user_id, key, resolution, version=version)
+    return resolution
 
 
+# 首次生成与 schema 修复共享同一个总时间预算（LLM_DEADLINE_SECONDS）。
+@llm_deadline()
 def _generate_launch_kit_output(*, llm_payload: dict[str, Any]) -> tuple[_LaunchKitOutput, int]:
     llm_client = get_llm_client()
     response_payload = llm_client.generate_json(
         operation="generate_launch_kit",
         system_prompt=LAUNCH_KIT_PROMPT,
         user_payload=llm_payload,
+        validate=_parse_launch_kit,
     )
 
     try:
@@ -548,43 +1025,470 @@ def _generate_launch_kit_output(*, llm_payload: dict[str, Any]) -> tuple[_Launch
     except LLMServiceError as exc:
         if exc.code != "LLM_SCHEMA_VALIDATION_FAILED":
             raise
-        last_error = exc
-
-    last_payload = response_payload
-    for attempt in range(1, SCHEMA_REPAIR_MAX_RETRIES + 1):
-        logger.warning(
-            "schema_retry operation=generate_launch_kit schema_retry_attempt=%s validation_error_brief=%s degraded=%s",
-            attempt,
-            _validation_error_brief(last_error.message),
-            False,
+        return _repair_launch_kit_output(
+            llm_payload=llm_payload,
+            invalid_payload=response_payload,
+            validation_error=exc,
         )
-        repair_payload = {
-            "original_user_payload": llm_payload,
-            "previous_invalid_response": last_payload,
-            "validation_error": last_error.message,
-        }
-        repaired_payload = llm_client.generate_json(
+
+
+async def _generate_launch_kit_output_async(*, llm_payload: dict[str, Any]) -> tuple[_LaunchKitOutput, int]:
+    # 装饰器只适用于同步函数；协程内用 with 设置同一个总预算。
+    with llm_deadline():
+        response_payload = await get_async_llm_client().generate_json(
             operation="generate_launch_kit",
-            system_prompt=LAUNCH_KIT_REPAIR_PROMPT,
-            user_payload=repair_payload,
+            system_prompt=LAUNCH_KIT_PROMPT,
+            user_payload=llm_payload,
+            validate=_parse_launch_kit,
         )
+
         try:
-            return _parse_launch_kit(repaired_payload), attempt
+            return _parse_launch_kit(response_payload), 0
         except LLMServiceError as exc:
             if exc.code != "LLM_SCHEMA_VALIDATION_FAILED":
                 raise
-            last_error = exc
-            last_payload = repaired_payload
+            return await _repair_launch_kit_output_async(
+                llm_payload=llm_payload,
+                invalid_payload=response_payload,
+                validation_error=exc,
+            )
 
-    raise llm_schema_error(
+
+def _repair_exhausted_error(exc: LLMServiceError) -> LLMServiceError:
+    return llm_schema_error(
         "generate_launch_kit",
         (
             "Launch kit schema validation failed after 2 schema repair retries. "
-            f"Last error: {_validation_error_brief(last_error.message)}"
+            f"Last error: {_validation_error_brief(exc.message)}"
         ),
     )
 
 
+# 流式兜底单独修复时同样受总预算约束；嵌套调用沿用外层更早的截止时间。
+@llm_deadline()
+def _repair_launch_kit_output(
+    *,
+    llm_payload: dict[str, Any],
+    invalid_payload: dict[str, Any],
+    validation_error: LLMServiceError,
+) -> tuple[_LaunchKitOutput, int]:
+    try:
+        return repair_llm_output(
+            llm_client=get_llm_client(),
+            operation="generate_launch_kit",
+            original_user_payload=llm_payload,
+            invalid_payload=invalid_payload,
+            validation_error=validation_error,
+            parse=_parse_launch_kit,
+            full_repair_prompt=LAUNCH_KIT_REPAIR_PROMPT,
+            targeted_repair_prompt=LAUNCH_KIT_FRAGMENT_REPAIR_PROMPT,
+            max_retries=SCHEMA_REPAIR_MAX_RETRIES,
+        )
+    except LLMServiceError as exc:
+        if exc.code != "LLM_SCHEMA_VALIDATION_FAILED":
+            raise
+        raise _repair_exhausted_error(exc) from exc
+
+
+async def _repair_launch_kit_output_async(
+    *,
+    llm_payload: dict[str, Any],
+    invalid_payload: dict[str, Any],
+    validation_error: LLMServiceError,
+) -> tuple[_LaunchKitOutput, int]:
+    with llm_deadline():
+        try:
+            return await repair_llm_output_async(
+                llm_client=get_async_llm_client(),
+                operation="generate_launch_kit",
+                original_user_payload=llm_payload,
+                invalid_payload=invalid_payload,
+                validation_error=validation_error,
+                parse=_parse_launch_kit,
+                full_repair_prompt=LAUNCH_KIT_REPAIR_PROMPT,
+                targeted_repair_prompt=LAUNCH_KIT_FRAGMENT_REPAIR_PROMPT,
+                max_retries=SCHEMA_REPAIR_MAX_RETRIES,
+            )
+        except LLMServiceError as exc:
+            if exc.code != "LLM_SCHEMA_VALIDATION_FAILED":
+                raise
+            raise _repair_exhausted_error(exc) from exc
+
+
+def _check_validated_part(
+    *,
+    operation: str,
+    user_payload: dict[str, Any],
+    response_payload: dict[str, Any],
+    schema: type[BaseModel],
+    label: str,
+    attempt: int,
+) -> tuple[Any, dict[str, Any] | None]:
+    """
+    校验一次分片响应：通过时返回 (结果, None)；
+    不合规时返回 (None, 带上错误信息的重试请求)，重试耗尽时抛出 schema 错误。
+    """
+    try:
+        return schema.model_validate(response_payload), None
+    except ValidationError as exc:
+        error_message = f"{label} schema validation failed: {exc}"
+        if attempt == SCHEMA_REPAIR_MAX_RETRIES:
+            raise llm_schema_error(
+                operation,
+                (
+                    f"{label} schema validation failed after {SCHEMA_REPAIR_MAX_RETRIES} schema repair retries. "
+                    f"Last error: {_validation_error_brief(error_message)}"
+                ),
+            ) from exc
+        logger.warning(
+            "schema_retry operation=%s schema_retry_attempt=%s validation_error_brief=%s degraded=%s",
+            operation,
+            attempt + 1,
+            _validation_error_brief(error_message),
+            False,
+        )
+        return None, {
+            **user_payload,
+            "previous_invalid_response": response_payload,
+            "validation_error": error_message,
+        }
+
+
+# 单个分片的首次生成与 schema 重试共享同一个总时间预算。
+@llm_deadline()
+def _generate_validated_part(
+    *,
+    operation: str,
+    system_prompt: str,
+    user_payload: dict[str, Any],
+    schema: type[BaseModel],
+    label: str,
+) -> tuple[Any, int]:
+    """调用一次 LLM 并按 schema 校验；不合规时带上错误信息单独重试该部分。"""
+    llm_client = get_llm_client()
+    request_payload = user_payload
+    for attempt in range(SCHEMA_REPAIR_MAX_RETRIES + 1):
+        response_payload = llm_client.generate_json(
+            operation=operation,
+            system_prompt=system_prompt,
+            user_payload=request_payload,
+            # 只有首次生成参与缓存；带上次错误的重试属于修复请求，不缓存。
+            validate=schema.model_validate if attempt == 0 else None,
+        )
+        result, retry_payload = _check_validated_part(
+            operation=operation,
+            user_payload=user_payload,
+            response_payload=response_payload,
+            schema=schema,
+            label=label,
+            attempt=attempt,
+        )
+        if retry_payload is None:
+            return result, attempt
+        request_payload = retry_payload
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+async def _generate_validated_part_async(
+    *,
+    operation: str,
+    system_prompt: str,
+    user_payload: dict[str, Any],
+    schema: type[BaseModel],
+    label: str,
+) -> tuple[Any, int]:
+    """Async variant of _generate_validated_part."""
+    llm_client = get_async_llm_client()
+    request_payload = user_payload
+    with llm_deadline():
+        for attempt in range(SCHEMA_REPAIR_MAX_RETRIES + 1):
+            response_payload = await llm_client.generate_json(
+                operation=operation,
+                system_prompt=system_prompt,
+                user_payload=request_payload,
+                validate=schema.model_validate if attempt == 0 else None,
+            )
+            result, retry_payload = _check_validated_part(
+                operation=operation,
+                user_payload=user_payload,
+                response_payload=response_payload,
+                schema=schema,
+                label=label,
+                attempt=attempt,
+            )
+            if retry_payload is None:
+                return result, attempt
+            request_payload = retry_payload
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+def _plan_summary(plan: _LaunchKitPlanOutput) -> dict[str, Any]:
+    return {
+        "sustainable_columns": plan.sustainable_columns,
+        "growth_experiment_suggestion": plan.growth_experiment_suggestion,
+        "days": [day.model_dump() for day in sorted(plan.days, key=lambda day: day.day_no)],
+    }
+
+
+def _day_request(
+    *,
+    llm_payload: dict[str, Any],
+    plan_summary: dict[str, Any],
+    plan_day: _LaunchKitPlanDay,
+) -> dict[str, Any]:
+    return {
+        "user_id": llm_payload["user_id"],
+        "context_bundle": llm_payload["context_bundle"],
+        "plan": plan_summary,
+        "day_no": plan_day.day_no,
+        "theme": plan_day.theme,
+    }
+
+
+def _day_output(plan_day: _LaunchKitPlanDay, body: _LaunchKitDayBody) -> _LaunchKitDayOutput:
+    return _LaunchKitDayOutput(
+        day_no=plan_day.day_no,
+        theme=plan_day.theme,
+        draft_or_outline=body.draft_or_outline,
+        opening_text=body.opening_text,
+    )
+
+
+def _assemble_parallel_output(
+    plan: _LaunchKitPlanOutput,
+    plan_attempts: int,
+    day_results: list[tuple[_LaunchKitDayOutput, int]],
+) -> tuple[_LaunchKitOutput, int]:
+    output = _parse_launch_kit(
+        {
+            "sustainable_columns": plan.sustainable_columns,
+            "growth_experiment_suggestion": plan.growth_experiment_suggestion,
+            "days": [day.model_dump() for day, _attempts in day_results],
+        }
+    )
+    return output, plan_attempts + sum(attempts for _day, attempts in day_results)
+
+
+def _generate_launch_kit_output_parallel(
+    *,
+    llm_payload: dict[str, Any],
+) -> tuple[_LaunchKitOutput, int]:
+    """
+    两阶段生成：先用一次短调用规划栏目、实验与 7 天主题，
+    再基于同一 context_bundle 并发生成 7 天正文；单日不合规只重试该日。
+    """
+    plan, plan_attempts = _generate_validated_part(
+        operation="generate_launch_kit_plan",
+        system_prompt=LAUNCH_KIT_PLAN_PROMPT,
+        user_payload=llm_payload,
+        schema=_LaunchKitPlanOutput,
+        label="Launch kit plan",
+    )
+    plan_summary = _plan_summary(plan)
+
+    def _generate_day(plan_day: _LaunchKitPlanDay) -> tuple[_LaunchKitDayOutput, int]:
+        body, attempts = _generate_validated_part(
+            operation="generate_launch_kit_day",
+            system_prompt=LAUNCH_KIT_DAY_PROMPT,
+            user_payload=_day_request(llm_payload=llm_payload, plan_summary=plan_summary, plan_day=plan_day),
+            schema=_LaunchKitDayBody,
+            label=f"Launch kit day {plan_day.day_no}",
+        )
+        return _day_output(plan_day, body), attempts
+
+    with ThreadPoolExecutor(max_workers=len(plan.days)) as executor:
+        day_results = list(executor.map(_generate_day, plan.days))
+    return _assemble_parallel_output(plan, plan_attempts, day_results)
+
+
+async def _generate_launch_kit_output_parallel_async(
+    *,
+    llm_payload: dict[str, Any],
+) -> tuple[_LaunchKitOutput, int]:
+    """Async variant of _generate_launch_kit_output_parallel：7 天正文用 asyncio.gather 并发。"""
+    plan, plan_attempts = await _generate_validated_part_async(
+        operation="generate_launch_kit_plan",
+        system_prompt=LAUNCH_KIT_PLAN_PROMPT,
+        user_payload=llm_payload,
+        schema=_LaunchKitPlanOutput,
+        label="Launch kit plan",
+    )
+    plan_summary = _plan_summary(plan)
+
+    async def _generate_day(plan_day: _LaunchKitPlanDay) -> tuple[_LaunchKitDayOutput, int]:
+        body, attempts = await _generate_validated_part_async(
+            operation="generate_launch_kit_day",
+            system_prompt=LAUNCH_KIT_DAY_PROMPT,
+            user_payload=_day_request(llm_payload=llm_payload, plan_summary=plan_summary, plan_day=plan_day),
+            schema=_LaunchKitDayBody,
+            label=f"Launch kit day {plan_day.day_no}",
+        )
+        return _day_output(plan_day, body), attempts
+
+    day_results = list(await asyncio.gather(*(_generate_day(plan_day) for plan_day in plan.days)))
+    return _assemble_parallel_output(plan, plan_attempts, day_results)
+
+
+def _resolve_generation_mode(generation_mode: str | None) -> str:
+    return generation_mode or get_settings().launch_kit_generation_mode
+
+
+def _build_launch_kit_llm_payload(
+    *,
+    user_id: str,
+    context_resolution: _ContextResolutionResult,
+    sustainable_columns: list[str] | None,
+    growth_experiment_suggestion: list[dict] | None,
+) -> dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "identity_model_id": context_resolution.resolved_identity_model_id,
+        "constitution_id": context_resolution.resolved_constitution_id,
+        "hint_sustainable_columns": sustainable_columns or [],
+        "hint_growth_experiment_suggestion": growth_experiment_suggestion or [],
+        "context_bundle": context_resolution.context_bundle,
+    }
+
+
+def _persist_launch_kit(
+    *,
+    db: Session,
+    user_id: str,
+    context_resolution: _ContextResolutionResult,
+    output: _LaunchKitOutput,
+) -> LaunchKit:
+    kit = LaunchKit(
+        user_id=user_id,
+        identity_model_id=context_resolution.resolved_identity_model_id,
+        constitution_id=context_resolution.resolved_constitution_id,
+        sustainable_columns_json=output.sustainable_columns,
+        growth_experiment_suggestion_json=output.growth_experiment_suggestion,
+    )
+    db.add(kit)
+    db.flush()
+
+    for day_output in sorted(output.days, key=lambda day: day.day_no):
+        day = LaunchKitDay(
+            kit_id=kit.id,
+            day_no=day_output.day_no,
+            theme=day_output.theme,
+            draft_or_outline=day_output.draft_or_outline,
+            opening_text=day_output.opening_text,
+        )
+        db.add(day)
+
+    db.commit()
+    db.refresh(kit)
+    return kit
+
+
+def _log_generation_metrics(
+    *,
+    user_id: str,
+    context_resolve_ms: int,
+    llm_generate_ms: int,
+    schema_repair_attempts: int,
+    total_start: float,
+    context_sources: dict[str, str],
+    first_day_ms: int | None = None,
+    generation_mode: str = "single",
+) -> None:
+    total_ms = int((time.perf_counter() - total_start) * 1000)
+    logger.info(
+        "launch_kit_generation_metrics user_id=%s generation_mode=%s context_resolve_ms=%s llm_generate_ms=%s schema_repair_attempts=%s total_ms=%s first_day_ms=%s context_sources=%s",
+        user_id,
+        generation_mode,
+        context_resolve_ms,
+        llm_generate_ms,
+        schema_repair_attempts,
+        total_ms,
+        first_day_ms,
+        json_codec.dumps(context_sources, sort_keys=True),
+    )
+
+
+class _StreamingDaysParser:
+    """
+    增量扫描 LLM 输出文本，在 days 数组中每闭合一个对象即返回其 JSON 片段。
+
+    只跟踪括号深度与字符串边界，不做完整 JSON 解析；最终结果仍以整体校验为准。
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._index = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_top_level_string: str | None = None
+        self._days_depth: int | None = None
+        self._object_start: int | None = None
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        self._text += chunk
+        completed: list[dict[str, Any]] = []
+        text = self._text
+        while self._index < len(text):
+            char = text[self._index]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        try:
+                            self._last_top_level_string = json_codec.loads(
+                                text[self._string_start : self._index + 1]
+                            )
+                        except json_codec.JSONDecodeError:
+                            self._last_top_level_string = None
+            elif char == '"':
+                self._in_string = True
+                self._string_start = self._index
+            elif char in "{[":
+                if (
+                    char == "["
+                    and self._depth == 1
+                    and self._days_depth is None
+                    and self._last_top_level_string == "days"
+                ):
+                    self._days_depth = self._depth + 1
+                elif char == "{" and self._days_depth is not None and self._depth == self._days_depth:
+                    self._object_start = self._index
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if (
+                    char == "}"
+                    and self._object_start is not None
+                    and self._days_depth is not None
+                    and self._depth == self._days_depth
+                ):
+                    fragment = text[self._object_start : self._index + 1]
+                    self._object_start = None
+                    try:
+                        item = json_codec.loads(fragment)
+                    except json_codec.JSONDecodeError:
+                        item = None
+                    if isinstance(item, dict):
+                        completed.append(item)
+                elif char == "]" and self._days_depth is not None and self._depth == self._days_depth - 1:
+                    self._days_depth = None
+            self._index += 1
+        return completed
+
+
+def _day_summary(day: _LaunchKitDayOutput) -> dict[str, Any]:
+    return day.model_dump()
+
+
 def generate_launch_kit(
     db: Session,
     user_id: str,
@@ -592,22 +1496,24 @@ def generate_launch_kit(
     constitution_id: str | None = None,
     sustainable_columns: list[str] | None = None,
     growth_experiment_suggestion: list[dict] | None = None,
+    generation_mode: str | None = None,
 ) -> LaunchKit:
-    """Generate a 7-day launch kit via LLM."""
+    """
+    Generate a 7-day launch kit via LLM.
+
+    generation_mode 为 single 时一次调用生成全部 7 天；为 parallel 时先规划再并发生成每天正文。
+    未传入时使用配置 LAUNCH_KIT_GENERATION_MODE。
+    """
     total_start = time.perf_counter()
+    resolved_mode = _resolve_generation_mode(generation_mode)
     context_resolve_ms = 0
     llm_generate_ms = 0
     schema_repair_attempts = 0
-    context_sources = {
-        "identity_model_source": "none",
-        "persona_constitution_source": "none",
-        "capability_profile_source": "none",
-        "risk_boundaries_source": "none",
-    }
+    context_sources = dict(_EMPTY_CONTEXT_SOURCES)
 
     try:
         context_start = time.perf_counter()
-        context_resolution = _resolve_context_bundle(
+        context_resolution = _load_context_bundle(
             db=db,
             user_id=user_id,
             requested_identity_model_id=identity_model_id,
@@ -616,73 +1522,310 @@ def generate_launch_kit(
         context_resolve_ms = int((time.perf_counter() - context_start) * 1000)
         context_sources = context_resolution.context_sources
 
-        llm_payload = {
-            "user_id": user_id,
-            "identity_model_id": context_resolution.resolved_identity_model_id,
-            "constitution_id": context_resolution.resolved_constitution_id,
-            "hint_sustainable_columns": sustainable_columns or [],
-            "hint_growth_experiment_suggestion": growth_experiment_suggestion or [],
-            "context_bundle": context_resolution.context_bundle,
-        }
+        llm_payload = _build_launch_kit_llm_payload(
+            user_id=user_id,
+            context_resolution=context_resolution,
+            sustainable_columns=sustainable_columns,
+            growth_experiment_suggestion=growth_experiment_suggestion,
+        )
 
         llm_start = time.perf_counter()
-        output, schema_repair_attempts = _generate_launch_kit_output(llm_payload=llm_payload)
+        if resolved_mode == "parallel":
+            output, schema_repair_attempts = _generate_launch_kit_output_parallel(llm_payload=llm_payload)
+        else:
+            output, schema_repair_attempts = _generate_launch_kit_output(llm_payload=llm_payload)
         llm_generate_ms = int((time.perf_counter() - llm_start) * 1000)
 
-        kit = LaunchKit(
+        return _persist_launch_kit(
+            db=db,
             user_id=user_id,
-            identity_model_id=context_resolution.resolved_identity_model_id,
-            constitution_id=context_resolution.resolved_constitution_id,
-            sustainable_columns_json=json.dumps(output.sustainable_columns, ensure_ascii=False),
-            growth_experiment_suggestion_json=json.dumps(
-                output.growth_experiment_suggestion,
-                ensure_ascii=False,
-            ),
+            context_resolution=context_resolution,
+            output=output,
         )
-        db.add(kit)
-        db.flush()
+    finally:
+        _log_generation_metrics(
+            user_id=user_id,
+            context_resolve_ms=context_resolve_ms,
+            llm_generate_ms=llm_generate_ms,
+            schema_repair_attempts=schema_repair_attempts,
+            total_start=total_start,
+            context_sources=context_sources,
+            generation_mode=resolved_mode,
+        )
+
 
-        for day_output in sorted(output.days, key=lambda day: day.day_no):
-            day = LaunchKitDay(
-                kit_id=kit.id,
-                day_no=day_output.day_no,
-                theme=day_output.theme,
-                draft_or_outline=day_output.draft_or_outline,
-                opening_text=day_output.opening_text,
+async def generate_launch_kit_async(
+    db: AsyncSession,
+    user_id: str,
+    identity_model_id: str | None = None,
+    constitution_id: str | None = None,
+    sustainable_columns: list[str] | None = None,
+    growth_experiment_suggestion: list[dict] | None = None,
+    generation_mode: str | None = None,
+) -> LaunchKit:
+    """Async variant of generate_launch_kit；上下文解析与落库走 run_sync，LLM 调用在事件循环内等待。"""
+    total_start = time.perf_counter()
+    resolved_mode = _resolve_generation_mode(generation_mode)
+    context_resolve_ms = 0
+    llm_generate_ms = 0
+    schema_repair_attempts = 0
+    context_sources = dict(_EMPTY_CONTEXT_SOURCES)
+
+    try:
+        context_start = time.perf_counter()
+        context_resolution = await db.run_sync(
+            lambda session: _load_context_bundle(
+                db=session,
+                user_id=user_id,
+                requested_identity_model_id=identity_model_id,
+                requested_constitution_id=constitution_id,
             )
-            db.add(day)
+        )
+        context_resolve_ms = int((time.perf_counter() - context_start) * 1000)
+        context_sources = context_resolution.context_sources
 
-        db.commit()
-        db.refresh(kit)
-        return kit
+        llm_payload = _build_launch_kit_llm_payload(
+            user_id=user_id,
+            context_resolution=context_resolution,
+            sustainable_columns=sustainable_columns,
+            growth_experiment_suggestion=growth_experiment_suggestion,
+        )
+
+        llm_start = time.perf_counter()
+        if resolved_mode == "parallel":
+            output, schema_repair_attempts = await _generate_launch_kit_output_parallel_async(
+                llm_payload=llm_payload
+            )
+        else:
+            output, schema_repair_attempts = await _generate_launch_kit_output_async(llm_payload=llm_payload)
+        llm_generate_ms = int((time.perf_counter() - llm_start) * 1000)
+
+        return await db.run_sync(
+            lambda session: _persist_launch_kit(
+                db=session,
+                user_id=user_id,
+                context_resolution=context_resolution,
+                output=output,
+            )
+        )
     finally:
-        total_ms = int((time.perf_counter() - total_start) * 1000)
-        logger.info(
-            "launch_kit_generation_metrics user_id=%s context_resolve_ms=%s llm_generate_ms=%s schema_repair_attempts=%s total_ms=%s context_sources=%s",
-            user_id,
-            context_resolve_ms,
-            llm_generate_ms,
-            schema_repair_attempts,
-            total_ms,
-            json.dumps(context_sources, ensure_ascii=False, sort_keys=True),
+        _log_generation_metrics(
+            user_id=user_id,
+            context_resolve_ms=context_resolve_ms,
+            llm_generate_ms=llm_generate_ms,
+            schema_repair_attempts=schema_repair_attempts,
+            total_start=total_start,
+            context_sources=context_sources,
+            generation_mode=resolved_mode,
         )
 
 
+def stream_launch_kit(
+    db: Session,
+    user_id: str,
+    identity_model_id: str | None = None,
+    constitution_id: str | None = None,
+    sustainable_columns: list[str] | None = None,
+    growth_experiment_suggestion: list[dict] | None = None,
+) -> Iterator[LaunchKitStreamEvent]:
+    """
+    Stream a 7-day launch kit generation.
+
+    每个 day 在 LLM 流中闭合并通过校验后立即产出 ``day`` 事件；
+    整体校验（必要时 schema 修复）并落库后产出 ``completed`` 事件，携带 kit id。
+    修复后内容发生变化的 day 会在 completed 之前再次推送，客户端以最后一次为准。
+    """
+    total_start = time.perf_counter()
+    context_resolve_ms = 0
+    llm_generate_ms = 0
+    schema_repair_attempts = 0
+    first_day_ms: int | None = None
+    context_sources = dict(_EMPTY_CONTEXT_SOURCES)
+
+    try:
+        context_start = time.perf_counter()
+        context_resolution = _load_context_bundle(
+            db=db,
+            user_id=user_id,
+            requested_identity_model_id=identity_model_id,
+            requested_constitution_id=constitution_id,
+        )
+        context_resolve_ms = int((time.perf_counter() - context_start) * 1000)
+        context_sources = context_resolution.context_sources
+
+        llm_payload = _build_launch_kit_llm_payload(
+            user_id=user_id,
+            context_resolution=context_resolution,
+            sustainable_columns=sustainable_columns,
+            growth_experiment_suggestion=growth_experiment_suggestion,
+        )
+
+        llm_start = time.perf_counter()
+        parser = _StreamingDaysParser()
+        emitted: dict[int, dict[str, Any]] = {}
+        for chunk in get_llm_client().stream_json_text(
+            operation="generate_launch_kit",
+            system_prompt=LAUNCH_KIT_PROMPT,
+            user_payload=llm_payload,
+        ):
+            for item in parser.feed(chunk):
+                try:
+                    day = _LaunchKitDayOutput.model_validate(item)
+                except ValidationError:
+                    # 单日不合法时先不推送，交给整体校验与修复处理。
+                    continue
+                if day.day_no in emitted:
+                    continue
+                emitted[day.day_no] = _day_summary(day)
+                if first_day_ms is None:
+                    first_day_ms = int((time.perf_counter() - total_start) * 1000)
+                yield LaunchKitStreamEvent(event="day", data=emitted[day.day_no])
+
+        try:
+            response_payload = parse_llm_json_text(parser.text, operation="generate_launch_kit")
+        except LLMServiceError as exc:
+            if not exc.retryable:
+                raise
+            # 流式输出不是合法 JSON 时退回非流式生成，保证最终结果可用。
+            logger.warning(
+                "launch_kit_stream_fallback user_id=%s reason=%s",
+                user_id,
+                exc.code,
+            )
+            output, schema_repair_attempts = _generate_launch_kit_output(llm_payload=llm_payload)
+        else:
+            try:
+                output = _parse_launch_kit(response_payload)
+            except LLMServiceError as exc:
+                if exc.code != "LLM_SCHEMA_VALIDATION_FAILED":
+                    raise
+                output, schema_repair_attempts = _repair_launch_kit_output(
+                    llm_payload=llm_payload,
+                    invalid_payload=response_payload,
+                    validation_error=exc,
+                )
+        llm_generate_ms = int((time.perf_counter() - llm_start) * 1000)
+
+        for day in sorted(output.days, key=lambda item: item.day_no):
+            summary = _day_summary(day)
+            if emitted.get(day.day_no) != summary:
+                emitted[day.day_no] = summary
+                yield LaunchKitStreamEvent(event="day", data=summary)
+
+        kit = _persist_launch_kit(
+            db=db,
+            user_id=user_id,
+            context_resolution=context_resolution,
+            output=output,
+        )
+        yield LaunchKitStreamEvent(
+            event="completed",
+            data={
+                "id": kit.id,
+                "user_id": kit.user_id,
+                "identity_model_id": kit.identity_model_id,
+                "constitution_id": kit.constitution_id,
+                "days": [
+                    {
+                        "day_no": day.day_no,
+                        "theme": day.theme,
+                        "opening_text": day.opening_text,
+                    }
+                    for day in kit.days
+                ],
+            },
+        )
+    finally:
+        _log_generation_metrics(
+            user_id=user_id,
+            context_resolve_ms=context_resolve_ms,
+            llm_generate_ms=llm_generate_ms,
+            schema_repair_attempts=schema_repair_attempts,
+            total_start=total_start,
+            context_sources=context_sources,
+            first_day_ms=first_day_ms,
+            generation_mode="stream",
+        )
+
+
+def _days_loader(*, summary: bool = False) -> Any:
+    """days 统一用 selectinload 一次取回；summary 视图不加载 draft_or_outline 长文本。"""
+    loader = selectinload(LaunchKit.days)
+    if summary:
+        loader = loader.defer(LaunchKitDay.draft_or_outline, raiseload=True)
+    return loader
+
+
 def get_user_launch_kits(db: Session, user_id: str) -> list[LaunchKit]:
     """Get all launch kits for a user."""
-    return db.query(LaunchKit).filter(LaunchKit.user_id == user_id).all()
+    return (
+        db.query(LaunchKit)
+        .options(_days_loader())
+        .filter(LaunchKit.user_id == user_id)
+        .all()
+    )
 
 
 def get_launch_kit(db: Session, kit_id: str) -> LaunchKit | None:
     """Get launch kit by ID with days."""
-    return db.query(LaunchKit).filter(LaunchKit.id == kit_id).first()
+    return db.query(LaunchKit).options(_days_loader()).filter(LaunchKit.id == kit_id).first()
 
 
 def get_latest_launch_kit(db: Session, user_id: str) -> LaunchKit | None:
     """Get user's latest launch kit."""
     return (
         db.query(LaunchKit)
+        .options(_days_loader())
         .filter(LaunchKit.user_id == user_id)
         .order_by(LaunchKit.created_at.desc())
         .first()
     )
+
+
+async def get_user_launch_kits_page_async(
+    db: AsyncSession,
+    user_id: str,
+    *,
+    limit: int,
+    cursor: str | None = None,
+    summary: bool = False,
+) -> Page[LaunchKit]:
+    """One page of a user's launch kits, newest first; days are eager-loaded for serialisation."""
+    stmt = apply_keyset(
+        select(LaunchKit).options(_days_loader(summary=summary)).where(LaunchKit.user_id == user_id),
+        LaunchKit.created_at,
+        LaunchKit.id,
+        limit=limit,
+        cursor=cursor,
+    )
+    return build_page(list((await db.scalars(stmt)).all()), limit=limit)
+
+
+async def get_launch_kit_async(
+    db: AsyncSession,
+    kit_id: str,
+    *,
+    summary: bool = False,
+) -> LaunchKit | None:
+    """Async variant of get_launch_kit."""
+    result = await db.scalars(
+        select(LaunchKit).options(_days_loader(summary=summary)).where(LaunchKit.id == kit_id)
+    )
+    return result.first()
+
+
+async def get_latest_launch_kit_async(
+    db: AsyncSession,
+    user_id: str,
+    *,
+    summary: bool = False,
+) -> LaunchKit | None:
+    """Async variant of get_latest_launch_kit."""
+    result = await db.scalars(
+        select(LaunchKit)
+        .options(_days_loader(summary=summary))
+        .where(LaunchKit.user_id == user_id)
+        .order_by(LaunchKit.created_at.desc())
+        .limit(1)
+    )
+    return result.first()
@@ -1,13 +1,32 @@
-"""LLM 客户端封装：重试、URL 归一化与结构化错误。"""
+"""LLM 客户端封装：重试、限流、熔断、URL 归一化与结构化错误。"""
 
 from __future__ import annotations
 
-import json
+import asyncio
+import hashlib
+import logging
+import math
+import random
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from functools import lru_cache
+from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse, urlunparse
 
-from app.core.config import Settings, get_settings
+from app.core import json_codec
+from app.core.config import LLMModelRateLimit, Settings, get_settings
+
+logger = logging.getLogger(__name__)
 
 
 class LLMServiceError(RuntimeError):
@@ -23,6 +42,7 @@ class LLMServiceError(RuntimeError):
         provider_request_id: str | None = None,
         retryable: bool = False,
         attempts: int = 1,
+        retry_after: float | None = None,
     ) -> None:
         super().__init__(message)
         self.code = code
@@ -32,6 +52,8 @@ class LLMServiceError(RuntimeError):
         self.provider_request_id = provider_request_id
         self.retryable = retryable
         self.attempts = attempts
+        # 上游通过 Retry-After / x-ratelimit-reset-* 建议的等待秒数，仅用于重试退避，不对外输出。
+        self.retry_after = retry_after
 
     def to_detail(self) -> dict[str, Any]:
         return {
@@ -108,11 +130,1064 @@ def _extract_request_id(error: Exception) -> str | None:
     return None
 
 
-class LLMClient:
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_reset_duration(value: str) -> float | None:
+    """解析 x-ratelimit-reset-* 的时长格式（如 "1s"、"6m0s"、"20ms"、"0.5"）。"""
+    text = value.strip()
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(text)
+    if not parts or "".join(number + unit for number, unit in parts) != text:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def _parse_retry_after(value: str) -> float | None:
+    """Retry-After 支持秒数与 HTTP 日期两种格式。"""
+    text = value.strip()
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _extract_retry_after(error: Exception, *, status_code: int | None) -> float | None:
+    """
+    从上游响应头提取建议等待秒数。
+
+    优先 retry-after-ms / retry-after；429 且没有 Retry-After 时，取已耗尽配额（remaining=0 或未给出）
+    对应的 x-ratelimit-reset-requests / x-ratelimit-reset-tokens 中的较大值。
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is None:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        parsed = _parse_retry_after(str(retry_after))
+        if parsed is not None:
+            return parsed
+
+    if status_code != 429:
+        return None
+    resets: list[float] = []
+    for kind in ("requests", "tokens"):
+        remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+        reset = headers.get(f"x-ratelimit-reset-{kind}")
+        if not reset or (remaining is not None and str(remaining).strip() != "0"):
+            continue
+        parsed = _parse_reset_duration(str(reset))
+        if parsed is not None:
+            resets.append(parsed)
+    return max(resets) if resets else None
+
+
+def build_llm_cache_key(
+    *,
+    model_name: str,
+    system_prompt: str,
+    user_payload: dict[str, Any],
+) -> str:
+    """对 (model_name, system_prompt, user_payload) 做规范化序列化后取 sha256。"""
+    canonical = json_codec.dumps_bytes(
+        {
+            "model_name": model_name,
+            "system_prompt": system_prompt,
+            "user_payload": user_payload,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(canonical).hexdigest()
+
+
+class LLMResponseCache:
+    """LLM 响应缓存接口：以 JSON 文本存储，读出时总是返回新对象。"""
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        raise NotImplementedError
+
+    def set(self, key: str, *, operation: str, payload: dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryLLMResponseCache(LLMResponseCache):
+    """进程内 LRU 缓存，带 TTL 与条目数上限。"""
+
+    def __init__(self, *, ttl_seconds: float, max_entries: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, raw = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return json_codec.loads(raw)
+
+    def set(self, key: str, *, operation: str, payload: dict[str, Any]) -> None:
+        raw = json_codec.dumps(payload)
+        expires_at = time.monotonic() + self._ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, raw)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteLLMResponseCache(LLMResponseCache):
+    """SQLite 表缓存：跨进程/重启复用，按最近访问时间淘汰。"""
+
+    def __init__(self, *, path: str, ttl_seconds: float, max_entries: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_response_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    operation TEXT NOT NULL,
+                    payload_json TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_response_cache_last_access_at "
+                "ON llm_response_cache (last_access_at)"
+            )
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT payload_json, expires_at FROM llm_response_cache WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            raw, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM llm_response_cache WHERE cache_key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE llm_response_cache SET last_access_at = ? WHERE cache_key = ?",
+                (now, key),
+            )
+        return json_codec.loads(raw)
+
+    def set(self, key: str, *, operation: str, payload: dict[str, Any]) -> None:
+        now = time.time()
+        raw = json_codec.dumps(payload)
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_response_cache
+                    (cache_key, operation, payload_json, expires_at, last_access_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, operation, raw, now + self._ttl_seconds, now),
+            )
+            self._conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?", (now,))
+            # 超出上限时按最近访问时间淘汰最旧条目。
+            self._conn.execute(
+                """
+                DELETE FROM llm_response_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_response_cache
+                    ORDER BY last_access_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self._max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_response_cache")
+
+
+def build_llm_response_cache(settings: Settings) -> LLMResponseCache | None:
+    """按配置构建缓存后端；backend=none 时返回 None。"""
+    if settings.llm_cache_backend == "memory":
+        return InMemoryLLMResponseCache(
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+            max_entries=settings.llm_cache_max_entries,
+        )
+    if settings.llm_cache_backend == "sqlite":
+        return SQLiteLLMResponseCache(
+            path=settings.llm_cache_sqlite_path,
+            ttl_seconds=settings.llm_cache_ttl_seconds,
+            max_entries=settings.llm_cache_max_entries,
+        )
+    return None
+
+
+def estimate_prompt_tokens(messages: list[dict[str, str]]) -> int:
+    """
+    粗略估算请求 token 数，用于 TPM 令牌桶预扣。
+
+    按 UTF-8 字节数 / 3：中文约 1 token/字，英文略偏保守；调用完成后按 usage 实际值校正。
+    """
+    return max(1, sum(len(message["content"].encode("utf-8")) for message in messages) // 3)
+
+
+class _TokenBucket:
+    """按分钟配额连续补充的令牌桶；容量等于每分钟配额，实际用量校正后允许为负（欠账）。"""
+
+    def __init__(self, per_minute: int, *, now: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated_at = now
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_for(self, amount: float) -> float:
+        """取得 amount 个令牌还需等待的秒数；单次需求超过整桶容量时按满桶计。"""
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+
+@dataclass
+class LLMPermit:
+    """限流放行凭证：调用结束后交还给 LLMRateLimiter.release。"""
+
+    model: str
+    tokens: int
+    queue_wait_ms: int
+
+
+# 协程等待方没有 Condition 可挂，按该间隔轮询队首状态。
+_ASYNC_POLL_SECONDS = 0.05
+
+
+class LLMRateLimiter:
+    """
+    进程级上游调用限流：在途请求上限 + 按模型的 RPM/TPM 令牌桶。
+
+    - 等待方按到达顺序 FIFO 放行，队首未放行前后来者不会插队；
+    - 等待超过排队期限，或令牌桶预计等待已超出剩余期限时，直接抛出 LLM_QUEUE_TIMEOUT；
+    - 同步与协程客户端共享同一实例，snapshot() 提供排队与等待耗时指标。
+    """
+
+    def __init__(
+        self,
+        *,
+        max_in_flight: int,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        model_limits: Mapping[str, LLMModelRateLimit],
+        queue_timeout_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_in_flight = max_in_flight
+        self._default_limit = LLMModelRateLimit(
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+        )
+        self._model_limits = dict(model_limits)
+        self._queue_timeout_seconds = queue_timeout_seconds
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queue: deque[object] = deque()
+        self._in_flight = 0
+        self._buckets: dict[str, tuple[_TokenBucket | None, _TokenBucket | None]] = {}
+        self._acquired = 0
+        self._rejected = 0
+        self._wait_total_ms = 0
+        self._wait_max_ms = 0
+
+    def acquire(
+        self,
+        *,
+        model: str,
+        tokens: int,
+        operation: str,
+        timeout: float | None = None,
+    ) -> LLMPermit:
+        """阻塞直到放行；超出排队期限（timeout 可进一步收紧）抛出 LLMServiceError(LLM_QUEUE_TIMEOUT)。"""
+        started_at = self._clock()
+        deadline = started_at + self._queue_timeout(timeout)
+        ticket = object()
+        with self._cond:
+            self._queue.append(ticket)
+            try:
+                while True:
+                    now = self._clock()
+                    wait = self._try_grant_locked(ticket, model=model, tokens=tokens, now=now)
+                    if wait is None:
+                        return self._granted_locked(model=model, tokens=tokens, started_at=started_at, now=now)
+                    remaining = self._check_deadline_locked(
+                        wait, deadline=deadline, now=now, model=model, operation=operation
+                    )
+                    self._cond.wait(min(wait, remaining))
+            except BaseException:
+                self._abandon_locked(ticket)
+                raise
+
+    async def acquire_async(
+        self,
+        *,
+        model: str,
+        tokens: int,
+        operation: str,
+        timeout: float | None = None,
+    ) -> LLMPermit:
+        """协程版 acquire：等待期间让出事件循环；被取消时退出队列。"""
+        started_at = self._clock()
+        deadline = started_at + self._queue_timeout(timeout)
+        ticket = object()
+        with self._cond:
+            self._queue.append(ticket)
+        try:
+            while True:
+                with self._cond:
+                    now = self._clock()
+                    wait = self._try_grant_locked(ticket, model=model, tokens=tokens, now=now)
+                    if wait is None:
+                        return self._granted_locked(model=model, tokens=tokens, started_at=started_at, now=now)
+                    remaining = self._check_deadline_locked(
+                        wait, deadline=deadline, now=now, model=model, operation=operation
+                    )
+                await asyncio.sleep(min(wait, remaining, _ASYNC_POLL_SECONDS))
+        except BaseException:
+            with self._cond:
+                self._abandon_locked(ticket)
+            raise
+
+    def release(self, permit: LLMPermit, *, used_tokens: int | None = None) -> None:
+        """交还在途名额；提供 used_tokens 时按实际用量校正 TPM 令牌桶。"""
+        with self._cond:
+            self._in_flight -= 1
+            _, tpm_bucket = self._buckets.get(permit.model, (None, None))
+            if tpm_bucket is not None and used_tokens is not None:
+                tpm_bucket.refill(self._clock())
+                tpm_bucket.level = min(tpm_bucket.capacity, tpm_bucket.level - (used_tokens - permit.tokens))
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict[str, int]:
+        with self._cond:
+            return {
+                "in_flight": self._in_flight,
+                "queued": len(self._queue),
+                "acquired": self._acquired,
+                "rejected": self._rejected,
+                "queue_wait_total_ms": self._wait_total_ms,
+                "queue_wait_max_ms": self._wait_max_ms,
+            }
+
+    def _queue_timeout(self, timeout: float | None) -> float:
+        if timeout is None:
+            return self._queue_timeout_seconds
+        return min(self._queue_timeout_seconds, timeout)
+
+    def _buckets_for(self, model: str, now: float) -> tuple[_TokenBucket | None, _TokenBucket | None]:
+        buckets = self._buckets.get(model)
+        if buckets is None:
+            limit = self._model_limits.get(model, self._default_limit)
+            buckets = (
+                _TokenBucket(limit.requests_per_minute, now=now) if limit.requests_per_minute else None,
+                _TokenBucket(limit.tokens_per_minute, now=now) if limit.tokens_per_minute else None,
+            )
+            self._buckets[model] = buckets
+        return buckets
+
+    def _try_grant_locked(self, ticket: object, *, model: str, tokens: int, now: float) -> float | None:
+        """放行返回 None；否则返回建议等待秒数（inf 表示需等待其他请求释放）。"""
+        if self._queue[0] is not ticket:
+            return math.inf
+        if self._max_in_flight and self._in_flight >= self._max_in_flight:
+            return math.inf
+        rpm_bucket, tpm_bucket = self._buckets_for(model, now)
+        wait = 0.0
+        if rpm_bucket is not None:
+            rpm_bucket.refill(now)
+            wait = max(wait, rpm_bucket.wait_for(1))
+        if tpm_bucket is not None:
+            tpm_bucket.refill(now)
+            wait = max(wait, tpm_bucket.wait_for(tokens))
+        if wait > 0:
+            return wait
+        if rpm_bucket is not None:
+            rpm_bucket.level -= 1
+        if tpm_bucket is not None:
+            tpm_bucket.level -= tokens
+        self._in_flight += 1
+        self._queue.popleft()
+        self._cond.notify_all()
+        return None
+
+    def _granted_locked(self, *, model: str, tokens: int, started_at: float, now: float) -> LLMPermit:
+        queue_wait_ms = int((now - started_at) * 1000)
+        self._acquired += 1
+        self._wait_total_ms += queue_wait_ms
+        self._wait_max_ms = max(self._wait_max_ms, queue_wait_ms)
+        if queue_wait_ms > 0:
+            logger.info(
+                "llm_queue_wait model=%s queue_wait_ms=%s in_flight=%s queued=%s",
+                model,
+                queue_wait_ms,
+                self._in_flight,
+                len(self._queue),
+            )
+        return LLMPermit(model=model, tokens=tokens, queue_wait_ms=queue_wait_ms)
+
+    def _check_deadline_locked(
+        self,
+        wait: float,
+        *,
+        deadline: float,
+        now: float,
+        model: str,
+        operation: str,
+    ) -> float:
+        """返回剩余排队时间；已超时或令牌桶等待必然超时时抛错。"""
+        remaining = deadline - now
+        if remaining > 0 and not (math.isfinite(wait) and wait > remaining):
+            return remaining
+        self._rejected += 1
+        logger.warning(
+            "llm_queue_timeout model=%s operation=%s in_flight=%s queued=%s",
+            model,
+            operation,
+            self._in_flight,
+            len(self._queue),
+        )
+        raise LLMServiceError(
+            code="LLM_QUEUE_TIMEOUT",
+            message="LLM request exceeded the local queue deadline.",
+            operation=operation,
+            retryable=False,
+        )
+
+    def _abandon_locked(self, ticket: object) -> None:
+        try:
+            self._queue.remove(ticket)
+        except ValueError:
+            return
+        # 队首可能变化，唤醒其余等待方重新检查。
+        self._cond.notify_all()
+
+
+def build_llm_rate_limiter(settings: Settings) -> LLMRateLimiter | None:
+    """按配置构建限流器；在途上限与配额全部为 0 时返回 None（不限流）。"""
+    limited = (
+        settings.llm_max_in_flight
+        or settings.llm_requests_per_minute
+        or settings.llm_tokens_per_minute
+        or any(
+            limit.requests_per_minute or limit.tokens_per_minute
+            for limit in settings.llm_model_rate_limits.values()
+        )
+    )
+    if not limited:
+        return None
+    return LLMRateLimiter(
+        max_in_flight=settings.llm_max_in_flight,
+        requests_per_minute=settings.llm_requests_per_minute,
+        tokens_per_minute=settings.llm_tokens_per_minute,
+        model_limits=settings.llm_model_rate_limits,
+        queue_timeout_seconds=settings.llm_queue_timeout_seconds,
+    )
+
+
+def _is_upstream_failure(error: LLMServiceError) -> bool:
+    """熔断只统计说明上游不健康的错误：超时、连接失败与 5xx；4xx/429/内容错误说明上游仍可用。"""
+    if error.code in {"LLM_UPSTREAM_TIMEOUT", "LLM_UPSTREAM_UNAVAILABLE"}:
+        return True
+    return (
+        error.code == "LLM_UPSTREAM_HTTP_ERROR"
+        and isinstance(error.provider_status, int)
+        and error.provider_status >= 500
+    )
+
+
+class CircuitBreaker:
+    """
+    单个上游（base URL + 模型）的熔断器：closed -> open -> half_open -> closed。
+
+    - closed：记录滚动窗口内的结果，请求数达到下限且失败率达到阈值时打开；
+    - open：不访问上游，直接抛出 LLM_CIRCUIT_OPEN，冷却 open_seconds 后进入半开；
+    - half_open：最多放行 half_open_max_calls 个探测请求，探测成功即关闭，失败重新打开。
+    """
+
+    def __init__(
+        self,
+        *,
+        window_seconds: float,
+        min_requests: int,
+        failure_rate_threshold: float,
+        open_seconds: float,
+        half_open_max_calls: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._window_seconds = window_seconds
+        self._min_requests = min_requests
+        self._failure_rate_threshold = failure_rate_threshold
+        self._open_seconds = open_seconds
+        self._half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    def before_call(self, *, operation: str) -> bool:
+        """放行返回是否为半开探测请求；熔断中抛出 LLMServiceError(LLM_CIRCUIT_OPEN)。"""
+        with self._lock:
+            now = self._clock()
+            state = self._refresh_locked(now)
+            if state == "closed":
+                return False
+            if state == "half_open" and self._probes < self._half_open_max_calls:
+                self._probes += 1
+                return True
+            retry_after = max(0.0, self._opened_at + self._open_seconds - now) if state == "open" else None
+        raise LLMServiceError(
+            code="LLM_CIRCUIT_OPEN",
+            message="LLM upstream circuit is open; request rejected without calling the provider.",
+            operation=operation,
+            retryable=False,
+            retry_after=retry_after,
+        )
+
+    def record(self, *, probe: bool, failure: bool | None) -> None:
+        """记录一次调用结果；failure=None 表示未到达上游（如排队超时），只归还探测名额。"""
+        with self._lock:
+            now = self._clock()
+            if probe:
+                self._probes -= 1
+            if failure is None:
+                return
+            if self._state == "half_open":
+                # 半开期间只看探测请求；打开前发出、迟到的结果忽略。
+                if probe and failure:
+                    self._trip_locked(now)
+                elif probe:
+                    self._close_locked()
+                return
+            if self._state == "open":
+                return
+            self._outcomes.append((now, failure))
+            self._failures += failure
+            self._prune_locked(now)
+            requests = len(self._outcomes)
+            if requests >= self._min_requests and self._failures / requests >= self._failure_rate_threshold:
+                self._trip_locked(now)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._refresh_locked(self._clock())
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            now = self._clock()
+            state = self._refresh_locked(now)
+            requests = len(self._outcomes)
+            return {
+                "state": state,
+                "requests": requests,
+                "failures": self._failures,
+                "failure_rate": round(self._failures / requests, 4) if requests else 0.0,
+                "retry_after_seconds": (
+                    round(max(0.0, self._opened_at + self._open_seconds - now), 3) if state == "open" else None
+                ),
+            }
+
+    def _refresh_locked(self, now: float) -> str:
+        if self._state == "open" and now - self._opened_at >= self._open_seconds:
+            self._state = "half_open"
+            self._probes = 0
+        elif self._state == "closed":
+            self._prune_locked(now)
+        return self._state
+
+    def _prune_locked(self, now: float) -> None:
+        horizon = now - self._window_seconds
+        while self._outcomes and self._outcomes[0][0] <= horizon:
+            _, failure = self._outcomes.popleft()
+            self._failures -= failure
+
+    def _trip_locked(self, now: float) -> None:
+        logger.warning(
+            "llm_circuit_opened previous_state=%s requests=%s failures=%s open_seconds=%s",
+            self._state,
+            len(self._outcomes),
+            self._failures,
+            self._open_seconds,
+        )
+        self._state = "open"
+        self._opened_at = now
+
+    def _close_locked(self) -> None:
+        logger.info("llm_circuit_closed")
+        self._state = "closed"
+        self._outcomes.clear()
+        self._failures = 0
+
+
+class LLMCircuitBreakerRegistry:
+    """按 (base_url, model) 懒创建熔断器；同步与异步客户端共享，供 /health 汇总状态。"""
+
+    def __init__(self, **breaker_options: Any) -> None:
+        self._breaker_options = breaker_options
+        self._breakers: dict[tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, base_url: str, model: str) -> CircuitBreaker:
+        key = (base_url, model)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(**self._breaker_options)
+                self._breakers[key] = breaker
+            return breaker
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        with self._lock:
+            items = list(self._breakers.items())
+        # 只暴露上游主机名，不输出完整 URL。
+        return [
+            {"upstream": urlparse(base_url).netloc, "model": model, **breaker.snapshot()}
+            for (base_url, model), breaker in items
+        ]
+
+
+def build_llm_circuit_breakers(settings: Settings) -> LLMCircuitBreakerRegistry | None:
+    """按配置构建熔断器注册表；关闭熔断时返回 None。"""
+    if not settings.llm_circuit_breaker_enabled:
+        return None
+    return LLMCircuitBreakerRegistry(
+        window_seconds=settings.llm_circuit_window_seconds,
+        min_requests=settings.llm_circuit_min_requests,
+        failure_rate_threshold=settings.llm_circuit_failure_rate_threshold,
+        open_seconds=settings.llm_circuit_open_seconds,
+        half_open_max_calls=settings.llm_circuit_half_open_max_calls,
+    )
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    重试退避策略：指数退避 + full jitter，单次等待封顶 max_delay_seconds。
+
+    上游给出 Retry-After 等建议时以其为准（不受封顶限制，但受总时间预算约束）。
+    sleep / async_sleep / jitter 可注入，便于测试。
+    """
+
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 8.0
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+    async_sleep: Callable[[float], Awaitable[None]] = field(default=asyncio.sleep, repr=False)
+    jitter: Callable[[], float] = field(default=random.random, repr=False)
+
+    def backoff(self, attempt: int, error: LLMServiceError) -> float:
+        """第 attempt 次失败后、下一次尝试前的等待秒数。"""
+        if error.retry_after is not None:
+            return error.retry_after
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * (2 ** (attempt - 1)))
+        return self.jitter() * ceiling
+
+
+# 当前生成的绝对截止时间（time.monotonic 基准）；未设置时由客户端按 LLM_DEADLINE_SECONDS 为单次调用兜底。
+_llm_deadline: ContextVar[float | None] = ContextVar("llm_deadline", default=None)
+
+
+@contextmanager
+def llm_deadline(seconds: float | None = None) -> Iterator[float]:
+    """
+    为一次生成（首次调用 + 重试 + schema 修复）设置共享的总时间预算。
+
+    seconds 默认取 LLM_DEADLINE_SECONDS；嵌套时取更早的截止时间。
+    ContextVar 不会自动传入线程池，并发子任务各自按单次调用兜底。
+    """
+    if seconds is None:
+        seconds = get_settings().llm_deadline_seconds
+    deadline = time.monotonic() + seconds
+    current = _llm_deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _llm_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _llm_deadline.reset(token)
+
+
+def _build_messages(system_prompt: str, user_payload: dict[str, Any]) -> list[dict[str, str]]:
+    # 严格保持 OpenAI Chat Completions 请求格式。
+    return [
+        {"role": "system", "content": system_prompt},
+        {
+            "role": "user",
+            "content": json_codec.dumps(user_payload),
+        },
+    ]
+
+
+def parse_llm_json_text(content: str, *, operation: str, request_id: str | None = None) -> dict[str, Any]:
+    """解析 LLM 返回的文本为 JSON 对象；内容异常时映射为可重试错误。"""
+    content = _strip_code_fence(content.strip())
+
+    if not content:
+        raise LLMServiceError(
+            code="LLM_INVALID_RESPONSE",
+            message="LLM response content is empty.",
+            operation=operation,
+            provider_request_id=request_id,
+            retryable=True,
+        )
+
+    try:
+        payload = json_codec.loads(content)
+    except json_codec.JSONDecodeError as exc:
+        raise LLMServiceError(
+            code="LLM_INVALID_RESPONSE",
+            message="LLM response is not valid JSON.",
+            operation=operation,
+            provider_request_id=request_id,
+            retryable=True,
+        ) from exc
+
+    if not isinstance(payload, dict):
+        raise LLMServiceError(
+            code="LLM_INVALID_RESPONSE",
+            message="LLM response JSON must be an object.",
+            operation=operation,
+            provider_request_id=request_id,
+            retryable=True,
+        )
+
+    return payload
+
+
+def _parse_completion_payload(completion: Any, *, operation: str) -> dict[str, Any]:
+    """从 completion 中取出 JSON 对象。"""
+    request_id = getattr(completion, "_request_id", None)
+    content = ""
+    if completion.choices:
+        content = completion.choices[0].message.content or ""
+    return parse_llm_json_text(content, operation=operation, request_id=request_id)
+
+
+def _map_completion_error(openai_module: Any, exc: Exception, *, operation: str) -> LLMServiceError:
+    """将 OpenAI SDK 异常映射为统一的 LLMServiceError（同步/异步客户端共用）。"""
+    if isinstance(exc, openai_module.APITimeoutError):
+        return LLMServiceError(
+            code="LLM_UPSTREAM_TIMEOUT",
+            message="LLM upstream request timed out.",
+            operation=operation,
+            provider_request_id=_extract_request_id(exc),
+            retryable=True,
+        )
+    if isinstance(exc, openai_module.APIConnectionError):
+        return LLMServiceError(
+            code="LLM_UPSTREAM_UNAVAILABLE",
+            message="LLM upstream connection failed.",
+            operation=operation,
+            provider_request_id=_extract_request_id(exc),
+            retryable=True,
+        )
+    if isinstance(exc, openai_module.APIStatusError):
+        status_code = getattr(exc, "status_code", None)
+        retryable = bool(
+            status_code in {408, 409, 429}
+            or (isinstance(status_code, int) and status_code >= 500)
+        )
+        return LLMServiceError(
+            code="LLM_UPSTREAM_HTTP_ERROR",
+            message="LLM upstream returned an HTTP error.",
+            operation=operation,
+            provider_status=status_code,
+            provider_request_id=_extract_request_id(exc),
+            retryable=retryable,
+            retry_after=_extract_retry_after(exc, status_code=status_code) if retryable else None,
+        )
+    return LLMServiceError(
+        code="LLM_CLIENT_ERROR",
+        message="Unexpected LLM client error.",
+        operation=operation,
+        retryable=False,
+    )
+
+
+def _should_retry_without_reasoning(error: LLMServiceError, *, include_reasoning: bool) -> bool:
+    """部分网关不识别 reasoning 扩展字段，400/422 时去掉后重试一次。"""
+    return (
+        include_reasoning
+        and error.code == "LLM_UPSTREAM_HTTP_ERROR"
+        and error.provider_status in {400, 422}
+    )
+
+
+class _BaseLLMClient:
+    """同步/异步客户端共享的配置与请求构造逻辑。"""
+
+    _model_name: str
+    _max_retries: int
+    _reasoning: bool | None
+    _cache: LLMResponseCache | None = None
+    _cache_operations: frozenset[str] = frozenset()
+    _limiter: LLMRateLimiter | None = None
+    _retry_policy: RetryPolicy = RetryPolicy()
+    _timeout_seconds: float | None = None
+    _deadline_seconds: float | None = None
+    _circuit: CircuitBreaker | None = None
+
+    def _load_settings(self, settings: Settings) -> None:
+        settings.validate_llm_settings()
+        self._model_name = settings.model_name or ""
+        self._max_retries = settings.openai_max_retries
+        self._reasoning = settings.reasoning
+        self._cache = get_llm_response_cache()
+        self._cache_operations = frozenset(settings.llm_cache_operations)
+        self._limiter = get_llm_rate_limiter()
+        self._retry_policy = RetryPolicy(
+            base_delay_seconds=settings.llm_retry_base_delay_seconds,
+            max_delay_seconds=settings.llm_retry_max_delay_seconds,
+        )
+        self._timeout_seconds = settings.openai_timeout_seconds
+        self._deadline_seconds = settings.llm_deadline_seconds
+        breakers = get_llm_circuit_breakers()
+        if breakers is not None:
+            self._circuit = breakers.get(normalize_openai_base_url(settings.openai_base_url or ""), self._model_name)
+
+    def _cache_key_for(
+        self,
+        *,
+        operation: str,
+        system_prompt: str,
+        user_payload: dict[str, Any],
+        validate: Callable[[dict[str, Any]], object] | None,
+    ) -> str | None:
+        # 只缓存调用方提供了校验函数的首次生成；schema 修复调用不传 validate，永不读写缓存。
+        if validate is None or self._cache is None or operation not in self._cache_operations:
+            return None
+        return build_llm_cache_key(
+            model_name=self._model_name,
+            system_prompt=system_prompt,
+            user_payload=user_payload,
+        )
+
+    def _lookup_cache(self, *, operation: str, cache_key: str | None) -> dict[str, Any] | None:
+        if cache_key is None or self._cache is None:
+            return None
+        try:
+            return self._cache.get(cache_key)
+        except Exception:
+            # 缓存故障不应影响主链路，退化为直接调用上游。
+            logger.warning("llm_cache_read_failed operation=%s", operation, exc_info=True)
+            return None
+
+    def _store_cache(
+        self,
+        *,
+        operation: str,
+        cache_key: str | None,
+        payload: dict[str, Any],
+        validate: Callable[[dict[str, Any]], object] | None,
+    ) -> None:
+        if cache_key is None or self._cache is None or validate is None:
+            return
+        try:
+            validate(payload)
+        except Exception:
+            # 不合规的输出交给调用方修复/降级，不能写入缓存，否则 TTL 内每次都重放同一个坏结果。
+            logger.info("llm_cache_skip_invalid operation=%s", operation)
+            return
+        try:
+            self._cache.set(cache_key, operation=operation, payload=payload)
+        except Exception:
+            logger.warning("llm_cache_write_failed operation=%s", operation, exc_info=True)
+
+    def _call_deadline(self) -> float | None:
+        """本次调用的截止时间：外层 llm_deadline 与单次调用兜底预算中更早者。"""
+        deadline = _llm_deadline.get()
+        if self._deadline_seconds is not None:
+            own = time.monotonic() + self._deadline_seconds
+            deadline = own if deadline is None else min(deadline, own)
+        return deadline
+
+    def _remaining_budget(self, deadline: float | None, *, operation: str) -> float | None:
+        """发起上游请求前检查剩余预算；预算耗尽抛出 LLM_DEADLINE_EXCEEDED。"""
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise LLMServiceError(
+                code="LLM_DEADLINE_EXCEEDED",
+                message="LLM generation exceeded its total time budget.",
+                operation=operation,
+                retryable=False,
+            )
+        return remaining
+
+    def _retry_delay(
+        self,
+        error: LLMServiceError,
+        *,
+        attempt: int,
+        max_attempts: int,
+        deadline: float | None,
+    ) -> float | None:
+        """返回下一次重试前的等待秒数；不应重试（或等待后预算不足）时返回 None。"""
+        if not error.retryable or attempt >= max_attempts:
+            return None
+        delay = self._retry_policy.backoff(attempt, error)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            logger.warning(
+                "llm_retry_skipped operation=%s attempt=%s code=%s delay_ms=%s reason=deadline",
+                error.operation,
+                attempt,
+                error.code,
+                int(delay * 1000),
+            )
+            return None
+        logger.info(
+            "llm_retry operation=%s attempt=%s code=%s provider_status=%s delay_ms=%s",
+            error.operation,
+            attempt,
+            error.code,
+            error.provider_status,
+            int(delay * 1000),
+        )
+        return delay
+
+    def _request_timeout(self, remaining: float | None) -> float | None:
+        """剩余预算短于默认超时时，收紧本次请求的超时。"""
+        if remaining is None or (self._timeout_seconds is not None and remaining >= self._timeout_seconds):
+            return None
+        return remaining
+
+    def _enter_circuit(self, operation: str) -> bool:
+        """熔断检查放在限流排队之前：熔断中不占用排队名额。"""
+        if self._circuit is None:
+            return False
+        return self._circuit.before_call(operation=operation)
+
+    def _record_circuit(self, probe: bool, error: LLMServiceError | None, *, reached: bool = True) -> None:
+        if self._circuit is None:
+            return
+        if not reached:
+            self._circuit.record(probe=probe, failure=None)
+            return
+        self._circuit.record(probe=probe, failure=error is not None and _is_upstream_failure(error))
+
+    def _release_permit(self, permit: LLMPermit | None, completion: Any = None) -> None:
+        if permit is None or self._limiter is None:
+            return
+        usage = getattr(completion, "usage", None)
+        used_tokens = getattr(usage, "total_tokens", None)
+        self._limiter.release(permit, used_tokens=used_tokens if isinstance(used_tokens, int) else None)
+
+    def _release_after_stream(self, stream: Any, permit: LLMPermit) -> Iterator[Any]:
+        """流式响应读完（或被关闭）后才交还在途名额。"""
+        try:
+            yield from stream
+        finally:
+            self._release_permit(permit)
+
+    @staticmethod
+    def _log_generate_metrics(
+        *,
+        operation: str,
+        cache_status: str,
+        started_at: float,
+        attempts: int,
+    ) -> None:
+        logger.info(
+            "llm_generate_metrics operation=%s cache=%s attempts=%s elapsed_ms=%s",
+            operation,
+            cache_status,
+            attempts,
+            int((time.perf_counter() - started_at) * 1000),
+        )
+
+    @staticmethod
+    def _client_options(settings: Settings) -> dict[str, Any]:
+        return {
+            "api_key": settings.openai_api_key,
+            "base_url": normalize_openai_base_url(settings.openai_base_url or ""),
+            "timeout": settings.openai_timeout_seconds,
+            "max_retries": 0,
+        }
+
+    def _build_completion_request(
+        self,
+        *,
+        messages: list[dict[str, str]],
+        include_reasoning: bool,
+        timeout: float | None = None,
+    ) -> dict[str, Any]:
+        request: dict[str, Any] = {
+            "model": self._model_name,
+            "messages": messages,
+            # 严格模式：始终要求上游返回 JSON 对象。
+            "response_format": {"type": "json_object"},
+            "temperature": 0.2,
+        }
+        if timeout is not None:
+            # 总预算所剩不多时收紧本次请求超时（SDK 的单请求 timeout 覆盖）。
+            request["timeout"] = timeout
+        if include_reasoning and self._reasoning is not None:
+            extra_body: dict[str, Any] = {"reasoning": self._reasoning}
+            # For many OpenAI-compatible gateways, reasoning=false alone does not
+            # disable reasoning, while enable_thinking=false does.
+            if self._reasoning is False:
+                extra_body["enable_thinking"] = False
+            request["extra_body"] = extra_body
+        return request
+
+
+class LLMClient(_BaseLLMClient):
     """OpenAI Chat Completions 封装：统一重试、解析与错误映射。"""
 
     def __init__(self, settings: Settings) -> None:
-        settings.validate_llm_settings()
+        self._load_settings(settings)
 
         try:
             import openai
@@ -123,15 +1198,7 @@ class LLMClient:
             ) from exc
 
         self._openai = openai
-        self._model_name = settings.model_name or ""
-        self._max_retries = settings.openai_max_retries
-        self._reason = settings.reason
-        self._client = OpenAI(
-            api_key=settings.openai_api_key,
-            base_url=normalize_openai_base_url(settings.openai_base_url or ""),
-            timeout=settings.openai_timeout_seconds,
-            max_retries=0,
-        )
+        self._client = OpenAI(**self._client_options(settings))
 
     def generate_json(
         self,
@@ -139,25 +1206,101 @@ class LLMClient:
         operation: str,
         system_prompt: str,
         user_payload: dict[str, Any],
+        validate: Callable[[dict[str, Any]], object] | None = None,
     ) -> dict[str, Any]:
         """
         调用 LLM 并返回 JSON 对象。
 
         重试由错误映射后的 retryable 决定，而不是盲目重试。
+        命中响应缓存时直接返回，不访问上游。
+        validate 为调用方的 schema 校验（失败时抛异常）：只有校验通过的结果才写入缓存，
+        未提供 validate 的调用（如 schema 修复）不使用缓存；返回值不受校验结果影响。
         """
+        started_at = time.perf_counter()
+        cache_key = self._cache_key_for(
+            operation=operation,
+            system_prompt=system_prompt,
+            user_payload=user_payload,
+            validate=validate,
+        )
+        cached = self._lookup_cache(operation=operation, cache_key=cache_key)
+        if cached is not None:
+            self._log_generate_metrics(
+                operation=operation, cache_status="hit", started_at=started_at, attempts=0
+            )
+            return cached
+
+        deadline = self._call_deadline()
         max_attempts = self._max_retries + 1
         for attempt in range(1, max_attempts + 1):
             try:
-                return self._generate_json_once(
+                payload = self._generate_json_once(
                     operation=operation,
                     system_prompt=system_prompt,
                     user_payload=user_payload,
+                    deadline=deadline,
                 )
             except LLMServiceError as error:
                 error.attempts = attempt
-                if error.retryable and attempt < max_attempts:
+                delay = self._retry_delay(error, attempt=attempt, max_attempts=max_attempts, deadline=deadline)
+                if delay is None:
+                    raise
+                self._retry_policy.sleep(delay)
+                continue
+            self._store_cache(operation=operation, cache_key=cache_key, payload=payload, validate=validate)
+            self._log_generate_metrics(
+                operation=operation,
+                cache_status="miss" if cache_key else "off",
+                started_at=started_at,
+                attempts=attempt,
+            )
+            return payload
+
+    def stream_json_text(
+        self,
+        *,
+        operation: str,
+        system_prompt: str,
+        user_payload: dict[str, Any],
+    ) -> Iterator[str]:
+        """
+        以 stream=True 调用 LLM，逐段产出 JSON 文本增量。
+
+        仅在建立流之前按 retryable 重试；流开始后出错直接抛出，由调用方决定降级。
+        """
+        messages = _build_messages(system_prompt, user_payload)
+        deadline = self._call_deadline()
+        max_attempts = self._max_retries + 1
+        stream: Any = None
+        for attempt in range(1, max_attempts + 1):
+            try:
+                stream = self._create_completion_with_reasoning_fallback(
+                    operation=operation,
+                    messages=messages,
+                    deadline=deadline,
+                    stream=True,
+                )
+                break
+            except LLMServiceError as error:
+                error.attempts = attempt
+                delay = self._retry_delay(error, attempt=attempt, max_attempts=max_attempts, deadline=deadline)
+                if delay is None:
+                    raise
+                self._retry_policy.sleep(delay)
+
+        try:
+            for chunk in stream:
+                choices = getattr(chunk, "choices", None) or []
+                if not choices:
                     continue
-                raise
+                delta = getattr(choices[0], "delta", None)
+                text = getattr(delta, "content", None)
+                if text:
+                    yield text
+        except LLMServiceError:
+            raise
+        except Exception as exc:
+            raise _map_completion_error(self._openai, exc, operation=operation) from exc
 
     def _generate_json_once(
         self,
@@ -165,172 +1308,281 @@ class LLMClient:
         operation: str,
         system_prompt: str,
         user_payload: dict[str, Any],
+        deadline: float | None = None,
     ) -> dict[str, Any]:
-        # 严格保持 OpenAI Chat Completions 请求格式。
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {
-                "role": "user",
-                "content": json.dumps(user_payload, ensure_ascii=False),
-            },
-        ]
-
-        completion = self._create_completion_with_reason_fallback(
+        completion = self._create_completion_with_reasoning_fallback(
             operation=operation,
-            messages=messages,
+            messages=_build_messages(system_prompt, user_payload),
+            deadline=deadline,
         )
+        return _parse_completion_payload(completion, operation=operation)
 
-        request_id = getattr(completion, "_request_id", None)
-        content = ""
-        if completion.choices:
-            content = completion.choices[0].message.content or ""
-        content = _strip_code_fence(content.strip())
+    def _create_completion(
+        self,
+        *,
+        operation: str,
+        messages: list[dict[str, str]],
+        include_reasoning: bool,
+        deadline: float | None = None,
+        stream: bool = False,
+    ) -> Any:
+        remaining = self._remaining_budget(deadline, operation=operation)
+        request = self._build_completion_request(
+            messages=messages,
+            include_reasoning=include_reasoning,
+            timeout=self._request_timeout(remaining),
+        )
+        if stream:
+            request["stream"] = True
+        probe = self._enter_circuit(operation)
+        permit = None
+        try:
+            if self._limiter is not None:
+                permit = self._limiter.acquire(
+                    model=self._model_name,
+                    tokens=estimate_prompt_tokens(messages),
+                    operation=operation,
+                    timeout=remaining,
+                )
+        except BaseException:
+            self._record_circuit(probe, None, reached=False)
+            raise
+        try:
+            completion = self._client.chat.completions.create(**request)
+        except Exception as exc:
+            self._release_permit(permit)
+            error = _map_completion_error(self._openai, exc, operation=operation)
+            self._record_circuit(probe, error)
+            raise error from exc
+        # 流式请求建立成功即视为上游可用。
+        self._record_circuit(probe, None)
+        if stream and permit is not None:
+            return self._release_after_stream(completion, permit)
+        self._release_permit(permit, completion)
+        return completion
 
-        if not content:
-            raise LLMServiceError(
-                code="LLM_INVALID_RESPONSE",
-                message="LLM response content is empty.",
+    def _create_completion_with_reasoning_fallback(
+        self,
+        *,
+        operation: str,
+        messages: list[dict[str, str]],
+        deadline: float | None = None,
+        stream: bool = False,
+    ) -> Any:
+        include_reasoning = self._reasoning is not None
+        try:
+            return self._create_completion(
                 operation=operation,
-                provider_request_id=request_id,
-                retryable=True,
+                messages=messages,
+                include_reasoning=include_reasoning,
+                deadline=deadline,
+                stream=stream,
             )
+        except LLMServiceError as error:
+            if _should_retry_without_reasoning(error, include_reasoning=include_reasoning):
+                return self._create_completion(
+                    operation=operation,
+                    messages=messages,
+                    include_reasoning=False,
+                    deadline=deadline,
+                    stream=stream,
+                )
+            raise
+
+
+class AsyncLLMClient(_BaseLLMClient):
+    """基于 AsyncOpenAI 的协程版客户端，与 LLMClient 保持相同的调用契约与错误映射。"""
+
+    def __init__(self, settings: Settings) -> None:
+        self._load_settings(settings)
 
         try:
-            payload = json.loads(content)
-        except json.JSONDecodeError as exc:
-            raise LLMServiceError(
-                code="LLM_INVALID_RESPONSE",
-                message="LLM response is not valid JSON.",
-                operation=operation,
-                provider_request_id=request_id,
-                retryable=True,
+            import openai
+            from openai import AsyncOpenAI
+        except ImportError as exc:
+            raise RuntimeError(
+                "openai package is required. Install dependencies before running the API."
             ) from exc
 
-        if not isinstance(payload, dict):
-            raise LLMServiceError(
-                code="LLM_INVALID_RESPONSE",
-                message="LLM response JSON must be an object.",
-                operation=operation,
-                provider_request_id=request_id,
-                retryable=True,
+        self._openai = openai
+        self._client = AsyncOpenAI(**self._client_options(settings))
+
+    async def generate_json(
+        self,
+        *,
+        operation: str,
+        system_prompt: str,
+        user_payload: dict[str, Any],
+        validate: Callable[[dict[str, Any]], object] | None = None,
+    ) -> dict[str, Any]:
+        """协程版 generate_json：等待上游期间不占用线程池 worker；validate 语义同 LLMClient.generate_json。"""
+        started_at = time.perf_counter()
+        cache_key = self._cache_key_for(
+            operation=operation,
+            system_prompt=system_prompt,
+            user_payload=user_payload,
+            validate=validate,
+        )
+        cached = self._lookup_cache(operation=operation, cache_key=cache_key)
+        if cached is not None:
+            self._log_generate_metrics(
+                operation=operation, cache_status="hit", started_at=started_at, attempts=0
             )
+            return cached
 
-        return payload
+        deadline = self._call_deadline()
+        max_attempts = self._max_retries + 1
+        for attempt in range(1, max_attempts + 1):
+            try:
+                payload = await self._generate_json_once(
+                    operation=operation,
+                    system_prompt=system_prompt,
+                    user_payload=user_payload,
+                    deadline=deadline,
+                )
+            except LLMServiceError as error:
+                error.attempts = attempt
+                delay = self._retry_delay(error, attempt=attempt, max_attempts=max_attempts, deadline=deadline)
+                if delay is None:
+                    raise
+                await self._retry_policy.async_sleep(delay)
+                continue
+            self._store_cache(operation=operation, cache_key=cache_key, payload=payload, validate=validate)
+            self._log_generate_metrics(
+                operation=operation,
+                cache_status="miss" if cache_key else "off",
+                started_at=started_at,
+                attempts=attempt,
+            )
+            return payload
 
-    def _build_completion_request(
+    async def _generate_json_once(
         self,
         *,
-        messages: list[dict[str, str]],
-        include_reason: bool,
+        operation: str,
+        system_prompt: str,
+        user_payload: dict[str, Any],
+        deadline: float | None = None,
     ) -> dict[str, Any]:
-        request: dict[str, Any] = {
-            "model": self._model_name,
-            "messages": messages,
-            # 严格模式：始终要求上游返回 JSON 对象。
-            "response_format": {"type": "json_object"},
-            "temperature": 0.2,
-        }
-        if include_reason and self._reason is not None:
-            extra_body: dict[str, Any] = {"easoning": self._reason}
-            # For many OpenAI-compatible gateways, reason=false alone does not
-            # disable reasoning, while enable_thinking=false does.
-            if self._reason is False:
-                extra_body["enable_thinking"] = False
-            request["extra_body"] = extra_body
-        return request
+        completion = await self._create_completion_with_reasoning_fallback(
+            operation=operation,
+            messages=_build_messages(system_prompt, user_payload),
+            deadline=deadline,
+        )
+        return _parse_completion_payload(completion, operation=operation)
 
-    def _create_completion(
+    async def _create_completion(
         self,
         *,
         operation: str,
         messages: list[dict[str, str]],
-        include_reason: bool,
+        include_reasoning: bool,
+        deadline: float | None = None,
     ) -> Any:
+        remaining = self._remaining_budget(deadline, operation=operation)
         request = self._build_completion_request(
             messages=messages,
-            include_reason=include_reason,
+            include_reasoning=include_reasoning,
+            timeout=self._request_timeout(remaining),
         )
+        probe = self._enter_circuit(operation)
+        permit = None
         try:
-            return self._client.chat.completions.create(**request)
-        except self._openai.APITimeoutError as exc:
-            raise LLMServiceError(
-                code="LLM_UPSTREAM_TIMEOUT",
-                message="LLM upstream request timed out.",
-                operation=operation,
-                provider_request_id=_extract_request_id(exc),
-                retryable=True,
-            ) from exc
-        except self._openai.APIConnectionError as exc:
-            raise LLMServiceError(
-                code="LLM_UPSTREAM_UNAVAILABLE",
-                message="LLM upstream connection failed.",
-                operation=operation,
-                provider_request_id=_extract_request_id(exc),
-                retryable=True,
-            ) from exc
-        except self._openai.APIStatusError as exc:
-            status_code = getattr(exc, "status_code", None)
-            retryable = bool(
-                status_code in {408, 409, 429}
-                or (isinstance(status_code, int) and status_code >= 500)
-            )
-            raise LLMServiceError(
-                code="LLM_UPSTREAM_HTTP_ERROR",
-                message="LLM upstream returned an HTTP error.",
-                operation=operation,
-                provider_status=status_code,
-                provider_request_id=_extract_request_id(exc),
-                retryable=retryable,
-            ) from exc
+            if self._limiter is not None:
+                permit = await self._limiter.acquire_async(
+                    model=self._model_name,
+                    tokens=estimate_prompt_tokens(messages),
+                    operation=operation,
+                    timeout=remaining,
+                )
+        except BaseException:
+            self._record_circuit(probe, None, reached=False)
+            raise
+        try:
+            completion = await self._client.chat.completions.create(**request)
         except Exception as exc:
-            raise LLMServiceError(
-                code="LLM_CLIENT_ERROR",
-                message="Unexpected LLM client error.",
-                operation=operation,
-                retryable=False,
-            ) from exc
+            self._release_permit(permit)
+            error = _map_completion_error(self._openai, exc, operation=operation)
+            self._record_circuit(probe, error)
+            raise error from exc
+        except BaseException:
+            # 协程被取消时同样要交还名额。
+            self._release_permit(permit)
+            self._record_circuit(probe, None, reached=False)
+            raise
+        self._record_circuit(probe, None)
+        self._release_permit(permit, completion)
+        return completion
 
-    def _create_completion_with_reason_fallback(
+    async def _create_completion_with_reasoning_fallback(
         self,
         *,
         operation: str,
         messages: list[dict[str, str]],
+        deadline: float | None = None,
     ) -> Any:
-        include_reason = self._reason is not None
+        include_reasoning = self._reasoning is not None
         try:
-            return self._create_completion(
+            return await self._create_completion(
                 operation=operation,
                 messages=messages,
-                include_reason=include_reason,
+                include_reasoning=include_reasoning,
+                deadline=deadline,
             )
         except LLMServiceError as error:
-            if (
-                include_reason
-                and error.code == "LLM_UPSTREAM_HTTP_ERROR"
-                and error.provider_status in {400, 422}
-            ):
-                return self._create_completion(
+            if _should_retry_without_reasoning(error, include_reasoning=include_reasoning):
+                return await self._create_completion(
                     operation=operation,
                     messages=messages,
-                    include_reason=False,
+                    include_reasoning=False,
+                    deadline=deadline,
                 )
             raise
 
 
+@lru_cache(maxsize=1)
+def get_llm_response_cache() -> LLMResponseCache | None:
+    """构建并缓存进程级 LLM 响应缓存；同步与异步客户端共享同一实例。"""
+    return build_llm_response_cache(get_settings())
+
+
+@lru_cache(maxsize=1)
+def get_llm_rate_limiter() -> LLMRateLimiter | None:
+    """构建并缓存进程级限流器；同步与异步客户端共享在途名额与令牌桶。"""
+    return build_llm_rate_limiter(get_settings())
+
+
+@lru_cache(maxsize=1)
+def get_llm_circuit_breakers() -> LLMCircuitBreakerRegistry | None:
+    """构建并缓存进程级熔断器注册表；/health 读取其状态。"""
+    return build_llm_circuit_breakers(get_settings())
+
+
 @lru_cache(maxsize=1)
 def get_llm_client() -> LLMClient:
     """构建并缓存进程级 LLM 客户端实例。"""
     return LLMClient(get_settings())
 
 
+@lru_cache(maxsize=1)
+def get_async_llm_client() -> AsyncLLMClient:
+    """构建并缓存进程级协程版 LLM 客户端实例。"""
+    return AsyncLLMClient(get_settings())
+
+
 def reset_llm_client_cache() -> None:
     """测试辅助：清理缓存客户端，避免用例间状态污染。"""
     get_llm_client.cache_clear()
+    get_async_llm_client.cache_clear()
+    get_llm_response_cache.cache_clear()
+    get_llm_rate_limiter.cache_clear()
+    get_llm_circuit_breakers.cache_clear()
 
 
 def ensure_llm_ready() -> None:
     """启动守卫：校验配置并预热初始化 OpenAI 客户端。"""
     settings = get_settings()
     settings.validate_llm_settings()
-    # Validate URL format and dependency load by constructing the client once.
+    # Validate URL format and dependency load by constructing the clients once.
     get_llm_client()
+    get_async_llm_client()
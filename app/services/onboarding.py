@@ -1,11 +1,13 @@
 """Onboarding 诊断服务。"""
 
-import json
 from datetime import datetime, timezone
 
 from sqlalchemy.orm import Session
 
+from app.core import json_codec
 from app.models.onboarding import OnboardingSession, CapabilityProfile
+from app.services.context_cache import invalidate_user_context
+from app.services.pagination import Page, apply_keyset, build_page
 
 
 def create_session(db: Session, user_id: str) -> OnboardingSession:
@@ -41,17 +43,17 @@ def complete_session(
 
     # 标记完成状态，并保存问卷快照。
     session.status = "completed"
-    session.questionnaire_responses = json.dumps(questionnaire_responses, ensure_ascii=False)
+    session.questionnaire_responses = json_codec.dumps(questionnaire_responses)
     session.completed_at = datetime.now(timezone.utc)
 
     # 根据六个关键维度生成能力画像。
     profile = CapabilityProfile(
         session_id=session_id,
         user_id=session.user_id,
-        skill_stack_json=json.dumps(skill_stack, ensure_ascii=False),
-        interest_energy_curve_json=json.dumps(interest_energy_curve, ensure_ascii=False),
+        skill_stack_json=skill_stack,
+        interest_energy_curve_json=interest_energy_curve,
         cognitive_style=cognitive_style,
-        value_boundaries_json=json.dumps(value_boundaries, ensure_ascii=False),
+        value_boundaries_json=value_boundaries,
         risk_tolerance=risk_tolerance,
         time_investment_hours=time_investment_hours,
     )
@@ -60,6 +62,7 @@ def complete_session(
     db.commit()
     db.refresh(session)
     db.refresh(profile)
+    invalidate_user_context(profile.user_id)
     return session, profile
 
 
@@ -76,3 +79,21 @@ def get_profile(db: Session, session_id: str) -> CapabilityProfile | None:
 def get_user_profiles(db: Session, user_id: str) -> list[CapabilityProfile]:
     """Get all capability profiles for a user."""
     return db.query(CapabilityProfile).filter(CapabilityProfile.user_id == user_id).all()
+
+
+def get_user_profiles_page(
+    db: Session,
+    user_id: str,
+    *,
+    limit: int,
+    cursor: str | None = None,
+) -> Page[CapabilityProfile]:
+    """One page of a user's capability profiles, newest first."""
+    query = apply_keyset(
+        db.query(CapabilityProfile).filter(CapabilityProfile.user_id == user_id),
+        CapabilityProfile.created_at,
+        CapabilityProfile.id,
+        limit=limit,
+        cursor=cursor,
+    )
+    return build_page(query.all(), limit=limit)
@@ -0,0 +1,77 @@
+"""列表接口的 keyset 分页：按 (created_at, id) 排序，游标对调用方不透明。"""
+
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Generic, Literal, TypeVar
+
+from sqlalchemy import and_, or_
+
+from app.core import json_codec
+
+T = TypeVar("T")
+
+SortDirection = Literal["asc", "desc"]
+
+
+@dataclass
+class Page(Generic[T]):
+    """一页结果；next_cursor 为 None 表示已到最后一页。"""
+
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+def encode_cursor(sort_value: datetime, row_id: str) -> str:
+    raw = json_codec.dumps_bytes([sort_value.isoformat(), row_id])
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """解析游标；格式非法时抛 ValueError，由路由映射为 400。"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_text, row_id = json_codec.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(sort_text), str(row_id)
+    except (ValueError, TypeError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def apply_keyset(
+    query: Any,
+    sort_column: Any,
+    id_column: Any,
+    *,
+    limit: int,
+    cursor: str | None,
+    direction: SortDirection = "desc",
+) -> Any:
+    """
+    给 Query/Select 加上 keyset 条件、排序与 limit+1（多取一条用于判断是否还有下一页）。
+
+    需要 (过滤列..., sort_column, id_column) 复合索引支撑，深页与首页代价相同。
+    """
+    if cursor is not None:
+        sort_value, row_id = decode_cursor(cursor)
+        if direction == "desc":
+            condition = or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < row_id))
+        else:
+            condition = or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > row_id))
+        query = query.filter(condition)
+
+    if direction == "desc":
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    return query.limit(limit + 1)
+
+
+def build_page(rows: list[T], *, limit: int, sort_attr: str = "created_at") -> Page[T]:
+    """把 apply_keyset 取回的 limit+1 行切成一页，并用本页最后一行生成下一页游标。"""
+    if len(rows) <= limit:
+        return Page(items=list(rows))
+    items = list(rows[:limit])
+    last = items[-1]
+    return Page(items=items, next_cursor=encode_cursor(getattr(last, sort_attr), last.id))
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
-import json
 from typing import Any
 
 from pydantic import BaseModel, ValidationError, model_validator
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.persona import PersonaConstitution, RiskBoundaryItem
-from app.services.llm_client import get_llm_client, llm_schema_error
+from app.services.context_cache import invalidate_user_context
+from app.services.llm_client import get_async_llm_client, get_llm_client, llm_schema_error
+from app.services.pagination import Page, apply_keyset, build_page
 
 
 class _PersonaConstitutionOutput(BaseModel):
@@ -68,6 +70,64 @@ def _parse_constitution(payload: dict[str, Any]) -> _PersonaConstitutionOutput:
         ) from exc
 
 
+def _next_constitution_version(db: Session, user_id: str) -> tuple[str | None, int]:
+    """版本号基于该用户最近一次宪法递增，返回 (previous_version_id, new_version)。"""
+    previous = (
+        db.query(PersonaConstitution)
+        .filter(PersonaConstitution.user_id == user_id)
+        .order_by(PersonaConstitution.version.desc())
+        .first()
+    )
+    if previous is None:
+        return None, 1
+    return previous.id, previous.version + 1
+
+
+def _build_constitution_payload(
+    *,
+    user_id: str,
+    identity_model_id: str | None,
+    common_words: list[str] | None,
+    forbidden_words: list[str] | None,
+) -> dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "identity_model_id": identity_model_id,
+        # 可选词汇提示，由调用方传入用于引导输出风格。
+        "hint_common_words": common_words or [],
+        "hint_forbidden_words": forbidden_words or [],
+    }
+
+
+def _persist_constitution(
+    db: Session,
+    *,
+    user_id: str,
+    identity_model_id: str | None,
+    output: _PersonaConstitutionOutput,
+    previous_version_id: str | None,
+    new_version: int,
+) -> PersonaConstitution:
+    constitution = PersonaConstitution(
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        common_words_json=output.common_words,
+        forbidden_words_json=output.forbidden_words,
+        sentence_preferences_json=output.sentence_preferences,
+        moat_positions_json=output.moat_positions,
+        narrative_mainline=output.narrative_mainline,
+        growth_arc_template=output.growth_arc_template,
+        version=new_version,
+        previous_version_id=previous_version_id,
+    )
+    db.add(constitution)
+    # 一次提交，保证内容与版本链同时生效。
+    db.commit()
+    invalidate_user_context(user_id)
+    db.refresh(constitution)
+    return constitution
+
+
 def generate_constitution(
     db: Session,
     user_id: str,
@@ -84,48 +144,65 @@ def generate_constitution(
     - 叙事主线（长期动机）
     - 成长Arc（阶段叙事模板）
     """
-    # 版本号基于该用户最近一次宪法递增。
-    previous = (
-        db.query(PersonaConstitution)
-        .filter(PersonaConstitution.user_id == user_id)
-        .order_by(PersonaConstitution.version.desc())
-        .first()
+    previous_version_id, new_version = _next_constitution_version(db, user_id)
+    llm_payload = _build_constitution_payload(
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        common_words=common_words,
+        forbidden_words=forbidden_words,
     )
-    previous_version_id = previous.id if previous else None
-    new_version = (previous.version + 1) if previous else 1
-
-    llm_payload = {
-        "user_id": user_id,
-        "identity_model_id": identity_model_id,
-        # 可选词汇提示，由调用方传入用于引导输出风格。
-        "hint_common_words": common_words or [],
-        "hint_forbidden_words": forbidden_words or [],
-    }
     # 先调用 LLM，再做严格解析，最后才落库。
     response_payload = get_llm_client().generate_json(
         operation="generate_constitution",
         system_prompt=PERSONA_CONSTITUTION_PROMPT,
         user_payload=llm_payload,
+        validate=_parse_constitution,
     )
     output = _parse_constitution(response_payload)
-
-    constitution = PersonaConstitution(
+    return _persist_constitution(
+        db,
         user_id=user_id,
         identity_model_id=identity_model_id,
-        common_words_json=json.dumps(output.common_words, ensure_ascii=False),
-        forbidden_words_json=json.dumps(output.forbidden_words, ensure_ascii=False),
-        sentence_preferences_json=json.dumps(output.sentence_preferences, ensure_ascii=False),
-        moat_positions_json=json.dumps(output.moat_positions, ensure_ascii=False),
-        narrative_mainline=output.narrative_mainline,
-        growth_arc_template=output.growth_arc_template,
-        version=new_version,
+        output=output,
         previous_version_id=previous_version_id,
+        new_version=new_version,
+    )
+
+
+async def generate_constitution_async(
+    db: AsyncSession,
+    user_id: str,
+    identity_model_id: str | None = None,
+    common_words: list[str] | None = None,
+    forbidden_words: list[str] | None = None,
+) -> PersonaConstitution:
+    """Async variant of generate_constitution; LLM 调用在事件循环内等待，不占用线程。"""
+    previous_version_id, new_version = await db.run_sync(
+        lambda session: _next_constitution_version(session, user_id)
+    )
+    llm_payload = _build_constitution_payload(
+        user_id=user_id,
+        identity_model_id=identity_model_id,
+        common_words=common_words,
+        forbidden_words=forbidden_words,
+    )
+    response_payload = await get_async_llm_client().generate_json(
+        operation="generate_constitution",
+        system_prompt=PERSONA_CONSTITUTION_PROMPT,
+        user_payload=llm_payload,
+        validate=_parse_constitution,
+    )
+    output = _parse_constitution(response_payload)
+    return await db.run_sync(
+        lambda session: _persist_constitution(
+            session,
+            user_id=user_id,
+            identity_model_id=identity_model_id,
+            output=output,
+            previous_version_id=previous_version_id,
+            new_version=new_version,
+        )
     )
-    db.add(constitution)
-    # 一次提交，保证内容与版本链同时生效。
-    db.commit()
-    db.refresh(constitution)
-    return constitution
 
 
 def get_user_constitutions(db: Session, user_id: str) -> list[PersonaConstitution]:
@@ -162,6 +239,7 @@ def create_risk_boundary(
     identity_model_id: str | None = None,
     constitution_id: str | None = None,
     source: str = "user_input",
+    keywords: list[str] | None = None,
 ) -> RiskBoundaryItem:
     """Create a risk boundary item."""
     item = RiskBoundaryItem(
@@ -171,10 +249,12 @@ def create_risk_boundary(
         risk_level=risk_level,
         boundary_type=boundary_type,
         statement=statement,
+        keywords_json=[keyword.strip() for keyword in keywords or [] if keyword.strip()],
         source=source,
     )
     db.add(item)
     db.commit()
+    invalidate_user_context(user_id)
     db.refresh(item)
     return item
 
@@ -182,3 +262,39 @@ def create_risk_boundary(
 def get_user_risk_boundaries(db: Session, user_id: str) -> list[RiskBoundaryItem]:
     """Get all risk boundaries for a user."""
     return db.query(RiskBoundaryItem).filter(RiskBoundaryItem.user_id == user_id).all()
+
+
+def get_user_constitutions_page(
+    db: Session,
+    user_id: str,
+    *,
+    limit: int,
+    cursor: str | None = None,
+) -> Page[PersonaConstitution]:
+    """One page of a user's persona constitutions, newest first."""
+    query = apply_keyset(
+        db.query(PersonaConstitution).filter(PersonaConstitution.user_id == user_id),
+        PersonaConstitution.created_at,
+        PersonaConstitution.id,
+        limit=limit,
+        cursor=cursor,
+    )
+    return build_page(query.all(), limit=limit)
+
+
+def get_user_risk_boundaries_page(
+    db: Session,
+    user_id: str,
+    *,
+    limit: int,
+    cursor: str | None = None,
+) -> Page[RiskBoundaryItem]:
+    """One page of a user's risk boundaries, newest first."""
+    query = apply_keyset(
+        db.query(RiskBoundaryItem).filter(RiskBoundaryItem.user_id == user_id),
+        RiskBoundaryItem.created_at,
+        RiskBoundaryItem.id,
+        limit=limit,
+        cursor=cursor,
+    )
+    return build_page(query.all(), limit=limit)
@@ -0,0 +1,279 @@
+"""基于 ValidationError 定位的 LLM 输出定向修复。"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from pydantic import ValidationError
+
+from app.services.llm_client import LLMServiceError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_PATH_TOKEN_PATTERN = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+
+FRAGMENT_RESPONSE_CONTRACT = """
+定向修复输出约定（targeted repair）：
+- 你会收到 original_user_payload、fragments、validation_errors。
+- fragments 的 key 为 JSON 路径（例如 days[3]、score），value 为该路径当前的无效值（缺失时为 null）。
+- 只重新生成 fragments 中列出的路径，不要输出其他部分。
+- 返回严格 JSON：{"fragments": {"<path>": <修复后的值>, ...}}，key 必须与输入完全一致。
+- 不要输出 markdown、说明性文字、注释或代码块围栏。
+""".strip()
+
+
+@dataclass
+class TargetedRepairPlan:
+    """需要重新生成的片段：路径 -> 当前值，以及每个路径对应的校验错误。"""
+
+    fragments: dict[str, Any] = field(default_factory=dict)
+    errors: dict[str, list[str]] = field(default_factory=dict)
+
+
+def format_path(loc: tuple[str | int, ...]) -> str:
+    """把 pydantic loc 转成 ``days[3].draft_or_outline`` 形式的路径。"""
+    text = ""
+    for part in loc:
+        if isinstance(part, int):
+            text += f"[{part}]"
+        elif text:
+            text += f".{part}"
+        else:
+            text = str(part)
+    return text
+
+
+def parse_path(path: str) -> tuple[str | int, ...]:
+    tokens: list[str | int] = []
+    for name, index in _PATH_TOKEN_PATTERN.findall(path):
+        tokens.append(int(index) if index else name)
+    return tuple(tokens)
+
+
+def _fragment_loc(loc: tuple[str | int, ...]) -> tuple[str | int, ...] | None:
+    # 列表元素以整个对象为修复单位（如 days[3]），其余以顶层字段为单位。
+    if not loc:
+        return None
+    for position, part in enumerate(loc):
+        if isinstance(part, int):
+            return loc[: position + 1]
+    return loc[:1]
+
+
+def _lookup(payload: Any, loc: tuple[str | int, ...]) -> Any:
+    current = payload
+    for part in loc:
+        if isinstance(part, int):
+            if not isinstance(current, list) or part >= len(current):
+                return None
+        elif not isinstance(current, dict) or part not in current:
+            return None
+        current = current[part]
+    return copy.deepcopy(current)
+
+
+def plan_targeted_repair(payload: dict[str, Any], error: ValidationError) -> TargetedRepairPlan | None:
+    """
+    根据 ValidationError 的 loc 收集需要重新生成的片段。
+
+    存在模型级错误（loc 为空，如条数/唯一性等跨字段规则）时返回 None，由调用方走整体修复。
+    """
+    plan = TargetedRepairPlan()
+    for item in error.errors():
+        fragment_loc = _fragment_loc(tuple(item.get("loc", ())))
+        if fragment_loc is None:
+            return None
+        path = format_path(fragment_loc)
+        if path not in plan.fragments:
+            plan.fragments[path] = _lookup(payload, fragment_loc)
+            plan.errors[path] = []
+        detail_path = format_path(tuple(item.get("loc", ())))
+        plan.errors[path].append(f"{detail_path}: {item.get('msg', 'invalid value')}")
+    return plan if plan.fragments else None
+
+
+def apply_targeted_repair(
+    payload: dict[str, Any],
+    plan: TargetedRepairPlan,
+    response: dict[str, Any],
+) -> dict[str, Any]:
+    """
+    把修复结果拼回原始响应。
+
+    若 LLM 未按约定返回 ``fragments``，则把整个响应视为完整候选结果。
+    """
+    fragments = response.get("fragments")
+    if not isinstance(fragments, dict):
+        return response
+
+    merged = copy.deepcopy(payload)
+    for path in plan.fragments:
+        if path not in fragments:
+            continue
+        loc = parse_path(path)
+        parent: Any = merged
+        try:
+            for part in loc[:-1]:
+                parent = parent[part]
+            last = loc[-1]
+            if isinstance(last, int):
+                while len(parent) <= last:
+                    parent.append(None)
+            parent[last] = fragments[path]
+        except (KeyError, IndexError, TypeError):
+            # 原响应结构已无法容纳该片段时跳过，交给下一轮校验处理。
+            continue
+    return merged
+
+
+def _schema_validation_cause(error: LLMServiceError) -> ValidationError | None:
+    cause = error.__cause__
+    return cause if isinstance(cause, ValidationError) else None
+
+
+def _validation_error_brief(error_message: str) -> str:
+    non_empty_lines = [line.strip() for line in (error_message or "").splitlines() if line.strip()]
+    first_line = non_empty_lines[0] if non_empty_lines else "unknown"
+    return first_line[:200]
+
+
+def _repair_request(
+    *,
+    operation: str,
+    attempt: int,
+    original_user_payload: dict[str, Any],
+    last_payload: dict[str, Any],
+    last_error: LLMServiceError,
+    full_repair_prompt: str,
+    targeted_repair_prompt: str,
+) -> tuple[str, dict[str, Any], TargetedRepairPlan | None]:
+    """构造一轮修复请求，返回 (system_prompt, user_payload, 定向修复计划)；无法定位时计划为 None。"""
+    cause = _schema_validation_cause(last_error)
+    plan = plan_targeted_repair(last_payload, cause) if cause is not None else None
+    logger.warning(
+        "schema_retry operation=%s schema_retry_attempt=%s validation_error_brief=%s degraded=%s repair_mode=%s",
+        operation,
+        attempt,
+        _validation_error_brief(last_error.message),
+        False,
+        "targeted" if plan is not None else "full",
+    )
+    if plan is not None:
+        return (
+            targeted_repair_prompt,
+            {
+                "original_user_payload": original_user_payload,
+                "fragments": plan.fragments,
+                "validation_errors": plan.errors,
+            },
+            plan,
+        )
+    return (
+        full_repair_prompt,
+        {
+            "original_user_payload": original_user_payload,
+            "previous_invalid_response": last_payload,
+            "validation_error": last_error.message,
+        },
+        None,
+    )
+
+
+def repair_llm_output(
+    *,
+    llm_client: Any,
+    operation: str,
+    original_user_payload: dict[str, Any],
+    invalid_payload: dict[str, Any],
+    validation_error: LLMServiceError,
+    parse: Callable[[dict[str, Any]], T],
+    full_repair_prompt: str,
+    targeted_repair_prompt: str,
+    max_retries: int,
+) -> tuple[T, int]:
+    """
+    执行 schema 修复，返回 (解析结果, 修复次数)。
+
+    优先按 ValidationError 定位只重新生成出错片段并拼回；无法定位时退回整体修复。
+    重试耗尽时抛出最后一次的 schema 校验错误，由调用方决定失败或降级。
+    ``parse`` 需在校验失败时抛出 code 为 LLM_SCHEMA_VALIDATION_FAILED 的错误，
+    并以 ``raise ... from ValidationError`` 保留原始校验异常。
+    """
+    last_error = validation_error
+    last_payload = invalid_payload
+    for attempt in range(1, max_retries + 1):
+        system_prompt, user_payload, plan = _repair_request(
+            operation=operation,
+            attempt=attempt,
+            original_user_payload=original_user_payload,
+            last_payload=last_payload,
+            last_error=last_error,
+            full_repair_prompt=full_repair_prompt,
+            targeted_repair_prompt=targeted_repair_prompt,
+        )
+        response_payload = llm_client.generate_json(
+            operation=operation,
+            system_prompt=system_prompt,
+            user_payload=user_payload,
+        )
+        candidate = apply_targeted_repair(last_payload, plan, response_payload) if plan is not None else response_payload
+
+        try:
+            return parse(candidate), attempt
+        except LLMServiceError as exc:
+            if exc.code != "LLM_SCHEMA_VALIDATION_FAILED":
+                raise
+            last_error = exc
+            last_payload = candidate
+
+    raise last_error
+
+
+async def repair_llm_output_async(
+    *,
+    llm_client: Any,
+    operation: str,
+    original_user_payload: dict[str, Any],
+    invalid_payload: dict[str, Any],
+    validation_error: LLMServiceError,
+    parse: Callable[[dict[str, Any]], T],
+    full_repair_prompt: str,
+    targeted_repair_prompt: str,
+    max_retries: int,
+) -> tuple[T, int]:
+    """repair_llm_output 的异步版本，llm_client 为 AsyncLLMClient。"""
+    last_error = validation_error
+    last_payload = invalid_payload
+    for attempt in range(1, max_retries + 1):
+        system_prompt, user_payload, plan = _repair_request(
+            operation=operation,
+            attempt=attempt,
+            original_user_payload=original_user_payload,
+            last_payload=last_payload,
+            last_error=last_error,
+            full_repair_prompt=full_repair_prompt,
+            targeted_repair_prompt=targeted_repair_prompt,
+        )
+        response_payload = await llm_client.generate_json(
+            operation=operation,
+            system_prompt=system_prompt,
+            user_payload=user_payload,
+        )
+        candidate = apply_targeted_repair(last_payload, plan, response_payload) if plan is not None else response_payload
+
+        try:
+            return parse(candidate), attempt
+        except LLMServiceError as exc:
+            if exc.code != "LLM_SCHEMA_VALIDATION_FAILED":
+                raise
+            last_error = exc
+            last_payload = candidate
+
+    raise last_error
@@ -0,0 +1,67 @@
+"""Add draft_hash/score/degraded to consistency_checks for result reuse
+
+Revision ID: 0003_consistency_draft_hash
+Revises: 0002_mvp_full
+Create Date: 2026-10-17 09:00:00.000000
+"""
+
+import hashlib
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_consistency_draft_hash"
+down_revision: Union[str, Sequence[str], None] = "0002_mvp_full"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def _draft_hash(draft_text: str | None) -> str:
+    # 与 app.services.consistency_check.compute_draft_hash 保持一致；迁移内联实现，避免依赖应用代码。
+    normalized = _WHITESPACE_PATTERN.sub(" ", draft_text or "").strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column("consistency_checks", sa.Column("draft_hash", sa.String(length=64), nullable=True))
+    op.add_column("consistency_checks", sa.Column("score", sa.Integer(), nullable=True))
+    op.add_column(
+        "consistency_checks",
+        sa.Column("degraded", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+    # 回填历史行的 draft_hash；历史行没有 score，不会被结果复用命中。
+    connection = op.get_bind()
+    consistency_checks = sa.table(
+        "consistency_checks",
+        sa.column("id", sa.String(length=36)),
+        sa.column("draft_text", sa.Text()),
+        sa.column("draft_hash", sa.String(length=64)),
+    )
+    rows = connection.execute(sa.select(consistency_checks.c.id, consistency_checks.c.draft_text)).all()
+    if rows:
+        connection.execute(
+            consistency_checks.update()
+            .where(consistency_checks.c.id == sa.bindparam("row_id"))
+            .values(draft_hash=sa.bindparam("row_hash")),
+            [{"row_id": row.id, "row_hash": _draft_hash(row.draft_text)} for row in rows],
+        )
+
+    op.create_index(
+        "ix_consistency_checks_draft_lookup",
+        "consistency_checks",
+        ["user_id", "constitution_id", "identity_model_id", "draft_hash"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_consistency_checks_draft_lookup", table_name="consistency_checks")
+    with op.batch_alter_table("consistency_checks") as batch_op:
+        batch_op.drop_column("degraded")
+        batch_op.drop_column("score")
+        batch_op.drop_column("draft_hash")
@@ -0,0 +1,27 @@
+"""Add segments_json to consistency_checks for incremental re-checks
+
+Revision ID: 0004_consistency_segments
+Revises: 0003_consistency_draft_hash
+Create Date: 2026-10-17 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_consistency_segments"
+down_revision: Union[str, Sequence[str], None] = "0003_consistency_draft_hash"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 历史行不回填：没有段落级结果的行不会被增量检查复用。
+    op.add_column("consistency_checks", sa.Column("segments_json", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("consistency_checks") as batch_op:
+        batch_op.drop_column("segments_json")
@@ -0,0 +1,39 @@
+"""Add (owner, created_at, id) composite indexes for keyset pagination
+
+Revision ID: 0005_list_pagination_indexes
+Revises: 0004_consistency_segments
+Create Date: 2026-10-17 11:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_list_pagination_indexes"
+down_revision: Union[str, Sequence[str], None] = "0004_consistency_segments"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 索引名 -> (表名, 列)；列顺序与列表接口的过滤列 + keyset 排序列一致。
+_INDEXES: dict[str, tuple[str, list[str]]] = {
+    "ix_launch_kits_user_created": ("launch_kits", ["user_id", "created_at", "id"]),
+    "ix_consistency_checks_user_created": ("consistency_checks", ["user_id", "created_at", "id"]),
+    "ix_persona_constitutions_user_created": ("persona_constitutions", ["user_id", "created_at", "id"]),
+    "ix_risk_boundary_items_user_created": ("risk_boundary_items", ["user_id", "created_at", "id"]),
+    "ix_capability_profiles_user_created": ("capability_profiles", ["user_id", "created_at", "id"]),
+    "ix_identity_models_user_created": ("identity_models", ["user_id", "created_at", "id"]),
+    "ix_event_logs_user_occurred": ("event_logs", ["user_id", "occurred_at", "id"]),
+    "ix_event_logs_name_occurred": ("event_logs", ["event_name", "occurred_at", "id"]),
+    "ix_event_logs_occurred": ("event_logs", ["occurred_at", "id"]),
+}
+
+
+def upgrade() -> None:
+    for index_name, (table_name, columns) in _INDEXES.items():
+        op.create_index(index_name, table_name, columns)
+
+
+def downgrade() -> None:
+    for index_name, (table_name, _columns) in reversed(list(_INDEXES.items())):
+        op.drop_index(index_name, table_name=table_name)
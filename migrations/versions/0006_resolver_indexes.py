@@ -0,0 +1,50 @@
+"""Add composite indexes for context resolver lookups
+
+Revision ID: 0006_resolver_indexes
+Revises: 0005_list_pagination_indexes
+Create Date: 2026-10-17 12:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_resolver_indexes"
+down_revision: Union[str, Sequence[str], None] = "0005_list_pagination_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 索引名 -> (表名, 列)；列顺序为 等值过滤列 + ORDER BY 列。
+# 排序全部为同向 DESC，数据库可反向扫描升序索引，无需单独声明 DESC。
+# (user_id, created_at, id) 与 event_logs(user_id, occurred_at, id) 已由 0005 提供。
+_INDEXES: dict[str, tuple[str, list[str]]] = {
+    "ix_persona_constitutions_user_version": (
+        "persona_constitutions",
+        ["user_id", "version", "created_at"],
+    ),
+    "ix_persona_constitutions_identity_version": (
+        "persona_constitutions",
+        ["user_id", "identity_model_id", "version", "created_at"],
+    ),
+    "ix_risk_boundary_items_constitution_created": (
+        "risk_boundary_items",
+        ["user_id", "constitution_id", "created_at", "id"],
+    ),
+    "ix_risk_boundary_items_identity_created": (
+        "risk_boundary_items",
+        ["user_id", "identity_model_id", "created_at", "id"],
+    ),
+    "ix_identity_selections_user_selected": ("identity_selections", ["user_id", "selected_at"]),
+    "ix_capability_profiles_user_session": ("capability_profiles", ["user_id", "session_id"]),
+}
+
+
+def upgrade() -> None:
+    for index_name, (table_name, columns) in _INDEXES.items():
+        op.create_index(index_name, table_name, columns)
+
+
+def downgrade() -> None:
+    for index_name, (table_name, _columns) in reversed(list(_INDEXES.items())):
+        op.drop_index(index_name, table_name=table_name)
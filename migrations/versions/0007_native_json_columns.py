@@ -0,0 +1,114 @@
+"""Convert *_json Text columns to native JSON (SQLite JSON1 / Postgres JSONB)
+
+Revision ID: 0007_native_json_columns
+Revises: 0006_resolver_indexes
+Create Date: 2026-10-17 13:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_native_json_columns"
+down_revision: Union[str, Sequence[str], None] = "0006_resolver_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 表名 -> {列名: 空值/非法 JSON 的回填值}；回填值为 None 表示保持 NULL。
+_COLUMNS: dict[str, dict[str, str | None]] = {
+    "capability_profiles": {
+        "skill_stack_json": "[]",
+        "interest_energy_curve_json": "[]",
+        "value_boundaries_json": "[]",
+    },
+    "identity_models": {
+        "content_pillars_json": "[]",
+        "tone_keywords_json": "[]",
+        "tone_examples_json": "[]",
+        "long_term_views_json": "[]",
+        "monetization_validation_order_json": "[]",
+        "risk_boundary_json": "[]",
+    },
+    "persona_constitutions": {
+        "common_words_json": "[]",
+        "forbidden_words_json": "[]",
+        "sentence_preferences_json": "[]",
+        "moat_positions_json": "[]",
+    },
+    "launch_kits": {
+        "sustainable_columns_json": "[]",
+        "growth_experiment_suggestion_json": "[]",
+    },
+    "consistency_checks": {
+        "deviation_items_json": "[]",
+        "deviation_reasons_json": "[]",
+        "suggestions_json": "[]",
+        "segments_json": None,
+    },
+    "event_logs": {
+        "payload_json": "{}",
+    },
+}
+
+
+def _upgrade_sqlite() -> None:
+    # SQLite 的 JSON 列按文本存储，旧数据无需转换；只把 NULL/非法文本规整为合法 JSON，读出时即为数组/对象。
+    for table_name, columns in _COLUMNS.items():
+        for column_name, fallback in columns.items():
+            if fallback is None:
+                op.execute(
+                    f"UPDATE {table_name} SET {column_name} = NULL "
+                    f"WHERE {column_name} IS NOT NULL AND json_valid({column_name}) = 0"
+                )
+            else:
+                op.execute(
+                    f"UPDATE {table_name} SET {column_name} = '{fallback}' "
+                    f"WHERE {column_name} IS NULL OR json_valid({column_name}) = 0"
+                )
+        with op.batch_alter_table(table_name) as batch_op:
+            for column_name in columns:
+                batch_op.alter_column(column_name, existing_type=sa.Text(), type_=sa.JSON())
+
+
+def _upgrade_postgresql() -> None:
+    for table_name, columns in _COLUMNS.items():
+        for column_name, fallback in columns.items():
+            empty = "NULL" if fallback is None else f"'{fallback}'::jsonb"
+            op.alter_column(
+                table_name,
+                column_name,
+                existing_type=sa.Text(),
+                type_=postgresql.JSONB(),
+                postgresql_using=(
+                    f"CASE WHEN {column_name} IS NULL OR btrim({column_name}) = '' "
+                    f"THEN {empty} ELSE {column_name}::jsonb END"
+                ),
+            )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _upgrade_postgresql()
+    else:
+        _upgrade_sqlite()
+
+
+def downgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+    for table_name, columns in reversed(list(_COLUMNS.items())):
+        if is_postgresql:
+            for column_name in columns:
+                op.alter_column(
+                    table_name,
+                    column_name,
+                    existing_type=postgresql.JSONB(),
+                    type_=sa.Text(),
+                    postgresql_using=f"{column_name}::text",
+                )
+            continue
+        with op.batch_alter_table(table_name) as batch_op:
+            for column_name in columns:
+                batch_op.alter_column(column_name, existing_type=sa.JSON(), type_=sa.Text())
@@ -0,0 +1,51 @@
+"""Add generation_jobs table for background LLM generation
+
+Revision ID: 0008_generation_jobs
+Revises: 0007_native_json_columns
+Create Date: 2026-10-17 14:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0008_generation_jobs"
+down_revision: Union[str, Sequence[str], None] = "0007_native_json_columns"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_JSON = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "generation_jobs",
+        sa.Column("id", sa.String(length=36), nullable=False),
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("operation", sa.String(length=50), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("request_json", _JSON, nullable=True),
+        sa.Column("result_json", _JSON, nullable=True),
+        sa.Column("error_json", _JSON, nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_generation_jobs_user_created", "generation_jobs", ["user_id", "created_at", "id"])
+    # 启动恢复按状态扫描未完成任务。
+    op.create_index("ix_generation_jobs_status_created", "generation_jobs", ["status", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_generation_jobs_status_created", table_name="generation_jobs")
+    op.drop_index("ix_generation_jobs_user_created", table_name="generation_jobs")
+    op.drop_table("generation_jobs")
@@ -0,0 +1,44 @@
+"""Add idempotency_records table for generation endpoints
+
+Revision ID: 0009_idempotency_records
+Revises: 0008_generation_jobs
+Create Date: 2026-10-17 15:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0009_idempotency_records"
+down_revision: Union[str, Sequence[str], None] = "0008_generation_jobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "idempotency_records",
+        sa.Column("user_id", sa.String(length=36), nullable=False),
+        sa.Column("operation", sa.String(length=50), nullable=False),
+        sa.Column("idempotency_key", sa.String(length=255), nullable=False),
+        sa.Column("request_hash", sa.String(length=64), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("response_status", sa.Integer(), nullable=True),
+        sa.Column("response_json", sa.JSON().with_variant(postgresql.JSONB(), "postgresql"), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        # 复合主键的前缀 user_id 同时支撑按用户清理过期记录。
+        sa.PrimaryKeyConstraint("user_id", "operation", "idempotency_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("idempotency_records")
@@ -0,0 +1,26 @@
+"""Add heartbeat_at lease column to generation_jobs
+
+Revision ID: 0010_generation_job_lease
+Revises: 0009_idempotency_records
+Create Date: 2026-10-17 18:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0010_generation_job_lease"
+down_revision: Union[str, Sequence[str], None] = "0009_idempotency_records"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 执行中的任务由所在进程定期续约；租约过期的 running 任务才视为进程崩溃遗留。
+    op.add_column("generation_jobs", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("generation_jobs", "heartbeat_at")
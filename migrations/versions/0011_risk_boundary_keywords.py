@@ -0,0 +1,32 @@
+"""Add keywords_json to risk_boundary_items for local precheck
+
+Revision ID: 0011_risk_boundary_keywords
+Revises: 0010_generation_job_lease
+Create Date: 2026-10-17 20:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0011_risk_boundary_keywords"
+down_revision: Union[str, Sequence[str], None] = "0010_generation_job_lease"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 历史条目回填空数组：仍只按 statement 中引号标注的词参与预检。
+    json_type = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+    op.add_column(
+        "risk_boundary_items",
+        sa.Column("keywords_json", json_type, nullable=True, server_default=sa.text("'[]'")),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("risk_boundary_items") as batch_op:
+        batch_op.drop_column("keywords_json")
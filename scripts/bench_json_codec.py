@@ -0,0 +1,111 @@
+"""JSON 编解码微基准：对比标准库 json 与 app.core.json_codec 当前后端。
+
+用法：python scripts/bench_json_codec.py --number 2000
+
+载荷按典型接口响应构造：一次生成的 3 个身份模型、一个 7 天启动包（含每日正文）；
+输出每种载荷的字节数，以及 dumps/loads 单次耗时（微秒）与相对标准库的加速比。
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import sys
+import timeit
+from typing import Any, Callable
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core import json_codec  # noqa: E402
+
+
+def _identity_models_payload() -> dict[str, Any]:
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc).isoformat()
+    models = []
+    for index in range(3):
+        models.append(
+            {
+                "id": f"00000000-0000-0000-0000-00000000000{index}",
+                "user_id": "00000000-0000-0000-0000-0000000000aa",
+                "session_id": "00000000-0000-0000-0000-0000000000bb",
+                "title": f"职场成长记录者 {index + 1}",
+                "target_audience_pain": "刚入职两三年、想转型但缺少方向的年轻职场人，担心试错成本太高。",
+                "content_pillars_json": ["职场成长", "副业实验", "效率工具", "复盘方法"],
+                "tone_keywords_json": ["真诚", "克制", "有数据", "不说教"],
+                "tone_examples_json": [f"示例句子 {n}：先讲结论，再给可以照做的步骤。" for n in range(5)],
+                "long_term_views_json": [f"长期观点 {n}：小步快跑比一次押注更可持续。" for n in range(5)],
+                "differentiation": "用真实副业账本说话，每周公开收入与时间投入。",
+                "growth_path_0_3m": "0-3 个月：稳定周更，验证两个内容支柱。",
+                "growth_path_3_12m": "3-12 个月：沉淀模板与课程，建立私域。",
+                "monetization_validation_order_json": ["咨询", "模板", "训练营"],
+                "risk_boundary_json": ["不承诺收益", "不晒未经授权的公司信息"],
+                "is_primary": index == 0,
+                "is_backup": index == 1,
+                "created_at": created_at,
+            }
+        )
+    return {"models": models}
+
+
+def _launch_kit_payload() -> dict[str, Any]:
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc).isoformat()
+    days = [
+        {
+            "id": f"00000000-0000-0000-0000-0000000001{day_no:02d}",
+            "day_no": day_no,
+            "theme": f"第 {day_no} 天：从一次失败的副业实验说起",
+            "draft_or_outline": "今天分享一个真实的复盘。" * 60,
+            "opening_text": "先说结论：不要在没有验证需求之前投入大块时间。",
+            "created_at": created_at,
+        }
+        for day_no in range(1, 8)
+    ]
+    return {
+        "id": "00000000-0000-0000-0000-000000000100",
+        "user_id": "00000000-0000-0000-0000-0000000000aa",
+        "identity_model_id": "00000000-0000-0000-0000-000000000000",
+        "constitution_id": None,
+        "sustainable_columns_json": ["周复盘", "工具清单", "读者问答"],
+        "growth_experiment_suggestion_json": [
+            {"name": f"实验 {n}", "hypothesis": "标题带具体数字能提升打开率", "metric": "打开率"}
+            for n in range(3)
+        ],
+        "days": days,
+        "created_at": created_at,
+    }
+
+
+def _time_us(func: Callable[[], Any], number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1_000_000
+
+
+def _run_payload(label: str, payload: dict[str, Any], *, number: int) -> None:
+    text = json.dumps(payload, ensure_ascii=False)
+    encoded = text.encode("utf-8")
+    stdlib_dumps = _time_us(lambda: json.dumps(payload, ensure_ascii=False).encode("utf-8"), number)
+    codec_dumps = _time_us(lambda: json_codec.dumps_bytes(payload), number)
+    stdlib_loads = _time_us(lambda: json.loads(encoded), number)
+    codec_loads = _time_us(lambda: json_codec.loads(encoded), number)
+    print(
+        f"{label:<16} bytes={len(encoded):>6} "
+        f"dumps_us stdlib={stdlib_dumps:>7.1f} codec={codec_dumps:>7.1f} x{stdlib_dumps / codec_dumps:>5.1f}  "
+        f"loads_us stdlib={stdlib_loads:>7.1f} codec={codec_loads:>7.1f} x{stdlib_loads / codec_loads:>5.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"json_codec backend={json_codec.BACKEND}")
+    _run_payload("identity_models", _identity_models_payload(), number=args.number)
+    _run_payload("launch_kit", _launch_kit_payload(), number=args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""SQLite 连接 profile 并发读写基准：对比驱动默认配置与 SQLITE_* 配置。
+
+用法：python scripts/bench_sqlite_profile.py --seconds 5 --writers 4 --readers 8
+
+写线程模拟 log_event（每次插入一行事件并单独提交），读线程模拟列表查询；
+输出两种配置下的读写吞吐、写入 p95 延迟与 "database is locked" 次数。
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+import app.models  # noqa: E402,F401
+from app.core.config import Settings  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import create_app_engine  # noqa: E402
+from app.models.consistency_check import EventLog  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+def _run_profile(label: str, settings: Settings, *, seconds: float, writers: int, readers: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_app_engine(f"sqlite:///{Path(tmp_dir, 'bench.db').as_posix()}", settings)
+        Base.metadata.create_all(bind=engine)
+        session_local = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
+        with session_local() as db:
+            user = User()
+            db.add(user)
+            db.commit()
+            user_id = user.id
+
+        stop_at = time.perf_counter() + seconds
+        lock = threading.Lock()
+        stats = {"writes": 0, "reads": 0, "locked": 0}
+        write_latencies: list[float] = []
+
+        def _writer() -> None:
+            while time.perf_counter() < stop_at:
+                started = time.perf_counter()
+                try:
+                    with session_local() as db:
+                        db.add(EventLog(user_id=user_id, event_name="content_published", stage="MVP"))
+                        db.commit()
+                except OperationalError:
+                    with lock:
+                        stats["locked"] += 1
+                    continue
+                with lock:
+                    stats["writes"] += 1
+                    write_latencies.append(time.perf_counter() - started)
+
+        def _reader() -> None:
+            while time.perf_counter() < stop_at:
+                try:
+                    with session_local() as db:
+                        db.query(EventLog).filter(EventLog.user_id == user_id).order_by(
+                            EventLog.occurred_at.desc()
+                        ).limit(50).all()
+                except OperationalError:
+                    with lock:
+                        stats["locked"] += 1
+                    continue
+                with lock:
+                    stats["reads"] += 1
+
+        threads = [threading.Thread(target=_writer) for _ in range(writers)]
+        threads += [threading.Thread(target=_reader) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    write_latencies.sort()
+    p95 = write_latencies[int(len(write_latencies) * 0.95) - 1] * 1000 if write_latencies else 0.0
+    print(
+        f"{label:<8} writes/s={stats['writes'] / seconds:>8.1f} reads/s={stats['reads'] / seconds:>8.1f} "
+        f"write_p95_ms={p95:>7.2f} locked={stats['locked']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args()
+
+    options = {"seconds": args.seconds, "writers": args.writers, "readers": args.readers}
+    _run_profile("default", Settings(sqlite_pragmas_enabled=False), **options)
+    _run_profile("profile", Settings(), **options)
+
+
+if __name__ == "__main__":
+    main()
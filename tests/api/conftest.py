@@ -8,12 +8,14 @@ from fastapi.testclient import TestClient
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
 import app.main as main_module
 import app.models  # noqa: F401
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.models.user import User
 
 
@@ -62,13 +64,28 @@ def api_context(monkeypatch, tmp_path) -> Iterator[ApiTestContext]:
         finally:
             db.close()
 
+    # TestClient 每个请求使用独立事件循环，异步引擎不复用连接。
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path.as_posix()}", poolclass=NullPool)
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+        class_=AsyncSession,
+    )
+
+    async def _override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
     main_module.app.dependency_overrides[get_db] = _override_get_db
+    main_module.app.dependency_overrides[get_async_db] = _override_get_async_db
     client = TestClient(main_module.app)
     try:
         yield ApiTestContext(client=client, session_local=SessionLocal, user_id=user_id)
     finally:
         client.close()
         main_module.app.dependency_overrides.clear()
+        async_engine.sync_engine.dispose()
         engine.dispose()
 
 
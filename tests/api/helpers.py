@@ -43,10 +43,10 @@ def create_capability_profile(
     profile = CapabilityProfile(
         session_id=session_id,
         user_id=user_id,
-        skill_stack_json=json.dumps(skill_stack or ["python"], ensure_ascii=False),
-        interest_energy_curve_json=json.dumps([{"topic": "tech", "score": 4}], ensure_ascii=False),
+        skill_stack_json=skill_stack or ["python"],
+        interest_energy_curve_json=[{"topic": "tech", "score": 4}],
         cognitive_style="structured",
-        value_boundaries_json=json.dumps(["no fake claims"], ensure_ascii=False),
+        value_boundaries_json=["no fake claims"],
         risk_tolerance=risk_tolerance,
         time_investment_hours=time_investment_hours,
     )
@@ -70,15 +70,15 @@ def create_identity_model(
         session_id=session_id,
         title=title,
         target_audience_pain="low output consistency",
-        content_pillars_json=json.dumps(["pillar1", "pillar2", "pillar3"], ensure_ascii=False),
-        tone_keywords_json=json.dumps(["calm", "clear"], ensure_ascii=False),
-        tone_examples_json=json.dumps(["e1", "e2", "e3", "e4", "e5"], ensure_ascii=False),
-        long_term_views_json=json.dumps(["v1", "v2", "v3", "v4", "v5"], ensure_ascii=False),
+        content_pillars_json=["pillar1", "pillar2", "pillar3"],
+        tone_keywords_json=["calm", "clear"],
+        tone_examples_json=["e1", "e2", "e3", "e4", "e5"],
+        long_term_views_json=["v1", "v2", "v3", "v4", "v5"],
         differentiation="data-backed iteration",
         growth_path_0_3m="weekly publishing",
         growth_path_3_12m="productized services",
-        monetization_validation_order_json=json.dumps(["lead", "pilot"], ensure_ascii=False),
-        risk_boundary_json=json.dumps(["no impersonation"], ensure_ascii=False),
+        monetization_validation_order_json=["lead", "pilot"],
+        risk_boundary_json=["no impersonation"],
         is_primary=is_primary,
         is_backup=is_backup,
     )
@@ -99,10 +99,10 @@ def create_persona_constitution(
     constitution = PersonaConstitution(
         user_id=user_id,
         identity_model_id=identity_model_id,
-        common_words_json=json.dumps(["focus", "iterate", "clarity"], ensure_ascii=False),
-        forbidden_words_json=json.dumps(["guarantee", "overnight", "secret"], ensure_ascii=False),
-        sentence_preferences_json=json.dumps(["short intro", "one claim", "one action"], ensure_ascii=False),
-        moat_positions_json=json.dumps(["evidence first", "ethics bound", "repeatability"], ensure_ascii=False),
+        common_words_json=["focus", "iterate", "clarity"],
+        forbidden_words_json=["guarantee", "overnight", "secret"],
+        sentence_preferences_json=["short intro", "one claim", "one action"],
+        moat_positions_json=["evidence first", "ethics bound", "repeatability"],
         narrative_mainline="Teach systems for steady creator growth.",
         growth_arc_template="Problem -> Method -> Evidence -> Next step",
         version=version,
@@ -152,8 +152,8 @@ def create_launch_kit(
         user_id=user_id,
         identity_model_id=identity_model_id,
         constitution_id=constitution_id,
-        sustainable_columns_json=json.dumps(["col1", "col2", "col3"], ensure_ascii=False),
-        growth_experiment_suggestion_json=json.dumps([{"name": "exp1"}], ensure_ascii=False),
+        sustainable_columns_json=["col1", "col2", "col3"],
+        growth_experiment_suggestion_json=[{"name": "exp1"}],
     )
     if created_at is not None:
         kit.created_at = created_at
@@ -187,9 +187,9 @@ def create_consistency_check(
         identity_model_id=identity_model_id,
         constitution_id=constitution_id,
         draft_text="draft text",
-        deviation_items_json=json.dumps(["item-1"], ensure_ascii=False),
-        deviation_reasons_json=json.dumps(["reason-1"], ensure_ascii=False),
-        suggestions_json=json.dumps(["suggestion-1"], ensure_ascii=False),
+        deviation_items_json=["item-1"],
+        deviation_reasons_json=["reason-1"],
+        suggestions_json=["suggestion-1"],
         risk_triggered=False,
         risk_warning="",
     )
@@ -213,7 +213,7 @@ def create_event_log(
         user_id=user_id,
         event_name=event_name,
         stage=stage,
-        payload_json=json.dumps(payload or {}, ensure_ascii=False),
+        payload_json=payload or {},
     )
     db.add(event)
     db.commit()
@@ -22,16 +22,21 @@ EXPECTED_ROUTES = {
     ("POST", "/v1/risk-boundaries"),
     ("GET", "/v1/risk-boundaries/users/{user_id}"),
     ("POST", "/v1/launch-kits/generate"),
+    ("POST", "/v1/launch-kits/generate/stream"),
     ("GET", "/v1/launch-kits/users/{user_id}"),
     ("GET", "/v1/launch-kits/users/{user_id}/latest"),
     ("GET", "/v1/launch-kits/{kit_id}"),
     ("POST", "/v1/consistency-checks"),
+    ("POST", "/v1/consistency-checks/batch"),
     ("GET", "/v1/consistency-checks/users/{user_id}"),
     ("GET", "/v1/consistency-checks/{check_id}"),
     ("POST", "/v1/events"),
+    ("POST", "/v1/events/batch"),
     ("GET", "/v1/events/users/{user_id}"),
     ("GET", "/v1/events/name/{event_name}"),
     ("GET", "/v1/events/recent"),
+    ("GET", "/v1/jobs/{job_id}"),
+    ("GET", "/v1/jobs/{job_id}/events"),
 }
 
 
@@ -49,5 +54,5 @@ def _collect_runtime_routes() -> set[tuple[str, str]]:
 
 def test_runtime_routes_match_v1_inventory() -> None:
     runtime_routes = _collect_runtime_routes()
-    assert len(runtime_routes) == 29
+    assert len(runtime_routes) == 34
     assert runtime_routes == EXPECTED_ROUTES
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import copy
+import threading
+
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.consistency_check import ConsistencyCheck, EventLog
+from app.services import consistency_check as consistency_service
+from app.services.llm_client import LLMServiceError
+from tests.api.helpers import create_persona_constitution, create_risk_boundary_item
+
+
+def _valid_check_payload(score: int) -> dict:
+    return {
+        "deviation_items": [f"item-{score}"],
+        "deviation_reasons": ["reason"],
+        "suggestions": ["suggestion"],
+        "risk_triggered": False,
+        "risk_warning": "",
+        "score": score,
+    }
+
+
+class _FakeDraftLLMClient:
+    """Responds per draft_text so concurrent calls stay deterministic."""
+
+    def __init__(self, payload_by_draft: dict[str, dict | LLMServiceError]) -> None:
+        self._payload_by_draft = payload_by_draft
+        self.calls: list[dict] = []
+        self._lock = threading.Lock()
+
+    def generate_json(self, *, operation: str, system_prompt: str, user_payload: dict, validate=None) -> dict:
+        with self._lock:
+            self.calls.append(copy.deepcopy(user_payload))
+        draft_text = user_payload.get("draft_text") or user_payload["original_user_payload"]["draft_text"]
+        payload = self._payload_by_draft[draft_text]
+        if isinstance(payload, LLMServiceError):
+            raise payload
+        return copy.deepcopy(payload)
+
+
+def test_batch_returns_results_in_input_order_with_per_item_errors(
+    client: TestClient,
+    session_local: sessionmaker,
+    user_id: str,
+    monkeypatch,
+) -> None:
+    with session_local() as db:
+        constitution = create_persona_constitution(db, user_id=user_id)
+        create_risk_boundary_item(db, user_id=user_id, constitution_id=constitution.id)
+
+    invalid = _valid_check_payload(50)
+    invalid["suggestions"] = []
+    fake_client = _FakeDraftLLMClient(
+        {
+            "draft-a": _valid_check_payload(90),
+            "draft-b": LLMServiceError(
+                code="LLM_UPSTREAM_TIMEOUT",
+                message="timed out",
+                operation="check_consistency",
+                retryable=True,
+                attempts=3,
+            ),
+            "draft-c": invalid,
+            "draft-d": _valid_check_payload(70),
+        }
+    )
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+
+    response = client.post(
+        "/v1/consistency-checks/batch",
+        json={"user_id": user_id, "drafts": ["draft-a", "draft-b", "draft-c", "draft-d"]},
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+
+    assert [item["index"] for item in results] == [0, 1, 2, 3]
+    assert [item["status"] for item in results] == ["ok", "error", "ok", "ok"]
+    assert results[0]["score"] == 90
+    assert results[1]["error"]["code"] == "LLM_UPSTREAM_TIMEOUT"
+    assert results[2]["degraded"] is True
+    assert results[3]["score"] == 70
+
+    first_payload = fake_client.calls[0]
+    assert first_payload["context_bundle"]["persona_constitution"]["id"] == constitution.id
+    assert first_payload["context_bundle"]["risk_boundaries"][0]["statement"] == "Do not fabricate results."
+
+    with session_local() as db:
+        rows = db.query(ConsistencyCheck).filter(ConsistencyCheck.user_id == user_id).all()
+        assert sorted(row.draft_text for row in rows) == ["draft-a", "draft-c", "draft-d"]
+        assert {row.id for row in rows} == {results[i]["id"] for i in (0, 2, 3)}
+        events = db.query(EventLog).filter(EventLog.event_name == "consistency_check_triggered").all()
+        assert len(events) == 1
+
+
+def test_batch_resolves_context_once(
+    client: TestClient,
+    user_id: str,
+    monkeypatch,
+) -> None:
+    fake_client = _FakeDraftLLMClient({f"d{i}": _valid_check_payload(80) for i in range(3)})
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+    original = consistency_service._resolve_check_context
+    resolve_calls: list[str] = []
+
+    def _counting_resolve(**kwargs):
+        resolve_calls.append(kwargs["user_id"])
+        return original(**kwargs)
+
+    monkeypatch.setattr(consistency_service, "_resolve_check_context", _counting_resolve)
+
+    response = client.post(
+        "/v1/consistency-checks/batch",
+        json={"user_id": user_id, "drafts": ["d0", "d1", "d2"]},
+    )
+
+    assert response.status_code == 200
+    assert resolve_calls == [user_id]
+    assert len(fake_client.calls) == 3
+
+
+def test_batch_reuses_prior_and_duplicate_drafts(
+    client: TestClient,
+    user_id: str,
+    monkeypatch,
+) -> None:
+    fake_client = _FakeDraftLLMClient({"old": _valid_check_payload(81), "new": _valid_check_payload(64)})
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+
+    first = client.post("/v1/consistency-checks", json={"user_id": user_id, "draft_text": "old"})
+    assert first.status_code == 200
+
+    response = client.post(
+        "/v1/consistency-checks/batch",
+        json={"user_id": user_id, "drafts": [" old ", "new", "new"]},
+    )
+    results = response.json()["results"]
+
+    assert [item["cached"] for item in results] == [True, False, True]
+    assert results[0]["id"] == first.json()["id"]
+    assert results[0]["score"] == 81
+    assert results[1]["id"] == results[2]["id"]
+    assert len(fake_client.calls) == 2
+
+
+@pytest.mark.parametrize("drafts, status_code", [([], 422), (["x"] * 21, 400)])
+def test_batch_rejects_empty_or_oversized_requests(
+    client: TestClient,
+    user_id: str,
+    drafts: list[str],
+    status_code: int,
+) -> None:
+    response = client.post("/v1/consistency-checks/batch", json={"user_id": user_id, "drafts": drafts})
+    assert response.status_code == status_code
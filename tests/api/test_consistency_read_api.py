@@ -39,3 +39,41 @@ def test_consistency_read_endpoints(
 def test_consistency_detail_not_found_returns_404(client: TestClient) -> None:
     response = client.get("/v1/consistency-checks/missing")
     assert response.status_code == 404
+
+
+def test_consistency_list_pages_with_cursor(
+    client: TestClient,
+    user_id: str,
+    session_local: sessionmaker,
+) -> None:
+    now = datetime.now(timezone.utc)
+    with session_local() as db:
+        # 两条同一时间戳，验证 id 作为次排序键不会漏行或重复。
+        created = [
+            create_consistency_check(db, user_id=user_id, created_at=now - timedelta(minutes=minutes))
+            for minutes in (0, 1, 1, 2, 3)
+        ]
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        response = client.get(f"/v1/consistency-checks/users/{user_id}", params=params)
+        assert response.status_code == 200
+        seen += [item["id"] for item in response.json()]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert sorted(seen) == sorted(check.id for check in created)
+    assert seen[0] == created[0].id
+    assert seen[-1] == created[-1].id
+
+
+def test_consistency_list_rejects_bad_cursor_and_limit(client: TestClient, user_id: str) -> None:
+    url = f"/v1/consistency-checks/users/{user_id}"
+    assert client.get(url, params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get(url, params={"limit": 101}).status_code == 422
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-import json
 
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import sessionmaker
 
+from app.core.config import get_settings
+from app.models.consistency_check import EventLog
+from app.services import event_sink as event_sink_module
 from tests.api.helpers import create_event_log
 
 
@@ -40,7 +42,7 @@ def test_events_create_and_query_endpoints(
     named_events = named_response.json()
     assert named_events
     assert all(item["event_name"] == "experiment_created" for item in named_events)
-    assert json.loads(named_events[0]["payload_json"])["hypothesis"] == "new CTA works"
+    assert named_events[0]["payload_json"]["hypothesis"] == "new CTA works"
 
     recent_response = client.get("/v1/events/recent", params={"limit": 10})
     assert recent_response.status_code == 200
@@ -82,3 +84,82 @@ def test_events_limit_query_validation_returns_422(client: TestClient, user_id:
     assert user_response.status_code == 422
     assert name_response.status_code == 422
     assert recent_response.status_code == 422
+
+
+def test_events_batch_returns_per_item_results(
+    client: TestClient,
+    user_id: str,
+    session_local: sessionmaker,
+) -> None:
+    response = client.post(
+        "/v1/events/batch",
+        json={
+            "events": [
+                {"user_id": user_id, "event_name": "content_published", "stage": "MVP"},
+                {"user_id": user_id, "event_name": "invalid_event", "stage": "MVP"},
+                {"user_id": user_id, "event_name": "experiment_created", "stage": "V9"},
+                {"user_id": "missing-user", "event_name": "content_published", "stage": "MVP"},
+                {
+                    "user_id": user_id,
+                    "event_name": "experiment_created",
+                    "stage": "V1",
+                    "payload": {"variant": "b"},
+                },
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["accepted"], body["rejected"]) == (2, 3)
+    assert [item["status"] for item in body["results"]] == [
+        "accepted",
+        "rejected",
+        "rejected",
+        "rejected",
+        "accepted",
+    ]
+    assert "Invalid event_name" in body["results"][1]["error"]
+    assert "Invalid stage" in body["results"][2]["error"]
+    assert "User not found" in body["results"][3]["error"]
+
+    with session_local() as db:
+        stored = {event.id: event for event in db.query(EventLog).filter(EventLog.user_id == user_id)}
+    assert set(stored) == {body["results"][0]["id"], body["results"][4]["id"]}
+    assert stored[body["results"][4]["id"]].payload_json == {"variant": "b"}
+
+
+def test_events_batch_rejects_empty_or_oversized_requests(client: TestClient, user_id: str, monkeypatch) -> None:
+    monkeypatch.setenv("EVENT_BATCH_MAX_ITEMS", "2")
+    get_settings.cache_clear()
+    event = {"user_id": user_id, "event_name": "content_published", "stage": "MVP"}
+
+    assert client.post("/v1/events/batch", json={"events": []}).status_code == 422
+    assert client.post("/v1/events/batch", json={"events": [event] * 3}).status_code == 400
+
+
+def test_buffered_event_from_async_route_is_written_after_flush(
+    client: TestClient,
+    user_id: str,
+    session_local: sessionmaker,
+    monkeypatch,
+) -> None:
+    monkeypatch.setenv("EVENT_LOG_MODE", "buffered")
+    monkeypatch.setenv("EVENT_LOG_FLUSH_INTERVAL_SECONDS", "60")
+    get_settings.cache_clear()
+    event_sink_module.shutdown_event_sink()
+    try:
+        response = client.post(
+            "/v1/events",
+            json={"user_id": user_id, "event_name": "content_published", "stage": "MVP", "payload": {}},
+        )
+        assert response.status_code == 200
+        event_id = response.json()["id"]
+
+        assert event_sink_module.get_event_sink().flush(timeout=5)
+        with session_local() as db:
+            stored = db.get(EventLog, event_id)
+        assert stored is not None
+        assert stored.event_name == "content_published"
+    finally:
+        event_sink_module.shutdown_event_sink()
@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+import threading
+import time
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.core import json_codec
+from app.db.session import to_async_database_url
+from app.models.consistency_check import EventLog
+from app.models.generation_job import GenerationJob
+from app.models.identity_model import IdentityModel
+from app.services import generation_jobs as job_service
+from app.services import identity_model as identity_service
+from app.services import persona as persona_service
+from app.services.llm_client import LLMServiceError
+
+
+@pytest.fixture(autouse=True)
+def _fresh_job_runner():
+    job_service.shutdown_generation_job_runner()
+    yield
+    job_service.shutdown_generation_job_runner()
+
+
+class _IdentityLLMClient:
+    def generate_json(self, *, operation: str, system_prompt: str, user_payload: dict, validate=None) -> dict:
+        return {
+            "models": [
+                {
+                    "title": "Async Identity",
+                    "target_audience_pain": "Pain",
+                    "content_pillars": ["P1", "P2", "P3"],
+                    "tone_keywords": ["k1", "k2"],
+                    "tone_examples": ["e1", "e2", "e3", "e4", "e5"],
+                    "long_term_views": ["v1", "v2", "v3", "v4", "v5"],
+                    "differentiation": "Diff",
+                    "growth_path_0_3m": "Plan 1",
+                    "growth_path_3_12m": "Plan 2",
+                    "monetization_validation_order": ["m1"],
+                    "risk_boundary": ["r1"],
+                }
+            ]
+        }
+
+
+def _fake_constitution(**kwargs) -> SimpleNamespace:
+    return SimpleNamespace(id="constitution-1", user_id=kwargs["user_id"], version=1, narrative_mainline="mainline")
+
+
+def test_async_identity_generation_returns_202_and_job_result(
+    client: TestClient,
+    user_id: str,
+    session_local: sessionmaker,
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(identity_service, "get_llm_client", lambda: _IdentityLLMClient())
+
+    response = client.post(
+        "/v1/identity-models/generate?async=true",
+        json={"user_id": user_id, "capability_profile": {"skill_stack": ["python"]}, "count": 3},
+    )
+
+    assert response.status_code == 202
+    job = response.json()
+    assert job["operation"] == "identity_models"
+    assert job["user_id"] == user_id
+    assert response.headers["location"] == f"/v1/jobs/{job['id']}"
+
+    finished = client.get(f"/v1/jobs/{job['id']}", params={"wait": 5})
+    assert finished.status_code == 200
+    body = finished.json()
+    assert body["status"] == "succeeded"
+    assert body["error_json"] is None
+    assert body["started_at"] is not None and body["finished_at"] is not None
+    assert [item["title"] for item in body["result_json"]] == ["Async Identity"] * 3
+
+    with session_local() as db:
+        stored_ids = {model.id for model in db.query(IdentityModel).filter(IdentityModel.user_id == user_id)}
+        events = db.query(EventLog).filter(EventLog.event_name == "identity_models_generated").count()
+    assert stored_ids == {item["id"] for item in body["result_json"]}
+    assert events == 1
+
+
+def test_async_generation_returns_before_llm_call_finishes(
+    client: TestClient,
+    user_id: str,
+    monkeypatch,
+) -> None:
+    release = threading.Event()
+
+    def _slow_generate(**kwargs):
+        assert release.wait(5)
+        return _fake_constitution(**kwargs)
+
+    monkeypatch.setattr(persona_service, "generate_constitution", _slow_generate)
+
+    response = client.post("/v1/persona-constitutions/generate?async=true", json={"user_id": user_id})
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    pending = client.get(f"/v1/jobs/{job_id}", params={"wait": 0.1})
+    assert pending.json()["status"] in {"queued", "running"}
+
+    release.set()
+    finished = client.get(f"/v1/jobs/{job_id}", params={"wait": 5})
+    assert finished.json()["status"] == "succeeded"
+    assert finished.json()["result_json"] == {
+        "id": "constitution-1",
+        "user_id": user_id,
+        "version": 1,
+        "narrative_mainline": "mainline",
+    }
+
+
+def test_async_generation_llm_error_is_stored_on_job(
+    client: TestClient,
+    user_id: str,
+    monkeypatch,
+) -> None:
+    def _raise_error(**_kwargs):
+        raise LLMServiceError(
+            code="LLM_UPSTREAM_TIMEOUT",
+            message="timed out",
+            operation="generate_constitution",
+            retryable=True,
+            attempts=3,
+        )
+
+    monkeypatch.setattr(persona_service, "generate_constitution", _raise_error)
+
+    response = client.post("/v1/persona-constitutions/generate?async=true", json={"user_id": user_id})
+    finished = client.get(f"/v1/jobs/{response.json()['id']}", params={"wait": 5})
+
+    body = finished.json()
+    assert body["status"] == "failed"
+    assert body["result_json"] is None
+    assert body["error_json"]["code"] == "LLM_UPSTREAM_TIMEOUT"
+    assert body["error_json"]["retryable"] is True
+
+
+def test_job_events_stream_ends_with_completed_event(
+    client: TestClient,
+    user_id: str,
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(persona_service, "generate_constitution", _fake_constitution)
+
+    job_id = client.post("/v1/persona-constitutions/generate?async=true", json={"user_id": user_id}).json()["id"]
+
+    with client.stream("GET", f"/v1/jobs/{job_id}/events") as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [frame for frame in response.read().decode("utf-8").split("\n\n") if frame]
+
+    events = [frame.split("\n")[0].removeprefix("event: ") for frame in frames]
+    assert events[-1] == "completed"
+    assert set(events[:-1]) <= {"status"}
+    final = json_codec.loads(frames[-1].split("\n")[1].removeprefix("data: "))
+    assert final["id"] == job_id
+    assert final["result_json"]["id"] == "constitution-1"
+
+
+def test_unknown_job_returns_404(client: TestClient) -> None:
+    assert client.get("/v1/jobs/missing-job").status_code == 404
+    assert client.get("/v1/jobs/missing-job", params={"wait": 0.1}).status_code == 404
+    assert client.get("/v1/jobs/missing-job/events").status_code == 404
+
+
+def test_execute_job_runs_each_job_once(user_id: str, session_local: sessionmaker, monkeypatch) -> None:
+    calls: list[str] = []
+
+    def _generate(**kwargs):
+        calls.append(kwargs["user_id"])
+        return _fake_constitution(**kwargs)
+
+    monkeypatch.setattr(persona_service, "generate_constitution", _generate)
+    with session_local() as db:
+        job = GenerationJob(
+            user_id=user_id,
+            operation="persona_constitution",
+            request_json={
+                "user_id": user_id,
+                "identity_model_id": None,
+                "common_words": [],
+                "forbidden_words": [],
+            },
+        )
+        db.add(job)
+        db.commit()
+        job_service.execute_job(db, job.id)
+        job_service.execute_job(db, job.id)
+        db.refresh(job)
+
+    assert calls == [user_id]
+    assert job.status == "succeeded"
+
+
+def test_recover_generation_jobs_requeues_queued_and_fails_expired_running(
+    user_id: str,
+    session_local: sessionmaker,
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(persona_service, "generate_constitution", _fake_constitution)
+    request = {"user_id": user_id, "identity_model_id": None, "common_words": [], "forbidden_words": []}
+    now = datetime.now(timezone.utc)
+    with session_local() as db:
+        queued = GenerationJob(user_id=user_id, operation="persona_constitution", request_json=request)
+        expired = GenerationJob(
+            user_id=user_id,
+            operation="persona_constitution",
+            status="running",
+            request_json=request,
+            heartbeat_at=now - timedelta(seconds=120),
+        )
+        # 其他进程仍在续约的任务不能被本进程启动恢复打断。
+        leased = GenerationJob(
+            user_id=user_id,
+            operation="persona_constitution",
+            status="running",
+            request_json=request,
+            heartbeat_at=now,
+        )
+        db.add_all([queued, expired, leased])
+        db.commit()
+
+        assert job_service.recover_generation_jobs(db) == 1
+        # 关闭线程池会等待重新提交的任务执行完。
+        job_service.shutdown_generation_job_runner()
+        db.expire_all()
+        finished = job_service.get_job(db, queued.id)
+        interrupted = job_service.get_job(db, expired.id)
+        still_running = job_service.get_job(db, leased.id)
+
+    assert finished.status == "succeeded"
+    assert interrupted.status == "failed"
+    assert interrupted.error_json["code"] == "JOB_INTERRUPTED"
+    assert still_running.status == "running"
+
+
+def test_runner_renews_leases_of_its_running_jobs(
+    user_id: str,
+    session_local: sessionmaker,
+    monkeypatch,
+) -> None:
+    release = threading.Event()
+    started = threading.Event()
+
+    def _slow_generate(**kwargs):
+        started.set()
+        assert release.wait(5)
+        return _fake_constitution(**kwargs)
+
+    monkeypatch.setattr(persona_service, "generate_constitution", _slow_generate)
+    request = {"user_id": user_id, "identity_model_id": None, "common_words": [], "forbidden_words": []}
+    with session_local() as db:
+        job = GenerationJob(user_id=user_id, operation="persona_constitution", request_json=request)
+        db.add(job)
+        db.commit()
+        runner = job_service.get_generation_job_runner()
+        runner.submit(db.get_bind(), job.id)
+        assert started.wait(5)
+
+        # 把心跳拨回到租约之外：续约后不会被当作过期任务中断。
+        db.execute(
+            update(GenerationJob)
+            .where(GenerationJob.id == job.id)
+            .values(heartbeat_at=datetime.now(timezone.utc) - timedelta(seconds=120))
+        )
+        db.commit()
+        runner.maintain_leases()
+        db.expire_all()
+        assert job_service.get_job(db, job.id).status == "running"
+
+        release.set()
+        job_service.shutdown_generation_job_runner()
+        db.expire_all()
+        assert job_service.get_job(db, job.id).status == "succeeded"
+
+
+def test_async_waiter_is_woken_by_job_completion_without_blocking_the_loop(session_local: sessionmaker) -> None:
+    runner = job_service.get_generation_job_runner()
+
+    async def _scenario() -> int:
+        ticks = 0
+
+        async def _tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(_tick())
+        waiter = asyncio.create_task(runner.wait_for_update(runner.sequence(), 30))
+        await asyncio.sleep(0.1)
+        assert not waiter.done()
+        # 不存在的任务认领失败后直接结束，同样递增序号并唤醒等待方。
+        runner.submit(session_local.kw["bind"], "missing-job")
+        await asyncio.wait_for(waiter, timeout=5)
+        ticker.cancel()
+        return ticks
+
+    assert asyncio.run(_scenario()) >= 5
+
+
+def _add_persona_job(session_local: sessionmaker, user_id: str) -> str:
+    request = {"user_id": user_id, "identity_model_id": None, "common_words": [], "forbidden_words": []}
+    with session_local() as db:
+        job = GenerationJob(user_id=user_id, operation="persona_constitution", request_json=request)
+        db.add(job)
+        db.commit()
+        return job.id
+
+
+def test_runner_close_leaves_unstarted_jobs_queued(
+    user_id: str,
+    session_local: sessionmaker,
+    monkeypatch,
+) -> None:
+    release = threading.Event()
+    started = threading.Event()
+
+    def _slow_generate(**kwargs):
+        started.set()
+        assert release.wait(5)
+        return _fake_constitution(**kwargs)
+
+    monkeypatch.setattr(persona_service, "generate_constitution", _slow_generate)
+    running_id = _add_persona_job(session_local, user_id)
+    waiting_id = _add_persona_job(session_local, user_id)
+    runner = job_service.GenerationJobRunner(max_workers=1, lease_seconds=60)
+    bind = session_local.kw["bind"]
+    runner.submit(bind, running_id)
+    runner.submit(bind, waiting_id)
+    assert started.wait(5)
+
+    closer = threading.Thread(target=runner.close)
+    closer.start()
+    # close 先取消线程池里尚未开始的任务，再等待执行中的任务结束。
+    time.sleep(0.2)
+    release.set()
+    closer.join(5)
+
+    with session_local() as db:
+        assert job_service.get_job(db, running_id).status == "succeeded"
+        # 未开始的任务保持 queued，下次启动由 recover_generation_jobs 重新提交。
+        assert job_service.get_job(db, waiting_id).status == "queued"
+
+
+def test_job_updates_report_running_without_waiting_for_poll_interval(
+    user_id: str,
+    session_local: sessionmaker,
+    monkeypatch,
+) -> None:
+    # 轮询与心跳间隔都远大于测试时长：状态变化只能靠本进程的唤醒及时送达。
+    monkeypatch.setenv("GENERATION_JOB_POLL_INTERVAL_SECONDS", "30")
+    monkeypatch.setenv("GENERATION_JOB_HEARTBEAT_SECONDS", "30")
+    release = threading.Event()
+
+    def _slow_generate(**kwargs):
+        assert release.wait(5)
+        return _fake_constitution(**kwargs)
+
+    monkeypatch.setattr(persona_service, "generate_constitution", _slow_generate)
+    job_id = _add_persona_job(session_local, user_id)
+    bind = session_local.kw["bind"]
+
+    async def _scenario() -> list[str]:
+        engine = create_async_engine(to_async_database_url(str(bind.url)), poolclass=NullPool)
+        statuses: list[str] = []
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as db:
+                updates = job_service.iter_job_updates(db, job_id)
+                statuses.append((await asyncio.wait_for(anext(updates), 5)).status)
+                job_service.get_generation_job_runner().submit(bind, job_id)
+                statuses.append((await asyncio.wait_for(anext(updates), 5)).status)
+                release.set()
+                statuses.append((await asyncio.wait_for(anext(updates), 5)).status)
+        finally:
+            release.set()
+            await engine.dispose()
+        return statuses
+
+    assert asyncio.run(_scenario()) == ["queued", "running", "succeeded"]
@@ -5,6 +5,7 @@ from sqlalchemy.exc import SQLAlchemyError
 
 import app.main as main_module
 from app.db.session import get_db
+from app.services.llm_client import get_llm_circuit_breakers
 
 
 class _BrokenSession:
@@ -27,3 +28,26 @@ def test_health_returns_503_when_database_unavailable(monkeypatch) -> None:
 
     assert response.status_code == 503
     assert response.json() == {"detail": "database unavailable"}
+
+
+def test_health_reports_open_llm_circuit_as_degraded(monkeypatch) -> None:
+    monkeypatch.setattr(main_module, "ensure_llm_ready", lambda: None)
+    monkeypatch.setenv("LLM_CIRCUIT_MIN_REQUESTS", "2")
+    breaker = get_llm_circuit_breakers().get("https://api.openai.com/v1", "test-model")
+    for _ in range(2):
+        breaker.record(probe=False, failure=True)
+
+    with TestClient(main_module.app) as client:
+        response = client.get("/health")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "degraded"
+    assert body["db_ok"] is True
+    assert len(body["llm_circuits"]) == 1
+    circuit = body["llm_circuits"][0]
+    assert circuit["upstream"] == "api.openai.com"
+    assert circuit["model"] == "test-model"
+    assert circuit["state"] == "open"
+    assert circuit["failure_rate"] == 1.0
+    assert 0 < circuit["retry_after_seconds"] <= 30
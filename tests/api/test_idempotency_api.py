@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+import pytest
+
+from app.services import generation_jobs as job_service
+from app.services import launch_kit as launch_kit_service
+from app.services import persona as persona_service
+from app.services.llm_client import LLMServiceError
+
+
+@pytest.fixture(autouse=True)
+def _fresh_job_runner():
+    job_service.shutdown_generation_job_runner()
+    yield
+    job_service.shutdown_generation_job_runner()
+
+
+def _install_fake_launch_kit(monkeypatch) -> list[dict]:
+    calls: list[dict] = []
+
+    def _fake_generate(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(
+            id=f"kit-{len(calls)}",
+            user_id=kwargs["user_id"],
+            identity_model_id=None,
+            days=[SimpleNamespace(day_no=1, theme="主题", opening_text="开场")],
+        )
+
+    async def _fake_generate_async(**kwargs):
+        return _fake_generate(**kwargs)
+
+    # 同步生成走 async 路由，async=true 的任务在线程中走同步版本。
+    monkeypatch.setattr(launch_kit_service, "generate_launch_kit", _fake_generate)
+    monkeypatch.setattr(launch_kit_service, "generate_launch_kit_async", _fake_generate_async)
+    return calls
+
+
+def test_same_idempotency_key_replays_first_response(client: TestClient, user_id: str, monkeypatch) -> None:
+    calls = _install_fake_launch_kit(monkeypatch)
+    headers = {"Idempotency-Key": "kit-request-1"}
+
+    first = client.post("/v1/launch-kits/generate", json={"user_id": user_id}, headers=headers)
+    second = client.post("/v1/launch-kits/generate", json={"user_id": user_id}, headers=headers)
+
+    assert first.status_code == 200
+    assert "idempotent-replayed" not in first.headers
+    assert second.status_code == 200
+    assert second.headers["idempotent-replayed"] == "true"
+    assert second.json() == first.json()
+    assert len(calls) == 1
+
+    # 不同的 key 视为新的生成请求。
+    third = client.post("/v1/launch-kits/generate", json={"user_id": user_id}, headers={"Idempotency-Key": "other"})
+    assert third.json()["id"] == "kit-2"
+    assert len(calls) == 2
+
+
+def test_idempotency_key_reused_with_different_body_returns_422(
+    client: TestClient,
+    user_id: str,
+    monkeypatch,
+) -> None:
+    _install_fake_launch_kit(monkeypatch)
+    headers = {"Idempotency-Key": "kit-request-1"}
+
+    assert client.post("/v1/launch-kits/generate", json={"user_id": user_id}, headers=headers).status_code == 200
+    response = client.post(
+        "/v1/launch-kits/generate",
+        json={"user_id": user_id, "generation_mode": "parallel"},
+        headers=headers,
+    )
+
+    assert response.status_code == 422
+    assert "different request body" in response.json()["detail"]
+
+
+def test_concurrent_key_reuse_with_different_body_returns_422(
+    client: TestClient,
+    user_id: str,
+    monkeypatch,
+) -> None:
+    started = threading.Event()
+    release = threading.Event()
+    calls = _install_fake_launch_kit(monkeypatch)
+    fake_generate = launch_kit_service.generate_launch_kit
+
+    async def _slow_generate(**kwargs):
+        started.set()
+        assert await asyncio.to_thread(release.wait, 5)
+        return fake_generate(**kwargs)
+
+    monkeypatch.setattr(launch_kit_service, "generate_launch_kit_async", _slow_generate)
+    headers = {"Idempotency-Key": "kit-request-1"}
+    responses: dict[str, object] = {}
+
+    first = threading.Thread(
+        target=lambda: responses.setdefault(
+            "first",
+            client.post("/v1/launch-kits/generate", json={"user_id": user_id}, headers=headers),
+        )
+    )
+    first.start()
+    assert started.wait(5)
+    mismatched = client.post(
+        "/v1/launch-kits/generate",
+        json={"user_id": user_id, "generation_mode": "parallel"},
+        headers=headers,
+    )
+    release.set()
+    first.join(5)
+
+    assert mismatched.status_code == 422
+    assert "different request body" in mismatched.json()["detail"]
+    assert responses["first"].status_code == 200
+    assert len(calls) == 1
+
+
+def test_failed_generation_is_not_stored_and_key_can_retry(
+    client: TestClient,
+    user_id: str,
+    monkeypatch,
+) -> None:
+    outcomes = ["error", "ok"]
+
+    async def _generate(**kwargs):
+        if outcomes.pop(0) == "error":
+            raise LLMServiceError(
+                code="LLM_UPSTREAM_TIMEOUT",
+                message="timed out",
+                operation="generate_constitution",
+                retryable=True,
+            )
+        return SimpleNamespace(id="constitution-1", user_id=kwargs["user_id"], version=1, narrative_mainline="m")
+
+    monkeypatch.setattr(persona_service, "generate_constitution_async", _generate)
+    headers = {"Idempotency-Key": "constitution-request-1"}
+
+    failed = client.post("/v1/persona-constitutions/generate", json={"user_id": user_id}, headers=headers)
+    retried = client.post("/v1/persona-constitutions/generate", json={"user_id": user_id}, headers=headers)
+
+    assert failed.status_code == 502
+    assert failed.json()["detail"]["code"] == "LLM_UPSTREAM_TIMEOUT"
+    assert retried.status_code == 200
+    assert retried.json()["id"] == "constitution-1"
+    assert "idempotent-replayed" not in retried.headers
+
+
+def test_async_request_with_same_key_replays_the_same_job(client: TestClient, user_id: str, monkeypatch) -> None:
+    calls = _install_fake_launch_kit(monkeypatch)
+    headers = {"Idempotency-Key": "kit-async-1"}
+
+    first = client.post("/v1/launch-kits/generate?async=true", json={"user_id": user_id}, headers=headers)
+    second = client.post("/v1/launch-kits/generate?async=true", json={"user_id": user_id}, headers=headers)
+
+    assert first.status_code == 202
+    assert second.status_code == 202
+    assert second.json()["id"] == first.json()["id"]
+    assert second.headers["location"] == f"/v1/jobs/{first.json()['id']}"
+    assert second.headers["idempotent-replayed"] == "true"
+
+    finished = client.get(f"/v1/jobs/{first.json()['id']}", params={"wait": 5})
+    assert finished.json()["status"] == "succeeded"
+    assert len(calls) == 1
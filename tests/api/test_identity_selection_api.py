@@ -16,7 +16,7 @@ class _FakeLLMClient:
         self._payload_by_operation = copy.deepcopy(payload_by_operation)
         self._lock = threading.Lock()
 
-    def generate_json(self, *, operation: str, system_prompt: str, user_payload: dict) -> dict:
+    async def generate_json(self, *, operation: str, system_prompt: str, user_payload: dict, validate=None) -> dict:
         with self._lock:
             operation_payload = self._payload_by_operation[operation]
             if not operation_payload:
@@ -86,7 +86,7 @@ def test_get_user_identity_models_returns_latest_generated_batch_only(
             ]
         }
     )
-    monkeypatch.setattr(identity_service, "get_llm_client", lambda: fake_client)
+    monkeypatch.setattr(identity_service, "get_async_llm_client", lambda: fake_client)
 
     first_generate = client.post(
         "/v1/identity-models/generate",
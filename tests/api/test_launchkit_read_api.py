@@ -4,6 +4,8 @@ import copy
 from datetime import datetime, timedelta, timezone
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
 from app.services import launch_kit as launch_kit_service
@@ -21,7 +23,7 @@ class _FakeLaunchKitLLMClient:
         self.payload = copy.deepcopy(payload)
         self.calls: list[dict] = []
 
-    def generate_json(self, *, operation: str, system_prompt: str, user_payload: dict) -> dict:
+    async def generate_json(self, *, operation: str, system_prompt: str, user_payload: dict, validate=None) -> dict:
         self.calls.append(
             {
                 "operation": operation,
@@ -92,6 +94,68 @@ def test_launchkit_read_endpoints(
     assert [day["day_no"] for day in detail["days"]] == [1, 2, 3, 4, 5, 6, 7]
 
 
+def _count_launch_kit_selects(client: TestClient, url: str) -> tuple[int, list[str], dict]:
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT") and "launch_kit" in statement:
+            statements.append(statement)
+
+    # 监听 Engine 类，同时覆盖同步引擎与异步引擎底层的 sync_engine。
+    event.listen(Engine, "before_cursor_execute", _record)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(Engine, "before_cursor_execute", _record)
+    assert response.status_code == 200
+    return len(statements), statements, response.json()
+
+
+def test_launchkit_list_query_count_is_independent_of_kit_count(
+    client: TestClient,
+    user_id: str,
+    session_local: sessionmaker,
+) -> None:
+    with session_local() as db:
+        create_launch_kit(db, user_id=user_id)
+    single_count, _, single = _count_launch_kit_selects(client, f"/v1/launch-kits/users/{user_id}")
+
+    with session_local() as db:
+        for _ in range(5):
+            create_launch_kit(db, user_id=user_id)
+    many_count, _, many = _count_launch_kit_selects(client, f"/v1/launch-kits/users/{user_id}")
+
+    assert len(single) == 1 and len(many) == 6
+    assert all(len(kit["days"]) == 7 for kit in many)
+    # 一次查启动包 + 一次 selectinload 查全部 days，不随启动包数量增长。
+    assert single_count == many_count == 2
+
+
+def test_launchkit_summary_view_omits_draft_text(
+    client: TestClient,
+    user_id: str,
+    session_local: sessionmaker,
+) -> None:
+    with session_local() as db:
+        kit = create_launch_kit(db, user_id=user_id)
+
+    for url in (
+        f"/v1/launch-kits/users/{user_id}?view=summary",
+        f"/v1/launch-kits/users/{user_id}/latest?view=summary",
+        f"/v1/launch-kits/{kit.id}?view=summary",
+    ):
+        _, statements, body = _count_launch_kit_selects(client, url)
+        summary = body[0] if isinstance(body, list) else body
+        assert summary["id"] == kit.id
+        assert [day["theme"] for day in summary["days"]] == [f"Theme {i}" for i in range(1, 8)]
+        assert all("draft_or_outline" not in day for day in summary["days"])
+        assert not any("draft_or_outline" in statement for statement in statements)
+
+    full = client.get(f"/v1/launch-kits/{kit.id}").json()
+    assert full["days"][0]["draft_or_outline"] == "Draft 1"
+    assert client.get(f"/v1/launch-kits/{kit.id}?view=compact").status_code == 422
+
+
 def test_launchkit_latest_not_found_returns_404(client: TestClient, user_id: str) -> None:
     response = client.get(f"/v1/launch-kits/users/{user_id}/latest")
     assert response.status_code == 404
@@ -109,7 +173,7 @@ def test_launchkit_generate_backfills_resolved_identity_and_constitution(
     monkeypatch,
 ) -> None:
     fake_client = _FakeLaunchKitLLMClient(_valid_launch_kit_payload())
-    monkeypatch.setattr(launch_kit_service, "get_llm_client", lambda: fake_client)
+    monkeypatch.setattr(launch_kit_service, "get_async_llm_client", lambda: fake_client)
 
     with session_local() as db:
         session = create_onboarding_session(db, user_id=user_id, status="completed")
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import copy
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.models.consistency_check import EventLog
+from app.models.launch_kit import LaunchKit
+from app.services import launch_kit as launch_kit_service
+from app.services.llm_client import LLMServiceError
+
+
+def _valid_launch_kit_payload() -> dict:
+    return {
+        "sustainable_columns": ["col1", "col2", "col3"],
+        "growth_experiment_suggestion": [
+            {
+                "name": "exp",
+                "hypothesis": "hyp",
+                "variables": ["v1"],
+                "duration": "7d",
+                "success_metric": "metric",
+            }
+        ],
+        "days": [
+            {
+                "day_no": i,
+                "theme": f"theme-{i} {{\"brace\"}}",
+                "draft_or_outline": f"draft-{i} [x]",
+                "opening_text": f"opening-{i}",
+            }
+            for i in range(1, 8)
+        ],
+    }
+
+
+def _chunked(text: str, size: int) -> list[str]:
+    return [text[index : index + size] for index in range(0, len(text), size)]
+
+
+class _FakeStreamingLLMClient:
+    def __init__(self, stream_text: str, repair_payload: dict | None = None) -> None:
+        self.stream_text = stream_text
+        self.repair_payload = copy.deepcopy(repair_payload)
+        self.stream_calls: list[str] = []
+        self.generate_calls: list[str] = []
+
+    def stream_json_text(self, *, operation: str, system_prompt: str, user_payload: dict):
+        self.stream_calls.append(operation)
+        yield from _chunked(self.stream_text, 7)
+
+    def generate_json(self, *, operation: str, system_prompt: str, user_payload: dict, validate=None) -> dict:
+        self.generate_calls.append(operation)
+        if self.repair_payload is None:
+            raise AssertionError("unexpected generate_json call")
+        return copy.deepcopy(self.repair_payload)
+
+
+def _parse_sse(text: str) -> list[tuple[str, dict]]:
+    events: list[tuple[str, dict]] = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_streaming_days_parser_emits_each_day_once_closed() -> None:
+    text = json.dumps(_valid_launch_kit_payload(), ensure_ascii=False)
+    parser = launch_kit_service._StreamingDaysParser()
+
+    emitted: list[dict] = []
+    for chunk in _chunked(text, 5):
+        emitted.extend(parser.feed(chunk))
+
+    assert [item["day_no"] for item in emitted] == list(range(1, 8))
+    assert emitted[0]["theme"] == 'theme-1 {"brace"}'
+    assert parser.text == text
+
+
+def test_streaming_days_parser_ignores_nested_objects_outside_days() -> None:
+    parser = launch_kit_service._StreamingDaysParser()
+    emitted = parser.feed('{"growth_experiment_suggestion": [{"name": "days"}], "days": [{"day_no": 1}]}')
+    assert emitted == [{"day_no": 1}]
+
+
+def test_stream_launch_kit_emits_days_then_completed(
+    client: TestClient,
+    session_local: sessionmaker,
+    user_id: str,
+    monkeypatch,
+) -> None:
+    fake_client = _FakeStreamingLLMClient(json.dumps(_valid_launch_kit_payload(), ensure_ascii=False))
+    monkeypatch.setattr(launch_kit_service, "get_llm_client", lambda: fake_client)
+
+    response = client.post("/v1/launch-kits/generate/stream", json={"user_id": user_id})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _parse_sse(response.text)
+    assert [name for name, _ in events] == ["day"] * 7 + ["completed"]
+    assert [data["day_no"] for _, data in events[:7]] == list(range(1, 8))
+    completed = events[-1][1]
+    assert [day["day_no"] for day in completed["days"]] == list(range(1, 8))
+    assert fake_client.generate_calls == []
+
+    with session_local() as db:
+        assert db.get(LaunchKit, completed["id"]) is not None
+        assert db.query(EventLog).filter(EventLog.event_name == "launch_kit_generated").count() == 1
+
+
+def test_stream_launch_kit_repairs_and_resends_changed_days(
+    client: TestClient,
+    user_id: str,
+    monkeypatch,
+) -> None:
+    broken = _valid_launch_kit_payload()
+    broken["days"] = broken["days"][:6]
+    repaired = _valid_launch_kit_payload()
+    repaired["days"][6]["theme"] = "repaired-7"
+    fake_client = _FakeStreamingLLMClient(json.dumps(broken, ensure_ascii=False), repair_payload=repaired)
+    monkeypatch.setattr(launch_kit_service, "get_llm_client", lambda: fake_client)
+
+    response = client.post("/v1/launch-kits/generate/stream", json={"user_id": user_id})
+    events = _parse_sse(response.text)
+
+    assert [name for name, _ in events] == ["day"] * 7 + ["completed"]
+    assert events[6][1]["theme"] == "repaired-7"
+    assert fake_client.generate_calls == ["generate_launch_kit"]
+
+
+def test_stream_launch_kit_reports_llm_error_as_event(
+    client: TestClient,
+    user_id: str,
+    monkeypatch,
+) -> None:
+    class _FailingClient:
+        def stream_json_text(self, *, operation: str, system_prompt: str, user_payload: dict):
+            raise LLMServiceError(
+                code="LLM_UPSTREAM_HTTP_ERROR",
+                message="upstream failed",
+                operation=operation,
+                provider_status=503,
+                retryable=True,
+                attempts=3,
+            )
+            yield ""  # pragma: no cover
+
+    monkeypatch.setattr(launch_kit_service, "get_llm_client", lambda: _FailingClient())
+
+    response = client.post("/v1/launch-kits/generate/stream", json={"user_id": user_id})
+    events = _parse_sse(response.text)
+
+    assert events == [
+        (
+            "error",
+            {
+                "code": "LLM_UPSTREAM_HTTP_ERROR",
+                "message": "upstream failed",
+                "operation": "generate_launch_kit",
+                "provider_status": 503,
+                "provider_request_id": None,
+                "retryable": True,
+                "attempts": 3,
+            },
+        )
+    ]
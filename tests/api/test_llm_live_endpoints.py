@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import os
 from pathlib import Path
 import time
@@ -347,9 +346,9 @@ def test_consistency_check_live_multi_scenarios(
         body = response.json()
         assert body["id"]
 
-        deviation_items = json.loads(body["deviation_items"])
-        deviation_reasons = json.loads(body["deviation_reasons"])
-        suggestions = json.loads(body["suggestions"])
+        deviation_items = body["deviation_items"]
+        deviation_reasons = body["deviation_reasons"]
+        suggestions = body["suggestions"]
 
         assert deviation_items
         assert deviation_reasons
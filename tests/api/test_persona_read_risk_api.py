@@ -64,6 +64,7 @@ def test_risk_boundary_create_and_list_endpoints(
             "risk_level": 3,
             "boundary_type": "legal",
             "statement": "Do not impersonate people.",
+            "keywords": [" impersonate ", ""],
             "source": "user_input",
         },
     )
@@ -71,10 +72,12 @@ def test_risk_boundary_create_and_list_endpoints(
     created_item = create_response.json()
     assert created_item["risk_level"] == 3
     assert created_item["boundary_type"] == "legal"
+    assert created_item["keywords"] == ["impersonate"]
 
     list_response = client.get(f"/v1/risk-boundaries/users/{user_id}")
     assert list_response.status_code == 200
     assert len(list_response.json()) == 2
+    assert sorted(item["keywords_json"] for item in list_response.json()) == [[], ["impersonate"]]
 
 
 def test_risk_boundary_validation_error_returns_422(client: TestClient, user_id: str) -> None:
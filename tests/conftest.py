@@ -15,6 +15,8 @@ from app.core.config import get_settings
 os.environ.setdefault("OPENAI_API_KEY", "test-openai-key")
 os.environ.setdefault("OPENAI_BASE_URL", "https://api.openai.com/v1")
 os.environ.setdefault("MODEL_NAME", "test-model")
+# 测试默认同步写事件日志，请求返回后即可查询到事件。
+os.environ.setdefault("EVENT_LOG_MODE", "sync")
 
 
 @pytest.fixture(autouse=True)
@@ -27,10 +29,14 @@ def _reset_config_caches() -> None:
     except ModuleNotFoundError:
         reset_llm = None
 
+    from app.services.context_cache import reset_context_cache
+
     get_settings.cache_clear()
     if reset_llm is not None:
         reset_llm()
+    reset_context_cache()
     yield
     get_settings.cache_clear()
     if reset_llm is not None:
         reset_llm()
+    reset_context_cache()
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.base import Base
+from app.models.user import User
+from app.services import consistency_check as consistency_service
+
+
+class _SegmentLLMClient:
+    """按草稿内容返回结果：含 risk 时报告偏离并触发风险，以 ! 结尾时返回无效结构以触发降级，其余无偏离。"""
+
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+        self._lock = threading.Lock()
+
+    def generate_json(self, *, operation: str, system_prompt: str, user_payload: dict, validate=None) -> dict:
+        with self._lock:
+            self.calls.append(user_payload)
+        draft_text = user_payload.get("draft_text") or user_payload["original_user_payload"]["draft_text"]
+        if draft_text.endswith("!"):
+            return {"deviation_items": []}
+        if "risk" in draft_text:
+            return {
+                "deviation_items": [f"item:{draft_text}"],
+                "deviation_reasons": ["reason"],
+                "suggestions": ["suggestion"],
+                "risk_triggered": True,
+                "risk_warning": f"warning:{draft_text}",
+                "score": 40,
+            }
+        return {
+            "deviation_items": [consistency_service.NO_DEVIATION_PLACEHOLDER],
+            "deviation_reasons": ["reason"],
+            "suggestions": ["suggestion"],
+            "risk_triggered": False,
+            "risk_warning": "",
+            "score": 90,
+        }
+
+
+def _make_db(tmp_path) -> tuple[Session, str]:
+    engine = create_engine(
+        f"sqlite:///{(tmp_path / 'incremental.db').as_posix()}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)()
+    user = User()
+    db.add(user)
+    db.commit()
+    return db, user.id
+
+
+def _close_db(db: Session) -> None:
+    engine = db.bind
+    db.close()
+    engine.dispose()
+
+
+def _segment_texts(client: _SegmentLLMClient) -> list[str]:
+    return sorted(call["draft_text"] for call in client.calls if "segment" in call)
+
+
+def test_split_draft_segments_uses_blank_lines() -> None:
+    assert consistency_service._split_draft_segments("a\n\n  \n b \nc\n\n\n") == ["a", "b \nc"]
+
+
+def test_recheck_only_sends_changed_segments(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db(tmp_path)
+    fake_client = _SegmentLLMClient()
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+
+    first = consistency_service.check_consistency(db=db, user_id=user_id, draft_text="aaaa\n\nbbbb\n\ncccc")
+    # 首次检查没有可复用段落：逐段检查并记录各段结论。
+    assert _segment_texts(fake_client) == ["aaaa", "bbbb", "cccc"]
+    assert first.segments_total == 3
+    assert first.segments_reused == 0
+
+    fake_client.calls.clear()
+    second = consistency_service.check_consistency(
+        db=db, user_id=user_id, draft_text="aaaa\n\nrisk\n\ncccc"
+    )
+
+    assert _segment_texts(fake_client) == ["risk"]
+    assert fake_client.calls[0]["segment"] == {"index": 1, "count": 3}
+    assert second.segments_reused == 2
+    # 其他段落的“未发现明显偏离”占位不会和偏离项一起出现。
+    assert second.check.deviation_items_json == ["item:risk"]
+    assert second.check.risk_triggered is True
+    assert second.check.risk_warning == "warning:risk"
+    # 按段落长度加权：(4*90 + 4*40 + 4*90) / 12
+    assert second.score == 73
+    segments = second.check.segments_json
+    assert [segment["hash"] for segment in segments] == [
+        consistency_service.compute_draft_hash(text) for text in ("aaaa", "risk", "cccc")
+    ]
+    _close_db(db)
+
+
+def test_single_segment_result_is_reused_after_expansion(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db(tmp_path)
+    fake_client = _SegmentLLMClient()
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+
+    consistency_service.check_consistency(db=db, user_id=user_id, draft_text="intro")
+    fake_client.calls.clear()
+    expanded = consistency_service.check_consistency(db=db, user_id=user_id, draft_text="intro\n\nmore")
+
+    assert _segment_texts(fake_client) == ["more"]
+    assert expanded.segments_reused == 1
+    _close_db(db)
+
+
+def test_first_check_with_findings_seeds_segment_records(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db(tmp_path)
+    fake_client = _SegmentLLMClient()
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+
+    first = consistency_service.check_consistency(
+        db=db, user_id=user_id, draft_text="aaaa\n\nrisk\n\ncccc"
+    )
+    assert _segment_texts(fake_client) == ["aaaa", "cccc", "risk"]
+    assert first.segments_total == 3
+    assert first.check.deviation_items_json == ["item:risk"]
+    assert first.check.risk_triggered is True
+    # 偏离项记在所属段落上，其余段落记为无偏离。
+    records = {record["hash"]: record for record in first.check.segments_json}
+    assert records[consistency_service.compute_draft_hash("risk")]["deviation_items"] == ["item:risk"]
+    assert records[consistency_service.compute_draft_hash("aaaa")]["risk_triggered"] is False
+
+    # 只修改有偏离的段落：下次检查只发送这一段。
+    fake_client.calls.clear()
+    second = consistency_service.check_consistency(
+        db=db, user_id=user_id, draft_text="aaaa\n\nfixed\n\ncccc"
+    )
+    assert _segment_texts(fake_client) == ["fixed"]
+    assert second.segments_reused == 2
+    assert second.check.risk_triggered is False
+    assert second.check.deviation_items_json == [consistency_service.NO_DEVIATION_PLACEHOLDER]
+    _close_db(db)
+
+
+def test_degraded_segments_are_rechecked_and_force_skips_reuse(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db(tmp_path)
+    fake_client = _SegmentLLMClient()
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+
+    consistency_service.check_consistency(db=db, user_id=user_id, draft_text="good")
+    first = consistency_service.check_consistency(db=db, user_id=user_id, draft_text="good\n\nbad!")
+    assert first.degraded is True
+    assert first.segments_reused == 1
+
+    fake_client.calls.clear()
+    second = consistency_service.check_consistency(db=db, user_id=user_id, draft_text="good\n\nbad!\n\nnew")
+    assert _segment_texts(fake_client) == ["bad!", "new"]
+    assert second.segments_reused == 1
+
+    fake_client.calls.clear()
+    forced = consistency_service.check_consistency(
+        db=db, user_id=user_id, draft_text="good\n\nfixed", force=True
+    )
+    # force 不复用任何段落，但仍逐段检查并重新记录各段结论。
+    assert _segment_texts(fake_client) == ["fixed", "good"]
+    assert forced.segments_reused == 0
+    assert forced.segments_total == 2
+    _close_db(db)
+
+
+def test_merge_keeps_placeholder_only_when_no_segment_reports_findings() -> None:
+    clean = consistency_service._ConsistencyCheckOutput(
+        deviation_items=[consistency_service.NO_DEVIATION_PLACEHOLDER],
+        deviation_reasons=["reason"],
+        suggestions=["suggestion"],
+        risk_triggered=False,
+        risk_warning="",
+        score=90,
+    )
+    finding = clean.model_copy(update={"deviation_items": [consistency_service.NO_DEVIATION_PLACEHOLDER, "item"]})
+
+    merged = consistency_service._merge_segment_outputs([("a", clean), ("b", clean)])
+    assert merged.deviation_items == [consistency_service.NO_DEVIATION_PLACEHOLDER]
+
+    merged = consistency_service._merge_segment_outputs([("a", clean), ("b", finding)])
+    assert merged.deviation_items == ["item"]
+
+
+def test_incremental_can_be_disabled(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("CONSISTENCY_INCREMENTAL_ENABLED", "false")
+    db, user_id = _make_db(tmp_path)
+    fake_client = _SegmentLLMClient()
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+
+    result = consistency_service.check_consistency(db=db, user_id=user_id, draft_text="one\n\ntwo")
+
+    assert len(fake_client.calls) == 1
+    assert "segment" not in fake_client.calls[0]
+    assert result.check.segments_json is None
+    _close_db(db)
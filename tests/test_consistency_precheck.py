@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.models.persona import PersonaConstitution, RiskBoundaryItem
+from app.models.user import User
+from app.services import consistency_check as consistency_service
+
+
+class _RecordingLLMClient:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def generate_json(self, *, operation: str, system_prompt: str, user_payload: dict, validate=None) -> dict:
+        self.calls.append(user_payload)
+        return {
+            "deviation_items": ["item"],
+            "deviation_reasons": ["reason"],
+            "suggestions": ["suggestion"],
+            "risk_triggered": False,
+            "risk_warning": "",
+            "score": 90,
+        }
+
+
+def _make_db_with_constitution(tmp_path) -> tuple[Session, str]:
+    engine = create_engine(
+        f"sqlite:///{(tmp_path / 'precheck.db').as_posix()}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)()
+    user = User()
+    db.add(user)
+    db.commit()
+    constitution = PersonaConstitution(
+        user_id=user.id,
+        forbidden_words_json=["Guarantee", "躺赚"],
+    )
+    db.add(constitution)
+    db.commit()
+    db.add_all(
+        [
+            RiskBoundaryItem(
+                user_id=user.id,
+                constitution_id=constitution.id,
+                risk_level=5,
+                statement="不要承诺“保本”或“稳赚”。",
+            ),
+            RiskBoundaryItem(
+                user_id=user.id,
+                constitution_id=constitution.id,
+                risk_level=2,
+                statement="Never share private client data without consent.",
+            ),
+        ]
+    )
+    db.commit()
+    return db, user.id
+
+
+def _close_db(db: Session) -> None:
+    engine = db.bind
+    db.close()
+    engine.dispose()
+
+
+def _pattern(term: str, kind: str = consistency_service.PRECHECK_KIND_FORBIDDEN_WORD):
+    return consistency_service._PrecheckPattern(
+        term=term,
+        normalized=consistency_service._normalize_for_match(term),
+        kind=kind,
+    )
+
+
+def test_automaton_finds_overlapping_terms_with_spans() -> None:
+    automaton = consistency_service._KeywordAutomaton(
+        [_pattern("he"), _pattern("she"), _pattern("hers"), _pattern("躺赚")]
+    )
+
+    hits = automaton.scan("uSHErs 想躺赚")
+
+    assert [(hit.term, hit.start, hit.end) for hit in hits] == [
+        ("she", 1, 4),
+        ("he", 2, 4),
+        ("hers", 2, 6),
+        ("躺赚", 8, 10),
+    ]
+
+
+def test_boundary_terms_use_keywords_and_quoted_words() -> None:
+    def terms(statement: str, keywords: list | None = None) -> list[str]:
+        return consistency_service._boundary_terms(RiskBoundaryItem(statement=statement, keywords_json=keywords))
+
+    assert terms("不要承诺“保本”或“稳赚”。") == ["保本", "稳赚"]
+    assert terms("医疗建议。") == []
+    assert terms("Never share private client data without consent.") == []
+    assert terms("Never share private client data.", [" client data ", "", None]) == ["client data"]
+    assert terms("不要承诺“保本”。", ["稳赚"]) == ["稳赚", "保本"]
+
+
+def test_unquoted_boundary_with_keywords_triggers_precheck_hit(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("CONSISTENCY_PRECHECK_MODE", "short_circuit")
+    get_settings.cache_clear()
+    db, user_id = _make_db_with_constitution(tmp_path)
+    constitution_id = db.query(PersonaConstitution.id).scalar()
+    db.add(
+        RiskBoundaryItem(
+            user_id=user_id,
+            constitution_id=constitution_id,
+            risk_level=4,
+            statement="不提供医疗建议",
+            keywords_json=["处方", "Dosage"],
+        )
+    )
+    db.commit()
+    fake_client = _RecordingLLMClient()
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+
+    result = consistency_service.check_consistency(db=db, user_id=user_id, draft_text="推荐 dosage 和处方")
+
+    assert result.short_circuited is True
+    assert [(hit.term, hit.kind, hit.risk_level) for hit in result.precheck_hits] == [
+        ("Dosage", consistency_service.PRECHECK_KIND_RISK_BOUNDARY, 4),
+        ("处方", consistency_service.PRECHECK_KIND_RISK_BOUNDARY, 4),
+    ]
+    assert result.check.risk_triggered is True
+    assert fake_client.calls == []
+    _close_db(db)
+
+
+def test_annotate_mode_attaches_hits_to_llm_payload(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db_with_constitution(tmp_path)
+    fake_client = _RecordingLLMClient()
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+
+    result = consistency_service.check_consistency(
+        db=db,
+        user_id=user_id,
+        draft_text="我们 guarantee 保本收益",
+    )
+
+    assert result.short_circuited is False
+    assert [hit.term for hit in result.precheck_hits] == ["Guarantee", "保本"]
+    assert fake_client.calls[0]["precheck_hits"][0] == {
+        "term": "Guarantee",
+        "kind": "forbidden_word",
+        "start": 3,
+        "end": 12,
+        "risk_level": None,
+    }
+    _close_db(db)
+
+
+def test_short_circuit_mode_skips_llm_for_obvious_violations(monkeypatch, tmp_path) -> None:
+    monkeypatch.setenv("CONSISTENCY_PRECHECK_MODE", "short_circuit")
+    get_settings.cache_clear()
+    db, user_id = _make_db_with_constitution(tmp_path)
+    constitution_id = db.query(PersonaConstitution.id).scalar()
+    # 未加引号的短 statement 只交给 LLM 按语义判断，不作为短路关键词。
+    db.add(RiskBoundaryItem(user_id=user_id, constitution_id=constitution_id, risk_level=4, statement="医疗建议"))
+    db.commit()
+    fake_client = _RecordingLLMClient()
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+
+    violating = consistency_service.check_consistency(db=db, user_id=user_id, draft_text="保本躺赚")
+    clean = consistency_service.check_consistency(db=db, user_id=user_id, draft_text="认真复盘")
+    unquoted = consistency_service.check_consistency(db=db, user_id=user_id, draft_text="不提供医疗建议")
+
+    assert violating.short_circuited is True
+    assert violating.check.risk_triggered is True
+    assert "保本" in violating.check.risk_warning
+    assert violating.score == 50
+    assert clean.short_circuited is False
+    assert unquoted.short_circuited is False
+    assert unquoted.precheck_hits == []
+    assert len(fake_client.calls) == 2
+    _close_db(db)
+
+
+def test_automaton_is_cached_per_constitution_version(tmp_path) -> None:
+    db, user_id = _make_db_with_constitution(tmp_path)
+    consistency_service.clear_precheck_cache()
+
+    first = consistency_service._resolve_check_context(
+        db=db, user_id=user_id, identity_model_id=None, constitution_id=None
+    )
+    second = consistency_service._resolve_check_context(
+        db=db, user_id=user_id, identity_model_id=None, constitution_id=None
+    )
+    assert first.automaton is second.automaton
+
+    first.constitution.version = 2
+    db.commit()
+    third = consistency_service._resolve_check_context(
+        db=db, user_id=user_id, identity_model_id=None, constitution_id=None
+    )
+    assert third.automaton is not first.automaton
+    _close_db(db)
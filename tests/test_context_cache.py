@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.base import Base
+from app.models.user import User
+from app.services import context_cache
+from app.services import launch_kit as launch_kit_service
+from app.services import persona as persona_service
+from app.services.context_cache import ContextBundleCache
+
+
+def test_cache_returns_copies_and_honours_ttl_and_lru(monkeypatch) -> None:
+    clock = [100.0]
+    monkeypatch.setattr(context_cache.time, "monotonic", lambda: clock[0])
+    cache = ContextBundleCache(ttl_seconds=10, max_entries=2)
+
+    cache.set("u1", "a", {"items": [1]}, version=0)
+    hit = cache.get("u1", "a")
+    hit["items"].append(2)
+    assert cache.get("u1", "a") == {"items": [1]}
+
+    cache.set("u1", "b", {"items": []}, version=0)
+    cache.get("u1", "a")
+    cache.set("u2", "a", {"items": []}, version=0)
+    assert cache.get("u1", "b") is None  # 最久未访问的条目被淘汰
+    assert cache.get("u1", "a") is not None
+
+    clock[0] += 11
+    assert cache.get("u1", "a") is None
+
+
+def test_invalidation_drops_entries_and_rejects_stale_backfill() -> None:
+    cache = ContextBundleCache(ttl_seconds=60, max_entries=10)
+    cache.set("u1", "a", "old", version=cache.version("u1"))
+    cache.set("u2", "a", "other", version=cache.version("u2"))
+
+    version_before_read = cache.version("u1")
+    cache.invalidate_user("u1")
+    cache.set("u1", "a", "stale", version=version_before_read)
+
+    assert cache.get("u1", "a") is None
+    assert cache.get("u2", "a") == "other"
+
+
+def test_launch_kit_context_is_cached_until_user_writes(tmp_path) -> None:
+    engine = create_engine(
+        f"sqlite:///{(tmp_path / 'context_cache.db').as_posix()}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)()
+    user = User()
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    def _load():
+        statements.clear()
+        return launch_kit_service._load_context_bundle(
+            db=db,
+            user_id=user_id,
+            requested_identity_model_id=None,
+            requested_constitution_id=None,
+        )
+
+    first = _load()
+    assert first.context_bundle["risk_boundaries"] == []
+    assert len(statements) == 4
+
+    second = _load()
+    assert second == first
+    assert statements == []
+
+    persona_service.create_risk_boundary(
+        db,
+        user_id=user_id,
+        risk_level=4,
+        boundary_type="legal",
+        statement="不要承诺收益。",
+    )
+    third = _load()
+    assert [item["statement"] for item in third.context_bundle["risk_boundaries"]] == ["不要承诺收益。"]
+    assert len(statements) == 4
+
+    db.close()
+    engine.dispose()
@@ -0,0 +1,108 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from app.core.config import Settings
+from app.db.session import (
+    create_app_engine,
+    create_async_app_engine,
+    shared_memory_database_url,
+    to_async_database_url,
+)
+
+
+def _pragma(engine, name: str):
+    with engine.connect() as connection:
+        return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_file_database_applies_sqlite_profile(tmp_path: Path) -> None:
+    settings = Settings(sqlite_busy_timeout_ms=1234, sqlite_cache_size_kib=4096, sqlite_pool_size=3)
+    engine = create_app_engine(f"sqlite:///{(tmp_path / 'profile.db').as_posix()}", settings)
+    try:
+        assert isinstance(engine.pool, QueuePool)
+        assert engine.pool.size() == 3
+        assert _pragma(engine, "journal_mode") == "wal"
+        assert _pragma(engine, "busy_timeout") == 1234
+        assert _pragma(engine, "synchronous") == 1  # NORMAL
+        assert _pragma(engine, "cache_size") == -4096
+        assert _pragma(engine, "temp_store") == 2  # MEMORY
+        assert _pragma(engine, "mmap_size") == settings.sqlite_mmap_size_bytes
+    finally:
+        engine.dispose()
+
+
+def test_memory_database_shares_one_connection() -> None:
+    engine = create_app_engine("sqlite:///:memory:", Settings())
+    try:
+        assert isinstance(engine.pool, StaticPool)
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE t (x INTEGER)"))
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT count(*) FROM t")).scalar() == 0
+        assert _pragma(engine, "temp_store") == 2
+    finally:
+        engine.dispose()
+
+
+def test_memory_database_is_shared_between_sync_and_async_engines() -> None:
+    database_url = shared_memory_database_url("sqlite:///:memory:")
+    assert database_url != shared_memory_database_url("sqlite:///:memory:")
+    assert shared_memory_database_url(database_url) == database_url
+    engine = create_app_engine(database_url, Settings())
+    async_engine = create_async_app_engine(database_url, Settings())
+
+    async def _count_rows() -> int:
+        async with async_engine.connect() as connection:
+            return (await connection.execute(text("SELECT count(*) FROM t"))).scalar()
+
+    try:
+        assert isinstance(engine.pool, StaticPool)
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE t (x INTEGER)"))
+            connection.execute(text("INSERT INTO t VALUES (1)"))
+        assert asyncio.run(_count_rows()) == 1
+    finally:
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
+
+
+def test_sqlite_profile_can_be_disabled(tmp_path: Path) -> None:
+    engine = create_app_engine(
+        f"sqlite:///{(tmp_path / 'plain.db').as_posix()}",
+        Settings(sqlite_pragmas_enabled=False),
+    )
+    try:
+        assert _pragma(engine, "journal_mode") == "delete"
+    finally:
+        engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "database_url, expected",
+    [
+        ("sqlite:///./data/bss.db", "sqlite+aiosqlite:///./data/bss.db"),
+        ("sqlite+pysqlite:///:memory:", "sqlite+aiosqlite:///:memory:"),
+        ("postgresql+psycopg2://u:p@db:5432/bss", "postgresql+asyncpg://u:p@db:5432/bss"),
+    ],
+)
+def test_to_async_database_url(database_url: str, expected: str) -> None:
+    assert to_async_database_url(database_url) == expected
+
+
+def test_async_engine_applies_sqlite_profile(tmp_path: Path) -> None:
+    engine = create_async_app_engine(f"sqlite:///{(tmp_path / 'async.db').as_posix()}", Settings())
+
+    async def _read_pragmas() -> tuple[str, int]:
+        try:
+            async with engine.connect() as connection:
+                journal_mode = (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+                busy_timeout = (await connection.execute(text("PRAGMA busy_timeout"))).scalar()
+                return journal_mode, busy_timeout
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(_read_pragmas()) == ("wal", 5000)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import get_settings
+from app.db.base import Base
+from app.models.consistency_check import EventLog
+from app.models.user import User
+from app.services import event_log as event_service
+from app.services import event_sink as event_sink_module
+from app.services.event_sink import EventSink
+
+
+def _make_session(tmp_path: Path) -> Session:
+    engine = create_engine(
+        f"sqlite:///{(tmp_path / 'events.db').as_posix()}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)()
+    db.add(User(id="user-1"))
+    db.commit()
+    return db
+
+
+def _row(index: int) -> dict:
+    return {
+        "id": f"event-{index}",
+        "user_id": "user-1",
+        "event_name": "content_published",
+        "stage": "MVP",
+        "identity_model_id": None,
+        "payload_json": {},
+    }
+
+
+def test_sink_batches_inserts_and_flushes_on_close(tmp_path: Path) -> None:
+    db = _make_session(tmp_path)
+    engine = db.get_bind()
+    statements: list[int] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count_inserts(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.startswith("INSERT INTO event_logs"):
+            statements.append(len(parameters) if executemany else 1)
+
+    sink = EventSink(batch_size=3, flush_interval_seconds=60, max_queue_size=100)
+    sink.start()
+    for index in range(7):
+        assert sink.submit(engine, _row(index))
+    sink.close()
+
+    assert db.query(EventLog).count() == 7
+    assert statements == [3, 3, 1]
+    db.close()
+    engine.dispose()
+
+
+def test_sink_flush_waits_for_pending_rows(tmp_path: Path) -> None:
+    db = _make_session(tmp_path)
+    sink = EventSink(batch_size=100, flush_interval_seconds=60, max_queue_size=100)
+    sink.start()
+    sink.submit(db.get_bind(), _row(1))
+
+    assert sink.flush(timeout=5)
+    assert db.query(EventLog).count() == 1
+    sink.close()
+    db.close()
+    db.get_bind().dispose()
+
+
+def test_sink_keeps_other_rows_when_one_row_fails(tmp_path: Path) -> None:
+    db = _make_session(tmp_path)
+    sink = EventSink(batch_size=100, flush_interval_seconds=60, max_queue_size=100)
+    sink.start()
+    # 第 3 条与第 1 条主键冲突，整批 executemany 失败后逐行重试，只丢弃冲突的这一行。
+    for row in (_row(1), _row(2), _row(1), _row(3)):
+        sink.submit(db.get_bind(), row)
+    sink.close()
+
+    assert sorted(event.id for event in db.query(EventLog).all()) == ["event-1", "event-2", "event-3"]
+    db.close()
+    db.get_bind().dispose()
+
+
+def test_sink_rejects_when_queue_is_full() -> None:
+    sink = EventSink(batch_size=10, flush_interval_seconds=1, max_queue_size=1)
+    # 未启动后台线程，队列不会被消费。
+    assert sink.submit(None, _row(1)) is True
+    assert sink.submit(None, _row(2), timeout=0.01) is False
+
+
+def test_buffered_log_event_returns_before_write(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("EVENT_LOG_MODE", "buffered")
+    monkeypatch.setenv("EVENT_LOG_FLUSH_INTERVAL_SECONDS", "60")
+    get_settings.cache_clear()
+    db = _make_session(tmp_path)
+    try:
+        created = event_service.log_event(
+            db=db, user_id="user-1", event_name="content_published", stage="MVP"
+        )
+        assert created.id
+        assert db.query(EventLog).count() == 0
+
+        event_sink_module.shutdown_event_sink()
+        stored = db.query(EventLog).one()
+        assert stored.id == created.id
+    finally:
+        event_sink_module.shutdown_event_sink()
+        db.close()
+        db.get_bind().dispose()
+
+
+def test_buffered_log_event_falls_back_to_sync_when_queue_full(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("EVENT_LOG_MODE", "buffered")
+    get_settings.cache_clear()
+    db = _make_session(tmp_path)
+    full_sink = EventSink(batch_size=1, flush_interval_seconds=1, max_queue_size=1)
+    full_sink.submit(None, _row(0))
+    monkeypatch.setattr(event_service, "get_event_sink", lambda: full_sink)
+
+    event_service.log_event(db=db, user_id="user-1", event_name="content_published", stage="MVP")
+
+    assert db.query(EventLog).count() == 1
+    db.close()
+    db.get_bind().dispose()
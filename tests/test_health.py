@@ -9,4 +9,4 @@ def test_health_endpoint(monkeypatch) -> None:
     response = client.get("/health")
 
     assert response.status_code == 200
-    assert response.json() == {"status": "ok", "db_ok": True}
+    assert response.json() == {"status": "ok", "db_ok": True, "llm_circuits": []}
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.base import Base
+from app.models.idempotency import IdempotencyRecord
+from app.models.user import User
+from app.services import idempotency as idempotency_service
+from app.services.idempotency import IdempotencyError, SingleFlight, StoredResponse
+
+
+@pytest.fixture()
+def session_local(tmp_path) -> sessionmaker:
+    engine = create_engine(
+        f"sqlite:///{(tmp_path / 'idempotency.db').as_posix()}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, class_=Session)
+    engine.dispose()
+
+
+@pytest.fixture()
+def user_id(session_local: sessionmaker) -> str:
+    with session_local() as db:
+        user = User()
+        db.add(user)
+        db.commit()
+        return user.id
+
+
+def test_hash_request_ignores_key_order() -> None:
+    assert idempotency_service.hash_request({"a": 1, "b": [1, 2]}) == idempotency_service.hash_request(
+        {"b": [1, 2], "a": 1}
+    )
+    assert idempotency_service.hash_request({"a": 1}) != idempotency_service.hash_request({"a": 2})
+
+
+def test_single_flight_coalesces_concurrent_calls_and_shares_errors() -> None:
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[int] = []
+    results: list[object] = []
+
+    def _slow() -> str:
+        calls.append(1)
+        started.set()
+        assert release.wait(5)
+        return "done"
+
+    leader = threading.Thread(target=lambda: results.append(flights.do("k", _slow)))
+    leader.start()
+    assert started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flights.do("k", _slow))) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ["done"] * 4
+    assert flights.in_flight() == 0
+
+    def _fail() -> str:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flights.do("k", _fail)
+    assert flights.do("k", lambda: "again") == "again"
+
+
+def test_execute_idempotent_without_key_coalesces_concurrent_duplicates(
+    session_local: sessionmaker,
+    user_id: str,
+) -> None:
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[int] = []
+    results: list[StoredResponse] = []
+
+    def _execute() -> StoredResponse:
+        calls.append(1)
+        started.set()
+        assert release.wait(5)
+        return StoredResponse(200, {"id": "kit-1"})
+
+    def _request() -> None:
+        with session_local() as db:
+            results.append(
+                idempotency_service.execute_idempotent(
+                    db,
+                    user_id=user_id,
+                    operation="launch_kit",
+                    request={"user_id": user_id},
+                    idempotency_key=None,
+                    execute=_execute,
+                )
+            )
+
+    threads = [threading.Thread(target=_request) for _ in range(3)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert [result.body for result in results] == [{"id": "kit-1"}] * 3
+
+
+def test_duplicates_with_different_keys_share_one_execution_and_each_key_replays(
+    session_local: sessionmaker,
+    user_id: str,
+) -> None:
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[int] = []
+    results: dict[str | None, StoredResponse] = {}
+
+    def _execute() -> StoredResponse:
+        calls.append(1)
+        started.set()
+        assert release.wait(5)
+        return StoredResponse(200, {"id": "kit-1"})
+
+    def _request(key: str | None) -> None:
+        with session_local() as db:
+            results[key] = idempotency_service.execute_idempotent(
+                db,
+                user_id=user_id,
+                operation="launch_kit",
+                request={"user_id": user_id},
+                idempotency_key=key,
+                execute=_execute,
+            )
+
+    threads = [threading.Thread(target=_request, args=(key,)) for key in ("key-a", "key-b", None)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # 等其余请求进入合并等待后再放行首个执行。
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert {key: result.body for key, result in results.items()} == {
+        "key-a": {"id": "kit-1"},
+        "key-b": {"id": "kit-1"},
+        None: {"id": "kit-1"},
+    }
+
+    # 每个键各自保存了可重放的响应，重试时不再执行。
+    for key in ("key-a", "key-b"):
+        with session_local() as db:
+            replayed = idempotency_service.execute_idempotent(
+                db,
+                user_id=user_id,
+                operation="launch_kit",
+                request={"user_id": user_id},
+                idempotency_key=key,
+                execute=_execute,
+            )
+        assert replayed.replayed is True
+    assert calls == [1]
+
+
+def test_concurrent_key_reuse_with_different_body_returns_422(
+    session_local: sessionmaker,
+    user_id: str,
+) -> None:
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[int] = []
+    results: dict[str, StoredResponse | IdempotencyError] = {}
+
+    def _execute() -> StoredResponse:
+        calls.append(1)
+        started.set()
+        assert release.wait(5)
+        return StoredResponse(200, {"id": "kit-1"})
+
+    def _request(label: str, request: dict) -> None:
+        with session_local() as db:
+            try:
+                results[label] = idempotency_service.execute_idempotent(
+                    db,
+                    user_id=user_id,
+                    operation="launch_kit",
+                    request=request,
+                    idempotency_key="key-1",
+                    execute=_execute,
+                )
+            except IdempotencyError as error:
+                results[label] = error
+
+    first = threading.Thread(target=_request, args=("first", {"user_id": user_id}))
+    first.start()
+    assert started.wait(5)
+    # 同一个键、不同请求体的并发请求不能加入首个请求的合并，拿到别人的响应。
+    mismatched = threading.Thread(
+        target=_request,
+        args=("mismatched", {"user_id": user_id, "generation_mode": "parallel"}),
+    )
+    mismatched.start()
+    mismatched.join(5)
+    release.set()
+    first.join(5)
+
+    assert calls == [1]
+    assert isinstance(results["first"], StoredResponse)
+    assert results["first"].body == {"id": "kit-1"}
+    assert isinstance(results["mismatched"], IdempotencyError)
+    assert results["mismatched"].status_code == 422
+
+
+def test_in_progress_key_conflicts_until_lock_timeout(session_local: sessionmaker, user_id: str) -> None:
+    now = datetime.now(timezone.utc)
+    request = {"user_id": user_id}
+    with session_local() as db:
+        db.add(
+            IdempotencyRecord(
+                user_id=user_id,
+                operation="launch_kit",
+                idempotency_key="key-1",
+                request_hash=idempotency_service.hash_request(request),
+                status="in_progress",
+                created_at=now,
+                expires_at=now + timedelta(days=1),
+            )
+        )
+        db.commit()
+
+        with pytest.raises(IdempotencyError) as conflict:
+            idempotency_service.execute_idempotent(
+                db,
+                user_id=user_id,
+                operation="launch_kit",
+                request=request,
+                idempotency_key="key-1",
+                execute=lambda: StoredResponse(200, {"id": "kit-1"}),
+            )
+        assert conflict.value.status_code == 409
+
+        # 超过锁超时的进行中记录视为崩溃遗留，可重新认领。
+        record = db.get(IdempotencyRecord, (user_id, "launch_kit", "key-1"))
+        record.created_at = now - timedelta(hours=1)
+        db.commit()
+        response = idempotency_service.execute_idempotent(
+            db,
+            user_id=user_id,
+            operation="launch_kit",
+            request=request,
+            idempotency_key="key-1",
+            execute=lambda: StoredResponse(200, {"id": "kit-1"}),
+        )
+
+    assert response.body == {"id": "kit-1"}
+    assert response.replayed is False
+
+
+def test_expired_records_are_not_replayed(session_local: sessionmaker, user_id: str) -> None:
+    now = datetime.now(timezone.utc)
+    request = {"user_id": user_id}
+    with session_local() as db:
+        db.add(
+            IdempotencyRecord(
+                user_id=user_id,
+                operation="launch_kit",
+                idempotency_key="key-1",
+                request_hash=idempotency_service.hash_request(request),
+                status="completed",
+                response_status=200,
+                response_json={"id": "old"},
+                created_at=now - timedelta(days=2),
+                expires_at=now - timedelta(days=1),
+            )
+        )
+        db.commit()
+
+        response = idempotency_service.execute_idempotent(
+            db,
+            user_id=user_id,
+            operation="launch_kit",
+            request=request,
+            idempotency_key="key-1",
+            execute=lambda: StoredResponse(200, {"id": "new"}),
+        )
+
+    assert response.body == {"id": "new"}
+    assert response.replayed is False
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from types import ModuleType
+
+import pytest
+
+from app.api.responses import CodecJSONResponse
+from app.core import json_codec
+
+_PAYLOAD = {
+    "content_pillars": ["职场成长", "副业实验"],
+    "tone_examples": [{"text": "先讲结论，再给例子。", "weight": 0.5}],
+    "day_no": 3,
+    "ok": True,
+    "missing": None,
+}
+
+
+def _load_stdlib_codec(monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    """在屏蔽 orjson 的情况下单独加载一份 json_codec，不影响已导入的模块。"""
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    spec = importlib.util.spec_from_file_location("_json_codec_stdlib", json_codec.__file__)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_dumps_is_compact_and_keeps_non_ascii() -> None:
+    text = json_codec.dumps({"theme": "第一天", "items": [1, 2]})
+
+    assert text == '{"theme":"第一天","items":[1,2]}'
+    assert json_codec.dumps_bytes({"theme": "第一天"}) == '{"theme":"第一天"}'.encode("utf-8")
+    assert json_codec.loads(text) == {"theme": "第一天", "items": [1, 2]}
+    assert json_codec.loads(text.encode("utf-8")) == {"theme": "第一天", "items": [1, 2]}
+
+
+def test_dumps_sort_keys_orders_nested_objects() -> None:
+    assert json_codec.dumps({"b": 1, "a": {"d": 2, "c": 3}}, sort_keys=True) == '{"a":{"c":3,"d":2},"b":1}'
+
+
+def test_stdlib_fallback_matches_active_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    fallback = _load_stdlib_codec(monkeypatch)
+
+    assert fallback.BACKEND == "json"
+    assert fallback.dumps(_PAYLOAD) == json_codec.dumps(_PAYLOAD)
+    assert fallback.dumps(_PAYLOAD, sort_keys=True) == json_codec.dumps(_PAYLOAD, sort_keys=True)
+    assert fallback.dumps_bytes(_PAYLOAD) == json_codec.dumps_bytes(_PAYLOAD)
+    assert fallback.loads(json_codec.dumps(_PAYLOAD)) == _PAYLOAD
+
+
+def test_invalid_json_and_unsupported_types_raise_stdlib_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    for codec in (json_codec, _load_stdlib_codec(monkeypatch)):
+        with pytest.raises(json.JSONDecodeError):
+            codec.loads("not json")
+        with pytest.raises(codec.JSONDecodeError):
+            codec.loads("{")
+        with pytest.raises(TypeError):
+            codec.dumps({"value": object()})
+
+
+def test_codec_json_response_renders_with_codec() -> None:
+    response = CodecJSONResponse({"theme": "第一天"})
+
+    assert response.body == '{"theme":"第一天"}'.encode("utf-8")
+    assert response.headers["content-type"] == "application/json"
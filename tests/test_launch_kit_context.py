@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import itertools
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.base import Base
+from app.models.identity_model import IdentitySelection
+from app.models.persona import RiskBoundaryItem
+from app.models.user import User
+from app.services import launch_kit as launch_kit_service
+from tests.api.helpers import (
+    create_capability_profile,
+    create_identity_model,
+    create_onboarding_session,
+    create_persona_constitution,
+)
+
+_BASE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _at(minutes: int) -> datetime:
+    return _BASE_TIME + timedelta(minutes=minutes)
+
+
+def _new_user(db: Session) -> str:
+    user = User()
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def _add_boundary(
+    db: Session,
+    *,
+    user_id: str,
+    minutes: int,
+    constitution_id: str | None = None,
+    identity_model_id: str | None = None,
+) -> None:
+    db.add(
+        RiskBoundaryItem(
+            user_id=user_id,
+            constitution_id=constitution_id,
+            identity_model_id=identity_model_id,
+            statement=f"boundary-{minutes}",
+            created_at=_at(minutes),
+        )
+    )
+    db.commit()
+
+
+def _select(db: Session, *, user_id: str, identity_id: str, minutes: int) -> None:
+    db.add(IdentitySelection(user_id=user_id, primary_identity_id=identity_id, selected_at=_at(minutes)))
+    db.commit()
+
+
+@pytest.fixture()
+def db(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{(tmp_path / 'context.db').as_posix()}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture()
+def scenario(db: Session) -> dict[str, str]:
+    """多身份、多版本宪法、分范围风险边界，外加一个他人用户与一个孤立选择的用户。"""
+    ids: dict[str, str] = {}
+    user = ids["user"] = _new_user(db)
+    other = ids["other"] = _new_user(db)
+    orphan = ids["orphan"] = _new_user(db)
+    ids["empty"] = _new_user(db)
+
+    sessions = [create_onboarding_session(db, user_id=user) for _ in range(3)]
+    create_capability_profile(db, session_id=sessions[0].id, user_id=user)
+    create_capability_profile(db, session_id=sessions[1].id, user_id=user)
+
+    identities = [
+        create_identity_model(db, user_id=user, title="i1", session_id=sessions[0].id),
+        create_identity_model(db, user_id=user, title="i2", session_id=sessions[1].id),
+        create_identity_model(db, user_id=user, title="i3"),
+        create_identity_model(db, user_id=user, title="i4", session_id=sessions[2].id),
+    ]
+    for index, identity in enumerate(identities):
+        identity.created_at = _at(index)
+        ids[f"i{index + 1}"] = identity.id
+    db.commit()
+    _select(db, user_id=user, identity_id=ids["i1"], minutes=10)
+    _select(db, user_id=user, identity_id=ids["i2"], minutes=11)
+
+    for name, identity_key, version in (("c1", "i1", 1), ("c2", "i1", 2), ("c3", "i2", 1), ("c4", None, 3)):
+        constitution = create_persona_constitution(
+            db,
+            user_id=user,
+            identity_model_id=ids[identity_key] if identity_key else None,
+            version=version,
+        )
+        ids[name] = constitution.id
+
+    for minutes in range(20, 28):
+        _add_boundary(db, user_id=user, minutes=minutes, constitution_id=ids["c2"], identity_model_id=ids["i1"])
+    for minutes in range(30, 33):
+        _add_boundary(db, user_id=user, minutes=minutes, identity_model_id=ids["i3"])
+    for minutes in range(40, 42):
+        _add_boundary(db, user_id=user, minutes=minutes)
+
+    other_identity = create_identity_model(db, user_id=other, title="other")
+    ids["other_identity"] = other_identity.id
+    ids["other_constitution"] = create_persona_constitution(
+        db, user_id=other, identity_model_id=other_identity.id
+    ).id
+    _add_boundary(db, user_id=other, minutes=50, constitution_id=ids["other_constitution"])
+
+    # 选择记录指向他人身份：应记为孤立并回退到 latest。
+    create_identity_model(db, user_id=orphan, title="orphan-own")
+    _select(db, user_id=orphan, identity_id=other_identity.id, minutes=60)
+    return ids
+
+
+def _resolve_both(db: Session, **kwargs):
+    sequential = launch_kit_service._resolve_context_bundle_sequential(db=db, **kwargs)
+    batched = launch_kit_service._resolve_context_bundle(db=db, **kwargs)
+    return sequential, batched
+
+
+def test_batched_resolution_matches_sequential_cascade(db: Session, scenario: dict[str, str]) -> None:
+    identity_options = [None, "i1", "i2", "i3", "i4", "other_identity", "missing"]
+    constitution_options = [None, "c1", "c3", "c4", "other_constitution", "missing"]
+    seen_sources: set[tuple[str, ...]] = set()
+
+    for user_key in ("user", "orphan", "empty"):
+        for identity_key, constitution_key in itertools.product(identity_options, constitution_options):
+            sequential, batched = _resolve_both(
+                db,
+                user_id=scenario[user_key],
+                requested_identity_model_id=scenario.get(identity_key, identity_key),
+                requested_constitution_id=scenario.get(constitution_key, constitution_key),
+            )
+            assert batched == sequential, (user_key, identity_key, constitution_key)
+            seen_sources.add(tuple(sequential.context_sources.values()))
+
+    # 覆盖到每一级回退来源，parity 才有意义。
+    sources_by_kind = list(zip(*seen_sources))
+    assert set(sources_by_kind[0]) == {"request", "selection", "latest", "none"}
+    assert set(sources_by_kind[1]) == {"request", "identity", "latest", "none"}
+    assert set(sources_by_kind[2]) == {"session", "latest", "none"}
+    assert set(sources_by_kind[3]) == {"constitution", "identity", "latest", "none"}
+
+
+def test_batched_resolution_uses_fixed_query_count(db: Session, scenario: dict[str, str]) -> None:
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", _record)
+    try:
+        launch_kit_service._resolve_context_bundle(
+            db=db,
+            user_id=scenario["user"],
+            requested_identity_model_id="missing",
+            requested_constitution_id="missing",
+        )
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", _record)
+
+    assert len(statements) == 4
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import get_settings
+from app.services.llm_client import (
+    CircuitBreaker,
+    LLMClient,
+    LLMServiceError,
+    build_llm_circuit_breakers,
+)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _DummyTimeoutError(Exception):
+    pass
+
+
+class _DummyConnectionError(Exception):
+    pass
+
+
+class _DummyStatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"status={status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={})
+
+
+def _breaker(clock: _FakeClock, **overrides) -> CircuitBreaker:
+    options = {
+        "window_seconds": 60.0,
+        "min_requests": 4,
+        "failure_rate_threshold": 0.5,
+        "open_seconds": 30.0,
+        "half_open_max_calls": 1,
+        "clock": clock,
+    }
+    options.update(overrides)
+    return CircuitBreaker(**options)
+
+
+def _build_client(create_func, breaker: CircuitBreaker) -> LLMClient:
+    client = object.__new__(LLMClient)
+    client._max_retries = 0
+    client._model_name = "test-model"
+    client._reasoning = None
+    client._circuit = breaker
+    client._openai = SimpleNamespace(
+        APITimeoutError=_DummyTimeoutError,
+        APIConnectionError=_DummyConnectionError,
+        APIStatusError=_DummyStatusError,
+    )
+    client._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create_func)))
+    return client
+
+
+def test_circuit_opens_on_failure_rate_and_rejects_fast() -> None:
+    clock = _FakeClock()
+    breaker = _breaker(clock)
+
+    for failure in (True, True, True):
+        breaker.record(probe=False, failure=failure)
+    # 请求数未达下限，即便全部失败也保持关闭。
+    assert breaker.state == "closed"
+
+    breaker.record(probe=False, failure=False)
+    assert breaker.state == "open"
+
+    clock.now += 10
+    with pytest.raises(LLMServiceError) as exc_info:
+        breaker.before_call(operation="generate_identity_models")
+    error = exc_info.value
+    assert error.code == "LLM_CIRCUIT_OPEN"
+    assert error.operation == "generate_identity_models"
+    assert error.retryable is False
+    assert error.retry_after == 20
+
+
+def test_failures_outside_the_window_are_forgotten() -> None:
+    clock = _FakeClock()
+    breaker = _breaker(clock)
+
+    for _ in range(3):
+        breaker.record(probe=False, failure=True)
+    clock.now += 61
+    breaker.record(probe=False, failure=True)
+    breaker.record(probe=False, failure=False)
+
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["requests"] == 2
+
+
+def test_half_open_probe_success_closes_and_failure_reopens() -> None:
+    clock = _FakeClock()
+    breaker = _breaker(clock, min_requests=1)
+    breaker.record(probe=False, failure=True)
+    assert breaker.state == "open"
+
+    clock.now += 30
+    assert breaker.state == "half_open"
+    probe = breaker.before_call(operation="op")
+    assert probe is True
+    # 探测名额已用完，其余请求继续快速失败。
+    with pytest.raises(LLMServiceError):
+        breaker.before_call(operation="op")
+    breaker.record(probe=True, failure=True)
+    assert breaker.state == "open"
+
+    clock.now += 30
+    probe = breaker.before_call(operation="op")
+    # 未到达上游的探测只归还名额，不改变状态。
+    breaker.record(probe=probe, failure=None)
+    assert breaker.state == "half_open"
+    probe = breaker.before_call(operation="op")
+    breaker.record(probe=probe, failure=False)
+    assert breaker.state == "closed"
+    assert breaker.before_call(operation="op") is False
+
+
+def test_client_trips_on_upstream_errors_and_stops_calling_provider() -> None:
+    clock = _FakeClock()
+    breaker = _breaker(clock, min_requests=2)
+    call_count = {"count": 0}
+
+    def _create(**_kwargs):
+        call_count["count"] += 1
+        raise _DummyStatusError(503)
+
+    client = _build_client(_create, breaker)
+    for _ in range(2):
+        with pytest.raises(LLMServiceError) as exc_info:
+            client.generate_json(operation="op", system_prompt="p", user_payload={})
+        assert exc_info.value.code == "LLM_UPSTREAM_HTTP_ERROR"
+
+    with pytest.raises(LLMServiceError) as exc_info:
+        client.generate_json(operation="op", system_prompt="p", user_payload={})
+
+    assert exc_info.value.code == "LLM_CIRCUIT_OPEN"
+    assert exc_info.value.to_detail()["code"] == "LLM_CIRCUIT_OPEN"
+    assert call_count["count"] == 2
+
+
+@pytest.mark.parametrize("status_code", [400, 429])
+def test_client_errors_do_not_trip_the_circuit(status_code: int) -> None:
+    breaker = _breaker(_FakeClock(), min_requests=2)
+
+    def _create(**_kwargs):
+        raise _DummyStatusError(status_code)
+
+    client = _build_client(_create, breaker)
+    for _ in range(3):
+        with pytest.raises(LLMServiceError):
+            client.generate_json(operation="op", system_prompt="p", user_payload={})
+
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["failures"] == 0
+
+
+def test_build_llm_circuit_breakers_is_keyed_per_upstream_and_model(monkeypatch) -> None:
+    registry = build_llm_circuit_breakers(get_settings())
+    assert registry is not None
+    first = registry.get("https://a.example.com/v1", "model-a")
+    assert registry.get("https://a.example.com/v1", "model-a") is first
+    assert registry.get("https://a.example.com/v1", "model-b") is not first
+    assert registry.get("https://b.example.com/v1", "model-a") is not first
+    assert {(item["upstream"], item["model"]) for item in registry.snapshot()} == {
+        ("a.example.com", "model-a"),
+        ("a.example.com", "model-b"),
+        ("b.example.com", "model-a"),
+    }
+
+    monkeypatch.setenv("LLM_CIRCUIT_BREAKER_ENABLED", "false")
+    get_settings.cache_clear()
+    assert build_llm_circuit_breakers(get_settings()) is None
@@ -1,10 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import json
+import time
 from types import SimpleNamespace
 
 import pytest
 
-from app.services.llm_client import LLMClient, LLMServiceError
+from app.services import llm_client as llm_client_module
+from app.services.llm_client import (
+    AsyncLLMClient,
+    InMemoryLLMResponseCache,
+    LLMClient,
+    LLMRateLimiter,
+    RetryPolicy,
+    LLMServiceError,
+    SQLiteLLMResponseCache,
+    build_llm_cache_key,
+    llm_deadline,
+)
 
 
 class _DummyTimeoutError(Exception):
@@ -38,11 +54,20 @@ class _Completion:
         self._request_id = request_id
 
 
+async def _no_async_sleep(_seconds: float) -> None:
+    return None
+
+
+# 测试默认不真正等待退避时间。
+_NO_SLEEP_POLICY = RetryPolicy(sleep=lambda _seconds: None, async_sleep=_no_async_sleep)
+
+
 def _build_client(create_func, retries: int = 0, reasoning: bool | None = None) -> LLMClient:
     client = object.__new__(LLMClient)
     client._max_retries = retries
     client._model_name = "test-model"
     client._reasoning = reasoning
+    client._retry_policy = _NO_SLEEP_POLICY
     client._openai = SimpleNamespace(
         APITimeoutError=_DummyTimeoutError,
         APIConnectionError=_DummyConnectionError,
@@ -56,6 +81,29 @@ def _build_client(create_func, retries: int = 0, reasoning: bool | None = None)
     return client
 
 
+def _build_async_client(create_func, retries: int = 0, reasoning: bool | None = None) -> AsyncLLMClient:
+    client = object.__new__(AsyncLLMClient)
+    client._max_retries = retries
+    client._model_name = "test-model"
+    client._reasoning = reasoning
+    client._retry_policy = _NO_SLEEP_POLICY
+    client._openai = SimpleNamespace(
+        APITimeoutError=_DummyTimeoutError,
+        APIConnectionError=_DummyConnectionError,
+        APIStatusError=_DummyStatusError,
+    )
+
+    async def _create(**kwargs):
+        return create_func(**kwargs)
+
+    client._client = SimpleNamespace(
+        chat=SimpleNamespace(
+            completions=SimpleNamespace(create=_create),
+        )
+    )
+    return client
+
+
 def test_generate_json_invalid_json_raises_structured_error() -> None:
     def _create(**_kwargs):
         return _Completion("this is not json")
@@ -145,7 +193,7 @@ def test_generate_json_uses_strict_openai_chat_completions_format() -> None:
     assert captured["messages"][0]["role"] == "system"
     assert captured["messages"][0]["content"] == "system prompt"
     assert captured["messages"][1]["role"] == "user"
-    assert '"foo": "bar"' in captured["messages"][1]["content"]
+    assert json.loads(captured["messages"][1]["content"]) == {"foo": "bar"}
 
 
 def test_generate_json_includes_reasoning_true_when_enabled() -> None:
@@ -260,3 +308,513 @@ def test_generate_json_does_not_retry_on_400_status() -> None:
     assert error.retryable is False
     assert error.attempts == 1
     assert call_count["count"] == 1
+
+
+def test_async_generate_json_uses_same_request_format() -> None:
+    captured: dict = {}
+
+    def _create(**kwargs):
+        captured.update(kwargs)
+        return _Completion('{"ok": true}')
+
+    client = _build_async_client(_create, retries=0, reasoning=False)
+
+    payload = asyncio.run(
+        client.generate_json(
+            operation="test_async_request_format",
+            system_prompt="system prompt",
+            user_payload={"foo": "bar"},
+        )
+    )
+
+    assert payload == {"ok": True}
+    assert captured["model"] == "test-model"
+    assert captured["response_format"] == {"type": "json_object"}
+    assert captured["extra_body"] == {"reasoning": False, "enable_thinking": False}
+    assert json.loads(captured["messages"][1]["content"]) == {"foo": "bar"}
+
+
+def test_async_generate_json_timeout_retries_exhausted() -> None:
+    call_count = {"count": 0}
+
+    def _create(**_kwargs):
+        call_count["count"] += 1
+        raise _DummyTimeoutError("timed out")
+
+    client = _build_async_client(_create, retries=2)
+
+    with pytest.raises(LLMServiceError) as exc_info:
+        asyncio.run(
+            client.generate_json(
+                operation="test_async_timeout",
+                system_prompt="prompt",
+                user_payload={"foo": "bar"},
+            )
+        )
+
+    error = exc_info.value
+    assert error.code == "LLM_UPSTREAM_TIMEOUT"
+    assert error.retryable is True
+    assert error.attempts == 3
+    assert call_count["count"] == 3
+
+
+def test_async_generate_json_retries_without_reasoning_on_status_error() -> None:
+    calls: list[dict] = []
+
+    def _create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise _DummyStatusError(422)
+        return _Completion('{"ok": true}')
+
+    client = _build_async_client(_create, retries=0, reasoning=True)
+
+    payload = asyncio.run(
+        client.generate_json(
+            operation="test_async_reasoning_fallback",
+            system_prompt="prompt",
+            user_payload={"foo": "bar"},
+        )
+    )
+
+    assert payload == {"ok": True}
+    assert len(calls) == 2
+    assert calls[0]["extra_body"] == {"reasoning": True}
+    assert "extra_body" not in calls[1]
+
+
+def test_async_generate_json_invalid_json_raises_structured_error() -> None:
+    def _create(**_kwargs):
+        return _Completion("this is not json")
+
+    client = _build_async_client(_create, retries=0)
+
+    with pytest.raises(LLMServiceError) as exc_info:
+        asyncio.run(
+            client.generate_json(
+                operation="test_async_invalid_json",
+                system_prompt="prompt",
+                user_payload={"foo": "bar"},
+            )
+        )
+
+    assert exc_info.value.code == "LLM_INVALID_RESPONSE"
+    assert exc_info.value.attempts == 1
+
+
+def test_stream_json_text_yields_deltas_and_requests_stream() -> None:
+    captured: dict = {}
+    call_count = {"count": 0}
+
+    def _create(**kwargs):
+        call_count["count"] += 1
+        if call_count["count"] == 1:
+            raise _DummyTimeoutError("timed out")
+        captured.update(kwargs)
+        return [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=part))])
+            for part in ['{"a"', None, ": 1}"]
+        ] + [SimpleNamespace(choices=[])]
+
+    client = _build_client(_create, retries=1)
+
+    parts = list(
+        client.stream_json_text(
+            operation="test_stream",
+            system_prompt="prompt",
+            user_payload={"foo": "bar"},
+        )
+    )
+
+    assert parts == ['{"a"', ": 1}"]
+    assert captured["stream"] is True
+    assert call_count["count"] == 2
+
+
+def test_build_llm_cache_key_is_stable_across_key_order() -> None:
+    first = build_llm_cache_key(
+        model_name="m",
+        system_prompt="p",
+        user_payload={"a": 1, "b": {"x": "中文", "y": [1, 2]}},
+    )
+    second = build_llm_cache_key(
+        model_name="m",
+        system_prompt="p",
+        user_payload={"b": {"y": [1, 2], "x": "中文"}, "a": 1},
+    )
+    other_model = build_llm_cache_key(
+        model_name="m2",
+        system_prompt="p",
+        user_payload={"a": 1, "b": {"x": "中文", "y": [1, 2]}},
+    )
+
+    assert first == second
+    assert first != other_model
+
+
+def test_generate_json_cache_hit_skips_upstream_call() -> None:
+    call_count = {"count": 0}
+
+    def _create(**_kwargs):
+        call_count["count"] += 1
+        return _Completion('{"ok": true, "items": [1]}')
+
+    client = _build_client(_create, retries=0)
+    client._cache = InMemoryLLMResponseCache(ttl_seconds=60, max_entries=8)
+    client._cache_operations = frozenset({"cached_op"})
+
+    first = client.generate_json(operation="cached_op", system_prompt="p", user_payload={"foo": "bar"}, validate=dict)
+    first["items"].append(2)
+    second = client.generate_json(operation="cached_op", system_prompt="p", user_payload={"foo": "bar"}, validate=dict)
+
+    assert call_count["count"] == 1
+    assert second == {"ok": True, "items": [1]}
+
+
+def test_generate_json_cache_skips_operations_not_enabled() -> None:
+    call_count = {"count": 0}
+
+    def _create(**_kwargs):
+        call_count["count"] += 1
+        return _Completion('{"ok": true}')
+
+    client = _build_client(_create, retries=0)
+    client._cache = InMemoryLLMResponseCache(ttl_seconds=60, max_entries=8)
+    client._cache_operations = frozenset({"other_op"})
+
+    client.generate_json(operation="uncached_op", system_prompt="p", user_payload={"foo": "bar"}, validate=dict)
+    client.generate_json(operation="uncached_op", system_prompt="p", user_payload={"foo": "bar"}, validate=dict)
+
+    assert call_count["count"] == 2
+
+
+def test_generate_json_does_not_cache_errors() -> None:
+    calls: list[dict] = []
+
+    def _create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            raise _DummyStatusError(400)
+        return _Completion('{"ok": true}')
+
+    client = _build_client(_create, retries=0)
+    client._cache = InMemoryLLMResponseCache(ttl_seconds=60, max_entries=8)
+    client._cache_operations = frozenset({"cached_op"})
+
+    with pytest.raises(LLMServiceError):
+        client.generate_json(operation="cached_op", system_prompt="p", user_payload={"foo": "bar"}, validate=dict)
+    payload = client.generate_json(operation="cached_op", system_prompt="p", user_payload={"foo": "bar"}, validate=dict)
+
+    assert payload == {"ok": True}
+    assert len(calls) == 2
+
+
+def test_generate_json_does_not_cache_schema_invalid_or_unvalidated_results() -> None:
+    responses = ['{"ok": false}', '{"ok": true}', '{"repaired": true}', '{"repaired": true}']
+    calls: list[dict] = []
+
+    def _create(**kwargs):
+        calls.append(kwargs)
+        return _Completion(responses[len(calls) - 1])
+
+    def _validate(payload: dict) -> None:
+        if payload.get("ok") is not True:
+            raise ValueError("schema invalid")
+
+    client = _build_client(_create, retries=0)
+    client._cache = InMemoryLLMResponseCache(ttl_seconds=60, max_entries=8)
+    client._cache_operations = frozenset({"cached_op"})
+
+    # 不合规的结果照常返回给调用方，但不写入缓存，下一次仍访问上游。
+    assert client.generate_json(operation="cached_op", system_prompt="p", user_payload={}, validate=_validate) == {
+        "ok": False
+    }
+    assert client.generate_json(operation="cached_op", system_prompt="p", user_payload={}, validate=_validate) == {
+        "ok": True
+    }
+    # 修复调用不传 validate：既不读也不写缓存。
+    for _ in range(2):
+        client.generate_json(operation="cached_op", system_prompt="repair", user_payload={})
+
+    assert len(calls) == 4
+    assert client.generate_json(operation="cached_op", system_prompt="p", user_payload={}, validate=_validate) == {
+        "ok": True
+    }
+    assert len(calls) == 4
+
+
+def test_in_memory_cache_expires_entries_and_evicts_lru(monkeypatch) -> None:
+    now = {"value": 100.0}
+    monkeypatch.setattr(llm_client_module.time, "monotonic", lambda: now["value"])
+    cache = InMemoryLLMResponseCache(ttl_seconds=10, max_entries=2)
+
+    cache.set("a", operation="op", payload={"v": "a"})
+    cache.set("b", operation="op", payload={"v": "b"})
+    assert cache.get("a") == {"v": "a"}
+    cache.set("c", operation="op", payload={"v": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": "a"}
+    now["value"] += 11
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+
+
+def test_sqlite_cache_round_trip_and_size_bound(tmp_path) -> None:
+    cache = SQLiteLLMResponseCache(
+        path=str(tmp_path / "llm_cache.db"),
+        ttl_seconds=60,
+        max_entries=2,
+    )
+
+    cache.set("a", operation="op", payload={"v": "中文"})
+    cache.set("b", operation="op", payload={"v": "b"})
+    cache.set("c", operation="op", payload={"v": "c"})
+
+    assert cache.get("a") is None
+    assert cache.get("b") == {"v": "b"}
+    assert cache.get("c") == {"v": "c"}
+
+    reopened = SQLiteLLMResponseCache(
+        path=str(tmp_path / "llm_cache.db"),
+        ttl_seconds=60,
+        max_entries=2,
+    )
+    assert reopened.get("c") == {"v": "c"}
+
+
+def test_async_generate_json_shares_response_cache() -> None:
+    call_count = {"count": 0}
+
+    def _create(**_kwargs):
+        call_count["count"] += 1
+        return _Completion('{"ok": true}')
+
+    client = _build_async_client(_create, retries=0)
+    client._cache = InMemoryLLMResponseCache(ttl_seconds=60, max_entries=8)
+    client._cache_operations = frozenset({"cached_op"})
+
+    async def _run_twice() -> list[dict]:
+        return [
+            await client.generate_json(operation="cached_op", system_prompt="p", user_payload={"n": 1}, validate=dict),
+            await client.generate_json(operation="cached_op", system_prompt="p", user_payload={"n": 1}, validate=dict),
+        ]
+
+    assert asyncio.run(_run_twice()) == [{"ok": True}, {"ok": True}]
+    assert call_count["count"] == 1
+
+
+def test_generate_json_holds_limiter_permit_only_during_upstream_call() -> None:
+    limiter = LLMRateLimiter(
+        max_in_flight=1,
+        requests_per_minute=0,
+        tokens_per_minute=0,
+        model_limits={},
+        queue_timeout_seconds=1.0,
+    )
+    in_flight_during_call: list[int] = []
+    outcomes = ["timeout", "ok"]
+
+    def _create(**_kwargs):
+        in_flight_during_call.append(limiter.snapshot()["in_flight"])
+        if outcomes.pop(0) == "timeout":
+            raise _DummyTimeoutError("timed out")
+        return _Completion('{"ok": true}')
+
+    client = _build_client(_create, retries=1)
+    client._limiter = limiter
+
+    assert client.generate_json(operation="op", system_prompt="p", user_payload={}) == {"ok": True}
+    assert in_flight_during_call == [1, 1]
+    assert limiter.snapshot()["in_flight"] == 0
+    assert limiter.snapshot()["acquired"] == 2
+
+
+def test_stream_json_text_releases_limiter_permit_after_stream_ends() -> None:
+    limiter = LLMRateLimiter(
+        max_in_flight=1,
+        requests_per_minute=0,
+        tokens_per_minute=0,
+        model_limits={},
+        queue_timeout_seconds=1.0,
+    )
+
+    def _create(**_kwargs):
+        return [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="{}"))])]
+
+    client = _build_client(_create)
+    client._limiter = limiter
+
+    stream = client.stream_json_text(operation="op", system_prompt="p", user_payload={})
+    assert next(stream) == "{}"
+    assert limiter.snapshot()["in_flight"] == 1
+    assert list(stream) == []
+    assert limiter.snapshot()["in_flight"] == 0
+
+
+def _status_error(status_code: int, headers: dict[str, str]) -> _DummyStatusError:
+    error = _DummyStatusError(status_code)
+    error.response = SimpleNamespace(headers=headers)
+    return error
+
+
+def _recording_policy(sleeps: list[float], *, jitter: float = 1.0) -> RetryPolicy:
+    async def _async_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    return RetryPolicy(
+        base_delay_seconds=1.0,
+        max_delay_seconds=3.0,
+        sleep=sleeps.append,
+        async_sleep=_async_sleep,
+        jitter=lambda: jitter,
+    )
+
+
+def test_retry_policy_full_jitter_exponential_backoff_is_capped() -> None:
+    error = LLMServiceError(code="LLM_UPSTREAM_TIMEOUT", message="t", operation="op", retryable=True)
+
+    assert [_recording_policy([]).backoff(attempt, error) for attempt in (1, 2, 3, 5)] == [1.0, 2.0, 3.0, 3.0]
+    assert _recording_policy([], jitter=0.25).backoff(2, error) == 0.5
+
+    error.retry_after = 12.0
+    assert _recording_policy([]).backoff(1, error) == 12.0
+
+
+def test_generate_json_backs_off_between_retries() -> None:
+    sleeps: list[float] = []
+
+    def _create(**_kwargs):
+        raise _DummyTimeoutError("timed out")
+
+    client = _build_client(_create, retries=3)
+    client._retry_policy = _recording_policy(sleeps)
+
+    with pytest.raises(LLMServiceError) as exc_info:
+        client.generate_json(operation="op", system_prompt="p", user_payload={})
+
+    assert exc_info.value.attempts == 4
+    assert sleeps == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"retry-after": "7"}, 7.0),
+        ({"retry-after-ms": "1500", "retry-after": "7"}, 1.5),
+        (
+            {
+                "x-ratelimit-remaining-requests": "10",
+                "x-ratelimit-reset-requests": "2s",
+                "x-ratelimit-remaining-tokens": "0",
+                "x-ratelimit-reset-tokens": "1m30s",
+            },
+            90.0,
+        ),
+        ({"x-ratelimit-reset-requests": "250ms"}, 0.25),
+    ],
+)
+def test_generate_json_honours_provider_retry_hints(headers: dict[str, str], expected: float) -> None:
+    sleeps: list[float] = []
+    outcomes = ["rate_limited", "ok"]
+
+    def _create(**_kwargs):
+        if outcomes.pop(0) == "rate_limited":
+            raise _status_error(429, headers)
+        return _Completion('{"ok": true}')
+
+    client = _build_client(_create, retries=1)
+    client._retry_policy = _recording_policy(sleeps)
+
+    assert client.generate_json(operation="op", system_prompt="p", user_payload={}) == {"ok": True}
+    assert sleeps == [expected]
+
+
+def test_retry_after_http_date_is_converted_to_seconds() -> None:
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    error = _status_error(503, {"retry-after": format_datetime(retry_at, usegmt=True)})
+
+    delay = llm_client_module._extract_retry_after(error, status_code=503)
+
+    assert delay is not None and 25 <= delay <= 30
+
+
+def test_generate_json_gives_up_when_backoff_exceeds_deadline() -> None:
+    sleeps: list[float] = []
+    call_count = {"count": 0}
+
+    def _create(**_kwargs):
+        call_count["count"] += 1
+        raise _status_error(429, {"retry-after": "60"})
+
+    client = _build_client(_create, retries=2)
+    client._retry_policy = _recording_policy(sleeps)
+
+    with llm_deadline(5):
+        with pytest.raises(LLMServiceError) as exc_info:
+            client.generate_json(operation="op", system_prompt="p", user_payload={})
+
+    assert exc_info.value.code == "LLM_UPSTREAM_HTTP_ERROR"
+    assert exc_info.value.attempts == 1
+    assert call_count["count"] == 1
+    assert sleeps == []
+
+
+def test_deadline_is_shared_across_calls_and_tightens_request_timeout() -> None:
+    captured: list[dict] = []
+
+    def _create(**kwargs):
+        captured.append(kwargs)
+        return _Completion('{"ok": true}')
+
+    client = _build_client(_create)
+    client._timeout_seconds = 90.0
+
+    client.generate_json(operation="op", system_prompt="p", user_payload={})
+    assert "timeout" not in captured[-1]
+
+    with llm_deadline(5):
+        client.generate_json(operation="op", system_prompt="p", user_payload={})
+        assert 0 < captured[-1]["timeout"] <= 5
+        # 内层预算不能超过外层剩余时间。
+        with llm_deadline(60):
+            client.generate_json(operation="op", system_prompt="p", user_payload={})
+            assert captured[-1]["timeout"] <= 5
+
+    with llm_deadline(0):
+        with pytest.raises(LLMServiceError) as exc_info:
+            client.generate_json(operation="op", system_prompt="p", user_payload={})
+    assert exc_info.value.code == "LLM_DEADLINE_EXCEEDED"
+    assert len(captured) == 3
+
+
+def test_async_generate_json_backs_off_with_async_sleep() -> None:
+    sleeps: list[float] = []
+
+    def _create(**_kwargs):
+        raise _DummyTimeoutError("timed out")
+
+    client = _build_async_client(_create, retries=2)
+    client._retry_policy = _recording_policy(sleeps)
+
+    with pytest.raises(LLMServiceError):
+        asyncio.run(client.generate_json(operation="op", system_prompt="p", user_payload={}))
+
+    assert sleeps == [1.0, 2.0]
+
+
+def test_llm_deadline_decorator_starts_a_fresh_budget_per_call() -> None:
+    seen: list[float | None] = []
+
+    @llm_deadline(5)
+    def _generate() -> None:
+        seen.append(llm_client_module._llm_deadline.get())
+
+    _generate()
+    time.sleep(0.01)
+    _generate()
+
+    assert seen[0] is not None and seen[1] is not None
+    assert seen[0] < seen[1]
+    assert llm_client_module._llm_deadline.get() is None
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
-import json
 from types import SimpleNamespace
 
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
 import app.main as main_module
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.models.user import User
 from app.services import consistency_check as consistency_service
 from app.services import identity_model as identity_service
@@ -42,7 +43,15 @@ def _create_test_client(monkeypatch, tmp_path) -> tuple[TestClient, str, Engine]
         finally:
             db.close()
 
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path.as_posix()}", poolclass=NullPool)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def _override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
     main_module.app.dependency_overrides[get_db] = _override_get_db
+    main_module.app.dependency_overrides[get_async_db] = _override_get_async_db
     client = TestClient(main_module.app)
     return client, user_id, engine
 
@@ -62,7 +71,7 @@ def _assert_error_detail_fields(detail: dict) -> None:
 def test_identity_route_returns_structured_502(monkeypatch, tmp_path) -> None:
     client, user_id, engine = _create_test_client(monkeypatch, tmp_path)
     try:
-        def _raise_error(*_args, **_kwargs):
+        async def _raise_error(*_args, **_kwargs):
             raise LLMServiceError(
                 code="LLM_INVALID_RESPONSE",
                 message="response is invalid",
@@ -73,7 +82,7 @@ def test_identity_route_returns_structured_502(monkeypatch, tmp_path) -> None:
                 attempts=2,
             )
 
-        monkeypatch.setattr(identity_service, "generate_identity_models", _raise_error)
+        monkeypatch.setattr(identity_service, "generate_identity_models_async", _raise_error)
         response = client.post(
             "/v1/identity-models/generate",
             json={"user_id": user_id, "capability_profile": {}, "count": 3},
@@ -89,7 +98,7 @@ def test_identity_route_returns_structured_502(monkeypatch, tmp_path) -> None:
 def test_persona_route_returns_structured_502(monkeypatch, tmp_path) -> None:
     client, user_id, engine = _create_test_client(monkeypatch, tmp_path)
     try:
-        def _raise_error(*_args, **_kwargs):
+        async def _raise_error(*_args, **_kwargs):
             raise LLMServiceError(
                 code="LLM_SCHEMA_VALIDATION_FAILED",
                 message="schema invalid",
@@ -100,7 +109,7 @@ def test_persona_route_returns_structured_502(monkeypatch, tmp_path) -> None:
                 attempts=1,
             )
 
-        monkeypatch.setattr(persona_service, "generate_constitution", _raise_error)
+        monkeypatch.setattr(persona_service, "generate_constitution_async", _raise_error)
         response = client.post(
             "/v1/persona-constitutions/generate",
             json={"user_id": user_id},
@@ -116,7 +125,7 @@ def test_persona_route_returns_structured_502(monkeypatch, tmp_path) -> None:
 def test_launch_kit_route_returns_structured_502(monkeypatch, tmp_path) -> None:
     client, user_id, engine = _create_test_client(monkeypatch, tmp_path)
     try:
-        def _raise_error(*_args, **_kwargs):
+        async def _raise_error(*_args, **_kwargs):
             raise LLMServiceError(
                 code="LLM_UPSTREAM_HTTP_ERROR",
                 message="upstream failed",
@@ -127,7 +136,7 @@ def test_launch_kit_route_returns_structured_502(monkeypatch, tmp_path) -> None:
                 attempts=3,
             )
 
-        monkeypatch.setattr(launch_kit_service, "generate_launch_kit", _raise_error)
+        monkeypatch.setattr(launch_kit_service, "generate_launch_kit_async", _raise_error)
         response = client.post(
             "/v1/launch-kits/generate",
             json={"user_id": user_id},
@@ -173,9 +182,9 @@ def test_consistency_route_returns_degraded_payload_and_event(monkeypatch, tmp_p
         def _degraded_result(*_args, **_kwargs):
             check = SimpleNamespace(
                 id="check-degraded",
-                deviation_items_json='["未发现明显偏离（建议人工复核）"]',
-                deviation_reasons_json='["LLM 结构化输出不稳定，已使用降级结果，请人工复核。"]',
-                suggestions_json='["请人工复核草稿后再发布。"]',
+                deviation_items_json=["未发现明显偏离（建议人工复核）"],
+                deviation_reasons_json=["LLM 结构化输出不稳定，已使用降级结果，请人工复核。"],
+                suggestions_json=["请人工复核草稿后再发布。"],
                 risk_triggered=False,
                 risk_warning="",
             )
@@ -204,7 +213,7 @@ def test_consistency_route_returns_degraded_payload_and_event(monkeypatch, tmp_p
         events = events_response.json()
         consistency_events = [e for e in events if e["event_name"] == "consistency_check_triggered"]
         assert consistency_events
-        payload = json.loads(consistency_events[0]["payload_json"])
+        payload = consistency_events[0]["payload_json"]
         assert payload["score"] == 60
         assert payload["degraded"] is True
         assert payload["degrade_reason"] == "llm_schema_retry_exhausted"
@@ -218,7 +227,7 @@ def test_consistency_route_returns_degraded_payload_and_event(monkeypatch, tmp_p
 def test_identity_route_strict_mode_keeps_502_for_upstream_400(monkeypatch, tmp_path) -> None:
     client, user_id, engine = _create_test_client(monkeypatch, tmp_path)
     try:
-        def _raise_error(*_args, **_kwargs):
+        async def _raise_error(*_args, **_kwargs):
             raise LLMServiceError(
                 code="LLM_UPSTREAM_HTTP_ERROR",
                 message="response_format is not supported",
@@ -229,7 +238,7 @@ def test_identity_route_strict_mode_keeps_502_for_upstream_400(monkeypatch, tmp_
                 attempts=1,
             )
 
-        monkeypatch.setattr(identity_service, "generate_identity_models", _raise_error)
+        monkeypatch.setattr(identity_service, "generate_identity_models_async", _raise_error)
         response = client.post(
             "/v1/identity-models/generate",
             json={"user_id": user_id, "capability_profile": {}, "count": 3},
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import copy
-import json
 import threading
 
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.db.base import Base
 from app.models.consistency_check import ConsistencyCheck
@@ -28,7 +30,7 @@ class _FakeLLMClient:
         self.calls: list[dict] = []
         self._lock = threading.Lock()
 
-    def generate_json(self, *, operation: str, system_prompt: str, user_payload: dict) -> dict:
+    def generate_json(self, *, operation: str, system_prompt: str, user_payload: dict, validate=None) -> dict:
         with self._lock:
             self.calls.append(
                 {
@@ -46,6 +48,38 @@ class _FakeLLMClient:
             return copy.deepcopy(operation_payload)
 
 
+class _AsyncFakeLLMClient:
+    """异步服务路径用：按同一份脚本返回响应，调用记录与被包装的 fake 共享。"""
+
+    def __init__(self, sync_client: _FakeLLMClient) -> None:
+        self._sync_client = sync_client
+        self.calls = sync_client.calls
+
+    async def generate_json(self, *, operation: str, system_prompt: str, user_payload: dict, validate=None) -> dict:
+        return self._sync_client.generate_json(
+            operation=operation,
+            system_prompt=system_prompt,
+            user_payload=user_payload,
+        )
+
+
+def _run_with_async_session(tmp_path, func):
+    """在 _make_db_session 建好的同一个数据库上用 AsyncSession 执行 func(db)。"""
+
+    async def _main():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{(tmp_path / 'service_tests.db').as_posix()}",
+            poolclass=NullPool,
+        )
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as db:
+                return await func(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_main())
+
+
 def _make_db_session(tmp_path) -> tuple[Session, str]:
     db_path = tmp_path / "service_tests.db"
     engine = create_engine(f"sqlite:///{db_path.as_posix()}", connect_args={"check_same_thread": False})
@@ -310,6 +344,58 @@ def test_generate_constitution_increments_version(monkeypatch, tmp_path) -> None
     _close_db(db)
 
 
+def test_generate_constitution_async_increments_version(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db_session(tmp_path)
+    payload = {
+        "common_words": ["w1", "w2", "w3"],
+        "forbidden_words": ["f1", "f2", "f3"],
+        "sentence_preferences": ["s1", "s2", "s3"],
+        "moat_positions": ["m1", "m2", "m3"],
+        "narrative_mainline": "Narrative",
+        "growth_arc_template": "Growth Arc",
+    }
+    fake_client = _AsyncFakeLLMClient(_FakeLLMClient({"generate_constitution": payload}))
+    monkeypatch.setattr(persona_service, "get_async_llm_client", lambda: fake_client)
+    monkeypatch.setattr(persona_service, "get_llm_client", lambda: pytest.fail("sync client used"))
+
+    async def _generate_twice(async_db):
+        first = await persona_service.generate_constitution_async(db=async_db, user_id=user_id)
+        second = await persona_service.generate_constitution_async(db=async_db, user_id=user_id)
+        return first, second
+
+    first, second = _run_with_async_session(tmp_path, _generate_twice)
+
+    assert first.version == 1
+    assert second.version == 2
+    assert second.previous_version_id == first.id
+    assert len(fake_client.calls) == 2
+    _close_db(db)
+
+
+def test_generate_identity_models_async_persists_count(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db_session(tmp_path)
+    fake_client = _AsyncFakeLLMClient(
+        _FakeLLMClient({"generate_identity_models": _identity_model_payloads("Async", 3)})
+    )
+    monkeypatch.setattr(identity_service, "get_async_llm_client", lambda: fake_client)
+
+    models = _run_with_async_session(
+        tmp_path,
+        lambda async_db: identity_service.generate_identity_models_async(
+            db=async_db,
+            user_id=user_id,
+            session_id=None,
+            capability_profile={"skill_stack": ["python"]},
+            count=3,
+        ),
+    )
+
+    assert sorted(model.title for model in models) == ["Async A", "Async B", "Async C"]
+    assert all(call["user_payload"]["count"] == 1 for call in fake_client.calls)
+    assert db.query(IdentityModel).filter(IdentityModel.user_id == user_id).count() == 3
+    _close_db(db)
+
+
 def test_generate_launch_kit_creates_7_days(monkeypatch, tmp_path) -> None:
     db, user_id = _make_db_session(tmp_path)
     payload = _valid_launch_kit_payload()
@@ -327,6 +413,102 @@ def test_generate_launch_kit_creates_7_days(monkeypatch, tmp_path) -> None:
     _close_db(db)
 
 
+def _launch_kit_plan_payload() -> dict:
+    payload = _valid_launch_kit_payload()
+    payload["days"] = [{"day_no": day["day_no"], "theme": day["theme"]} for day in payload["days"]]
+    return payload
+
+
+class _FakeParallelLaunchKitClient(_FakeLLMClient):
+    """Day bodies keyed by day_no; a list value is consumed one response per call."""
+
+    def __init__(self, plan_payloads: list[dict], day_payloads: dict[int, dict | list[dict]]) -> None:
+        super().__init__({"generate_launch_kit_plan": plan_payloads})
+        self._day_payloads = copy.deepcopy(day_payloads)
+
+    def generate_json(self, *, operation: str, system_prompt: str, user_payload: dict, validate=None) -> dict:
+        if operation != "generate_launch_kit_day":
+            return super().generate_json(
+                operation=operation,
+                system_prompt=system_prompt,
+                user_payload=user_payload,
+            )
+        with self._lock:
+            self.calls.append(
+                {
+                    "operation": operation,
+                    "system_prompt": system_prompt,
+                    "user_payload": copy.deepcopy(user_payload),
+                }
+            )
+            day_payload = self._day_payloads[user_payload["day_no"]]
+            if isinstance(day_payload, list):
+                return copy.deepcopy(day_payload.pop(0))
+            return copy.deepcopy(day_payload)
+
+
+def _day_body(day_no: int) -> dict:
+    return {"draft_or_outline": f"draft-{day_no}", "opening_text": f"opening-{day_no}"}
+
+
+def test_generate_launch_kit_parallel_mode_plans_then_generates_each_day(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db_session(tmp_path)
+    fake_client = _FakeParallelLaunchKitClient(
+        [_launch_kit_plan_payload()],
+        {day_no: _day_body(day_no) for day_no in range(1, 8)},
+    )
+    monkeypatch.setattr(launch_kit_service, "get_llm_client", lambda: fake_client)
+
+    kit = launch_kit_service.generate_launch_kit(db=db, user_id=user_id, generation_mode="parallel")
+
+    assert [day.day_no for day in kit.days] == [1, 2, 3, 4, 5, 6, 7]
+    assert [day.theme for day in kit.days] == [f"theme-{i}" for i in range(1, 8)]
+    assert kit.days[2].draft_or_outline == "draft-3"
+    operations = [call["operation"] for call in fake_client.calls]
+    assert operations[0] == "generate_launch_kit_plan"
+    assert operations.count("generate_launch_kit_day") == 7
+    day_call = next(call for call in fake_client.calls if call["operation"] == "generate_launch_kit_day")
+    assert "context_bundle" in day_call["user_payload"]
+    assert len(day_call["user_payload"]["plan"]["days"]) == 7
+    _close_db(db)
+
+
+def test_generate_launch_kit_parallel_mode_retries_only_invalid_day(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db_session(tmp_path)
+    day_payloads: dict[int, dict | list[dict]] = {day_no: _day_body(day_no) for day_no in range(1, 8)}
+    day_payloads[4] = [{"draft_or_outline": "", "opening_text": "opening-4"}, _day_body(4)]
+    fake_client = _FakeParallelLaunchKitClient([_launch_kit_plan_payload()], day_payloads)
+    monkeypatch.setattr(launch_kit_service, "get_llm_client", lambda: fake_client)
+
+    kit = launch_kit_service.generate_launch_kit(db=db, user_id=user_id, generation_mode="parallel")
+
+    assert kit.days[3].draft_or_outline == "draft-4"
+    day_calls = [call for call in fake_client.calls if call["operation"] == "generate_launch_kit_day"]
+    assert len(day_calls) == 8
+    retried = [call for call in day_calls if "validation_error" in call["user_payload"]]
+    assert len(retried) == 1
+    assert retried[0]["user_payload"]["day_no"] == 4
+    assert "generate_launch_kit" not in [call["operation"] for call in fake_client.calls]
+    _close_db(db)
+
+
+def test_generate_launch_kit_parallel_mode_raises_after_day_retries_exhausted(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db_session(tmp_path)
+    day_payloads: dict[int, dict | list[dict]] = {day_no: _day_body(day_no) for day_no in range(1, 8)}
+    day_payloads[2] = {"draft_or_outline": "draft-2"}
+    fake_client = _FakeParallelLaunchKitClient([_launch_kit_plan_payload()], day_payloads)
+    monkeypatch.setattr(launch_kit_service, "get_llm_client", lambda: fake_client)
+
+    with pytest.raises(LLMServiceError) as exc_info:
+        launch_kit_service.generate_launch_kit(db=db, user_id=user_id, generation_mode="parallel")
+
+    assert exc_info.value.code == "LLM_SCHEMA_VALIDATION_FAILED"
+    assert exc_info.value.operation == "generate_launch_kit_day"
+    assert "after 2 schema repair retries" in exc_info.value.message
+    assert db.query(LaunchKit).count() == 0
+    _close_db(db)
+
+
 def test_generate_launch_kit_injects_context_bundle_from_saved_records(monkeypatch, tmp_path) -> None:
     db, user_id = _make_db_session(tmp_path)
     fake_client = _FakeLLMClient({"generate_launch_kit": _valid_launch_kit_payload()})
@@ -338,10 +520,10 @@ def test_generate_launch_kit_injects_context_bundle_from_saved_records(monkeypat
     profile = CapabilityProfile(
         session_id=session.id,
         user_id=user_id,
-        skill_stack_json=json.dumps(["python", "writing"], ensure_ascii=False),
-        interest_energy_curve_json=json.dumps([{"topic": "growth"}], ensure_ascii=False),
+        skill_stack_json=["python", "writing"],
+        interest_energy_curve_json=[{"topic": "growth"}],
         cognitive_style="structured",
-        value_boundaries_json=json.dumps(["no fake claims"], ensure_ascii=False),
+        value_boundaries_json=["no fake claims"],
         risk_tolerance=2,
         time_investment_hours=6,
     )
@@ -350,15 +532,15 @@ def test_generate_launch_kit_injects_context_bundle_from_saved_records(monkeypat
         session_id=session.id,
         title="Growth Coach",
         target_audience_pain="Inconsistent publishing",
-        content_pillars_json=json.dumps(["pillar-1", "pillar-2", "pillar-3"], ensure_ascii=False),
-        tone_keywords_json=json.dumps(["clear", "calm"], ensure_ascii=False),
-        tone_examples_json=json.dumps(["e1", "e2", "e3", "e4", "e5"], ensure_ascii=False),
-        long_term_views_json=json.dumps(["v1", "v2", "v3", "v4", "v5"], ensure_ascii=False),
+        content_pillars_json=["pillar-1", "pillar-2", "pillar-3"],
+        tone_keywords_json=["clear", "calm"],
+        tone_examples_json=["e1", "e2", "e3", "e4", "e5"],
+        long_term_views_json=["v1", "v2", "v3", "v4", "v5"],
         differentiation="Evidence-first workflow",
         growth_path_0_3m="Publish weekly",
         growth_path_3_12m="Build products",
-        monetization_validation_order_json=json.dumps(["lead", "pilot"], ensure_ascii=False),
-        risk_boundary_json=json.dumps(["no guarantee claims"], ensure_ascii=False),
+        monetization_validation_order_json=["lead", "pilot"],
+        risk_boundary_json=["no guarantee claims"],
     )
     db.add_all([profile, identity])
     db.flush()
@@ -366,10 +548,10 @@ def test_generate_launch_kit_injects_context_bundle_from_saved_records(monkeypat
     constitution = PersonaConstitution(
         user_id=user_id,
         identity_model_id=identity.id,
-        common_words_json=json.dumps(["clarity", "system", "evidence"], ensure_ascii=False),
-        forbidden_words_json=json.dumps(["guarantee", "overnight", "secret"], ensure_ascii=False),
-        sentence_preferences_json=json.dumps(["one claim", "one proof", "one action"], ensure_ascii=False),
-        moat_positions_json=json.dumps(["truthful", "repeatable", "ethical"], ensure_ascii=False),
+        common_words_json=["clarity", "system", "evidence"],
+        forbidden_words_json=["guarantee", "overnight", "secret"],
+        sentence_preferences_json=["one claim", "one proof", "one action"],
+        moat_positions_json=["truthful", "repeatable", "ethical"],
         narrative_mainline="Build repeatable growth systems.",
         growth_arc_template="Problem -> Method -> Proof",
         version=1,
@@ -416,10 +598,10 @@ def test_generate_launch_kit_resolves_missing_constitution_id_from_identity(monk
     constitution = PersonaConstitution(
         user_id=user_id,
         identity_model_id=identity.id,
-        common_words_json=json.dumps(["a", "b", "c"], ensure_ascii=False),
-        forbidden_words_json=json.dumps(["x", "y", "z"], ensure_ascii=False),
-        sentence_preferences_json=json.dumps(["p1", "p2", "p3"], ensure_ascii=False),
-        moat_positions_json=json.dumps(["m1", "m2", "m3"], ensure_ascii=False),
+        common_words_json=["a", "b", "c"],
+        forbidden_words_json=["x", "y", "z"],
+        sentence_preferences_json=["p1", "p2", "p3"],
+        moat_positions_json=["m1", "m2", "m3"],
         narrative_mainline="Mainline",
         growth_arc_template="Arc",
         version=1,
@@ -450,10 +632,10 @@ def test_generate_launch_kit_fallbacks_when_ids_invalid_or_missing(monkeypatch,
     related_constitution = PersonaConstitution(
         user_id=user_id,
         identity_model_id=latest_identity.id,
-        common_words_json=json.dumps(["a", "b", "c"], ensure_ascii=False),
-        forbidden_words_json=json.dumps(["x", "y", "z"], ensure_ascii=False),
-        sentence_preferences_json=json.dumps(["p1", "p2", "p3"], ensure_ascii=False),
-        moat_positions_json=json.dumps(["m1", "m2", "m3"], ensure_ascii=False),
+        common_words_json=["a", "b", "c"],
+        forbidden_words_json=["x", "y", "z"],
+        sentence_preferences_json=["p1", "p2", "p3"],
+        moat_positions_json=["m1", "m2", "m3"],
         narrative_mainline="Mainline",
         growth_arc_template="Arc",
         version=1,
@@ -623,6 +805,90 @@ def test_check_consistency_retries_when_score_invalid_then_succeeds(monkeypatch,
     _close_db(db)
 
 
+def test_check_consistency_repairs_only_invalid_field(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db_session(tmp_path)
+    invalid_payload = {
+        "deviation_items": ["item-1"],
+        "deviation_reasons": ["reason-1"],
+        "suggestions": ["suggestion-1"],
+        "risk_triggered": False,
+        "risk_warning": "",
+        "score": "70分",
+    }
+    fake_client = _FakeLLMClient(
+        {"check_consistency": [invalid_payload, {"fragments": {"score": 72}}]}
+    )
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+
+    result = consistency_service.check_consistency(
+        db=db,
+        user_id=user_id,
+        draft_text="a draft text",
+    )
+
+    assert result.score == 72
+    assert result.schema_repair_attempts == 1
+    assert result.check.deviation_items_json == ["item-1"]
+    assert fake_client.calls[1]["user_payload"]["fragments"] == {"score": "70分"}
+    _close_db(db)
+
+
+def test_check_consistency_reuses_result_for_whitespace_equivalent_draft(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db_session(tmp_path)
+    payload = {
+        "deviation_items": ["item-1"],
+        "deviation_reasons": ["reason-1"],
+        "suggestions": ["suggestion-1"],
+        "risk_triggered": False,
+        "risk_warning": "",
+        "score": 77,
+    }
+    fake_client = _FakeLLMClient({"check_consistency": payload})
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+
+    first = consistency_service.check_consistency(db=db, user_id=user_id, draft_text="a  draft\ntext ")
+    second = consistency_service.check_consistency(db=db, user_id=user_id, draft_text=" a draft text")
+    forced = consistency_service.check_consistency(
+        db=db,
+        user_id=user_id,
+        draft_text="a draft text",
+        force=True,
+    )
+
+    assert first.cached is False
+    assert second.cached is True
+    assert second.check.id == first.check.id
+    assert second.score == 77
+    assert forced.cached is False
+    assert forced.check.id != first.check.id
+    assert len(fake_client.calls) == 2
+    assert first.check.draft_hash == consistency_service.compute_draft_hash("a draft text")
+    _close_db(db)
+
+
+def test_check_consistency_does_not_reuse_degraded_result(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db_session(tmp_path)
+    invalid_payload = {
+        "deviation_items": [],
+        "deviation_reasons": [],
+        "suggestions": [],
+        "risk_triggered": False,
+        "risk_warning": "",
+        "score": "invalid",
+    }
+    fake_client = _FakeLLMClient({"check_consistency": invalid_payload})
+    monkeypatch.setattr(consistency_service, "get_llm_client", lambda: fake_client)
+
+    first = consistency_service.check_consistency(db=db, user_id=user_id, draft_text="same draft")
+    second = consistency_service.check_consistency(db=db, user_id=user_id, draft_text="same draft")
+
+    assert first.degraded is True
+    assert first.check.degraded is True
+    assert second.cached is False
+    assert len(fake_client.calls) == 6
+    _close_db(db)
+
+
 def test_check_consistency_degrades_after_schema_retry_exhaustion(monkeypatch, tmp_path) -> None:
     db, user_id = _make_db_session(tmp_path)
     invalid_payload = {
@@ -651,9 +917,9 @@ def test_check_consistency_degrades_after_schema_retry_exhaustion(monkeypatch, t
     assert result.degrade_reason == consistency_service.DEGRADE_REASON_SCHEMA_RETRY_EXHAUSTED
     assert result.schema_repair_attempts == 2
 
-    deviation_items = json.loads(check.deviation_items_json)
-    deviation_reasons = json.loads(check.deviation_reasons_json)
-    suggestions = json.loads(check.suggestions_json)
+    deviation_items = check.deviation_items_json
+    deviation_reasons = check.deviation_reasons_json
+    suggestions = check.suggestions_json
     assert deviation_items
     assert deviation_reasons
     assert suggestions
@@ -663,11 +929,12 @@ def test_check_consistency_degrades_after_schema_retry_exhaustion(monkeypatch, t
 
 def test_generate_launch_kit_retries_schema_then_succeeds(monkeypatch, tmp_path) -> None:
     db, user_id = _make_db_session(tmp_path)
+    repaired_day = dict(_valid_launch_kit_payload()["days"][4], draft_or_outline="repaired-draft-5")
     fake_client = _FakeLLMClient(
         {
             "generate_launch_kit": [
                 _invalid_launch_kit_payload_missing_outline(),
-                _valid_launch_kit_payload(),
+                {"fragments": {"days[4]": repaired_day}},
             ]
         }
     )
@@ -677,8 +944,84 @@ def test_generate_launch_kit_retries_schema_then_succeeds(monkeypatch, tmp_path)
 
     assert kit.id is not None
     assert len(kit.days) == 7
+    assert kit.days[4].draft_or_outline == "repaired-draft-5"
     assert len([c for c in fake_client.calls if c["operation"] == "generate_launch_kit"]) == 2
-    assert "You are repairing an invalid 7-day launch kit JSON." in fake_client.calls[1]["system_prompt"]
+    repair_call = fake_client.calls[1]
+    assert "You are repairing fragments of an invalid 7-day launch kit JSON." in repair_call["system_prompt"]
+    assert list(repair_call["user_payload"]["fragments"]) == ["days[4]"]
+    assert "previous_invalid_response" not in repair_call["user_payload"]
+    assert repair_call["user_payload"]["validation_errors"]["days[4]"][0].startswith(
+        "days[4].draft_or_outline:"
+    )
+    _close_db(db)
+
+
+def test_generate_launch_kit_async_repairs_schema_then_succeeds(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db_session(tmp_path)
+    repaired_day = dict(_valid_launch_kit_payload()["days"][4], draft_or_outline="repaired-draft-5")
+    fake_client = _AsyncFakeLLMClient(
+        _FakeLLMClient(
+            {
+                "generate_launch_kit": [
+                    _invalid_launch_kit_payload_missing_outline(),
+                    {"fragments": {"days[4]": repaired_day}},
+                ]
+            }
+        )
+    )
+    monkeypatch.setattr(launch_kit_service, "get_async_llm_client", lambda: fake_client)
+
+    kit = _run_with_async_session(
+        tmp_path,
+        lambda async_db: launch_kit_service.generate_launch_kit_async(db=async_db, user_id=user_id),
+    )
+
+    stored = db.get(LaunchKit, kit.id)
+    assert [day.day_no for day in stored.days] == [1, 2, 3, 4, 5, 6, 7]
+    assert stored.days[4].draft_or_outline == "repaired-draft-5"
+    assert list(fake_client.calls[1]["user_payload"]["fragments"]) == ["days[4]"]
+    _close_db(db)
+
+
+def test_generate_launch_kit_async_parallel_mode_retries_only_invalid_day(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db_session(tmp_path)
+    day_payloads: dict[int, dict | list[dict]] = {day_no: _day_body(day_no) for day_no in range(1, 8)}
+    day_payloads[4] = [{"draft_or_outline": "", "opening_text": "opening-4"}, _day_body(4)]
+    fake_client = _AsyncFakeLLMClient(_FakeParallelLaunchKitClient([_launch_kit_plan_payload()], day_payloads))
+    monkeypatch.setattr(launch_kit_service, "get_async_llm_client", lambda: fake_client)
+
+    kit = _run_with_async_session(
+        tmp_path,
+        lambda async_db: launch_kit_service.generate_launch_kit_async(
+            db=async_db,
+            user_id=user_id,
+            generation_mode="parallel",
+        ),
+    )
+
+    stored = db.get(LaunchKit, kit.id)
+    assert [day.theme for day in stored.days] == [f"theme-{i}" for i in range(1, 8)]
+    assert stored.days[3].draft_or_outline == "draft-4"
+    day_calls = [call for call in fake_client.calls if call["operation"] == "generate_launch_kit_day"]
+    assert len(day_calls) == 8
+    retried = [call for call in day_calls if "validation_error" in call["user_payload"]]
+    assert [call["user_payload"]["day_no"] for call in retried] == [4]
+    _close_db(db)
+
+
+def test_generate_launch_kit_uses_full_repair_for_model_level_errors(monkeypatch, tmp_path) -> None:
+    db, user_id = _make_db_session(tmp_path)
+    invalid = _valid_launch_kit_payload()
+    invalid["days"] = invalid["days"][:6]
+    fake_client = _FakeLLMClient({"generate_launch_kit": [invalid, _valid_launch_kit_payload()]})
+    monkeypatch.setattr(launch_kit_service, "get_llm_client", lambda: fake_client)
+
+    kit = launch_kit_service.generate_launch_kit(db=db, user_id=user_id)
+
+    assert len(kit.days) == 7
+    repair_call = fake_client.calls[1]
+    assert "You are repairing an invalid 7-day launch kit JSON." in repair_call["system_prompt"]
+    assert repair_call["user_payload"]["previous_invalid_response"] == invalid
     _close_db(db)
 
 
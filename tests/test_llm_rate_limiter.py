@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.config import LLMModelRateLimit, get_settings
+from app.services.llm_client import (
+    LLMRateLimiter,
+    LLMServiceError,
+    build_llm_rate_limiter,
+    estimate_prompt_tokens,
+)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _limiter(**overrides) -> LLMRateLimiter:
+    options = {
+        "max_in_flight": 0,
+        "requests_per_minute": 0,
+        "tokens_per_minute": 0,
+        "model_limits": {},
+        "queue_timeout_seconds": 5.0,
+    }
+    options.update(overrides)
+    return LLMRateLimiter(**options)
+
+
+def _wait_until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_waiters_are_granted_in_fifo_order_within_max_in_flight() -> None:
+    limiter = _limiter(max_in_flight=1)
+    held = limiter.acquire(model="m", tokens=1, operation="op")
+    order: list[str] = []
+    permits = []
+
+    def _waiter(name: str) -> None:
+        permit = limiter.acquire(model="m", tokens=1, operation="op")
+        order.append(name)
+        permits.append(permit)
+
+    threads = []
+    for index, name in enumerate(["first", "second", "third"]):
+        thread = threading.Thread(target=_waiter, args=(name,))
+        thread.start()
+        threads.append(thread)
+        _wait_until(lambda: limiter.snapshot()["queued"] == index + 1)
+
+    for expected in (1, 2, 3):
+        limiter.release(held)
+        _wait_until(lambda: len(order) == expected)
+        assert limiter.snapshot()["in_flight"] == 1
+        held = permits[-1]
+    limiter.release(held)
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["first", "second", "third"]
+    snapshot = limiter.snapshot()
+    assert snapshot["in_flight"] == 0
+    assert snapshot["acquired"] == 4
+    assert snapshot["queue_wait_max_ms"] > 0
+
+
+def test_queue_deadline_exceeded_raises_and_leaves_queue() -> None:
+    limiter = _limiter(max_in_flight=1, queue_timeout_seconds=0.05)
+    limiter.acquire(model="m", tokens=1, operation="op")
+
+    with pytest.raises(LLMServiceError) as exc_info:
+        limiter.acquire(model="m", tokens=1, operation="generate_identity_models")
+
+    assert exc_info.value.code == "LLM_QUEUE_TIMEOUT"
+    assert exc_info.value.operation == "generate_identity_models"
+    assert exc_info.value.retryable is False
+    assert limiter.snapshot()["queued"] == 0
+    assert limiter.snapshot()["rejected"] == 1
+
+
+def test_requests_per_minute_bucket_fails_fast_and_is_per_model() -> None:
+    clock = _FakeClock()
+    limiter = _limiter(
+        requests_per_minute=60,
+        model_limits={"slow-model": LLMModelRateLimit(requests_per_minute=1)},
+        clock=clock,
+    )
+
+    limiter.acquire(model="slow-model", tokens=1, operation="op")
+    # 下一个令牌需要 60s，超过 5s 排队期限：不等待，直接失败。
+    started = time.monotonic()
+    with pytest.raises(LLMServiceError):
+        limiter.acquire(model="slow-model", tokens=1, operation="op")
+    assert time.monotonic() - started < 1
+
+    # 其他模型使用默认配额，不受影响。
+    limiter.acquire(model="default-model", tokens=1, operation="op")
+
+    clock.now += 60
+    limiter.acquire(model="slow-model", tokens=1, operation="op")
+
+
+def test_tokens_per_minute_bucket_is_corrected_by_actual_usage() -> None:
+    clock = _FakeClock()
+    limiter = _limiter(tokens_per_minute=600, queue_timeout_seconds=1.0, clock=clock)
+
+    permit = limiter.acquire(model="m", tokens=100, operation="op")
+    limiter.release(permit, used_tokens=550)
+
+    # 桶内只剩 50，再取 100 需等待 5s（10 token/s），超出 1s 期限。
+    with pytest.raises(LLMServiceError):
+        limiter.acquire(model="m", tokens=100, operation="op")
+
+    clock.now += 5
+    limiter.acquire(model="m", tokens=100, operation="op")
+
+
+def test_async_acquire_waits_for_release_and_cancellation_leaves_queue() -> None:
+    limiter = _limiter(max_in_flight=1)
+    held = limiter.acquire(model="m", tokens=1, operation="op")
+
+    async def _scenario() -> None:
+        waiter = asyncio.create_task(limiter.acquire_async(model="m", tokens=1, operation="op"))
+        await asyncio.sleep(0.1)
+        assert not waiter.done()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.snapshot()["queued"] == 0
+
+        waiter = asyncio.create_task(limiter.acquire_async(model="m", tokens=1, operation="op"))
+        await asyncio.sleep(0.1)
+        limiter.release(held)
+        permit = await asyncio.wait_for(waiter, timeout=5)
+        limiter.release(permit)
+
+    asyncio.run(_scenario())
+    assert limiter.snapshot()["in_flight"] == 0
+
+
+def test_build_llm_rate_limiter_respects_settings(monkeypatch) -> None:
+    monkeypatch.setenv("LLM_MAX_IN_FLIGHT", "0")
+    get_settings.cache_clear()
+    assert build_llm_rate_limiter(get_settings()) is None
+
+    monkeypatch.setenv("LLM_MODEL_RATE_LIMITS", '{"test-model": {"tokens_per_minute": 1000}}')
+    get_settings.cache_clear()
+    assert isinstance(build_llm_rate_limiter(get_settings()), LLMRateLimiter)
+
+
+def test_estimate_prompt_tokens_counts_cjk_as_one_token_per_char() -> None:
+    assert estimate_prompt_tokens([{"role": "user", "content": "中文内容"}]) == 4
+    assert estimate_prompt_tokens([{"role": "system", "content": ""}]) == 1
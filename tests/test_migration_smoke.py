@@ -2,7 +2,16 @@ from pathlib import Path
 
 from alembic import command
 from alembic.config import Config
-from sqlalchemy import create_engine, inspect
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+
+from app.models.consistency_check import EventLog
+from app.models.identity_model import IdentityModel, IdentitySelection
+from app.models.onboarding import CapabilityProfile
+from app.models.persona import PersonaConstitution, RiskBoundaryItem
+from app.services.consistency_check import compute_draft_hash
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
@@ -32,3 +41,175 @@ def test_upgrade_and_downgrade(tmp_path: Path) -> None:
 
     command.downgrade(config, "base")
     assert "users" not in _table_names(database_url)
+
+
+def test_draft_hash_migration_backfills_existing_rows(tmp_path: Path) -> None:
+    db_path = tmp_path / "migration_backfill.db"
+    database_url = f"sqlite:///{db_path.as_posix()}"
+    config = _build_alembic_config(database_url)
+
+    command.upgrade(config, "0002_mvp_full")
+    engine = create_engine(database_url)
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("INSERT INTO users (id) VALUES ('u1')"))
+            connection.execute(
+                text(
+                    "INSERT INTO consistency_checks (id, user_id, draft_text) "
+                    "VALUES ('c1', 'u1', :draft_text)"
+                ),
+                {"draft_text": "  hello\n\tworld "},
+            )
+
+        command.upgrade(config, "head")
+
+        with engine.connect() as connection:
+            row = connection.execute(
+                text("SELECT draft_hash, score, degraded FROM consistency_checks WHERE id = 'c1'")
+            ).one()
+        indexes = {index["name"] for index in inspect(engine).get_indexes("consistency_checks")}
+    finally:
+        engine.dispose()
+
+    assert row.draft_hash == compute_draft_hash("hello world")
+    assert row.score is None
+    assert not row.degraded
+    assert "ix_consistency_checks_draft_lookup" in indexes
+
+
+def test_keyset_pagination_uses_composite_index(tmp_path: Path) -> None:
+    db_path = tmp_path / "pagination_plan.db"
+    database_url = f"sqlite:///{db_path.as_posix()}"
+    command.upgrade(_build_alembic_config(database_url), "head")
+
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as connection:
+            plan = connection.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT * FROM consistency_checks "
+                    "WHERE user_id = :user_id AND (created_at < :created_at "
+                    "OR (created_at = :created_at AND id < :id)) "
+                    "ORDER BY created_at DESC, id DESC LIMIT 21"
+                ),
+                {"user_id": "u1", "created_at": "2026-01-01 00:00:00", "id": "x"},
+            ).all()
+    finally:
+        engine.dispose()
+
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_consistency_checks_user_created" in details
+    assert "TEMP B-TREE" not in details
+
+
+
+def test_native_json_migration_keeps_existing_text_values(tmp_path: Path) -> None:
+    db_path = tmp_path / "migration_json.db"
+    database_url = f"sqlite:///{db_path.as_posix()}"
+    config = _build_alembic_config(database_url)
+
+    command.upgrade(config, "0006_resolver_indexes")
+    engine = create_engine(database_url)
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("INSERT INTO users (id) VALUES ('u1')"))
+            connection.execute(
+                text(
+                    "INSERT INTO persona_constitutions "
+                    "(id, user_id, common_words_json, forbidden_words_json, sentence_preferences_json) "
+                    "VALUES ('p1', 'u1', :common_words, NULL, 'not json')"
+                ),
+                {"common_words": '["结论先行", "复盘"]'},
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO event_logs (id, user_id, event_name, stage, payload_json) "
+                    "VALUES ('e1', 'u1', 'content_published', 'MVP', '{\"variant\": \"b\"}')"
+                )
+            )
+
+        command.upgrade(config, "head")
+
+        with Session(engine) as db:
+            constitution = db.get(PersonaConstitution, "p1")
+            event_log = db.get(EventLog, "e1")
+            assert constitution.common_words_json == ["结论先行", "复盘"]
+            assert constitution.forbidden_words_json == []
+            assert constitution.sentence_preferences_json == []
+            assert event_log.payload_json == {"variant": "b"}
+
+        command.downgrade(config, "0006_resolver_indexes")
+        with engine.connect() as connection:
+            raw = connection.execute(
+                text("SELECT common_words_json FROM persona_constitutions WHERE id = 'p1'")
+            ).scalar_one()
+        assert raw == '["结论先行", "复盘"]'
+    finally:
+        engine.dispose()
+
+# 与 app/services 中上下文解析/列表查询同形的语句（等值过滤 + ORDER BY + LIMIT）。
+_RESOLVER_QUERIES = {
+    "constitution_latest": select(PersonaConstitution)
+    .where(PersonaConstitution.user_id == "u1")
+    .order_by(PersonaConstitution.version.desc(), PersonaConstitution.created_at.desc())
+    .limit(1),
+    "constitution_by_identity": select(PersonaConstitution)
+    .where(PersonaConstitution.user_id == "u1", PersonaConstitution.identity_model_id == "im1")
+    .order_by(PersonaConstitution.version.desc(), PersonaConstitution.created_at.desc())
+    .limit(1),
+    "boundaries_by_constitution": select(RiskBoundaryItem)
+    .where(RiskBoundaryItem.user_id == "u1", RiskBoundaryItem.constitution_id == "pc1")
+    .order_by(RiskBoundaryItem.created_at.desc(), RiskBoundaryItem.id.desc())
+    .limit(20),
+    "boundaries_by_identity": select(RiskBoundaryItem)
+    .where(RiskBoundaryItem.user_id == "u1", RiskBoundaryItem.identity_model_id == "im1")
+    .order_by(RiskBoundaryItem.created_at.desc(), RiskBoundaryItem.id.desc())
+    .limit(20),
+    "boundaries_latest": select(RiskBoundaryItem)
+    .where(RiskBoundaryItem.user_id == "u1")
+    .order_by(RiskBoundaryItem.created_at.desc(), RiskBoundaryItem.id.desc())
+    .limit(20),
+    "identity_selection": select(IdentitySelection)
+    .where(IdentitySelection.user_id == "u1")
+    .order_by(IdentitySelection.selected_at.desc())
+    .limit(1),
+    "identity_latest": select(IdentityModel)
+    .where(IdentityModel.user_id == "u1")
+    .order_by(IdentityModel.created_at.desc(), IdentityModel.id.desc())
+    .limit(1),
+    "profile_by_session": select(CapabilityProfile)
+    .where(CapabilityProfile.user_id == "u1", CapabilityProfile.session_id == "s1")
+    .limit(1),
+    "profile_latest": select(CapabilityProfile)
+    .where(CapabilityProfile.user_id == "u1")
+    .order_by(CapabilityProfile.created_at.desc(), CapabilityProfile.id.desc())
+    .limit(1),
+    "events_by_user": select(EventLog)
+    .where(EventLog.user_id == "u1")
+    .order_by(EventLog.occurred_at.desc())
+    .limit(100),
+}
+
+
+@pytest.fixture(scope="module")
+def migrated_engine(tmp_path_factory: pytest.TempPathFactory):
+    db_path = tmp_path_factory.mktemp("resolver_plan") / "resolver_plan.db"
+    database_url = f"sqlite:///{db_path.as_posix()}"
+    command.upgrade(_build_alembic_config(database_url), "head")
+    engine = create_engine(database_url)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", sorted(_RESOLVER_QUERIES))
+def test_resolver_queries_avoid_temp_btree_sorts(migrated_engine, name: str) -> None:
+    compiled = _RESOLVER_QUERIES[name].compile(
+        dialect=sqlite.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+    with migrated_engine.connect() as connection:
+        plan = connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+
+    details = " ".join(row[-1] for row in plan)
+    assert "USING INDEX" in details or "USING COVERING INDEX" in details
+    assert "TEMP B-TREE" not in details
@@ -5,11 +5,13 @@ from types import SimpleNamespace
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
 import app.main as main_module
 from app.db.base import Base
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.models.user import User
 from app.services import consistency_check as consistency_service
 from app.services import identity_model as identity_service
@@ -40,7 +42,15 @@ def _create_test_client(monkeypatch, tmp_path) -> tuple[TestClient, str, Engine]
         finally:
             db.close()
 
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path.as_posix()}", poolclass=NullPool)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def _override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
     main_module.app.dependency_overrides[get_db] = _override_get_db
+    main_module.app.dependency_overrides[get_async_db] = _override_get_async_db
     client = TestClient(main_module.app)
     return client, user_id, engine
 
@@ -49,7 +59,7 @@ def test_identity_route_passes_expected_parameters(monkeypatch, tmp_path) -> Non
     client, user_id, engine = _create_test_client(monkeypatch, tmp_path)
     captured: dict = {}
     try:
-        def _fake_generate(**kwargs):
+        async def _fake_generate(**kwargs):
             captured.update(kwargs)
             return [
                 SimpleNamespace(
@@ -62,7 +72,7 @@ def test_identity_route_passes_expected_parameters(monkeypatch, tmp_path) -> Non
                 )
             ]
 
-        monkeypatch.setattr(identity_service, "generate_identity_models", _fake_generate)
+        monkeypatch.setattr(identity_service, "generate_identity_models_async", _fake_generate)
         response = client.post(
             "/v1/identity-models/generate",
             json={
@@ -87,7 +97,7 @@ def test_persona_route_passes_expected_parameters(monkeypatch, tmp_path) -> None
     client, user_id, engine = _create_test_client(monkeypatch, tmp_path)
     captured: dict = {}
     try:
-        def _fake_generate(**kwargs):
+        async def _fake_generate(**kwargs):
             captured.update(kwargs)
             return SimpleNamespace(
                 id="constitution-1",
@@ -96,7 +106,7 @@ def test_persona_route_passes_expected_parameters(monkeypatch, tmp_path) -> None
                 narrative_mainline="mainline",
             )
 
-        monkeypatch.setattr(persona_service, "generate_constitution", _fake_generate)
+        monkeypatch.setattr(persona_service, "generate_constitution_async", _fake_generate)
         response = client.post(
             "/v1/persona-constitutions/generate",
             json={
@@ -121,7 +131,7 @@ def test_launch_kit_route_passes_expected_parameters(monkeypatch, tmp_path) -> N
     client, user_id, engine = _create_test_client(monkeypatch, tmp_path)
     captured: dict = {}
     try:
-        def _fake_generate(**kwargs):
+        async def _fake_generate(**kwargs):
             captured.update(kwargs)
             return SimpleNamespace(
                 id="kit-1",
@@ -130,7 +140,7 @@ def test_launch_kit_route_passes_expected_parameters(monkeypatch, tmp_path) -> N
                 days=[SimpleNamespace(day_no=1, theme="t", opening_text="o")],
             )
 
-        monkeypatch.setattr(launch_kit_service, "generate_launch_kit", _fake_generate)
+        monkeypatch.setattr(launch_kit_service, "generate_launch_kit_async", _fake_generate)
         response = client.post(
             "/v1/launch-kits/generate",
             json={
@@ -139,6 +149,7 @@ def test_launch_kit_route_passes_expected_parameters(monkeypatch, tmp_path) -> N
                 "constitution_id": "constitution-2",
                 "sustainable_columns": ["col-1"],
                 "growth_experiment_suggestion": [{"name": "exp"}],
+                "generation_mode": "parallel",
             },
         )
         assert response.status_code == 200
@@ -147,6 +158,7 @@ def test_launch_kit_route_passes_expected_parameters(monkeypatch, tmp_path) -> N
         assert captured["constitution_id"] == "constitution-2"
         assert captured["sustainable_columns"] == ["col-1"]
         assert captured["growth_experiment_suggestion"] == [{"name": "exp"}]
+        assert captured["generation_mode"] == "parallel"
     finally:
         client.close()
         main_module.app.dependency_overrides.clear()
@@ -161,9 +173,9 @@ def test_consistency_route_passes_expected_parameters(monkeypatch, tmp_path) ->
             captured.update(kwargs)
             check = SimpleNamespace(
                 id="check-1",
-                deviation_items_json='["item-1"]',
-                deviation_reasons_json='["reason-1"]',
-                suggestions_json='["suggestion-1"]',
+                deviation_items_json=["item-1"],
+                deviation_reasons_json=["reason-1"],
+                suggestions_json=["suggestion-1"],
                 risk_triggered=False,
                 risk_warning="",
             )
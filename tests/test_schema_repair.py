@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, ValidationError
+import pytest
+
+from app.services.schema_repair import (
+    apply_targeted_repair,
+    format_path,
+    parse_path,
+    plan_targeted_repair,
+)
+
+
+class _Item(BaseModel):
+    name: str
+    size: int
+
+
+class _Payload(BaseModel):
+    title: str
+    items: list[_Item]
+
+
+def _validation_error(payload: dict) -> ValidationError:
+    with pytest.raises(ValidationError) as exc_info:
+        _Payload.model_validate(payload)
+    return exc_info.value
+
+
+def test_format_and_parse_path_round_trip() -> None:
+    loc = ("items", 3, "name")
+    assert format_path(loc) == "items[3].name"
+    assert parse_path("items[3].name") == loc
+
+
+def test_plan_targets_list_items_and_top_level_fields() -> None:
+    payload = {
+        "title": None,
+        "items": [{"name": "a", "size": 1}, {"name": "b", "size": "big"}, {"size": 3}],
+    }
+
+    plan = plan_targeted_repair(payload, _validation_error(payload))
+
+    assert plan is not None
+    assert plan.fragments == {
+        "title": None,
+        "items[1]": {"name": "b", "size": "big"},
+        "items[2]": {"size": 3},
+    }
+    assert plan.errors["items[2]"] == ["items[2].name: Field required"]
+
+
+def test_apply_targeted_repair_splices_fragments_back() -> None:
+    payload = {"title": "t", "items": [{"name": "a", "size": 1}, {"name": "b", "size": "big"}]}
+    plan = plan_targeted_repair(payload, _validation_error(payload))
+    assert plan is not None
+
+    merged = apply_targeted_repair(
+        payload,
+        plan,
+        {"fragments": {"items[1]": {"name": "b", "size": 2}, "unexpected": "ignored"}},
+    )
+
+    assert _Payload.model_validate(merged).items[1].size == 2
+    assert "unexpected" not in merged
+    assert payload["items"][1]["size"] == "big"
+
+
+def test_apply_targeted_repair_accepts_full_payload_without_fragments() -> None:
+    payload = {"title": "t", "items": [{"name": "a", "size": "x"}]}
+    plan = plan_targeted_repair(payload, _validation_error(payload))
+    assert plan is not None
+
+    full = {"title": "t2", "items": [{"name": "a", "size": 1}]}
+    assert apply_targeted_repair(payload, plan, full) == full